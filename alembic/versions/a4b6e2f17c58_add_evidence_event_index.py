@@ -0,0 +1,61 @@
+"""Add local EvidenceAnchored event index
+
+Revision ID: a4b6e2f17c58
+Revises: f3c2d9e8a104
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# Import app models to reuse GUID TypeDecorator
+from app import models as app_models
+
+# revision identifiers, used by Alembic.
+revision = 'a4b6e2f17c58'
+down_revision = 'f3c2d9e8a104'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'evidence_events',
+        sa.Column('id', app_models.GUID(), nullable=False),
+        sa.Column('chain', sa.String(), nullable=False),
+        sa.Column('contract', sa.String(), nullable=False),
+        sa.Column('bundle_hash', sa.String(), nullable=False),
+        sa.Column('txid', sa.String(), nullable=False),
+        sa.Column('log_index', sa.Integer(), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('block_hash', sa.String(), nullable=True),
+        sa.Column('sender', sa.String(), nullable=True),
+        sa.Column('anchored_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chain', 'txid', 'log_index', name='uq_evidence_event_log')
+    )
+    op.create_index('ix_evidence_events_bundle_hash', 'evidence_events', ['bundle_hash'])
+    op.create_index('ix_evidence_events_block_number', 'evidence_events', ['block_number'])
+
+    op.create_table(
+        'index_cursors',
+        sa.Column('id', app_models.GUID(), nullable=False),
+        sa.Column('chain', sa.String(), nullable=False),
+        sa.Column('contract', sa.String(), nullable=False),
+        sa.Column('rpc_url', sa.String(), nullable=True),
+        sa.Column('first_block', sa.BigInteger(), nullable=True),
+        sa.Column('last_block', sa.BigInteger(), nullable=False),
+        sa.Column('last_block_hash', sa.String(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chain', 'contract', name='uq_index_cursor_chain_contract')
+    )
+
+
+def downgrade():
+    op.drop_table('index_cursors')
+    op.drop_index('ix_evidence_events_block_number', 'evidence_events')
+    op.drop_index('ix_evidence_events_bundle_hash', 'evidence_events')
+    op.drop_table('evidence_events')
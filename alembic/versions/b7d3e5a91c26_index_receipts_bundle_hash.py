@@ -0,0 +1,22 @@
+"""Index receipts.bundle_hash for DB-first verification
+
+Revision ID: b7d3e5a91c26
+Revises: a4b6e2f17c58
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e5a91c26'
+down_revision = 'a4b6e2f17c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_receipts_bundle_hash'), 'receipts', ['bundle_hash'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_receipts_bundle_hash'), table_name='receipts')
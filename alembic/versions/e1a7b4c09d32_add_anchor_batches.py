@@ -0,0 +1,65 @@
+"""Add Merkle-batched anchoring tables
+
+Revision ID: e1a7b4c09d32
+Revises: d8f9c3b21456
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# Import app models to reuse GUID TypeDecorator
+from app import models as app_models
+
+# revision identifiers, used by Alembic.
+revision = 'e1a7b4c09d32'
+down_revision = 'd8f9c3b21456'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'anchor_batches',
+        sa.Column('id', app_models.GUID(), nullable=False),
+        sa.Column('project_id', app_models.GUID(), nullable=True),
+        sa.Column('merkle_root', sa.String(), nullable=True),
+        sa.Column('size', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('anchored_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_anchor_batches_project_id', 'anchor_batches', ['project_id'])
+    op.create_index('ix_anchor_batches_merkle_root', 'anchor_batches', ['merkle_root'])
+
+    op.create_table(
+        'anchor_batch_items',
+        sa.Column('id', app_models.GUID(), nullable=False),
+        sa.Column('receipt_id', app_models.GUID(), nullable=False),
+        sa.Column('batch_id', app_models.GUID(), nullable=True),
+        sa.Column('bundle_hash', sa.String(), nullable=False),
+        sa.Column('leaf_index', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['receipt_id'], ['receipts.id']),
+        sa.ForeignKeyConstraint(['batch_id'], ['anchor_batches.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('receipt_id')
+    )
+    op.create_index('ix_anchor_batch_items_batch_id', 'anchor_batch_items', ['batch_id'])
+
+    # Batched receipts complete in the flush job, which needs the original callback target
+    op.add_column('receipts', sa.Column('callback_url', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('receipts', 'callback_url')
+
+    op.drop_index('ix_anchor_batch_items_batch_id', 'anchor_batch_items')
+    op.drop_table('anchor_batch_items')
+
+    op.drop_index('ix_anchor_batches_merkle_root', 'anchor_batches')
+    op.drop_index('ix_anchor_batches_project_id', 'anchor_batches')
+    op.drop_table('anchor_batches')
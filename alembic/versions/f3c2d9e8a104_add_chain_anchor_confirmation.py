@@ -0,0 +1,43 @@
+"""Track submit/confirm state on chain anchors
+
+Revision ID: f3c2d9e8a104
+Revises: e1a7b4c09d32
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f3c2d9e8a104'
+down_revision = 'e1a7b4c09d32'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows were written after the receipt was mined: they are confirmed.
+    op.add_column('chain_anchors', sa.Column('status', sa.String(), nullable=False, server_default='confirmed'))
+    op.add_column('chain_anchors', sa.Column('block_number', sa.Integer(), nullable=True))
+    op.add_column('chain_anchors', sa.Column('block_hash', sa.String(), nullable=True))
+    op.add_column('chain_anchors', sa.Column('rpc_url', sa.String(), nullable=True))
+    op.add_column('chain_anchors', sa.Column('contract', sa.String(), nullable=True))
+    op.add_column('chain_anchors', sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('chain_anchors', sa.Column('chain_id', sa.Integer(), nullable=True))
+    op.add_column('chain_anchors', sa.Column('signer', sa.String(), nullable=True))
+    op.add_column('chain_anchors', sa.Column('nonce', sa.Integer(), nullable=True))
+    op.create_index('ix_chain_anchors_status', 'chain_anchors', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_chain_anchors_status', 'chain_anchors')
+    op.drop_column('chain_anchors', 'nonce')
+    op.drop_column('chain_anchors', 'signer')
+    op.drop_column('chain_anchors', 'chain_id')
+    op.drop_column('chain_anchors', 'submitted_at')
+    op.drop_column('chain_anchors', 'contract')
+    op.drop_column('chain_anchors', 'rpc_url')
+    op.drop_column('chain_anchors', 'block_hash')
+    op.drop_column('chain_anchors', 'block_number')
+    op.drop_column('chain_anchors', 'status')
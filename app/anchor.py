@@ -9,18 +9,19 @@ Key improvement vs earlier version:
 All functions accept explicit parameters, but still default to env vars for convenience.
 """
 
-import json
 import os
 import time
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from eth_utils import to_checksum_address  # type: ignore
 from hexbytes import HexBytes  # type: ignore
 from web3 import Web3  # type: ignore
 from web3.contract import Contract  # type: ignore
+from web3.exceptions import TimeExhausted  # type: ignore
 
+from . import fee_oracle, merkle, providers
+from .nonce_manager import get_nonce_manager
 from .schemas import ChainMatch
 
 # Default to Flare mainnet if not configured.
@@ -32,6 +33,7 @@ DEFAULT_LOOKBACK_BLOCKS = int(os.getenv("ANCHOR_LOOKBACK_BLOCKS", "50000"))
 
 # Minimal ABI fallback if file not provided.
 # Matches: function anchorEvidence(bytes32 bundleHash)
+#          function anchorEvidenceBatch(bytes32[] bundleHashes)
 #          event EvidenceAnchored(bytes32 bundleHash, address sender, uint256 ts)
 FALLBACK_ABI = [
     {
@@ -51,8 +53,18 @@ FALLBACK_ABI = [
         "stateMutability": "nonpayable",
         "type": "function",
     },
+    {
+        "inputs": [{"internalType": "bytes32[]", "name": "bundleHashes", "type": "bytes32[]"}],
+        "name": "anchorEvidenceBatch",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
 ]
 
+# Gas fallback when estimating anchorEvidence fails (the batch call has none, see _build_tx_anchor)
+ANCHOR_GAS_DEFAULT = 200_000
+
 
 def _hex32_from_prefixed(hex_str: str) -> bytes:
     if not isinstance(hex_str, str) or not hex_str.startswith("0x"):
@@ -64,14 +76,12 @@ def _hex32_from_prefixed(hex_str: str) -> bytes:
 
 
 def _load_abi(abi_path: Optional[str]) -> List[Dict[str, Any]]:
-    p = abi_path or DEFAULT_ABI_PATH
-    if p and Path(p).exists():
-        return json.loads(Path(p).read_text(encoding="utf-8"))
-    return FALLBACK_ABI
+    return providers.load_abi(abi_path or DEFAULT_ABI_PATH, FALLBACK_ABI)
 
 
 def _load_web3(rpc_url: Optional[str]) -> Web3:
-    return Web3(Web3.HTTPProvider(rpc_url or DEFAULT_RPC_URL))
+    # Shared per endpoint (pooled keep-alive connections), see providers.py
+    return providers.get_web3(rpc_url or DEFAULT_RPC_URL)
 
 
 def _load_contract(
@@ -82,52 +92,206 @@ def _load_contract(
     if not addr:
         raise RuntimeError("ANCHOR_CONTRACT_ADDR is not set")
     abi = _load_abi(abi_path)
-    contract = w3.eth.contract(address=to_checksum_address(addr), abi=abi)
+    contract = providers.get_contract(
+        w3, rpc_url or DEFAULT_RPC_URL, to_checksum_address(addr), abi, abi_path or DEFAULT_ABI_PATH
+    )
     return w3, contract
 
 
-def _estimate_fees_eip1559(w3: Web3) -> Optional[Tuple[int, int]]:
-    try:
-        history = w3.eth.fee_history(5, "latest", [10, 50, 90])
-        base_fees = history["baseFeePerGas"]
-        base = int(base_fees[-1])
-        tip = int(2e9)
-        try:
-            prio = history.get("reward", [])
-            if prio and prio[-1]:
-                tip = max(tip, int(prio[-1][1]))
-        except Exception:
-            pass
-        max_priority = tip
-        max_fee = base * 2 + max_priority
-        return max_fee, max_priority
-    except Exception:
-        return None
+def _chain_id(w3: Web3, rpc_url: Optional[str] = None) -> int:
+    return providers.chain_id(w3, rpc_url or DEFAULT_RPC_URL)
+
 
+def _raw_tx(signed: Any) -> bytes:
+    # eth-account >= 0.13 renamed rawTransaction -> raw_transaction
+    raw = getattr(signed, "raw_transaction", None)
+    return raw if raw is not None else signed.rawTransaction
 
-def _build_tx_anchor(w3: Web3, contract: Contract, from_addr: str, bundle_hash32: bytes) -> Dict[str, Any]:
-    func = contract.functions.anchorEvidence(bundle_hash32)
+
+def _build_tx_anchor(
+    w3: Web3,
+    contract: Contract,
+    from_addr: str,
+    bundle_hash32: Union[bytes, List[bytes]],
+    *,
+    nonce: Optional[int] = None,
+    chain_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """anchorEvidence(hash) tx, or anchorEvidenceBatch(hashes) when given a list."""
+
+    if isinstance(bundle_hash32, list):
+        func = contract.functions.anchorEvidenceBatch(bundle_hash32)
+        # Gas grows with the number of events; cache per batch size.
+        fn_name, fallback_gas = f"anchorEvidenceBatch:{len(bundle_hash32)}", None
+    else:
+        func = contract.functions.anchorEvidence(bundle_hash32)
+        fn_name, fallback_gas = "anchorEvidence", ANCHOR_GAS_DEFAULT
     tx: Dict[str, Any] = {
         "from": from_addr,
-        "nonce": w3.eth.get_transaction_count(from_addr, "pending"),
-        "chainId": w3.eth.chain_id,
+        "nonce": nonce if nonce is not None else w3.eth.get_transaction_count(from_addr, "pending"),
+        "chainId": chain_id if chain_id is not None else w3.eth.chain_id,
     }
 
-    fees = _estimate_fees_eip1559(w3)
-    if fees:
-        max_fee, max_priority = fees
-        tx.update({"type": 2, "maxFeePerGas": max_fee, "maxPriorityFeePerGas": max_priority})
+    # Fees and gas come from the shared oracle/cache (no per-tx RPC round trips).
+    tx.update(fee_oracle.fee_params(w3))
+    gas_est = fee_oracle.gas_limit(w3, contract.address, fn_name, lambda: func.estimate_gas({"from": from_addr}))
+    if gas_est is None and fallback_gas is None:
+        # Most likely a contract without anchorEvidenceBatch: sending would only revert.
+        raise RuntimeError(f"anchorEvidenceBatch gas estimation failed on {contract.address}")
+    tx.update({"gas": gas_est or fallback_gas})
+    return func.build_transaction(tx)
+
+
+def _replace_tx(w3: Web3, acct: Any, nm: Any, nonce: int, entry: Dict[str, Any]) -> Optional[str]:
+    """Re-broadcast a pending tx with the same nonce and bumped fees. Returns the new hash."""
+
+    from .nonce_manager import bump_fees
+
+    tx = entry.get("tx") or {}
+    if not tx:
+        return None
+    market = fee_oracle.fee_params(w3)
+    if "maxFeePerGas" in market:
+        current: Optional[Tuple[int, int]] = (market["maxFeePerGas"], market["maxPriorityFeePerGas"])
     else:
-        tx.update({"gasPrice": w3.eth.gas_price})
+        current = (market.get("gasPrice", 0), 0)
+    tx = bump_fees(tx, current)
+    try:
+        signed = acct.sign_transaction(tx)
+        tx_hash = Web3.to_hex(w3.eth.send_raw_transaction(_raw_tx(signed)))
+    except Exception:
+        return None
+    nm.mark_sent(nonce, tx_hash, tx, bumps=int(entry.get("bumps") or 0) + 1)
+    return tx_hash
 
+
+def _replace_stuck(w3: Web3, acct: Any, nm: Any) -> None:
     try:
-        gas_est = func.estimate_gas({"from": from_addr})
-        gas_est = int(gas_est * 1.2)
+        for nonce, entry in nm.reconcile(w3):
+            _replace_tx(w3, acct, nm, nonce, entry)
     except Exception:
-        gas_est = 200_000
+        pass
 
-    tx.update({"gas": gas_est})
-    return func.build_transaction(tx)
+
+def _submit_tx_anchor(
+    w3: Web3, contract: Contract, acct: Any, bundle_hash32: Union[bytes, List[bytes]], nm: Any, chain_id: int
+) -> Tuple[str, Optional[int]]:
+    """Broadcast one anchor tx without waiting for it. Returns (txid, managed_nonce)."""
+
+    if nm is None:
+        tx = _build_tx_anchor(w3, contract, acct.address, bundle_hash32, chain_id=chain_id)
+        signed = acct.sign_transaction(tx)
+        return Web3.to_hex(w3.eth.send_raw_transaction(_raw_tx(signed))), None
+
+    _replace_stuck(w3, acct, nm)
+    nonce = nm.acquire(w3)
+    try:
+        tx = _build_tx_anchor(w3, contract, acct.address, bundle_hash32, nonce=nonce, chain_id=chain_id)
+        signed = acct.sign_transaction(tx)
+        tx_hash = Web3.to_hex(signed.hash)
+        nm.mark_sent(nonce, tx_hash, dict(tx))
+    except Exception:
+        # Nothing was broadcast: hand the nonce back.
+        nm.release(nonce)
+        raise
+    try:
+        w3.eth.send_raw_transaction(_raw_tx(signed))
+    except Exception as e:
+        msg = str(e).lower()
+        if "nonce too low" in msg or "replacement transaction underpriced" in msg:
+            # Someone else (another service, a manual tx) used it: resync before retrying.
+            nm.complete(nonce)
+            try:
+                nm.reconcile(w3, force=True)
+            except Exception:
+                pass
+            raise
+        # "already known", or a transport error (read timeout, reset) after which the node
+        # may hold the tx: the nonce stays in flight and waiting/`_replace_stuck` resolve it,
+        # re-broadcasting the recorded tx if it never arrived.
+    return tx_hash, nonce
+
+
+def _wait_tx_anchor(
+    w3: Web3, acct: Any, nm: Any, nonce: Optional[int], tx_hash: str, *, timeout: float = 180
+) -> Dict[str, Any]:
+    """Wait for the tx (or a fee-bumped replacement of it) to be mined.
+
+    Replacements may be broadcast by any worker (`_replace_stuck`), so the nonce's recorded
+    hash is re-read on every pass and all hashes seen so far are checked for a receipt.
+    """
+
+    if nm is None or nonce is None:
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+
+    from .nonce_manager import NONCE_STUCK_SECONDS
+
+    hashes = [tx_hash]
+    started = time.monotonic()
+    last_sent = started
+    consumed_checks = 0
+    while time.monotonic() - started < timeout:
+        entry = nm.get(nonce) or {}
+        for h in list(entry.get("hashes") or []) + [entry.get("tx_hash")]:
+            if h and h not in hashes:
+                hashes.append(h)
+                last_sent = time.monotonic()
+
+        for h in reversed(hashes):
+            try:
+                receipt = w3.eth.get_transaction_receipt(h)
+            except Exception:
+                receipt = None
+            if receipt:
+                nm.complete(nonce)
+                return receipt
+
+        try:
+            if int(w3.eth.get_transaction_count(acct.address, "latest")) > nonce:
+                # Nonce consumed but none of its recorded hashes has a receipt (yet): give the
+                # receipt lookup a moment, then accept it was used by another transaction.
+                consumed_checks += 1
+                if consumed_checks >= 3:
+                    nm.complete(nonce)
+                    raise RuntimeError(f"nonce {nonce} consumed by another transaction")
+                time.sleep(1)
+                continue
+        except RuntimeError:
+            raise
+        except Exception:
+            pass
+
+        if time.monotonic() - last_sent > NONCE_STUCK_SECONDS:
+            new_hash = _replace_tx(w3, acct, nm, nonce, entry)
+            if new_hash and new_hash not in hashes:
+                hashes.append(new_hash)
+            last_sent = time.monotonic()
+        time.sleep(2)
+
+    raise TimeoutError(f"anchor tx {hashes[-1]} not mined after {timeout}s")
+
+
+def _wait_confirmations(w3: Web3, receipt: Dict[str, Any], min_confirmations: int, *, timeout: float) -> Dict[str, Any]:
+    """Wait until `receipt`'s block is `min_confirmations` deep; returns the current receipt."""
+
+    tx_hash = receipt["transactionHash"]
+    started = time.monotonic()
+    while True:
+        if int(w3.eth.block_number) - int(receipt["blockNumber"]) + 1 >= min_confirmations:
+            try:
+                current = w3.eth.get_transaction_receipt(tx_hash)
+            except Exception:
+                current = None
+            if not current:
+                raise RuntimeError("anchor tx dropped by reorg")
+            if current["blockHash"] == receipt["blockHash"]:
+                return current
+            # Re-mined in another block: count confirmations from there.
+            receipt = current
+            continue
+        if time.monotonic() - started > timeout:
+            raise TimeoutError(f"anchor tx not {min_confirmations} blocks deep after {timeout}s")
+        time.sleep(2)
 
 
 def anchor_bundle(
@@ -138,6 +302,7 @@ def anchor_bundle(
     private_key: Optional[str] = None,
     abi_path: Optional[str] = None,
     lookback_blocks: Optional[int] = None,
+    min_confirmations: int = 0,
 ) -> Tuple[str, int]:
     """Anchor the 32-byte bundle hash on-chain.
 
@@ -145,10 +310,83 @@ def anchor_bundle(
 
     Notes:
     - `lookback_blocks` is accepted for interface symmetry (used by find_anchor).
+    - with `min_confirmations` > 1 this also waits for that depth (re-checking the
+      receipt so a reorged-out tx is not reported as anchored).
     """
 
     _ = lookback_blocks
 
+    receipt, tx_hash = _anchor_payload(
+        _hex32_from_prefixed(bundle_hash_hex),
+        rpc_url=rpc_url,
+        contract_addr=contract_addr,
+        private_key=private_key,
+        abi_path=abi_path,
+        min_confirmations=min_confirmations,
+    )
+    return Web3.to_hex(receipt.get("transactionHash") or HexBytes(tx_hash)), int(receipt["blockNumber"])
+
+
+def anchor_bundles(
+    bundle_hash_hexes: List[str],
+    *,
+    rpc_url: Optional[str] = None,
+    contract_addr: Optional[str] = None,
+    private_key: Optional[str] = None,
+    abi_path: Optional[str] = None,
+    min_confirmations: int = 0,
+) -> Tuple[str, int, Dict[str, int]]:
+    """Anchor several bundle hashes in one anchorEvidenceBatch tx (one event per hash).
+
+    Returns: (txid_hex, blockNumber, {bundle_hash_hex: log_index}) with every requested
+    hash present; raises if the mined receipt is missing an event for any of them.
+    """
+
+    if not bundle_hash_hexes:
+        raise ValueError("no bundle hashes to anchor")
+    hashes = [_hex32_from_prefixed(h) for h in bundle_hash_hexes]
+    receipt, tx_hash = _anchor_payload(
+        hashes,
+        rpc_url=rpc_url,
+        contract_addr=contract_addr,
+        private_key=private_key,
+        abi_path=abi_path,
+        min_confirmations=min_confirmations,
+    )
+    found = anchored_hashes(receipt, contract_addr or DEFAULT_CONTRACT_ADDR)
+    wanted = {"0x" + h.hex() for h in hashes}
+    missing = wanted - set(found)
+    if missing:
+        raise RuntimeError(f"batch anchor tx is missing {len(missing)} EvidenceAnchored event(s)")
+    return (
+        Web3.to_hex(receipt.get("transactionHash") or HexBytes(tx_hash)),
+        int(receipt["blockNumber"]),
+        {h: found[h] for h in sorted(wanted)},
+    )
+
+
+def _may_still_be_mined(nm: Any, nonce: Optional[int], err: Exception) -> bool:
+    """Whether a broadcast anchor tx that errored while waiting can still end up mined."""
+
+    if nm is not None and nonce is not None:
+        try:
+            return bool(nm.inflight(nonce))
+        except Exception:
+            return True
+    return isinstance(err, (TimeoutError, TimeExhausted))
+
+
+def _anchor_payload(
+    payload: Union[bytes, List[bytes]],
+    *,
+    rpc_url: Optional[str],
+    contract_addr: Optional[str],
+    private_key: Optional[str],
+    abi_path: Optional[str],
+    min_confirmations: int,
+) -> Tuple[Dict[str, Any], str]:
+    """Submit (with retries) and wait for a single or batch anchor tx. Returns (receipt, tx_hash)."""
+
     pk = private_key or os.getenv("ANCHOR_PRIVATE_KEY")
     if not pk:
         raise RuntimeError("ANCHOR_PRIVATE_KEY is not set")
@@ -156,25 +394,60 @@ def anchor_bundle(
     w3, contract = _load_contract(rpc_url=rpc_url, contract_addr=contract_addr, abi_path=abi_path)
     acct = w3.eth.account.from_key(pk)
 
-    bundle_hash32 = _hex32_from_prefixed(bundle_hash_hex)
+    chain_id = _chain_id(w3, rpc_url)
+    nm = get_nonce_manager(chain_id, acct.address)
 
     last_err: Optional[Exception] = None
     for attempt in range(3):
+        tx_hash: Optional[str] = None
+        nonce: Optional[int] = None
         try:
-            tx = _build_tx_anchor(w3, contract, acct.address, bundle_hash32)
-            signed = acct.sign_transaction(tx)
-            tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
+            tx_hash, nonce = _submit_tx_anchor(w3, contract, acct, payload, nm, chain_id)
+            receipt = _wait_tx_anchor(w3, acct, nm, nonce, tx_hash, timeout=180)
+            if receipt and receipt.get("status", 1) == 1 and min_confirmations > 1:
+                receipt = _wait_confirmations(w3, receipt, min_confirmations, timeout=180)
             if receipt and receipt.get("status", 1) == 1:
-                return tx_hash.hex(), int(receipt["blockNumber"])
+                # A fee-bumped replacement may have been mined instead of the tx sent here.
+                return receipt, Web3.to_hex(receipt.get("transactionHash") or HexBytes(tx_hash))
             last_err = RuntimeError("Transaction failed with status != 1")
         except Exception as e:
             last_err = e
+            if tx_hash is not None and _may_still_be_mined(nm, nonce, e):
+                # Resubmitting now could anchor the payload twice.
+                raise
             time.sleep(1 + attempt)
 
     raise last_err or RuntimeError("Unknown error anchoring bundle")
 
 
+def submit_anchor_tx(
+    bundle_hash_hex: str,
+    *,
+    rpc_url: Optional[str] = None,
+    contract_addr: Optional[str] = None,
+    private_key: Optional[str] = None,
+    abi_path: Optional[str] = None,
+) -> Tuple[str, Optional[int], int, str]:
+    """Broadcast an anchor tx and return immediately with (txid_hex, nonce, chain_id, signer).
+
+    With the nonce manager enabled many of these can be in flight per signer; the
+    nonce is None when nonces are left to the node. (chain_id, signer, nonce) identify the
+    nonce manager entry, whose tx hash changes when a stuck tx is fee-bumped.
+    """
+
+    pk = private_key or os.getenv("ANCHOR_PRIVATE_KEY")
+    if not pk:
+        raise RuntimeError("ANCHOR_PRIVATE_KEY is not set")
+
+    w3, contract = _load_contract(rpc_url=rpc_url, contract_addr=contract_addr, abi_path=abi_path)
+    acct = w3.eth.account.from_key(pk)
+    chain_id = _chain_id(w3, rpc_url)
+    txid, nonce = _submit_tx_anchor(
+        w3, contract, acct, _hex32_from_prefixed(bundle_hash_hex), get_nonce_manager(chain_id, acct.address), chain_id
+    )
+    return txid, nonce, chain_id, acct.address
+
+
 def find_anchor(
     bundle_hash_hex: str,
     *,
@@ -182,8 +455,22 @@ def find_anchor(
     contract_addr: Optional[str] = None,
     abi_path: Optional[str] = None,
     lookback_blocks: Optional[int] = None,
+    merkle_proof: Optional[Dict[str, Any]] = None,
 ) -> ChainMatch:
-    """Find EvidenceAnchored event for a given bundle hash."""
+    """Find EvidenceAnchored event for a given bundle hash.
+
+    Looks in the local event index (chain_index.py) first and scans only the unindexed
+    tail of the chain over RPC.
+
+    When `merkle_proof` (a `merkle_proof.json` document) is given, the bundle hash is
+    checked for inclusion first and the event is looked up for the batch root instead.
+    """
+
+    if merkle_proof is not None:
+        try:
+            bundle_hash_hex = merkle.root_for_proof(bundle_hash_hex, merkle_proof)
+        except ValueError:
+            return ChainMatch(matches=False)
 
     try:
         w3, contract = _load_contract(rpc_url=rpc_url, contract_addr=contract_addr, abi_path=abi_path)
@@ -195,47 +482,122 @@ def find_anchor(
     except Exception:
         return ChainMatch(matches=False)
 
+    # Local event index first; RPC only covers blocks the indexer has not reached yet.
+    covered: Optional[Tuple[int, int]] = None
+    try:
+        from . import chain_index
+
+        if chain_index.CHAIN_INDEX_ENABLED:
+            indexed, covered = chain_index.find_indexed(
+                bundle_hash_hex, rpc_url=rpc_url or DEFAULT_RPC_URL, contract_addr=contract.address
+            )
+            if indexed is not None:
+                return indexed
+    except Exception:
+        covered = None
+
     lb = int(lookback_blocks if lookback_blocks is not None else DEFAULT_LOOKBACK_BLOCKS)
 
+    from . import chain_index, log_scan
+
     latest = w3.eth.block_number
-    from_block = max(0, latest - lb)
+    from_block = chain_index.scan_from(covered, max(0, latest - lb))
+    if from_block > latest:
+        return ChainMatch(matches=False)
 
-    # Filter by event signature only; bundleHash may not be indexed.
+    # Filter by event signature only; bundleHash may not be indexed. Windows are fetched
+    # concurrently, newest first, and the scan stops at the first match. A window the
+    # provider keeps refusing raises LogScanError rather than reporting "not anchored".
+    params = {"address": contract.address, "topics": [Web3.to_hex(EVIDENCE_ANCHORED_TOPIC0)]}
+    scan = log_scan.iter_logs(w3, params, from_block, latest)
     try:
-        event = contract.events.EvidenceAnchored()  # type: ignore
-        topic0 = event._get_event_topic()  # type: ignore
-        logs = w3.eth.get_logs(
-            {
-                "fromBlock": from_block,
-                "toBlock": latest,
-                "address": contract.address,
-                "topics": [topic0],
-            }
-        )
-    except Exception:
-        try:
-            evt_filter = contract.events.EvidenceAnchored().create_filter(fromBlock=from_block, toBlock=latest)  # type: ignore
-            logs = evt_filter.get_all_entries()  # type: ignore
-        except Exception:
-            logs = []
+        for _span, logs in scan:
+            for log in reversed(logs):
+                ev = chain_index.decode_evidence_log(log)
+                if ev is None or ev["bundle_hash"] != "0x" + bundle_hash32.hex():
+                    continue
+                anchored_at = ev["anchored_at"]
+                if anchored_at is None:
+                    try:
+                        ts = w3.eth.get_block(ev["block_number"]).get("timestamp")
+                        anchored_at = datetime.fromtimestamp(ts, tz=timezone.utc) if isinstance(ts, int) else None
+                    except Exception:
+                        anchored_at = None
+                return ChainMatch(matches=True, txid=ev["txid"], anchored_at=anchored_at)
+    finally:
+        scan.close()
+
+    return ChainMatch(matches=False)
+
 
-    for log in reversed(logs):
+def find_anchors(
+    bundle_hashes: List[str],
+    *,
+    rpc_url: Optional[str] = None,
+    contract_addr: Optional[str] = None,
+    abi_path: Optional[str] = None,
+    lookback_blocks: Optional[int] = None,
+) -> Dict[str, ChainMatch]:
+    """`find_anchor` for many hashes: one index query plus at most one log scan.
+
+    Returns {bundle_hash (as given): ChainMatch}. The scan covers the unindexed tail once
+    for all hashes and stops as soon as every hash has been found.
+    """
+
+    wanted: Dict[str, List[str]] = {}
+    for h in bundle_hashes:
         try:
-            decoded = contract.events.EvidenceAnchored().process_log(log)  # type: ignore
-            args = decoded["args"]
-            ev_hash: bytes = args.get("bundleHash", b"")
-            if isinstance(ev_hash, HexBytes):
-                ev_hash = bytes(ev_hash)
-            if ev_hash == bundle_hash32:
-                tx_hash = log["transactionHash"].hex()
-                blk = w3.eth.get_block(log["blockNumber"])
-                ts = blk.get("timestamp")
-                anchored_at = datetime.fromtimestamp(ts, tz=timezone.utc) if isinstance(ts, int) else None
-                return ChainMatch(matches=True, txid=tx_hash, anchored_at=anchored_at)
+            wanted.setdefault("0x" + _hex32_from_prefixed(h).hex(), []).append(h)
         except Exception:
             continue
+    out: Dict[str, ChainMatch] = {h: ChainMatch(matches=False) for h in bundle_hashes}
+    if not wanted:
+        return out
 
-    return ChainMatch(matches=False)
+    w3, contract = _load_contract(rpc_url=rpc_url, contract_addr=contract_addr, abi_path=abi_path)
+
+    def resolve(norm: str, match: ChainMatch) -> None:
+        for h in wanted.pop(norm, []):
+            out[h] = match
+
+    covered: Optional[Tuple[int, int]] = None
+    try:
+        from . import chain_index
+
+        if chain_index.CHAIN_INDEX_ENABLED:
+            indexed, covered = chain_index.find_indexed_many(
+                list(wanted), rpc_url=rpc_url or DEFAULT_RPC_URL, contract_addr=contract.address
+            )
+            for norm, match in indexed.items():
+                resolve(norm, match)
+    except Exception:
+        covered = None
+    if not wanted:
+        return out
+
+    lb = int(lookback_blocks if lookback_blocks is not None else DEFAULT_LOOKBACK_BLOCKS)
+    from . import chain_index, log_scan
+
+    latest = w3.eth.block_number
+    from_block = chain_index.scan_from(covered, max(0, latest - lb))
+    if from_block > latest:
+        return out
+
+    params = {"address": contract.address, "topics": [Web3.to_hex(EVIDENCE_ANCHORED_TOPIC0)]}
+    scan = log_scan.iter_logs(w3, params, from_block, latest)
+    try:
+        for _span, logs in scan:
+            for log in reversed(logs):
+                ev = chain_index.decode_evidence_log(log)
+                if ev is None or ev["bundle_hash"] not in wanted:
+                    continue
+                resolve(ev["bundle_hash"], ChainMatch(matches=True, txid=ev["txid"], anchored_at=ev["anchored_at"]))
+            if not wanted:
+                break
+    finally:
+        scan.close()
+
+    return out
 
 
 # --- Transaction-level verification helpers (used by tenant confirm-anchor) ---
@@ -244,6 +606,32 @@ def find_anchor(
 EVIDENCE_ANCHORED_TOPIC0 = Web3.keccak(text="EvidenceAnchored(bytes32,address,uint256)")
 
 
+def anchored_hashes(receipt: Dict[str, Any], contract_addr: str) -> Dict[str, int]:
+    """{bundle_hash_hex: log_index} for every EvidenceAnchored event `contract_addr` emitted in a tx receipt."""
+
+    caddr = to_checksum_address(contract_addr)
+    out: Dict[str, int] = {}
+    for pos, lg in enumerate(receipt.get("logs") or []):
+        try:
+            addr = lg.get("address")
+            if not addr or to_checksum_address(addr) != caddr:
+                continue
+            topics = lg.get("topics") or []
+            if not topics or bytes(HexBytes(topics[0])) != bytes(EVIDENCE_ANCHORED_TOPIC0):
+                continue
+            # Non-indexed args are ABI-encoded in data: bundleHash (bytes32) at 0, ts (uint256) at 32.
+            data_bytes = bytes(HexBytes(lg.get("data") or b""))
+            if len(data_bytes) < 64:
+                continue
+            log_index = lg.get("logIndex")
+            if isinstance(log_index, str):
+                log_index = int(log_index, 16)
+            out.setdefault("0x" + data_bytes[:32].hex(), int(log_index if log_index is not None else pos))
+        except Exception:
+            continue
+    return out
+
+
 def verify_anchor_tx(
     *,
     txid: str,
@@ -277,59 +665,20 @@ def verify_anchor_tx(
         caddr = contract_addr or DEFAULT_CONTRACT_ADDR
         if not caddr:
             return False, int(receipt.get("blockNumber") or 0), None
-        caddr = to_checksum_address(caddr)
 
-        logs = receipt.get("logs") or []
-        for lg in logs:
+        # Batch txs (anchorEvidenceBatch) carry one event per hash; any of them may match.
+        if "0x" + expected.hex() in anchored_hashes(receipt, caddr):
+            blk_no = int(receipt.get("blockNumber") or 0)
+            anchored_at: Optional[datetime] = None
             try:
-                addr = lg.get("address")
-                if not addr:
-                    continue
-                if to_checksum_address(addr) != caddr:
-                    continue
-
-                topics = lg.get("topics") or []
-                if not topics:
-                    continue
-
-                t0 = topics[0]
-                t0_bytes = bytes(t0) if not isinstance(t0, (bytes, bytearray)) else bytes(t0)
-                if t0_bytes != bytes(EVIDENCE_ANCHORED_TOPIC0):
-                    continue
-
-                data = lg.get("data")
-                if isinstance(data, HexBytes):
-                    data_bytes = bytes(data)
-                elif isinstance(data, (bytes, bytearray)):
-                    data_bytes = bytes(data)
-                elif isinstance(data, str):
-                    data_bytes = bytes(HexBytes(data))
-                else:
-                    continue
-
-                # Non-indexed args are ABI-encoded in data:
-                # - bundleHash (bytes32) at offset 0
-                # - ts (uint256) at offset 32
-                if len(data_bytes) < 64:
-                    continue
-
-                bundle_hash32 = data_bytes[:32]
-                if bundle_hash32 != expected:
-                    continue
-
-                blk_no = int(receipt.get("blockNumber") or 0)
-                anchored_at: Optional[datetime] = None
-                try:
-                    blk = w3.eth.get_block(blk_no)
-                    ts = blk.get("timestamp")
-                    if isinstance(ts, int):
-                        anchored_at = datetime.fromtimestamp(ts, tz=timezone.utc)
-                except Exception:
-                    anchored_at = None
-
-                return True, blk_no, anchored_at
+                blk = w3.eth.get_block(blk_no)
+                ts = blk.get("timestamp")
+                if isinstance(ts, int):
+                    anchored_at = datetime.fromtimestamp(ts, tz=timezone.utc)
             except Exception:
-                continue
+                anchored_at = None
+
+            return True, blk_no, anchored_at
 
         return False, int(receipt.get("blockNumber") or 0), None
     except Exception:
@@ -0,0 +1,177 @@
+"""Merkle-batched anchoring bookkeeping.
+
+Receipts that reach the anchoring stage with `anchoring.batch.enabled` are parked as
+AnchorBatchItem rows. A flush job claims them, groups them per project (each project
+may anchor on different chains), builds one Merkle tree per group and anchors its root.
+
+This module only handles DB state and proofs; the RQ job in `jobs.py` does the
+anchoring and receipt finalization.
+
+Flushes are normally scheduled by the receipts themselves (one delayed flush per window).
+A recurring sweep (`sweep_anchor_batches_job`) covers a lost flush - expired marker,
+restarted worker - by flushing items older than the window, and releases batches whose
+flusher died after claiming them so they are claimed again.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from . import merkle, models
+
+PROOF_VERSION = "1.0"
+
+ANCHOR_BATCH_SWEEP_INTERVAL = int(os.getenv("ANCHOR_BATCH_SWEEP_INTERVAL", "60"))
+ANCHOR_BATCH_STALE_SECONDS = int(os.getenv("ANCHOR_BATCH_STALE_SECONDS", "900"))
+
+
+def add_pending(session, receipt_id: str, bundle_hash: str) -> models.AnchorBatchItem:
+    existing = (
+        session.query(models.AnchorBatchItem).filter(models.AnchorBatchItem.receipt_id == receipt_id).one_or_none()
+    )
+    if existing is not None:
+        # Re-processing a receipt: replace the hash only if it was not batched yet.
+        if existing.batch_id is None:
+            existing.bundle_hash = bundle_hash
+        return existing
+    item = models.AnchorBatchItem(receipt_id=receipt_id, bundle_hash=bundle_hash)
+    session.add(item)
+    return item
+
+
+def pending_count(session) -> int:
+    return session.query(models.AnchorBatchItem).filter(models.AnchorBatchItem.batch_id.is_(None)).count()
+
+
+def oldest_pending_at(session) -> Optional[datetime]:
+    """created_at of the longest-waiting unclaimed item (None when nothing waits)."""
+
+    return (
+        session.query(func.min(models.AnchorBatchItem.created_at))
+        .filter(models.AnchorBatchItem.batch_id.is_(None))
+        .scalar()
+    )
+
+
+def has_stale_pending(session, window_seconds: int, *, now: Optional[datetime] = None) -> bool:
+    """True when an unclaimed item has waited longer than the flush window (its flush was lost)."""
+
+    oldest = oldest_pending_at(session)
+    if oldest is None:
+        return False
+    now = now or datetime.utcnow()
+    if oldest.tzinfo is not None:
+        oldest = oldest.replace(tzinfo=None)
+    return now - oldest >= timedelta(seconds=max(0, int(window_seconds)))
+
+
+def release_stale_batches(session, *, older_than: datetime) -> int:
+    """Return items of batches stuck in "pending" (flusher died mid-way) to the queue.
+
+    The abandoned batch is marked "failed"; its items are claimed again by the next flush.
+    Returns the number of released items.
+    """
+
+    stale = (
+        session.query(models.AnchorBatch)
+        .filter(models.AnchorBatch.status == "pending", models.AnchorBatch.created_at < older_than)
+        .all()
+    )
+    released = 0
+    for batch in stale:
+        released += (
+            session.query(models.AnchorBatchItem)
+            .filter(models.AnchorBatchItem.batch_id == batch.id)
+            .update(
+                {models.AnchorBatchItem.batch_id: None, models.AnchorBatchItem.leaf_index: None},
+                synchronize_session=False,
+            )
+        )
+        batch.status = "failed"
+    if stale:
+        session.commit()
+    return released
+
+
+def claim_pending(
+    session, *, limit: int
+) -> List[Tuple[models.AnchorBatch, List[models.AnchorBatchItem], List[List[Dict[str, str]]]]]:
+    """Claim up to `limit` pending items into new batches (one per project).
+
+    Claiming is a guarded UPDATE (`batch_id IS NULL`), so concurrent flushers never
+    put the same receipt into two batches.
+
+    Returns [(batch, items_in_leaf_order, proofs)].
+    """
+
+    rows = (
+        session.query(models.AnchorBatchItem.id, models.Receipt.project_id)
+        .join(models.Receipt, models.Receipt.id == models.AnchorBatchItem.receipt_id)
+        .filter(models.AnchorBatchItem.batch_id.is_(None))
+        .order_by(models.AnchorBatchItem.created_at, models.AnchorBatchItem.id)
+        .limit(limit)
+        .all()
+    )
+    if not rows:
+        return []
+
+    by_project: Dict[Any, List[Any]] = {}
+    for item_id, project_id in rows:
+        by_project.setdefault(project_id, []).append(item_id)
+
+    out = []
+    for project_id, item_ids in by_project.items():
+        batch = models.AnchorBatch(id=uuid.uuid4(), project_id=project_id, status="pending")
+        session.add(batch)
+        session.flush()
+        claimed = (
+            session.query(models.AnchorBatchItem)
+            .filter(models.AnchorBatchItem.id.in_(item_ids), models.AnchorBatchItem.batch_id.is_(None))
+            .update({models.AnchorBatchItem.batch_id: batch.id}, synchronize_session=False)
+        )
+        if not claimed:
+            session.delete(batch)
+            session.commit()
+            continue
+
+        items = (
+            session.query(models.AnchorBatchItem)
+            .filter(models.AnchorBatchItem.batch_id == batch.id)
+            .order_by(models.AnchorBatchItem.created_at, models.AnchorBatchItem.id)
+            .all()
+        )
+        root, proofs = merkle.merkle_proofs([it.bundle_hash for it in items])
+        for idx, it in enumerate(items):
+            it.leaf_index = idx
+        batch.merkle_root = root
+        batch.size = len(items)
+        session.commit()
+        out.append((batch, items, proofs))
+
+    return out
+
+
+def proof_document(
+    batch: models.AnchorBatch,
+    item: models.AnchorBatchItem,
+    proof: List[Dict[str, str]],
+    anchors: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Content of `merkle_proof.json` for one batch member."""
+
+    return {
+        "version": PROOF_VERSION,
+        "algorithm": "sha256",
+        "batch_id": str(batch.id),
+        "leaf": item.bundle_hash,
+        "index": item.leaf_index,
+        "size": batch.size,
+        "root": batch.merkle_root,
+        "proof": proof,
+        "anchors": anchors,
+    }
@@ -0,0 +1,91 @@
+"""DB-side lookup of bundles anchored by this middleware.
+
+Verification of a bundle produced here does not need the chain: `receipts.bundle_hash`
+(indexed) leads to the receipt, and `chain_anchors` already hold the txid, block and time
+for every chain it was anchored on. Batch members additionally carry the Merkle root
+their anchors point at.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from . import models
+from .schemas import AnchorRecord, BundleAnchors
+
+
+def find_bundle(session, bundle_hash: str) -> Optional[BundleAnchors]:
+    """Anchors recorded for `bundle_hash`, or None if no receipt has that bundle."""
+
+    h = str(bundle_hash or "").strip().lower()
+    if not h:
+        return None
+    rec = (
+        session.query(models.Receipt)
+        .filter(models.Receipt.bundle_hash == h)
+        .order_by(models.Receipt.created_at.desc())
+        .first()
+    )
+    if rec is None:
+        return None
+
+    rows = (
+        session.query(models.ChainAnchor)
+        .filter(models.ChainAnchor.receipt_id == str(rec.id))
+        .order_by(models.ChainAnchor.anchored_at.asc())
+        .all()
+    )
+    anchors: List[AnchorRecord] = [
+        AnchorRecord(
+            chain=r.chain,
+            txid=r.txid,
+            status=r.status or "confirmed",
+            block_number=r.block_number,
+            anchored_at=r.anchored_at,
+        )
+        for r in rows
+    ]
+    # Receipts anchored before chain_anchors existed only carry the first tx on the receipt.
+    if not anchors and rec.flare_txid:
+        anchors.append(AnchorRecord(chain=rec.chain, txid=rec.flare_txid, anchored_at=rec.anchored_at))
+
+    merkle_root = None
+    batch = (
+        session.query(models.AnchorBatch)
+        .join(models.AnchorBatchItem, models.AnchorBatchItem.batch_id == models.AnchorBatch.id)
+        .filter(models.AnchorBatchItem.receipt_id == str(rec.id), models.AnchorBatch.status == "anchored")
+        .first()
+    )
+    if batch is not None:
+        merkle_root = batch.merkle_root
+
+    return BundleAnchors(receipt_id=str(rec.id), bundle_hash=h, anchors=anchors, merkle_root=merkle_root)
+
+
+def recheck(session, found: BundleAnchors) -> None:
+    """Confirm each recorded anchor tx on-chain (sets `AnchorRecord.onchain`)."""
+
+    from . import anchor
+
+    rows = {
+        (r.chain, r.txid): r
+        for r in session.query(models.ChainAnchor).filter(models.ChainAnchor.receipt_id == found.receipt_id).all()
+    }
+    expected = found.merkle_root or found.bundle_hash
+    for a in found.anchors:
+        if a.status != "confirmed":
+            continue
+        row = rows.get((a.chain, a.txid))
+        try:
+            ok, block, anchored_at = anchor.verify_anchor_tx(
+                txid=a.txid,
+                expected_bundle_hash_hex=expected,
+                rpc_url=getattr(row, "rpc_url", None),
+                contract_addr=getattr(row, "contract", None),
+            )
+        except Exception:
+            ok, block, anchored_at = False, None, None
+        a.onchain = bool(ok)
+        if ok:
+            a.block_number = a.block_number or block
+            a.anchored_at = a.anchored_at or anchored_at
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import atexit
+import itertools
 import json
 import os
 import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -13,6 +19,35 @@ from .schemas import ChainMatch
 # Load .env so FLARE_RPC_URL and ANCHOR_CONTRACT_ADDR are available for Node scripts
 load_dotenv()
 
+# Long-lived sidecar (scripts/sidecar.js) instead of one `node` process per call
+ANCHOR_NODE_SIDECAR = os.getenv("ANCHOR_NODE_SIDECAR", "1").lower() in ("1", "true", "yes")
+ANCHOR_NODE_TIMEOUT = float(os.getenv("ANCHOR_NODE_TIMEOUT", "180"))  # anchor: send + wait for 1 block
+ANCHOR_NODE_FIND_TIMEOUT = float(os.getenv("ANCHOR_NODE_FIND_TIMEOUT", "20"))
+ANCHOR_NODE_PING_TIMEOUT = float(os.getenv("ANCHOR_NODE_PING_TIMEOUT", "5"))
+ANCHOR_NODE_FIND_CONCURRENCY = int(os.getenv("ANCHOR_NODE_FIND_CONCURRENCY", "8"))
+ANCHOR_NODE_MAX_RESTARTS = int(os.getenv("ANCHOR_NODE_MAX_RESTARTS", "5"))  # per minute
+
+# Only what the Node scripts read; the sidecar does not need the rest of our environment.
+_SIDECAR_ENV_KEYS = (
+    "PATH",
+    "HOME",
+    "SYSTEMROOT",
+    "NODE_PATH",
+    "NODE_OPTIONS",
+    "NODE_EXTRA_CA_CERTS",
+    "HTTP_PROXY",
+    "HTTPS_PROXY",
+    "NO_PROXY",
+    "FLARE_RPC_URL",
+    "RPC_URL",
+    "ANCHOR_CONTRACT_ADDR",
+    "CONTRACT_ADDR",
+    "ANCHOR_PRIVATE_KEY",
+    "PRIVATE_KEY",
+    "ANCHOR_LOOKBACK_BLOCKS",
+    "LOG_SCAN_CHUNK_BLOCKS",
+)
+
 
 def _parse_iso_utc(ts: Optional[str]) -> Optional[datetime]:
     if not ts:
@@ -50,7 +85,180 @@ def _node_env() -> dict:
     return env
 
 
-def _run_node(args: list[str]) -> Tuple[int, str, str]:
+def _sidecar_env() -> dict:
+    env = _node_env()
+    return {k: env[k] for k in _SIDECAR_ENV_KEYS if k in env}
+
+
+class SidecarError(RuntimeError):
+    """The sidecar could not be reached or died before answering."""
+
+
+class NodeSidecar:
+    """Supervised `node scripts/sidecar.js` speaking newline-delimited JSON on stdio.
+
+    Requests carry an id and may be in flight concurrently from many threads; a reader
+    thread routes each response line to its waiting caller. If the process exits, all
+    pending calls fail with SidecarError and the next call starts a fresh process
+    (at most ANCHOR_NODE_MAX_RESTARTS per minute). After a fork (RQ work horses) the
+    child starts its own process rather than sharing the parent's pipes.
+
+    A call that times out also fails with SidecarError, and the process is killed (so
+    the next call gets a fresh one with new RPC connections) unless an anchor is in
+    flight and the sidecar still answers a ping: killing it then would orphan a tx
+    that may already be broadcast.
+    """
+
+    def __init__(self, cmd: Optional[List[str]] = None, env: Optional[dict] = None, cwd: Optional[str] = None):
+        self.cmd = cmd or ["node", "scripts/sidecar.js"]
+        self.env = env
+        self.cwd = cwd
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._pid: Optional[int] = None
+        self._pending: Dict[int, Tuple[str, Future]] = {}
+        self._ids = itertools.count(1)
+        self._starts: List[float] = []
+
+    def _alive(self) -> bool:
+        return self._proc is not None and self._pid == os.getpid() and self._proc.poll() is None
+
+    def _start(self) -> subprocess.Popen:
+        now = time.time()
+        self._starts = [t for t in self._starts if now - t < 60]
+        if len(self._starts) >= ANCHOR_NODE_MAX_RESTARTS:
+            raise SidecarError("sidecar restarting too often")
+        self._starts.append(now)
+        proc = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            env=self.env if self.env is not None else _sidecar_env(),
+            cwd=self.cwd or os.getcwd(),
+        )
+        self._proc, self._pid = proc, os.getpid()
+        self._pending = {}
+        threading.Thread(target=self._read_loop, args=(proc, self._pending), name="node-sidecar", daemon=True).start()
+        return proc
+
+    def _read_loop(self, proc: subprocess.Popen, pending: Dict[int, Tuple[str, Future]]) -> None:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            try:
+                msg = json.loads(line)
+            except Exception:
+                continue
+            _op, fut = pending.pop(msg.get("id"), (None, None))
+            if fut is None:
+                continue
+            if msg.get("ok"):
+                fut.set_result(msg.get("result") or {})
+            else:
+                fut.set_exception(RuntimeError(str(msg.get("error") or "sidecar_error")))
+        for _op, fut in list(pending.values()):
+            if not fut.done():
+                fut.set_exception(SidecarError("sidecar exited"))
+        pending.clear()
+
+    def _send(
+        self, op: str, params: Dict[str, Any]
+    ) -> Tuple[subprocess.Popen, Dict[int, Tuple[str, Future]], int, Future]:
+        with self._lock:
+            proc = self._proc if self._alive() else self._start()
+            pending = self._pending
+            rid = next(self._ids)
+            fut: Future = Future()
+            pending[rid] = (op, fut)
+        try:
+            with self._write_lock:
+                assert proc.stdin is not None
+                proc.stdin.write(json.dumps({"id": rid, "op": op, **params}) + "\n")
+                proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            pending.pop(rid, None)
+            raise SidecarError(f"sidecar write failed: {e}") from e
+        return proc, pending, rid, fut
+
+    def request(self, op: str, timeout: Optional[float] = None, **params: Any) -> Dict[str, Any]:
+        if timeout is None:
+            timeout = ANCHOR_NODE_FIND_TIMEOUT if op in ("find", "ping") else ANCHOR_NODE_TIMEOUT
+        proc, pending, rid, fut = self._send(op, params)
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            pending.pop(rid, None)
+            self._recover(proc, pending)
+            raise SidecarError(f"sidecar {op} timed out after {timeout}s") from None
+        finally:
+            pending.pop(rid, None)
+
+    def _recover(self, proc: subprocess.Popen, pending: Dict[int, Tuple[str, Future]]) -> None:
+        """After a timed-out call: kill the process unless an anchor is in flight and it still answers."""
+
+        if proc.poll() is not None:
+            return
+        if any(op == "anchor" for op, _ in list(pending.values())):
+            try:
+                _proc, ping_pending, ping_id, ping = self._send("ping", {})
+                try:
+                    ping.result(timeout=ANCHOR_NODE_PING_TIMEOUT)
+                    return
+                finally:
+                    ping_pending.pop(ping_id, None)
+            except Exception:
+                pass
+        with self._lock:
+            if self._proc is proc:
+                self._proc = None
+        try:
+            proc.kill()  # the reader thread then fails the remaining calls
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.close()  # type: ignore[union-attr]
+                proc.wait(timeout=5)
+            except Exception:
+                proc.kill()
+
+
+_SIDECAR: Optional[NodeSidecar] = None
+_SIDECAR_LOCK = threading.Lock()
+
+
+def get_sidecar() -> NodeSidecar:
+    global _SIDECAR
+    with _SIDECAR_LOCK:
+        if _SIDECAR is None:
+            _SIDECAR = NodeSidecar()
+            atexit.register(_SIDECAR.close)
+        return _SIDECAR
+
+
+def _call(op: str, bundle_hash_hex: str, script: str) -> Dict[str, Any]:
+    """Run `op` on the sidecar; per-call `node <script>` if it is disabled or cannot start."""
+
+    if ANCHOR_NODE_SIDECAR:
+        try:
+            return get_sidecar().request(op, bundleHash=bundle_hash_hex)
+        except FileNotFoundError:
+            pass  # no node binary on PATH: same failure as the per-call path below
+    timeout = ANCHOR_NODE_FIND_TIMEOUT if op == "find" else ANCHOR_NODE_TIMEOUT
+    code, out, err = _run_node(["node", script, bundle_hash_hex], timeout=timeout)
+    if code != 0:
+        raise RuntimeError(err or out)
+    return json.loads(out)
+
+
+def _run_node(args: list[str], timeout: Optional[float] = None) -> Tuple[int, str, str]:
     proc = subprocess.run(
         args,
         capture_output=True,
@@ -58,51 +266,64 @@ def _run_node(args: list[str]) -> Tuple[int, str, str]:
         env=_node_env(),
         cwd=os.getcwd(),
         shell=False,
+        timeout=timeout,
     )
     return proc.returncode, proc.stdout.strip(), proc.stderr.strip()
 
 
 def anchor_bundle(bundle_hash_hex: str) -> Tuple[str, int]:
     """
-    Anchors the bundle hash using Node script (scripts/anchor.js).
+    Anchors the bundle hash via the Node sidecar (or scripts/anchor.js per call).
     Requires env: FLARE_RPC_URL, ANCHOR_CONTRACT_ADDR, ANCHOR_PRIVATE_KEY.
     Returns (txid_hex, blockNumber).
     """
     if not isinstance(bundle_hash_hex, str) or not bundle_hash_hex.startswith("0x") or len(bundle_hash_hex) != 66:
         raise ValueError("bundle_hash must be 0x-prefixed 32-byte hex")
 
-    code, out, err = _run_node(["node", "scripts/anchor.js", bundle_hash_hex])
-    if code != 0:
-        raise RuntimeError(f"node anchor failed: {err or out}")
+    try:
+        data = _call("anchor", bundle_hash_hex, "scripts/anchor.js")
+    except Exception as e:
+        raise RuntimeError(f"node anchor failed: {e}") from e
 
     try:
-        data = json.loads(out)
         txid = data.get("txid")
         block_number = int(data.get("blockNumber")) if data.get("blockNumber") is not None else 0
         if not txid:
             raise ValueError("missing txid in node output")
         return txid, block_number
     except Exception as e:
-        raise RuntimeError(f"invalid node anchor output: {e}; raw={out}") from e
+        raise RuntimeError(f"invalid node anchor output: {e}; raw={data}") from e
 
 
 def find_anchor(bundle_hash_hex: str) -> ChainMatch:
     """
-    Looks up the EvidenceAnchored event using Node script (scripts/find.js).
-    Requires env: FLARE_RPC_URL, ANCHOR_CONTRACT_ADDR.
+    Looks up the EvidenceAnchored event via the Node sidecar (or scripts/find.js per call).
+    Requires env: FLARE_RPC_URL, ANCHOR_CONTRACT_ADDR. Raises when the lookup itself fails.
     """
     if not isinstance(bundle_hash_hex, str) or not bundle_hash_hex.startswith("0x") or len(bundle_hash_hex) != 66:
         return ChainMatch(matches=False)
 
-    code, out, err = _run_node(["node", "scripts/find.js", bundle_hash_hex])
-    if code != 0:
-        return ChainMatch(matches=False)
-
     try:
-        data = json.loads(out)
+        data = _call("find", bundle_hash_hex, "scripts/find.js")
         matches = bool(data.get("matches"))
-        txid = data.get("txid") if matches else None
-        anchored_at = _parse_iso_utc(data.get("anchored_at")) if matches else None
-        return ChainMatch(matches=matches, txid=txid, anchored_at=anchored_at)
-    except Exception:
-        return ChainMatch(matches=False)
+    except Exception as e:
+        # Not "not anchored": callers report the lookup as unavailable and do not cache it.
+        raise RuntimeError(f"node find failed: {e}") from e
+
+    txid = data.get("txid") if matches else None
+    anchored_at = _parse_iso_utc(data.get("anchored_at")) if matches else None
+    return ChainMatch(matches=matches, txid=txid, anchored_at=anchored_at)
+
+
+def find_anchors(bundle_hash_hexes: List[str]) -> Dict[str, ChainMatch]:
+    """`find_anchor` for many hashes, up to ANCHOR_NODE_FIND_CONCURRENCY in flight on the sidecar.
+
+    Raises if any lookup fails, like `find_anchor`.
+    """
+
+    hashes = list(dict.fromkeys(bundle_hash_hexes))
+    if not hashes:
+        return {}
+    workers = max(1, min(ANCHOR_NODE_FIND_CONCURRENCY, len(hashes)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="node-find") as pool:
+        return dict(zip(hashes, pool.map(find_anchor, hashes)))
@@ -0,0 +1,192 @@
+"""Confirmation tracking for submitted (not yet confirmed) anchor transactions.
+
+With `anchoring.confirm_mode = "async"` the receipt job only broadcasts and records a
+`ChainAnchor(status="pending")`. A recurring RQ job then polls every pending txid of a
+chain with one JSON-RPC batch per tick and applies `tx_proof_policy.min_confirmations`:
+
+- receipt missing          -> still pending (or dropped / reorged out: keep waiting until timeout)
+- receipt status == 0      -> failed
+- block hash changed       -> reorg: re-read block, confirmations restart from the new block
+- depth >= min_confirmations -> confirmed
+
+Rows submitted through the nonce manager carry (chain_id, signer, nonce). A stuck tx may
+be fee-bumped by any worker, so each tick also asks for the receipts of the replacement
+hashes recorded for that nonce; the row follows whichever hash was mined, and the nonce
+is completed once its tx settles.
+
+This module only talks to RPC and updates ChainAnchor rows; receipt-level decisions
+(quorum, ISO status artifacts, callbacks) live in `jobs.py`.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import models, providers
+from .nonce_manager import get_nonce_manager
+
+ANCHOR_TRACKER_INTERVAL = int(os.getenv("ANCHOR_TRACKER_INTERVAL", "5"))
+ANCHOR_TRACKER_TIMEOUT = int(os.getenv("ANCHOR_TRACKER_TIMEOUT", "900"))
+ANCHOR_TRACKER_BATCH = int(os.getenv("ANCHOR_TRACKER_BATCH", "100"))
+RPC_TIMEOUT = float(os.getenv("ANCHOR_TRACKER_RPC_TIMEOUT", "10"))
+
+
+def _rpc_batch(rpc_url: str, calls: List[Tuple[str, list]]) -> List[Any]:
+    """Run JSON-RPC calls as one batch request; results come back in call order.
+
+    With several endpoints configured (comma-separated), the fastest healthy one is
+    tried first and the others on transport errors. Falls back to one request per call
+    for endpoints that reject batches.
+    """
+
+    payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    urls = providers.ordered_urls(rpc_url) or [rpc_url]
+    fallback = urls[0]
+    for url in urls:
+        sess = providers.http_session(url)
+        started = time.perf_counter()
+        try:
+            resp = sess.post(url, json=payload, timeout=RPC_TIMEOUT)
+            resp.raise_for_status()
+            body = resp.json()
+            if isinstance(body, list):
+                providers.record_call(url, (time.perf_counter() - started) * 1000)
+                by_id = {int(x.get("id")): x for x in body if isinstance(x, dict) and x.get("id") is not None}
+                return [by_id.get(i, {}).get("result") for i in range(len(calls))]
+            providers.record_call(url, (time.perf_counter() - started) * 1000, "batch: not supported", healthy=True)
+            fallback = url
+            break
+        except Exception as e:
+            providers.record_call(url, (time.perf_counter() - started) * 1000, f"batch: {type(e).__name__}")
+
+    rpc_url = fallback
+    sess = providers.http_session(rpc_url)
+    out: List[Any] = []
+    for m, p in calls:
+        started = time.perf_counter()
+        try:
+            resp = sess.post(rpc_url, json={"jsonrpc": "2.0", "id": 0, "method": m, "params": p}, timeout=RPC_TIMEOUT)
+            out.append(resp.json().get("result"))
+            providers.record_call(rpc_url, (time.perf_counter() - started) * 1000)
+        except Exception as e:
+            providers.record_call(rpc_url, (time.perf_counter() - started) * 1000, f"{m}: {type(e).__name__}")
+            out.append(None)
+    return out
+
+
+def fetch_receipts(rpc_url: str, txids: List[str]) -> Tuple[Optional[int], Dict[str, Optional[dict]]]:
+    """Return (latest_block, {txid: receipt_or_None}) using one batch round-trip."""
+
+    calls: List[Tuple[str, list]] = [("eth_blockNumber", [])]
+    calls += [("eth_getTransactionReceipt", [t]) for t in txids]
+    results = _rpc_batch(rpc_url, calls)
+    latest = int(results[0], 16) if results and results[0] else None
+    return latest, {t: r for t, r in zip(txids, results[1:])}
+
+
+def _apply(
+    row: models.ChainAnchor, receipt: Optional[dict], latest: Optional[int], min_conf: int, now: datetime
+) -> None:
+    if receipt is None:
+        if row.block_hash:
+            # Seen before, now gone: reorged out. Wait for re-inclusion.
+            row.block_number = None
+            row.block_hash = None
+        submitted = row.submitted_at or now
+        if submitted.tzinfo is not None:
+            submitted = submitted.replace(tzinfo=None)
+        if now - submitted > timedelta(seconds=ANCHOR_TRACKER_TIMEOUT):
+            row.status = "failed"
+        return
+
+    if int(str(receipt.get("status") or "0x1"), 16) != 1:
+        row.status = "failed"
+        return
+
+    blk_no = int(receipt["blockNumber"], 16)
+    blk_hash = receipt.get("blockHash")
+    # Block hash moving under us means the tx was re-mined in a different block.
+    row.block_number = blk_no
+    row.block_hash = blk_hash
+
+    depth = (latest - blk_no + 1) if latest is not None else 0
+    if depth >= max(1, int(min_conf or 0)):
+        row.status = "confirmed"
+        row.anchored_at = now
+
+
+def _nonce_manager(row: models.ChainAnchor, managers: Dict[Tuple[int, str], Any]) -> Any:
+    if row.nonce is None or row.chain_id is None or not row.signer:
+        return None
+    key = (int(row.chain_id), str(row.signer))
+    if key not in managers:
+        managers[key] = get_nonce_manager(*key)
+    return managers[key]
+
+
+def _tx_hashes(row: models.ChainAnchor, nm: Any) -> List[str]:
+    """Hashes that can settle a row: its txid, then any fee-bumped replacements of its nonce."""
+
+    hashes = [row.txid]
+    if nm is None:
+        return hashes
+    try:
+        entry = nm.get(int(row.nonce)) or {}
+    except Exception:
+        entry = {}
+    for h in list(entry.get("hashes") or []) + [entry.get("tx_hash")]:
+        if h and h not in hashes:
+            hashes.append(h)
+    return hashes
+
+
+def poll_pending(session, *, min_confirmations: int = 0) -> List[models.ChainAnchor]:
+    """Advance all pending ChainAnchor rows one tick. Returns rows whose status changed."""
+
+    rows = (
+        session.query(models.ChainAnchor)
+        .filter(models.ChainAnchor.status == "pending")
+        .order_by(models.ChainAnchor.submitted_at)
+        .all()
+    )
+    by_rpc: Dict[str, List[models.ChainAnchor]] = {}
+    for r in rows:
+        by_rpc.setdefault(r.rpc_url or "", []).append(r)
+
+    now = datetime.utcnow()
+    managers: Dict[Tuple[int, str], Any] = {}
+    changed: List[models.ChainAnchor] = []
+    for rpc_url, group in by_rpc.items():
+        if not rpc_url:
+            continue
+        for i in range(0, len(group), max(1, ANCHOR_TRACKER_BATCH)):
+            chunk = group[i : i + ANCHOR_TRACKER_BATCH]
+            candidates = [(r, _nonce_manager(r, managers)) for r in chunk]
+            hashes = {r.id: _tx_hashes(r, nm) for r, nm in candidates}
+            try:
+                latest, receipts = fetch_receipts(rpc_url, list(dict.fromkeys(h for hs in hashes.values() for h in hs)))
+            except Exception:
+                continue
+            for r, nm in candidates:
+                mined = next((h for h in reversed(hashes[r.id]) if receipts.get(h)), None)
+                if mined and mined != r.txid:
+                    # A replacement of the submitted tx was mined: that is the anchor.
+                    r.txid = mined
+                receipt = receipts.get(mined) if mined else None
+                _apply(r, receipt, latest, min_confirmations, now)
+                if r.status != "pending":
+                    changed.append(r)
+                    if receipt is not None and nm is not None:
+                        try:
+                            nm.complete(int(r.nonce))
+                        except Exception:
+                            pass
+    session.commit()
+    return changed
+
+
+def pending_remaining(session) -> int:
+    return session.query(models.ChainAnchor).filter(models.ChainAnchor.status == "pending").count()
@@ -6,7 +6,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
-from app import db, models
+from app import db, keys, models
 from app.observability import RequestIdMiddleware, configure_logging
 from app.settings import get_settings
 
@@ -21,10 +21,12 @@ from .routes.config import router as config_router
 from .routes.confirm_anchor import router as confirm_anchor_router
 from .routes.debug import router as debug_router
 from .routes.events import router as events_router
+from .routes.evidence import router as evidence_router
 from .routes.fi_messages import router as fi_messages_router
 from .routes.health import router as health_router
 from .routes.iso_messages import router as iso_messages_router
 from .routes.iso_write import router as iso_write_router
+from .routes.keys import router as keys_router
 from .routes.projects import router as projects_router
 from .routes.receipts import router as receipts_router
 from .routes.refunds import router as refunds_router
@@ -87,5 +89,10 @@ def create_app() -> FastAPI:
     app.include_router(agents_router)
     app.include_router(ai_agents_router)
     app.include_router(agent_anchoring_router)
+    app.include_router(keys_router)
+    app.include_router(evidence_router)
+
+    # Signing keys are cached per process; SIGHUP re-reads them after rotation.
+    keys.install_reload_signal()
 
     return app
@@ -12,6 +12,12 @@ router = APIRouter(tags=["anchors"])
 def get_anchors(rid: str, session=Depends(get_session)):
     rows = session.query(models.ChainAnchor).filter(models.ChainAnchor.receipt_id == rid).all()
     return [
-        {"chain": r.chain, "txid": r.txid, "anchored_at": r.anchored_at.isoformat() if r.anchored_at else None}
+        {
+            "chain": r.chain,
+            "txid": r.txid,
+            "status": r.status or "confirmed",
+            "block_number": r.block_number,
+            "anchored_at": r.anchored_at.isoformat() if r.anchored_at else None,
+        }
         for r in rows
     ]
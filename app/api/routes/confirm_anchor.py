@@ -25,7 +25,7 @@ def _load_project_chain_config(session, rec: models.Receipt, *, chain_name: Opti
     """Resolve a chain config dict from the receipt's project config.
 
     Expected project config shape:
-      { anchoring: { chains: [{name, contract, rpc_url?, explorer_base_url?}, ...] } }
+      { anchoring: { chains: [{name, contract, rpc_url?, rpc_urls?, explorer_base_url?}, ...] } }
     """
 
     if not rec.project_id:
@@ -74,10 +74,12 @@ def confirm_anchor(
     if not rec.bundle_hash:
         raise HTTPException(status_code=409, detail="missing_bundle_hash")
 
+    from app import providers
+
     # Resolve chain config from project settings.
     chain_cfg = _load_project_chain_config(session, rec, chain_name=req.chain)
     chain_name = str(chain_cfg.get("name") or req.chain or rec.chain or "unknown")
-    rpc_url = chain_cfg.get("rpc_url")
+    rpc_url = providers.join_urls(chain_cfg.get("rpc_urls")) or chain_cfg.get("rpc_url")
     contract_addr = chain_cfg.get("contract")
 
     # Validate tx really anchored this receipt's bundle hash on the configured contract.
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+from pathlib import Path
+from typing import Optional
+from zipfile import ZipFile
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from app import bundle, db, export
+from app.auth import Principal, resolve_principal
+from app.services import receipts as receipts_svc
+
+router = APIRouter(tags=["evidence"])
+
+ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "artifacts")
+
+
+def _zip_path(receipt_id: str) -> Path:
+    base = Path(ARTIFACTS_DIR).resolve()
+    path = (base / receipt_id / "evidence.zip").resolve()
+    if base not in path.parents or not path.exists():
+        raise HTTPException(status_code=404, detail="bundle_not_found")
+    return path
+
+
+def _read_members(receipt_id: str, *names: str) -> dict:
+    with ZipFile(_zip_path(receipt_id)) as zf:
+        present = set(zf.namelist())
+        return {n: zf.read(n) for n in names if n in present}
+
+
+@router.get("/v1/evidence/{receipt_id}/files/{name}")
+def get_member(receipt_id: str, name: str):
+    """One member of a receipt's evidence.zip (pair with .../proof for partial verification)."""
+    members = _read_members(receipt_id, name)
+    if name not in members:
+        raise HTTPException(status_code=404, detail="file_not_found")
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return Response(content=members[name], media_type=media_type)
+
+
+@router.get("/v1/evidence/{receipt_id}/files/{name}/proof")
+def get_member_proof(receipt_id: str, name: str):
+    """Merkle inclusion proof of a member of a v2 bundle, with the signed manifest it roots in."""
+    members = _read_members(receipt_id, "manifest.json", "manifest.sig", "public_key.pem")
+    manifest = members.get("manifest.json")
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="manifest_not_found")
+    try:
+        doc = bundle.member_proof(manifest, name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="file_not_found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {
+        **doc,
+        "receipt_id": receipt_id,
+        "manifest": manifest.decode("utf-8"),
+        "manifest_sig": members.get("manifest.sig", b"").hex(),
+        "public_key_pem": members.get("public_key.pem", b"").decode("utf-8"),
+    }
+
+
+@router.get("/v1/evidence/export")
+def export_evidence(
+    project_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    principal: Principal = Depends(resolve_principal),
+):
+    """Stream a tar archive of all evidence for a project and date range (YYYY-MM-DD).
+
+    Resume or page with `after=<cursor>` from the last `<receipt_id>/index.json` (or
+    `next_cursor` in export.json). Project keys export their own project; admins may pick any
+    project or omit it to export everything.
+    """
+    if principal.is_public:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    if principal.project_id:
+        if project_id and project_id != str(principal.project_id):
+            raise HTTPException(status_code=403, detail="forbidden_project")
+        project_id = str(principal.project_id)
+    elif not principal.is_admin:
+        raise HTTPException(status_code=403, detail="forbidden_scope_all")
+    if after:
+        try:
+            export.decode_cursor(after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="invalid_limit")
+
+    since_dt = receipts_svc.parse_date(since)
+    until_dt = receipts_svc.parse_date(until, end_of_day=True)
+
+    def body():
+        # Own session: the export outlives the request-scoped one.
+        own = db.SessionLocal()
+        try:
+            yield from export.iter_export(
+                own, project_id=project_id, since=since_dt, until=until_dt, after=after, limit=limit
+            )
+        finally:
+            own.close()
+
+    filename = f"evidence-export-{project_id or 'all'}.tar"
+    return StreamingResponse(
+        body(),
+        media_type="application/x-tar",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -14,7 +14,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app import models, schemas
+from app import blobstore, models, schemas
 from app.api.deps import get_session
 from app.auth.principal import Principal
 from app.auth.api_key_auth import resolve_principal
@@ -39,12 +39,12 @@ def _write_iso_artifact(session: Session, receipt_id: str, type_str: str, filena
     """Write ISO artifact to disk and create database record."""
     out_dir = _ensure_dir_for_receipt(receipt_id)
     file_path = out_dir / filename
+    sha = _sha256_hex(content)
     try:
-        file_path.write_bytes(content)
+        blobstore.write(file_path, content, sha)
     except Exception:
         # best-effort write; proceed to DB row
         pass
-    sha = _sha256_hex(content)
     art = models.ISOArtifact(receipt_id=receipt_id, type=type_str, path=str(file_path), sha256=sha)
     session.add(art)
     session.commit()
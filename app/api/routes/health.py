@@ -38,6 +38,14 @@ def health() -> dict:
         redis_ok = False
         redis_detail = str(e)
 
+    # RPC endpoints used by this process (pooled clients; counters since start)
+    try:
+        from app import providers
+
+        rpc = providers.stats()
+    except Exception:  # pragma: no cover
+        rpc = {}
+
     return {
         "status": "ok" if (db_ok and redis_ok) else "degraded",
         "ts": datetime.utcnow().isoformat(),
@@ -46,6 +54,7 @@ def health() -> dict:
             "db": {"ok": db_ok, "detail": db_detail},
             "redis": {"ok": redis_ok, "detail": redis_detail},
         },
+        "rpc": rpc,
     }
 
 
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app import keys
+from app.auth import Principal, resolve_principal
+
+router = APIRouter(tags=["keys"])
+
+
+@router.get("/v1/keys")
+def get_keys():
+    """Current bundle signing key id and public key (PEM)."""
+    return keys.info()
+
+
+@router.post("/v1/keys/reload")
+def reload_keys(principal: Principal = Depends(resolve_principal)):
+    """Re-read signing keys after rotation (admin only). Same as sending SIGHUP to the process."""
+    if not principal.is_admin:
+        raise HTTPException(403, "admin_required")
+    try:
+        return keys.reload()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"key_reload_failed: {e}")
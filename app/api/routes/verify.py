@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import base64
+import io
 import json
 import os
+import zipfile
 from hashlib import sha256
 from pathlib import Path
 from typing import List
 
 import requests
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from app import schemas
+from app import schemas, verify_cache
+from app.api.deps import get_session
 
 router = APIRouter(tags=["verify"])
 
@@ -35,8 +39,13 @@ def _fetch_cid_bytes(cid: str, store: str | None = None) -> bytes | None:
     return None
 
 
-@router.post("/v1/iso/verify", response_model=schemas.VerifyResponse)
-def verify(req: schemas.VerifyRequest):
+def verify_request(req: schemas.VerifyRequest, session) -> schemas.VerifyResponse:
+    """Verification shared by the public and x402 premium routes.
+
+    Bundles produced by this middleware are answered from `receipts`/`chain_anchors`
+    (optionally re-checked per tx on-chain); anything else falls back to an event lookup.
+    """
+
     errors: List[str] = []
 
     if not (req.bundle_hash or req.bundle_url):
@@ -44,47 +53,128 @@ def verify(req: schemas.VerifyRequest):
 
     bundle_hash = req.bundle_hash
     if not bundle_hash and req.bundle_url:
-        from app import bundle
-
-        verification = bundle.verify_bundle(req.bundle_url)
+        verification = verify_cache.verify_bundle_url(req.bundle_url)
         bundle_hash = verification.bundle_hash
         errors = list(verification.errors)
 
+    # DB first: indexed bundle_hash -> receipt -> anchors on every chain.
+    from app import anchor_lookup
+
+    try:
+        found = anchor_lookup.find_bundle(session, str(bundle_hash))
+    except Exception:
+        found = None
+    if found is not None:
+        if req.onchain_recheck:
+            anchor_lookup.recheck(session, found)
+        confirmed = [a for a in found.anchors if a.status == "confirmed" and a.onchain is not False]
+        if req.onchain_recheck and any(a.onchain is False for a in found.anchors):
+            errors.append("anchor_not_found_onchain")
+        if confirmed:
+            return schemas.VerifyResponse(
+                matches_onchain=True,
+                bundle_hash=bundle_hash,
+                flare_txid=confirmed[0].txid,
+                anchored_at=confirmed[0].anchored_at,
+                merkle_root=found.merkle_root,
+                receipt_id=found.receipt_id,
+                anchors=found.anchors,
+                source="db",
+                errors=errors,
+            )
+
     matches = False
     txid = None
     anchored_at = None
-    try:
-        from app import anchor
 
-        info = anchor.find_anchor(bundle_hash)
-        matches = info.matches
-        txid = info.txid
-        anchored_at = info.anchored_at
-    except Exception:
+    # Batch-anchored bundles: check inclusion locally, then look up the batch root on-chain.
+    merkle_root = found.merkle_root if found is not None else None
+    lookup_hash = merkle_root or bundle_hash
+    if req.merkle_proof is not None:
+        from app import merkle
+
         try:
-            from app import anchor_node
+            merkle_root = merkle.root_for_proof(str(bundle_hash), req.merkle_proof)
+            lookup_hash = merkle_root
+        except ValueError as e:
+            errors.append(str(e))
+            return schemas.VerifyResponse(matches_onchain=False, bundle_hash=bundle_hash, errors=errors)
+
+    # Cached chain answers (shared via Redis); onchain_recheck always asks the chain.
+    info = None if req.onchain_recheck or not lookup_hash else verify_cache.get_anchor(str(lookup_hash))
+    if info is None:
+        try:
+            from app import anchor
 
-            info = anchor_node.find_anchor(bundle_hash)
-            matches = info.matches
-            txid = info.txid
-            anchored_at = info.anchored_at
+            info = anchor.find_anchor(lookup_hash)
         except Exception:
-            errors.append("anchor_lookup_unavailable")
+            try:
+                from app import anchor_node
+
+                info = anchor_node.find_anchor(lookup_hash)
+            except Exception:
+                errors.append("anchor_lookup_unavailable")
+        if info is not None and lookup_hash:
+            verify_cache.put_anchor(str(lookup_hash), info)
+    if info is not None:
+        matches = info.matches
+        txid = info.txid
+        anchored_at = info.anchored_at
 
     return schemas.VerifyResponse(
-        matches_onchain=matches, bundle_hash=bundle_hash, flare_txid=txid, anchored_at=anchored_at, errors=errors
+        matches_onchain=matches,
+        bundle_hash=bundle_hash,
+        flare_txid=txid,
+        anchored_at=anchored_at,
+        merkle_root=merkle_root,
+        receipt_id=found.receipt_id if found is not None else None,
+        anchors=found.anchors if found is not None else [],
+        source="chain",
+        errors=errors,
     )
 
 
+@router.post("/v1/iso/verify", response_model=schemas.VerifyResponse)
+def verify(req: schemas.VerifyRequest, session=Depends(get_session)):
+    return verify_request(req, session)
+
+
+@router.post("/v1/iso/verify-member", response_model=schemas.VerifyResponse)
+def verify_member(req: schemas.VerifyMemberRequest, session=Depends(get_session)):
+    """Verify one file of a v2 bundle: proof -> signed Merkle root -> anchor, without the zip."""
+    from app import bundle
+
+    try:
+        content = base64.b64decode(req.content_b64, validate=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="content_b64_invalid")
+
+    root, errors = bundle.verify_member(req.name, content, req.proof)
+    if root is None or errors:
+        return schemas.VerifyResponse(matches_onchain=False, bundle_hash=root or "", errors=errors)
+    res = verify_request(schemas.VerifyRequest(bundle_hash=root, onchain_recheck=req.onchain_recheck), session)
+    res.errors = errors + list(res.errors)
+    return res
+
+
 @router.post("/v1/iso/verify-cid", response_model=schemas.VerifyResponse)
 def verify_cid(req: schemas.VerifyCidRequest):
     content = _fetch_cid_bytes(req.cid, req.store)
     if not content:
         raise HTTPException(status_code=404, detail="cid_not_found")
 
-    bundle_hash = "0x" + sha256(content).hexdigest()
+    content_hash = "0x" + sha256(content).hexdigest()
+    bundle_hash = content_hash
 
     errors: List[str] = []
+    if zipfile.is_zipfile(io.BytesIO(content)):
+        # v2 bundles anchor the signed Merkle root from manifest.json, not the zip hash.
+        from app import bundle
+
+        verification = bundle.verify_bundle_file(io.BytesIO(content), content_hash)
+        bundle_hash = verification.bundle_hash or content_hash
+        errors.extend(verification.errors)
+
     matches = False
     txid = None
     anchored_at = None
@@ -111,7 +201,7 @@ def verify_cid(req: schemas.VerifyCidRequest):
     vc_url = None
     arweave_txid = None
     issuer = None
-    checksums = {"content_sha256": bundle_hash, "bundle_sha256": bundle_hash, "zip_size_bytes": len(content)}
+    checksums = {"content_sha256": content_hash, "bundle_sha256": bundle_hash, "zip_size_bytes": len(content)}
 
     try:
         rid = req.receipt_id
@@ -24,8 +24,12 @@ async def premium_verify_bundle(request: Request, payload: schemas.VerifyRequest
     
     Price: 0.001 USDC
     """
-    from app.api.routes.verify import verify as verify_impl
-    return await verify_impl(payload)
+    from starlette.concurrency import run_in_threadpool
+
+    from app.api.routes.verify import verify_request
+
+    # verify_request is blocking (DB, RPC): keep it off the event loop.
+    return await run_in_threadpool(verify_request, payload, session)
 
 
 @require_payment("0.005", X402_RECIPIENT)
@@ -94,19 +98,43 @@ async def premium_bulk_verify(request: Request, payload: dict, session: Session
     """Bulk verify multiple bundles (x402-gated).
     
     Price: 0.010 USDC
+
+    Verifies up to BULK_VERIFY_MAX_ITEMS `bundle_urls` / `bundle_hashes` concurrently.
+    With `"stream": true` (or `Accept: application/x-ndjson`) results are streamed as
+    NDJSON lines in completion order; otherwise one JSON document is returned.
     """
-    bundle_urls = payload.get("bundle_urls", [])
-    
-    from app.api.routes.verify import verify as verify_impl
-    
-    results = []
-    for url in bundle_urls[:10]:  # Limit to 10
-        try:
-            result = await verify_impl(schemas.VerifyRequest(bundle_url=url))
-            results.append({"url": url, "result": result})
-        except Exception as e:
-            results.append({"url": url, "error": str(e)})
-    
+    import json
+
+    from fastapi import HTTPException
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import StreamingResponse
+    from starlette.concurrency import run_in_threadpool
+
+    from app import bulk_verify, db
+
+    bundle_urls = payload.get("bundle_urls") or []
+    bundle_hashes = payload.get("bundle_hashes") or []
+    if len(bundle_urls) + len(bundle_hashes) > bulk_verify.BULK_VERIFY_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"too_many_items: max {bulk_verify.BULK_VERIFY_MAX_ITEMS}")
+
+    stream = bool(payload.get("stream")) or "application/x-ndjson" in request.headers.get("accept", "")
+    if stream:
+
+        def lines():
+            # Own session: the request-scoped one is released before a streamed body is sent.
+            own = db.SessionLocal()
+            try:
+                for item in bulk_verify.iter_results(own, bundle_urls=bundle_urls, bundle_hashes=bundle_hashes):
+                    yield json.dumps(jsonable_encoder(item), separators=(",", ":")) + "\n"
+            finally:
+                own.close()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    def run():
+        return list(bulk_verify.iter_results(session, bundle_urls=bundle_urls, bundle_hashes=bundle_hashes))
+
+    results = await run_in_threadpool(run)
     return {"verified": len(results), "results": results}
 
 
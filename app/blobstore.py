@@ -0,0 +1,94 @@
+"""Content-addressed blob store for receipt artifacts.
+
+Blobs live under `<ARTIFACTS_DIR>/.blobs/<aa>/<bb>/<sha256>` and are written once;
+`artifacts/<rid>/<name>` is a hardlink to the blob, so identical files (the service
+public key, re-written XML) share one inode and repeated writes are skipped.
+
+Links are always swapped in with a rename, never written through, so replacing one
+receipt's file cannot change another's. Where hardlinks are unavailable (other
+filesystem, BLOB_STORE=off) files are written as plain copies.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+BLOB_STORE_ENABLED = (os.getenv("BLOB_STORE", "on") or "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def _root() -> Path:
+    return Path(os.getenv("BLOB_STORE_DIR") or Path(os.getenv("ARTIFACTS_DIR", "artifacts")) / ".blobs")
+
+
+def _hex(sha256: str) -> str:
+    return sha256.lower().replace("0x", "")
+
+
+def blob_path(sha256: str) -> Path:
+    h = _hex(sha256)
+    return _root() / h[:2] / h[2:4] / h
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; artifacts are served by /files
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def put(data: bytes, sha256: Optional[str] = None) -> str:
+    """Store `data` (skipped if the blob exists) and return its 0x-sha256.
+
+    `sha256` may be passed when the caller already hashed `data`.
+    """
+
+    sha = "0x" + _hex(sha256) if sha256 else "0x" + hashlib.sha256(data).hexdigest()
+    path = blob_path(sha)
+    if not path.exists():
+        _atomic_write(path, data)
+    return sha
+
+
+def write(dest: Path, data: bytes, sha256: Optional[str] = None) -> str:
+    """Materialise `data` at `dest` (hardlink into the store) and return its 0x-sha256."""
+
+    dest = Path(dest)
+    sha = "0x" + _hex(sha256) if sha256 else "0x" + hashlib.sha256(data).hexdigest()
+    if not BLOB_STORE_ENABLED:
+        _atomic_write(dest, data)
+        return sha
+
+    try:
+        put(data, sha)
+        blob = blob_path(sha)
+        try:
+            if os.path.samefile(blob, dest):
+                return sha
+        except OSError:
+            pass
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.lnk")
+        try:
+            os.link(blob, tmp)
+            os.replace(tmp, dest)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+    except OSError:
+        # No hardlinks here (e.g. blob dir on another filesystem): plain copy.
+        _atomic_write(dest, data)
+    return sha
@@ -0,0 +1,176 @@
+"""Concurrent bulk verification (x402 premium bulk-verify).
+
+Bundles are downloaded and validated on a bounded thread pool (through verify_cache,
+so repeated URLs/bundles are not fetched or validated again; manifest signatures are
+checked inline with the cached VerifyKey). Items are deduplicated by URL and bundle
+hash. Bundles anchored by this service are answered from the DB as soon as they are
+ready. The remaining on-chain lookups are sent in sub-batches of BULK_VERIFY_CHAIN_BATCH
+hashes while downloads are still running, each resolved with one `anchor.find_anchors`
+call (one index query, at most one log scan) or, failing that, concurrent Node sidecar
+lookups; a sub-batch's items are yielded as soon as it returns. When neither source can
+answer, the items report anchor_lookup_unavailable and nothing is cached.
+
+`iter_results` yields one dict per requested item, in completion order, so the route
+can stream NDJSON.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import schemas, verify_cache
+
+BULK_VERIFY_MAX_ITEMS = int(os.getenv("BULK_VERIFY_MAX_ITEMS", "500"))
+BULK_VERIFY_CONCURRENCY = int(os.getenv("BULK_VERIFY_CONCURRENCY", "8"))
+# Hashes per on-chain lookup sub-batch, and sub-batches in flight at once
+BULK_VERIFY_CHAIN_BATCH = int(os.getenv("BULK_VERIFY_CHAIN_BATCH", "32"))
+BULK_VERIFY_CHAIN_CONCURRENCY = int(os.getenv("BULK_VERIFY_CHAIN_CONCURRENCY", "2"))
+
+
+def _dedupe(values: List[Any]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for v in values or []:
+        if isinstance(v, str) and v.strip():
+            seen.setdefault(v.strip(), None)
+    return list(seen)
+
+
+def _response(
+    bundle_hash: str, errors: List[str], found, match: Optional[schemas.ChainMatch], source: str
+) -> schemas.VerifyResponse:
+    return schemas.VerifyResponse(
+        matches_onchain=bool(match and match.matches),
+        bundle_hash=bundle_hash,
+        flare_txid=match.txid if match else None,
+        anchored_at=match.anchored_at if match else None,
+        merkle_root=found.merkle_root if found is not None else None,
+        receipt_id=found.receipt_id if found is not None else None,
+        anchors=found.anchors if found is not None else [],
+        source=source,
+        errors=errors,
+    )
+
+
+def _lookup_chain(lookup_hashes: List[str]) -> Tuple[Dict[str, schemas.ChainMatch], bool]:
+    """({hash: match}, ok) for one sub-batch; the Node sidecar as the fallback.
+
+    ok is False when neither could answer: the hashes are then reported as
+    anchor_lookup_unavailable and nothing is cached.
+    """
+
+    if not lookup_hashes:
+        return {}, True
+    try:
+        from . import anchor
+
+        return anchor.find_anchors(lookup_hashes), True
+    except Exception:
+        pass
+    try:
+        from . import anchor_node
+
+        return anchor_node.find_anchors(lookup_hashes), True
+    except Exception:
+        return {}, False
+
+
+def iter_results(
+    session, *, bundle_urls: List[str], bundle_hashes: List[str], concurrency: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Verify many bundles; yields {"url"|"bundle_hash": ..., "result"|"error": ...} per item."""
+
+    from . import anchor_lookup
+
+    urls = _dedupe(bundle_urls)
+    hashes = _dedupe(bundle_hashes)
+    if len(urls) + len(hashes) > BULK_VERIFY_MAX_ITEMS:
+        raise ValueError(f"too_many_items: max {BULK_VERIFY_MAX_ITEMS}")
+
+    # lookup hash -> [(item, bundle_hash, errors, found)] waiting for the chain
+    waiting: Dict[str, List[Tuple[Dict[str, Any], str, List[str], Any]]] = {}
+    queued: List[str] = []  # lookup hashes not sent yet
+    batch_size = max(1, BULK_VERIFY_CHAIN_BATCH)
+
+    def settle(item: Dict[str, Any], bundle_hash: str, errors: List[str]) -> Optional[Dict[str, Any]]:
+        """Answer from the DB or cache if possible; otherwise queue for a batched chain lookup."""
+
+        try:
+            found = anchor_lookup.find_bundle(session, bundle_hash)
+        except Exception:
+            found = None
+        if found is not None:
+            confirmed = [a for a in found.anchors if a.status == "confirmed" and a.onchain is not False]
+            if confirmed:
+                match = schemas.ChainMatch(matches=True, txid=confirmed[0].txid, anchored_at=confirmed[0].anchored_at)
+                return {**item, "result": _response(bundle_hash, errors, found, match, "db")}
+        lookup = (found.merkle_root if found is not None else None) or bundle_hash
+        cached = verify_cache.get_anchor(lookup) if lookup else None
+        if cached is not None or not lookup:
+            return {**item, "result": _response(bundle_hash, errors, found, cached, "chain")}
+        if lookup not in waiting:
+            waiting[lookup] = []
+            queued.append(lookup)
+        waiting[lookup].append((item, bundle_hash, errors, found))
+        return None
+
+    def settle_url(item: Dict[str, Any], verification: schemas.VerificationResult) -> Optional[Dict[str, Any]]:
+        if not verification.bundle_hash:
+            return {**item, "result": _response("", list(verification.errors), None, None, "chain")}
+        return settle(item, verification.bundle_hash, list(verification.errors))
+
+    def answer(batch: List[str], matches: Dict[str, schemas.ChainMatch], ok: bool) -> Iterator[Dict[str, Any]]:
+        for lookup in batch:
+            match = matches.get(lookup)
+            if ok and match is not None:
+                verify_cache.put_anchor(lookup, match)
+            for item, bundle_hash, errors, found in waiting.pop(lookup, []):
+                errs = errors if ok else errors + ["anchor_lookup_unavailable"]
+                yield {**item, "result": _response(bundle_hash, errs, found, match, "chain")}
+
+    for h in hashes:
+        out = settle({"bundle_hash": h}, h, [])
+        if out is not None:
+            yield out
+
+    workers = max(1, min(int(concurrency or BULK_VERIFY_CONCURRENCY), len(urls) or 1))
+    with (
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-verify") as pool,
+        ThreadPoolExecutor(
+            max_workers=max(1, BULK_VERIFY_CHAIN_CONCURRENCY), thread_name_prefix="bulk-verify-chain"
+        ) as chain_pool,
+    ):
+        downloads: Dict[Future, str] = {pool.submit(verify_cache.verify_bundle_url, url): url for url in urls}
+        lookups: Dict[Future, List[str]] = {}
+
+        def send(flush: bool) -> None:
+            # Full sub-batches go out at once; a partial one only when nothing else is in
+            # flight (so early items are answered early) or once all downloads are done.
+            while queued and (flush or len(queued) >= batch_size or not lookups):
+                batch = queued[:batch_size]
+                del queued[:batch_size]
+                lookups[chain_pool.submit(_lookup_chain, batch)] = batch
+
+        send(not downloads)
+        while downloads or lookups:
+            done, _ = wait([*downloads, *lookups], return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut in lookups:
+                    batch = lookups.pop(fut)
+                    try:
+                        matches, ok = fut.result()
+                    except Exception:
+                        matches, ok = {}, False
+                    yield from answer(batch, matches, ok)
+                    continue
+                item = {"url": downloads.pop(fut)}
+                try:
+                    verification = fut.result()
+                except Exception as e:
+                    yield {**item, "error": str(e)}
+                    continue
+                out = settle_url(item, verification)
+                if out is not None:
+                    yield out
+            send(not downloads)
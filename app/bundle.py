@@ -1,47 +1,49 @@
 from __future__ import annotations
 
 import hashlib
-import io
 import json
 import os
+import struct
 import tempfile
+import zlib
 from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-from zipfile import ZIP_STORED, ZipFile, ZipInfo
-
-import requests
-
-from . import iso
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from zipfile import (  # type: ignore[attr-defined]
+    ZIP64_LIMIT,
+    ZIP_STORED,
+    ZipFile,
+    ZipInfo,
+    stringCentralDir,
+    stringEndArchive,
+    structCentralDir,
+    structEndArchive,
+)
+
+from . import blobstore, iso_validation, keys, merkle, sigverify
 from .schemas import VerificationResult
 
 try:
     from nacl import signing
-    from nacl.exceptions import BadSignatureError
-    from nacl.signing import VerifyKey
 except Exception:  # pragma: no cover
     signing = None  # type: ignore
 
-    class BadSignatureError(Exception):
-        pass
-
-    class _DummyVerifyKey:
-        def verify(self, *args, **kwargs):
-            raise BadSignatureError("nacl unavailable")
-
-    VerifyKey = _DummyVerifyKey  # type: ignore
-
 
 ARTIFACTS_DIR = Path(os.getenv("ARTIFACTS_DIR", "artifacts"))
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
 
-KEYS_DIR = Path(".keys")
-DEV_SK_HEX = KEYS_DIR / "service_sk.hex"
-DEV_PK_PEM = KEYS_DIR / "service_pk.pem"
+# verify_bundle limits: reject larger downloads, keep up to VERIFY_SPOOL_BYTES in memory
+VERIFY_MAX_BUNDLE_BYTES = int(os.getenv("VERIFY_MAX_BUNDLE_BYTES", str(64 * 1024 * 1024)))
+VERIFY_SPOOL_BYTES = int(os.getenv("VERIFY_SPOOL_BYTES", str(8 * 1024 * 1024)))
+VERIFY_HTTP_TIMEOUT = float(os.getenv("VERIFY_HTTP_TIMEOUT", "30"))
+_BUNDLE_HTTP_KEY = "bundle-download"
 
-ENV_SK_PATH = os.getenv("SERVICE_PRIVATE_KEY")
-ENV_PK_PATH = os.getenv("SERVICE_PUBLIC_KEY")
+BUNDLE_V1 = "1.0"
+BUNDLE_V2 = "2.0"
+MERKLE_ALG = "sha256-rfc6962"  # merkle.py tree over file_leaf() values plus header_leaf()
+# Manifest fields bound into the v2 root next to the member digests
+MANIFEST_HEADER_FIELDS = ("version", "reference", "receipt_id", "created_at", "key_id")
 
 
 def _sha256_hex(data: bytes) -> str:
@@ -58,107 +60,208 @@ def _serialize_json(obj: Any) -> Any:
     return obj
 
 
-def _to_pem(pk_raw: bytes) -> str:
-    import base64
+def _canonical_manifest_bytes(manifest: Dict[str, Any]) -> bytes:
+    """Canonical JSON bytes used for signing.
 
-    b64 = base64.b64encode(pk_raw).decode("ascii")
-    wrapped = "\n".join(b64[i : i + 64] for i in range(0, len(b64), 64))
-    return "-----BEGIN ED25519 PUBLIC KEY-----\n" + wrapped + "\n-----END ED25519 PUBLIC KEY-----\n"
+    We use compact encoding with sorted keys to ensure stable signatures.
+    """
+    return json.dumps(manifest, separators=(",", ":"), sort_keys=True, default=_serialize_json).encode("utf-8")
 
 
-def _pem_to_raw(pem_text: str) -> bytes:
-    import base64
+def file_leaf(name: str, sha256_hex: str) -> str:
+    """v2 Merkle leaf for a bundle member: sha256(utf8(name) || 0x00 || file sha256)."""
 
-    lines = [ln.strip() for ln in pem_text.strip().splitlines() if "-----" not in ln]
-    b64 = "".join(lines)
-    return base64.b64decode(b64)
+    digest = bytes.fromhex(str(sha256_hex).lower().replace("0x", ""))
+    return _sha256_hex(name.encode("utf-8") + b"\x00" + digest)
 
 
-def _ensure_keys() -> Tuple[Any, bytes, str]:
-    """Return (signing_key, raw_public_key_bytes, pem_text).
+def header_leaf(manifest: Dict[str, Any]) -> str:
+    """v2 Merkle leaf for the manifest header: `file_leaf("manifest.json", sha256(canonical header))`.
 
-    Preference:
-      1) SERVICE_PRIVATE_KEY (hex seed) + SERVICE_PUBLIC_KEY (PEM) file paths via env
-      2) Dev fallback: generate keypair into .keys/
+    The manifest never lists itself, so the name cannot collide with a member leaf.
     """
 
-    if signing is None:  # type: ignore
-        # Provide deterministic placeholders; signature verification will be skipped.
-        class _DummySK:
-            def sign(self, data: bytes):
-                class _Sig:
-                    signature = b""
-
-                return _Sig()
-
-        pem_text = "-----BEGIN ED25519 PUBLIC KEY-----\nUNAVAILABLE\n-----END ED25519 PUBLIC KEY-----\n"
-        return _DummySK(), b"", pem_text
-
-    # 1) Use provided keys
-    if ENV_SK_PATH and Path(ENV_SK_PATH).exists():
-        seed_hex = Path(ENV_SK_PATH).read_text().strip().lower().replace("0x", "")
-        seed = bytes.fromhex(seed_hex)
-        if len(seed) not in (32, 64):
-            raise ValueError("SERVICE_PRIVATE_KEY must contain 32-byte hex seed or 64-byte expanded key")
-        if len(seed) == 64:
-            seed = seed[:32]
-        sk = signing.SigningKey(seed)
-        pk_raw = sk.verify_key.encode()
-        if ENV_PK_PATH and Path(ENV_PK_PATH).exists():
-            pem_text = Path(ENV_PK_PATH).read_text(encoding="utf-8")
-        else:
-            pem_text = _to_pem(pk_raw)
-        return sk, pk_raw, pem_text
-
-    # 2) Dev fallback: generate and persist locally
-    KEYS_DIR.mkdir(parents=True, exist_ok=True)
-    if DEV_SK_HEX.exists() and DEV_PK_PEM.exists():
-        seed_hex = DEV_SK_HEX.read_text().strip()
-        sk = signing.SigningKey(bytes.fromhex(seed_hex))
-        pk_raw = sk.verify_key.encode()
-        pem_text = DEV_PK_PEM.read_text(encoding="utf-8")
-        return sk, pk_raw, pem_text
-
-    sk = signing.SigningKey.generate()
-    pk_raw = sk.verify_key.encode()
-    pem_text = _to_pem(pk_raw)
-    DEV_SK_HEX.write_text(sk.encode().hex())
-    DEV_PK_PEM.write_text(pem_text)
-    return sk, pk_raw, pem_text
+    header = {k: manifest.get(k) for k in MANIFEST_HEADER_FIELDS}
+    return file_leaf("manifest.json", _sha256_hex(_canonical_manifest_bytes(header)))
 
 
-def _canonical_manifest_bytes(manifest: Dict[str, Any]) -> bytes:
-    """Canonical JSON bytes used for signing.
+def _manifest_merkle(manifest: Dict[str, Any]) -> Tuple[str, List[List[Dict[str, str]]]]:
+    """(root, proofs) over the manifest "files" entries, in manifest (name-sorted) order, then the header.
 
-    We use compact encoding with sorted keys to ensure stable signatures.
+    v2 manifests list public_key.pem among the files, so the root binds the signing key
+    as well as the content: a manifest re-signed with another key no longer matches it.
     """
-    return json.dumps(manifest, separators=(",", ":"), sort_keys=True, default=_serialize_json).encode("utf-8")
+
+    files = manifest.get("files") or []
+    leaves = [file_leaf(str(f["name"]), str(f["sha256"])) for f in files]
+    return merkle.merkle_proofs(leaves + [header_leaf(manifest)])
+
+
+def member_proof(manifest_bytes: bytes, name: str) -> Dict[str, Any]:
+    """Inclusion proof of one member of a v2 bundle (raises KeyError/ValueError)."""
+
+    manifest = json.loads(manifest_bytes.decode("utf-8"))
+    if manifest.get("version") != BUNDLE_V2:
+        raise ValueError("bundle_not_v2")
+    files = manifest.get("files") or []
+    idx = next((i for i, f in enumerate(files) if f.get("name") == name), None)
+    if idx is None:
+        raise KeyError(name)
+    root, proofs = _manifest_merkle(manifest)
+    entry = files[idx]
+    return {
+        "version": BUNDLE_V2,
+        "name": name,
+        "sha256": entry["sha256"],
+        "size": entry.get("size"),
+        "leaf": file_leaf(name, entry["sha256"]),
+        "proof": proofs[idx],
+        "root": root,
+    }
 
 
-def _deterministic_zip(file_map: Dict[str, bytes], out_path: Path) -> bytes:
-    """Create a deterministic ZIP.
+def verify_member(name: str, content: bytes, proof_doc: Dict[str, Any]) -> Tuple[Optional[str], List[str]]:
+    """Check one member against a v2 proof document; returns (root, errors).
+
+    When the document carries "manifest", "manifest_sig" (hex) and "public_key_pem" (as
+    served by the evidence proof endpoint), the root is also checked against the signed
+    manifest, and the public key against the one the manifest (and so the root) commits to.
+    The caller then checks that `root` is anchored.
+    """
+
+    errors: List[str] = []
+    sha = _sha256_hex(content)
+    if str(proof_doc.get("sha256") or "").lower() != sha:
+        errors.append(f"file_hash_mismatch:{name}")
+    root = proof_doc.get("root")
+    if not root or not merkle.verify_proof(file_leaf(name, sha), proof_doc.get("proof") or [], root):
+        errors.append("merkle_proof_invalid")
+
+    manifest_text = proof_doc.get("manifest")
+    if manifest_text is not None:
+        manifest_bytes = manifest_text.encode("utf-8") if isinstance(manifest_text, str) else bytes(manifest_text)
+        pem = str(proof_doc.get("public_key_pem") or "").encode("utf-8")
+        try:
+            manifest = json.loads(manifest_bytes.decode("utf-8"))
+            if (manifest.get("merkle") or {}).get("root") != root or _manifest_merkle(manifest)[0] != root:
+                errors.append("manifest_root_mismatch")
+            files = manifest.get("files") or []
+            if not any(f.get("name") == name and f.get("sha256") == sha for f in files):
+                errors.append(f"manifest_missing_file:{name}")
+            if not any(f.get("name") == "public_key.pem" and f.get("sha256") == _sha256_hex(pem) for f in files):
+                errors.append("public_key_mismatch")
+        except Exception as e:
+            errors.append(f"manifest_invalid:{e}")
+        try:
+            sig = bytes.fromhex(str(proof_doc.get("manifest_sig") or ""))
+        except ValueError:
+            sig = b""
+        sig_error = sigverify.verify_one(pem, manifest_bytes, sig)
+        if sig_error:
+            errors.append(sig_error)
+
+    return (str(root) if root else None), errors
+
+
+def _deterministic_zip(file_map: Dict[str, bytes], out_path: Path) -> Tuple[str, int]:
+    """Stream a deterministic ZIP to `out_path`; return (sha256 hex of the zip, size).
 
     - sorted filenames
     - fixed timestamps (1980-01-01 00:00:00)
     - fixed permissions
     - ZIP_STORED (no compression)
+
+    Output is byte-identical to `ZipFile.writestr` into a seekable buffer, but each header is
+    written once with its CRC/size already known, so the archive goes straight to a temp file
+    (hashed as it is written) and is fsynced and renamed into place.
     """
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    mem = io.BytesIO()
-    with ZipFile(mem, mode="w", compression=ZIP_STORED) as zf:
-        for name in sorted(file_map.keys()):
-            zi = ZipInfo(filename=name, date_time=(1980, 1, 1, 0, 0, 0))
-            zi.external_attr = 0o644 << 16
-            zf.writestr(zi, file_map[name])
+    digest = hashlib.sha256()
+    infos: List[ZipInfo] = []
+    offset = 0
+    fd, tmp_name = tempfile.mkstemp(dir=out_path.parent, prefix=f".{out_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+
+            def emit(chunk: bytes) -> None:
+                nonlocal offset
+                fh.write(chunk)
+                digest.update(chunk)
+                offset += len(chunk)
+
+            for name in sorted(file_map.keys()):
+                data = file_map[name]
+                zi = ZipInfo(filename=name, date_time=(1980, 1, 1, 0, 0, 0))
+                zi.external_attr = 0o644 << 16
+                zi.compress_type = ZIP_STORED
+                zi.file_size = zi.compress_size = len(data)
+                zi.CRC = zlib.crc32(data)
+                zi.flag_bits = 0
+                zi.header_offset = offset
+                if zi.file_size > ZIP64_LIMIT / 1.05 or offset > ZIP64_LIMIT:
+                    raise ValueError("bundle too large for a non-zip64 archive")
+                emit(zi.FileHeader(False))
+                emit(data)
+                infos.append(zi)
+
+            # Central directory + end record, as ZipFile._write_end_record lays them out.
+            cd_start = offset
+            for zi in infos:
+                dt = zi.date_time
+                dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+                dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+                filename, flag_bits = zi._encodeFilenameFlags()
+                emit(
+                    struct.pack(
+                        structCentralDir,
+                        stringCentralDir,
+                        zi.create_version,
+                        zi.create_system,
+                        zi.extract_version,
+                        zi.reserved,
+                        flag_bits,
+                        zi.compress_type,
+                        dostime,
+                        dosdate,
+                        zi.CRC,
+                        zi.compress_size,
+                        zi.file_size,
+                        len(filename),
+                        len(zi.extra),
+                        len(zi.comment),
+                        0,
+                        zi.internal_attr,
+                        zi.external_attr,
+                        zi.header_offset,
+                    )
+                    + filename
+                    + zi.extra
+                    + zi.comment
+                )
+            emit(
+                struct.pack(
+                    structEndArchive, stringEndArchive, 0, 0, len(infos), len(infos), offset - cd_start, cd_start, 0
+                )
+            )
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp_name, 0o644)  # mkstemp creates 0600; bundles are served by /files
+        os.replace(tmp_name, out_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
 
-    data = mem.getvalue()
-    out_path.write_bytes(data)
-    return data
+    return "0x" + digest.hexdigest(), offset
 
 
-def create_bundle(receipt: Dict[str, Any], xml_bytes: bytes) -> Tuple[str, str]:
+def create_bundle(
+    receipt: Dict[str, Any], xml_bytes: bytes, *, xml_sha256: Optional[str] = None, version: str = BUNDLE_V1
+) -> Tuple[str, str]:
     """Build a deterministic evidence bundle and return (zip_path, bundle_hash).
 
     Bundle is self-contained:
@@ -170,7 +273,12 @@ def create_bundle(receipt: Dict[str, Any], xml_bytes: bytes) -> Tuple[str, str]:
       - public_key.pem
       - optional: credential.json, ivms101.json
 
-    Anchoring should anchor the **hash of the entire evidence.zip**.
+    Anchoring should anchor the **hash of the entire evidence.zip** (version "1.0").
+    Version "2.0" manifests also list public_key.pem and commit to a Merkle root over the
+    member digests and the manifest header (see `file_leaf` / `header_leaf`); that root is
+    returned as bundle_hash and anchored instead, so single members can be verified with
+    `member_proof` / `verify_member` without the zip.
+    `xml_sha256` (0x-hex, e.g. from the stored ISO artifact row) skips re-hashing pain001.xml.
     """
 
     rid = str(receipt["id"])
@@ -232,34 +340,52 @@ def create_bundle(receipt: Dict[str, Any], xml_bytes: bytes) -> Tuple[str, str]:
     except Exception:
         pass
 
+    # Signing keys (cached per process; key_id lets verifiers pick the key after rotation)
+    key = keys.service_key()
+    sk = key.signing_key
+    is_v2 = version == BUNDLE_V2
+
     files_for_manifest = {
         "pain001.xml": pain_xml,
         "receipt.json": receipt_json,
         "tip.json": tip_json,
         **extra_files,
     }
+    if is_v2:
+        # Listed (and so under the anchored root) to bind the key that signed the manifest.
+        files_for_manifest["public_key.pem"] = key.pem_bytes
+
+    # Each member is hashed once; pain001.xml may arrive pre-hashed from the artifact writer.
+    digests = {
+        name: (xml_sha256 if name == "pain001.xml" and xml_sha256 else _sha256_hex(content))
+        for name, content in files_for_manifest.items()
+    }
 
     manifest: Dict[str, Any] = {
-        "version": "1.0",
+        "version": BUNDLE_V2 if is_v2 else BUNDLE_V1,
         "reference": receipt.get("reference"),
         "receipt_id": rid,
         "created_at": _serialize_json(receipt.get("created_at")),
         "files": [
             {
                 "name": name,
-                "sha256": _sha256_hex(content),
+                "sha256": digests[name],
                 "size": len(content),
             }
             for name, content in sorted(files_for_manifest.items())
         ],
     }
 
+    manifest["key_id"] = key.key_id
+
+    merkle_root: Optional[str] = None
+    if is_v2:
+        merkle_root, _proofs = _manifest_merkle(manifest)
+        manifest["merkle"] = {"alg": MERKLE_ALG, "root": merkle_root}
+
     # Canonical manifest bytes used for signature
     manifest_canon = _canonical_manifest_bytes(manifest)
 
-    # Signing keys
-    sk, _pk_raw, pk_pem = _ensure_keys()
-
     # Sign canonical manifest bytes (not the zip hash)
     manifest_sig = b""
     if signing is not None:  # type: ignore
@@ -272,68 +398,97 @@ def create_bundle(receipt: Dict[str, Any], xml_bytes: bytes) -> Tuple[str, str]:
         "tip.json": tip_json,
         "manifest.json": manifest_canon,
         "manifest.sig": manifest_sig,
-        "public_key.pem": pk_pem.encode("utf-8"),
+        "public_key.pem": key.pem_bytes,
         **extra_files,
     }
 
     zip_path = out_dir / "evidence.zip"
-    zip_bytes = _deterministic_zip(file_map, zip_path)
-
-    bundle_hash = _sha256_hex(zip_bytes)
+    bundle_hash, _size = _deterministic_zip(file_map, zip_path)
+    if merkle_root is not None:
+        bundle_hash = merkle_root
 
-    # Persist convenience files
-    (out_dir / "pain001.xml").write_bytes(pain_xml)
-    (out_dir / "manifest.json").write_bytes(manifest_canon)
-    (out_dir / "manifest.sig").write_text(manifest_sig.hex())
-    (out_dir / "public_key.pem").write_text(pk_pem, encoding="utf-8")
+    # Persist convenience files (deduplicated: pain001.xml is usually already linked by the job)
+    blobstore.write(out_dir / "pain001.xml", pain_xml, digests["pain001.xml"])
+    blobstore.write(out_dir / "manifest.json", manifest_canon)
+    blobstore.write(out_dir / "manifest.sig", manifest_sig.hex().encode("ascii"))
+    blobstore.write(out_dir / "public_key.pem", key.pem_bytes)
 
     return str(zip_path), bundle_hash
 
 
-def verify_bundle(bundle_url: str) -> VerificationResult:
-    """Download a bundle, compute its hash, validate manifest, validate XML, verify manifest signature.
+class BundleTooLarge(ValueError):
+    pass
 
-    Returns VerificationResult(bundle_hash, errors).
-    """
 
-    errors: List[str] = []
+def _download_bundle(bundle_url: str, spool: Any) -> str:
+    """Stream `bundle_url` into `spool`, hashing on the way; return the 0x-sha256.
 
-    # Download file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
-        try:
-            resp = requests.get(bundle_url, stream=True, timeout=30)
-            resp.raise_for_status()
-        except Exception as e:
-            return VerificationResult(bundle_hash="", errors=[f"download_failed: {e}"])
+    Raises BundleTooLarge past VERIFY_MAX_BUNDLE_BYTES.
+    """
+
+    from . import providers
 
-        hasher = hashlib.sha256()
+    hasher = hashlib.sha256()
+    size = 0
+    with providers.http_session(_BUNDLE_HTTP_KEY).get(bundle_url, stream=True, timeout=VERIFY_HTTP_TIMEOUT) as resp:
+        resp.raise_for_status()
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > VERIFY_MAX_BUNDLE_BYTES:
+            raise BundleTooLarge(f"bundle_too_large:{declared}")
         for chunk in resp.iter_content(chunk_size=65536):
-            if chunk:
-                tmp.write(chunk)
-                hasher.update(chunk)
-        tmp.flush()
-        bundle_path = Path(tmp.name)
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > VERIFY_MAX_BUNDLE_BYTES:
+                raise BundleTooLarge(f"bundle_too_large:>{VERIFY_MAX_BUNDLE_BYTES}")
+            spool.write(chunk)
+            hasher.update(chunk)
+    spool.seek(0)
+    return "0x" + hasher.hexdigest()
+
+
+def verify_bundle_file(fp: Any, bundle_hash: str) -> VerificationResult:
+    """Validate an evidence.zip from a seekable file object whose sha256 is already known.
 
-    bundle_hash = "0x" + hasher.hexdigest()
+    For v2 bundles the returned bundle_hash is the manifest's Merkle root (the anchored value).
+    """
 
-    # Open zip and read contents
+    errors: List[str] = []
+    anchored_hash = bundle_hash
     try:
-        with ZipFile(bundle_path, "r") as zf:
+        with ZipFile(fp, "r") as zf:
+            members = {zi.filename: zi for zi in zf.infolist()}
+            small: Dict[str, bytes] = {}
 
             def read(name: str) -> bytes:
-                try:
-                    with zf.open(name) as f:
-                        return f.read()
-                except KeyError:
+                if name in small:
+                    return small[name]
+                zi = members.get(name)
+                if zi is None:
                     errors.append(f"missing_file:{name}")
                     return b""
+                with zf.open(zi) as f:
+                    small[name] = f.read()
+                return small[name]
+
+            def member_sha(name: str) -> Optional[str]:
+                if name in small:
+                    return _sha256_hex(small[name])
+                zi = members.get(name)
+                if zi is None:
+                    return None
+                h = hashlib.sha256()
+                with zf.open(zi) as f:
+                    for chunk in iter(lambda: f.read(65536), b""):
+                        h.update(chunk)
+                return "0x" + h.hexdigest()
 
             manifest_bytes = read("manifest.json")
             sig_bytes = read("manifest.sig")
             xml_bytes = read("pain001.xml")
             pk_pem_bytes = read("public_key.pem")
 
-            # Manifest validation
+            # Manifest validation: one pass, members hashed in chunks (never held whole unless already read)
             try:
                 manifest = json.loads(manifest_bytes.decode("utf-8"))
                 # Verify canonical encoding matches what was signed
@@ -347,35 +502,85 @@ def verify_bundle(bundle_url: str) -> VerificationResult:
                     if not name or not expected_sha:
                         errors.append("manifest_entry_invalid")
                         continue
-                    content = read(name)
-                    actual = _sha256_hex(content)
-                    if actual != expected_sha:
+                    actual = member_sha(name)
+                    if actual is None:
+                        errors.append(f"missing_file:{name}")
+                    elif actual != expected_sha:
                         errors.append(f"file_hash_mismatch:{name}")
+                # v2: the anchored value is the signed Merkle root over the member digests
+                # and header; the key must be listed so the root binds it.
+                if manifest.get("version") == BUNDLE_V2:
+                    signed_root = (manifest.get("merkle") or {}).get("root")
+                    if not any(f.get("name") == "public_key.pem" for f in manifest.get("files") or []):
+                        errors.append("manifest_missing_file:public_key.pem")
+                    elif not signed_root or _manifest_merkle(manifest)[0] != signed_root:
+                        errors.append("merkle_root_mismatch")
+                    else:
+                        anchored_hash = str(signed_root)
             except Exception as e:
                 errors.append(f"manifest_invalid:{e}")
 
             # XML validation (if schema present)
             try:
-                schema = iso._get_schema()  # type: ignore
-                if schema is not None and xml_bytes:
-                    schema.validate(xml_bytes)
+                if xml_bytes:
+                    iso_validation.validate_bytes(xml_bytes)
             except Exception as e:
                 errors.append(f"xml_invalid:{e}")
 
-            # Signature verification (over canonical manifest)
-            if signing is None:
-                errors.append("signature_check_unavailable")
-            else:
-                try:
-                    pk_raw = _pem_to_raw(pk_pem_bytes.decode("utf-8"))
-                    vk = VerifyKey(pk_raw)
-                    vk.verify(manifest_bytes, sig_bytes)
-                except BadSignatureError:
-                    errors.append("signature_invalid")
-                except Exception as e:
-                    errors.append(f"signature_check_failed:{e}")
+            # Signature verification (over canonical manifest); VerifyKey cached per public key
+            sig_error = sigverify.verify_one(pk_pem_bytes, manifest_bytes, sig_bytes)
+            if sig_error:
+                errors.append(sig_error)
 
     except Exception as e:
         errors.append(f"zip_open_failed:{e}")
 
-    return VerificationResult(bundle_hash=bundle_hash, errors=errors)
+    return VerificationResult(bundle_hash=anchored_hash, errors=errors)
+
+
+def verify_bundle(
+    bundle_url: str, *, lookup: Optional[Callable[[str], Optional[VerificationResult]]] = None
+) -> VerificationResult:
+    """Download a bundle, compute its hash, validate manifest, validate XML, verify manifest signature.
+
+    The download is hashed as it streams and kept in memory up to VERIFY_SPOOL_BYTES (spilling
+    to a temp file beyond that, removed on return); bundles over VERIFY_MAX_BUNDLE_BYTES are rejected.
+    `lookup(zip_hash)` may return an earlier result for the same bytes to skip validation; it
+    is called with the download's sha256 (for v2 bundles the result carries the Merkle root).
+
+    Returns VerificationResult(bundle_hash, errors).
+    """
+
+    with tempfile.SpooledTemporaryFile(max_size=VERIFY_SPOOL_BYTES) as spool:
+        try:
+            bundle_hash = _download_bundle(bundle_url, spool)
+        except BundleTooLarge as e:
+            return VerificationResult(bundle_hash="", errors=[str(e)])
+        except Exception as e:
+            return VerificationResult(bundle_hash="", errors=[f"download_failed: {e}"])
+        known = lookup(bundle_hash) if lookup is not None else None
+        return known if known is not None else verify_bundle_file(spool, bundle_hash)
+
+
+def audit_signatures(zip_paths: Sequence[Any]) -> List[Optional[str]]:
+    """Check the manifest signatures of many local evidence.zip files (audits).
+
+    Only manifest.json, manifest.sig and public_key.pem are read; the checks go through one
+    `sigverify.verify_many` call, so large audits (SIGVERIFY_POOL_MIN and up) use the
+    process pool. Returns one result per path, in order: None when the signature is valid,
+    otherwise a verify_bundle-style error string.
+    """
+
+    results: List[Optional[str]] = [None] * len(zip_paths)
+    items: List[sigverify.Item] = []
+    checked: List[int] = []
+    for i, path in enumerate(zip_paths):
+        try:
+            with ZipFile(path, "r") as zf:
+                items.append((zf.read("public_key.pem"), zf.read("manifest.json"), zf.read("manifest.sig")))
+            checked.append(i)
+        except Exception as e:
+            results[i] = f"zip_open_failed:{e}"
+    for i, err in zip(checked, sigverify.verify_many(items)):
+        results[i] = err
+    return results
@@ -0,0 +1,337 @@
+"""Incremental local index of EvidenceAnchored events.
+
+`find_anchor` used to scan up to ANCHOR_LOOKBACK_BLOCKS with eth_getLogs on every
+verification. Instead, a recurring job copies events for each configured
+(chain, contract) into `evidence_events` and remembers how far it got in
+`index_cursors`; lookups hit the DB and only the unsynced tail goes to RPC.
+
+Each cursor covers one contiguous block range [first_block, last_block]; lookups trust the
+index only inside it (`scan_from`). Older blocks are added with a backfill
+(`sync_contract(start_block=...)` below first_block), and `rewind=True` re-indexes from a
+block onwards.
+
+Reorgs: each cursor stores the hash of its last indexed block. If that block's hash
+changed, events from the last CHAIN_INDEX_REORG_DEPTH blocks are dropped and re-indexed.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_utils import to_checksum_address  # type: ignore
+from hexbytes import HexBytes  # type: ignore
+from web3 import Web3  # type: ignore
+
+from . import db, log_scan, models, providers
+from .schemas import ChainMatch
+
+CHAIN_INDEX_ENABLED = os.getenv("CHAIN_INDEX_ENABLED", "1").lower() in ("1", "true", "yes")
+CHAIN_INDEX_INTERVAL = int(os.getenv("CHAIN_INDEX_INTERVAL", "30"))
+CHAIN_INDEX_CHUNK_BLOCKS = int(os.getenv("CHAIN_INDEX_CHUNK_BLOCKS", "2000"))
+CHAIN_INDEX_MAX_BLOCKS_PER_RUN = int(os.getenv("CHAIN_INDEX_MAX_BLOCKS_PER_RUN", "100000"))
+CHAIN_INDEX_REORG_DEPTH = int(os.getenv("CHAIN_INDEX_REORG_DEPTH", "64"))
+
+
+def _bytes(val: Any) -> bytes:
+    if isinstance(val, (bytes, bytearray)):
+        return bytes(val)
+    return bytes(HexBytes(val))
+
+
+def _norm_hash(h: str) -> str:
+    return str(h).lower()
+
+
+def decode_evidence_log(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Decode a raw EvidenceAnchored log (bundleHash, ts in data; sender indexed)."""
+
+    from .anchor import EVIDENCE_ANCHORED_TOPIC0
+
+    topics = log.get("topics") or []
+    if not topics or _bytes(topics[0]) != bytes(EVIDENCE_ANCHORED_TOPIC0):
+        return None
+    data = _bytes(log.get("data") or b"")
+    if len(data) < 64:
+        return None
+    ts = int.from_bytes(data[32:64], "big")
+    sender = "0x" + _bytes(topics[1])[-20:].hex() if len(topics) > 1 else None
+    return {
+        "bundle_hash": "0x" + data[:32].hex(),
+        "txid": Web3.to_hex(_bytes(log["transactionHash"])),
+        "log_index": int(log.get("logIndex") or 0),
+        "block_number": int(log["blockNumber"]),
+        "block_hash": Web3.to_hex(_bytes(log["blockHash"])) if log.get("blockHash") else None,
+        "sender": sender,
+        "anchored_at": datetime.fromtimestamp(ts, tz=timezone.utc) if ts else None,
+    }
+
+
+def _rewind_if_reorged(session, w3: Web3, cursor: models.IndexCursor) -> bool:
+    if not cursor.last_block_hash or cursor.last_block < 0:
+        return False
+    try:
+        current = Web3.to_hex(w3.eth.get_block(int(cursor.last_block))["hash"])
+    except Exception:
+        return False
+    if current.lower() == cursor.last_block_hash.lower():
+        return False
+
+    rewind_to = max(-1, int(cursor.last_block) - CHAIN_INDEX_REORG_DEPTH)
+    (
+        session.query(models.EvidenceEvent)
+        .filter(
+            models.EvidenceEvent.chain == cursor.chain,
+            models.EvidenceEvent.contract == cursor.contract,
+            models.EvidenceEvent.block_number > rewind_to,
+        )
+        .delete(synchronize_session=False)
+    )
+    cursor.last_block = rewind_to
+    cursor.last_block_hash = None
+    if cursor.first_block is not None:
+        cursor.first_block = min(int(cursor.first_block), rewind_to + 1)
+    session.commit()
+    return True
+
+
+def _index_range(session, w3: Web3, *, chain: str, key: str, addr: str, from_block: int, to_block: int) -> List[str]:
+    """Add the EvidenceAnchored events of [from_block, to_block]; returns their bundle hashes."""
+
+    from . import anchor
+
+    topic0 = Web3.to_hex(anchor.EVIDENCE_ANCHORED_TOPIC0)
+    logs = log_scan.get_logs_range(w3, {"address": addr, "topics": [topic0]}, from_block, to_block)
+    seen: List[str] = []
+    for lg in logs:
+        ev = decode_evidence_log(lg)
+        if ev is None:
+            continue
+        exists = (
+            session.query(models.EvidenceEvent.id)
+            .filter(
+                models.EvidenceEvent.chain == chain,
+                models.EvidenceEvent.txid == ev["txid"],
+                models.EvidenceEvent.log_index == ev["log_index"],
+            )
+            .first()
+        )
+        if exists:
+            continue
+        session.add(models.EvidenceEvent(chain=chain, contract=key, **ev))
+        seen.append(ev["bundle_hash"])
+    return seen
+
+
+def _backfill(session, w3: Web3, cursor: models.IndexCursor, *, addr: str, start_block: int) -> List[str]:
+    """Extend a cursor's range down to `start_block`, newest chunk first.
+
+    first_block is lowered after every committed chunk, so the covered range stays
+    contiguous and an interrupted backfill resumes where it stopped.
+    """
+
+    seen: List[str] = []
+    first = int(cursor.first_block) if cursor.first_block is not None else int(cursor.last_block) + 1
+    while first > start_block:
+        lo = max(start_block, first - max(1, log_scan.chunk_size(w3, CHAIN_INDEX_CHUNK_BLOCKS)))
+        seen += _index_range(
+            session, w3, chain=cursor.chain, key=cursor.contract, addr=addr, from_block=lo, to_block=first - 1
+        )
+        cursor.first_block = first = lo
+        session.commit()
+    return seen
+
+
+def sync_contract(
+    session,
+    *,
+    chain: str,
+    rpc_url: Optional[str],
+    contract: str,
+    start_block: Optional[int] = None,
+    max_blocks: Optional[int] = None,
+    rewind: bool = False,
+) -> int:
+    """Index new EvidenceAnchored events for one contract. Returns the number added.
+
+    A new cursor starts at `start_block` (default: ANCHOR_LOOKBACK_BLOCKS behind head). For
+    an existing cursor, a `start_block` below its range is backfilled first (in full,
+    regardless of `max_blocks`); with `rewind` the cursor moves back to `start_block` and
+    re-indexes forward from there (events already indexed are kept).
+    Progress is committed per chunk, so an interrupted run resumes where it stopped.
+    """
+
+    from . import anchor
+
+    w3 = anchor._load_web3(rpc_url)
+    addr = to_checksum_address(contract)
+    key = addr.lower()
+    head = int(w3.eth.block_number)
+
+    cursor = (
+        session.query(models.IndexCursor)
+        .filter(models.IndexCursor.chain == chain, models.IndexCursor.contract == key)
+        .one_or_none()
+    )
+    seen: List[str] = []
+    if cursor is None:
+        start = start_block if start_block is not None else max(0, head - anchor.DEFAULT_LOOKBACK_BLOCKS)
+        cursor = models.IndexCursor(
+            chain=chain, contract=key, rpc_url=rpc_url, first_block=max(0, start), last_block=max(-1, start - 1)
+        )
+        session.add(cursor)
+        session.commit()
+    else:
+        if rpc_url and cursor.rpc_url != rpc_url:
+            cursor.rpc_url = rpc_url
+        if start_block is not None and rewind:
+            start = max(0, int(start_block))
+            if cursor.first_block is None or start < int(cursor.first_block):
+                cursor.first_block = start
+            if start - 1 < int(cursor.last_block):
+                cursor.last_block = start - 1
+                cursor.last_block_hash = None
+            session.commit()
+        elif start_block is not None:
+            seen += _backfill(session, w3, cursor, addr=addr, start_block=max(0, int(start_block)))
+
+    _rewind_if_reorged(session, w3, cursor)
+
+    from_block = int(cursor.last_block) + 1
+    until = min(head, from_block + int(max_blocks or CHAIN_INDEX_MAX_BLOCKS_PER_RUN) - 1)
+    while from_block <= until:
+        to_block = min(until, from_block + max(1, log_scan.chunk_size(w3, CHAIN_INDEX_CHUNK_BLOCKS)) - 1)
+        seen += _index_range(session, w3, chain=chain, key=key, addr=addr, from_block=from_block, to_block=to_block)
+        cursor.last_block = to_block
+        try:
+            cursor.last_block_hash = Web3.to_hex(w3.eth.get_block(to_block)["hash"])
+        except Exception:
+            cursor.last_block_hash = None
+        session.commit()
+        from_block = to_block + 1
+
+    if seen:
+        # Newly indexed anchors invalidate cached "not found" verification answers.
+        from . import verify_cache
+
+        verify_cache.invalidate(seen)
+    return len(seen)
+
+
+def index_targets(cfg) -> List[Dict[str, Any]]:
+    """(chain, rpc_url, contract) triples to index: org anchoring chains plus the env default."""
+
+    from . import anchor
+
+    targets = [{"chain": "flare", "rpc_url": anchor.DEFAULT_RPC_URL, "contract": anchor.DEFAULT_CONTRACT_ADDR}]
+    for ch in list(getattr(getattr(cfg, "anchoring", None), "chains", []) or []):
+        if getattr(ch, "contract", None):
+            targets.append(
+                {
+                    "chain": str(getattr(ch, "name", None) or "flare"),
+                    "rpc_url": providers.join_urls(getattr(ch, "rpc_urls", None))
+                    or getattr(ch, "rpc_url", None)
+                    or anchor.DEFAULT_RPC_URL,
+                    "contract": ch.contract,
+                }
+            )
+
+    seen = set()
+    out = []
+    for t in targets:
+        k = (t["chain"], str(t["contract"]).lower())
+        if t["contract"] and k not in seen:
+            seen.add(k)
+            out.append(t)
+    return out
+
+
+def sync_all(session, cfg, *, start_block: Optional[int] = None, rewind: bool = False) -> Dict[str, Any]:
+    """Sync every target; failures on one chain do not stop the others.
+
+    `start_block`/`rewind` apply to every target (backfill or re-index, see `sync_contract`).
+    """
+
+    results: Dict[str, Any] = {}
+    for t in index_targets(cfg):
+        name = f"{t['chain']}:{str(t['contract']).lower()}"
+        try:
+            results[name] = sync_contract(
+                session,
+                chain=t["chain"],
+                rpc_url=t["rpc_url"],
+                contract=t["contract"],
+                start_block=start_block,
+                rewind=rewind,
+            )
+        except Exception as e:
+            session.rollback()
+            results[name] = f"error: {e}"
+    return results
+
+
+def scan_from(covered: Optional[Tuple[int, int]], window_start: int) -> int:
+    """First block a lookup must still scan over RPC, for a lookback window from `window_start`.
+
+    The index only answers for the range it covers. When that range starts after the window
+    (new cursor, unfinished backfill) nothing is skipped; otherwise RPC starts right after it.
+    A cursor lagging behind the window start covers none of it, so the whole window is scanned.
+    """
+
+    if covered is None or covered[0] > window_start:
+        return window_start
+    return max(window_start, covered[1] + 1)
+
+
+def find_indexed(
+    bundle_hash_hex: str, *, rpc_url: Optional[str], contract_addr: str
+) -> Tuple[Optional[ChainMatch], Optional[Tuple[int, int]]]:
+    """Look a bundle hash up in the local index.
+
+    Returns (match, covered): `match` is None when not indexed; `covered` is the
+    (first_block, last_block) range indexed for this contract (None if it is not indexed
+    at all). Pass it to `scan_from` for the blocks that still need RPC.
+    """
+
+    found, covered = find_indexed_many([bundle_hash_hex], rpc_url=rpc_url, contract_addr=contract_addr)
+    return found.get(_norm_hash(bundle_hash_hex)), covered
+
+
+def find_indexed_many(
+    bundle_hashes: List[str], *, rpc_url: Optional[str], contract_addr: str
+) -> Tuple[Dict[str, ChainMatch], Optional[Tuple[int, int]]]:
+    """`find_indexed` for many hashes in one query: ({normalised_hash: match}, covered)."""
+
+    key = str(contract_addr).lower()
+    wanted = sorted({_norm_hash(h) for h in bundle_hashes})
+    session = db.SessionLocal()
+    try:
+        cursors = [
+            c
+            for c in session.query(models.IndexCursor).filter(models.IndexCursor.contract == key).all()
+            if not rpc_url or not c.rpc_url or c.rpc_url == rpc_url
+        ]
+        if not cursors:
+            return {}, None
+
+        found: Dict[str, ChainMatch] = {}
+        for i in range(0, len(wanted), 500):
+            rows = (
+                session.query(models.EvidenceEvent)
+                .filter(
+                    models.EvidenceEvent.contract == key,
+                    models.EvidenceEvent.chain.in_([c.chain for c in cursors]),
+                    models.EvidenceEvent.bundle_hash.in_(wanted[i : i + 500]),
+                )
+                .order_by(models.EvidenceEvent.block_number.asc())
+                .all()
+            )
+            # Ascending order: the newest event per hash wins, as in the single lookup.
+            for ev in rows:
+                found[ev.bundle_hash] = ChainMatch(matches=True, txid=ev.txid, anchored_at=ev.anchored_at)
+        if any(c.first_block is None for c in cursors):
+            return found, None
+        return found, (max(int(c.first_block) for c in cursors), min(int(c.last_block) for c in cursors))
+    finally:
+        session.close()
@@ -25,13 +25,35 @@ class AnchoringChain(BaseModel):
     name: str = Field(..., description="Chain name, e.g., flare")
     contract: str = Field(..., description="EvidenceAnchor contract address")
     rpc_url: Optional[str] = Field(None, description="RPC URL for this chain (falls back to ledger.rpc_url if absent)")
+    rpc_urls: List[str] = Field(
+        default_factory=list,
+        description="Several RPC URLs for this chain: reads are hedged across them, writes fail over (overrides rpc_url)",
+    )
     explorer_base_url: Optional[str] = Field(None, description="Explorer base URL, e.g. https://flarescan.com")
+    key_ref: Optional[str] = Field(None, description="Optional per-chain signer key reference (overrides security.key_ref)")
+
+
+class AnchorBatchConfig(BaseModel):
+    enabled: bool = Field(False, description="Accumulate receipts and anchor one Merkle root per batch")
+    max_size: int = Field(256, description="Flush as soon as this many receipts are waiting")
+    window_seconds: int = Field(30, description="Flush pending receipts at most this long after the first arrives")
+    strategy: str = Field(
+        "merkle",
+        description="merkle (anchor one root, proof per receipt) | multi (anchorEvidenceBatch: one event per hash, one tx)",
+    )
 
 
 class AnchoringConfig(BaseModel):
     chains: List[AnchoringChain] = Field(default_factory=list)
     lookback_blocks: int = 50_000
     signature_alg: str = "ed25519"
+    mode: str = Field("sequential", description="sequential | concurrent (submit to all chains in parallel)")
+    quorum: int = Field(1, description="Number of chain anchors required before a receipt is marked anchored")
+    batch: AnchorBatchConfig = AnchorBatchConfig()
+    confirm_mode: str = Field(
+        "inline",
+        description="inline (worker waits for receipts) | async (submit, then a tracker job confirms per tx_proof_policy)",
+    )
 
 
 class MappingConfig(BaseModel):
@@ -64,6 +86,9 @@ class EvidenceConfig(BaseModel):
         default_factory=lambda: ["pain001.xml", "receipt.json", "tip.json", "manifest.json", "public_key.pem"]
     )
     sign_over: str = Field("zip_without_sig", description="Which content to sign over")
+    bundle_version: str = Field(
+        "1.0", description="1.0 (anchor the zip hash) | 2.0 (anchor a Merkle root over member digests, key and manifest header)"
+    )
     store: EvidenceStore = EvidenceStore()
 
 
@@ -133,6 +158,13 @@ class IDStrategyConfig(BaseModel):
     timezone: str = "UTC"
 
 
+class ValidationConfig(BaseModel):
+    mode: Optional[str] = Field(
+        None, description="strict | sampled | off (XSD validation of generated ISO messages); unset: ISO_VALIDATION_MODE"
+    )
+    sample_rate: float = Field(0.1, description="Fraction of messages validated in sampled mode")
+
+
 class OrgConfigModel(BaseModel):
     org: OrgSection = OrgSection()
     ledger: LedgerConfig
@@ -146,6 +178,7 @@ class OrgConfigModel(BaseModel):
     security: SecurityConfig = SecurityConfig()
     id_strategy: IDStrategyConfig = IDStrategyConfig()
     compliance: ComplianceConfig = ComplianceConfig()
+    validation: ValidationConfig = ValidationConfig()
 
 
 def get_config(session: Session) -> OrgConfigModel:
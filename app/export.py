@@ -0,0 +1,244 @@
+"""Streaming bulk evidence export (audits).
+
+`iter_export` yields one uncompressed tar archive (PAX format) holding every receipt's
+artifact directory (evidence.zip, ISO XML, manifest, ...) for a project/date range:
+
+    <receipt_id>/<file>          files read straight from ARTIFACTS_DIR/<receipt_id>/
+    <receipt_id>/index.json      index entry for the receipt (file sha256s, resume cursor)
+    index.jsonl                  all index entries, one per line
+    export.json                  summary: filters, count, next_cursor, complete
+
+Memory stays constant: receipts come from a server-side DB cursor (`yield_per`) in
+(created_at, id) order, files are copied in EXPORT_CHUNK_BYTES chunks, and the index is
+spooled to a temporary file. Every index entry carries an opaque `cursor`; passing it back
+as `after` continues the export with the next receipt, so an interrupted download resumes
+from the last complete `<receipt_id>/index.json` and `limit` splits large exports.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import models
+
+ARTIFACTS_DIR = Path(os.getenv("ARTIFACTS_DIR", "artifacts"))
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(256 * 1024)))
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "200"))
+EXPORT_INDEX_SPOOL_BYTES = int(os.getenv("EXPORT_INDEX_SPOOL_BYTES", str(4 * 1024 * 1024)))
+
+_BLOCK = tarfile.BLOCKSIZE
+_RECORD = tarfile.RECORDSIZE
+
+
+def encode_cursor(created_at: datetime, receipt_id: Any) -> str:
+    raw = f"{created_at.isoformat()}|{receipt_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """(created_at, receipt_id) of a cursor (raises ValueError when malformed)."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        at, rid = raw.split("|", 1)
+        return datetime.fromisoformat(at), rid
+    except Exception:
+        raise ValueError("invalid_cursor")
+
+
+def _header(name: str, size: int, mtime: float) -> bytes:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(mtime)
+    info.mode = 0o644
+    return info.tobuf(format=tarfile.PAX_FORMAT)
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % _BLOCK)
+
+
+def _bytes_member(name: str, data: bytes, mtime: float) -> Iterator[bytes]:
+    yield _header(name, len(data), mtime)
+    yield data
+    yield _padding(len(data))
+
+
+def _file_member(name: str, path: Path, entry: Dict[str, Any]) -> Iterator[bytes]:
+    """Tar member for a file on disk, hashed on the way out; fills entry["size"/"sha256"]."""
+
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        yield _header(name, size, st.st_mtime)
+        h = hashlib.sha256()
+        left = size
+        while left > 0:
+            chunk = f.read(min(EXPORT_CHUNK_BYTES, left))
+            if not chunk:
+                # File shrank under us: keep the archive well-formed and flag the entry.
+                chunk = b"\0" * left
+                entry["truncated"] = True
+            h.update(chunk)
+            left -= len(chunk)
+            yield chunk
+        yield _padding(size)
+    entry["size"] = size
+    entry["sha256"] = "0x" + h.hexdigest()
+
+
+def _receipt_query(
+    session,
+    *,
+    project_id: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    after: Optional[Tuple[datetime, str]],
+):
+    q = session.query(models.Receipt)
+    if project_id:
+        q = q.filter(models.Receipt.project_id == project_id)
+    if since:
+        q = q.filter(models.Receipt.created_at >= since)
+    if until:
+        q = q.filter(models.Receipt.created_at <= until)
+    if after:
+        # SQLite keeps server-default timestamps without microseconds, so an exact
+        # (created_at, id) keyset comparison is unreliable there; filter from one second
+        # earlier and drop already-exported rows in iter_receipts.
+        q = q.filter(models.Receipt.created_at >= after[0] - timedelta(seconds=1))
+    return q.order_by(models.Receipt.created_at.asc(), models.Receipt.id.asc())
+
+
+def iter_receipts(
+    session,
+    *,
+    project_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[str] = None,
+) -> Iterator[models.Receipt]:
+    """Receipts in export order, streamed from a server-side cursor."""
+
+    pos = decode_cursor(after) if after else None
+    q = _receipt_query(session, project_id=project_id, since=since, until=until, after=pos)
+    for rec in q.yield_per(EXPORT_FETCH_SIZE):
+        if pos is not None:
+            at, pos_at = rec.created_at, pos[0]
+            if (at.tzinfo is None) != (pos_at.tzinfo is None):
+                at, pos_at = at.replace(tzinfo=None), pos_at.replace(tzinfo=None)
+            if (at, str(rec.id)) <= (pos_at, pos[1]):
+                continue
+        yield rec
+
+
+def _receipt_files(receipt_id: str) -> List[Path]:
+    base = ARTIFACTS_DIR / receipt_id
+    try:
+        return sorted(p for p in base.iterdir() if p.is_file() and not p.name.startswith("."))
+    except FileNotFoundError:
+        return []
+
+
+def _iso(dt: Optional[datetime]) -> Optional[str]:
+    return dt.isoformat() if dt else None
+
+
+def iter_export(
+    session,
+    *,
+    project_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Yield the export tar archive in chunks (see module docstring for the layout)."""
+
+    started = time.time()
+    count = 0
+    written = 0
+    next_cursor: Optional[str] = None
+    complete = True
+
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_INDEX_SPOOL_BYTES) as index:
+        receipts = iter_receipts(session, project_id=project_id, since=since, until=until, after=after)
+        for rec in receipts:
+            if limit is not None and count >= limit:
+                complete = False
+                break
+            rid = str(rec.id)
+            entry: Dict[str, Any] = {
+                "receipt_id": rid,
+                "project_id": str(rec.project_id) if rec.project_id else None,
+                "reference": rec.reference,
+                "status": rec.status,
+                "chain": rec.chain,
+                "bundle_hash": rec.bundle_hash,
+                "flare_txid": rec.flare_txid,
+                "created_at": _iso(rec.created_at),
+                "anchored_at": _iso(rec.anchored_at),
+                "files": [],
+                "cursor": encode_cursor(rec.created_at, rid),
+            }
+            for path in _receipt_files(rid):
+                file_entry: Dict[str, Any] = {"name": path.name}
+                try:
+                    for chunk in _file_member(f"{rid}/{path.name}", path, file_entry):
+                        written += len(chunk)
+                        yield chunk
+                except FileNotFoundError:
+                    continue
+                entry["files"].append(file_entry)
+
+            line = json.dumps(entry, separators=(",", ":"), sort_keys=True).encode("utf-8")
+            for chunk in _bytes_member(f"{rid}/index.json", line, started):
+                written += len(chunk)
+                yield chunk
+            index.write(line + b"\n")
+            next_cursor = entry["cursor"]
+            count += 1
+
+        size = index.tell()
+        index.seek(0)
+        header = _header("index.jsonl", size, started)
+        written += len(header)
+        yield header
+        while True:
+            chunk = index.read(EXPORT_CHUNK_BYTES)
+            if not chunk:
+                break
+            written += len(chunk)
+            yield chunk
+        pad = _padding(size)
+        written += len(pad)
+        yield pad
+
+    summary = {
+        "project_id": project_id,
+        "since": _iso(since),
+        "until": _iso(until),
+        "after": after,
+        "count": count,
+        "complete": complete,
+        "next_cursor": None if complete else next_cursor,
+        "last_cursor": next_cursor,
+    }
+    body = json.dumps(summary, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    for chunk in _bytes_member("export.json", body, started):
+        written += len(chunk)
+        yield chunk
+
+    # End-of-archive: two zero blocks, then pad to a full record like tarfile does.
+    trailer = 2 * _BLOCK
+    trailer += -(written + trailer) % _RECORD
+    yield b"\0" * trailer
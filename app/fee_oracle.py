@@ -0,0 +1,215 @@
+"""Shared fee suggestions and gas estimates for anchor transactions.
+
+Building an anchor tx used to cost a `fee_history` (or `gas_price`) call and an
+`estimate_gas` call every time. Here:
+
+- fee suggestions per RPC endpoint are refreshed at most every FEE_ORACLE_TTL seconds,
+  by a background thread while the endpoint is in use, and shared across workers via
+  Redis (RQ forks a work horse per job, so in-process caches alone would not help)
+- gas estimates are cached per (endpoint, contract, function): `anchorEvidence` costs
+  the same every call
+- a cache miss is single-flight per key: concurrent cold callers wait for one RPC read
+
+Without Redis everything still works per process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+FEE_ORACLE_TTL = float(os.getenv("FEE_ORACLE_TTL", "6"))
+FEE_ORACLE_IDLE_STOP = float(os.getenv("FEE_ORACLE_IDLE_STOP", "300"))
+GAS_CACHE_TTL = int(os.getenv("GAS_CACHE_TTL", "3600"))
+DEFAULT_TIP_WEI = int(os.getenv("FEE_ORACLE_MIN_TIP_WEI", str(int(2e9))))
+
+_LOCK = threading.Lock()
+_FEES: Dict[str, Tuple[float, Dict[str, int]]] = {}
+_GAS: Dict[str, Tuple[float, int]] = {}
+_LAST_USED: Dict[str, float] = {}
+_THREADS: Dict[str, threading.Thread] = {}
+_KEY_LOCKS: Dict[str, threading.Lock] = {}
+
+_REDIS = None
+_REDIS_RETRY_AT = 0.0
+
+
+def _redis():
+    """Cached Redis client; after a failure, retried at most every 30s."""
+
+    global _REDIS, _REDIS_RETRY_AT
+    if _REDIS is not None:
+        return _REDIS
+    if time.time() < _REDIS_RETRY_AT:
+        return None
+    try:
+        from .queue import get_redis
+
+        r = get_redis()
+        r.ping()
+        _REDIS = r
+        return r
+    except Exception:
+        _REDIS_RETRY_AT = time.time() + 30
+        return None
+
+
+def _endpoint(w3) -> str:
+    return str(getattr(getattr(w3, "provider", None), "endpoint_uri", None) or id(w3))
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _LOCK:
+        return _KEY_LOCKS.setdefault(key, threading.Lock())
+
+
+def _fresh_fees(key: str) -> Optional[Dict[str, int]]:
+    with _LOCK:
+        cached = _FEES.get(key)
+    return cached[1] if cached and time.time() - cached[0] < FEE_ORACLE_TTL else None
+
+
+def _rkey(kind: str, *parts: str) -> str:
+    return f"{kind}:" + hashlib.sha256("|".join(parts).encode()).hexdigest()[:24]
+
+
+def fetch_fee_params(w3) -> Dict[str, int]:
+    """One RPC read of current fees, as tx fields (EIP-1559 if supported, else legacy)."""
+
+    try:
+        history = w3.eth.fee_history(5, "latest", [10, 50, 90])
+        base = int(history["baseFeePerGas"][-1])
+        tip = DEFAULT_TIP_WEI
+        try:
+            prio = history.get("reward", [])
+            if prio and prio[-1]:
+                tip = max(tip, int(prio[-1][1]))
+        except Exception:
+            pass
+        return {"type": 2, "maxFeePerGas": base * 2 + tip, "maxPriorityFeePerGas": tip}
+    except Exception:
+        return {"gasPrice": int(w3.eth.gas_price)}
+
+
+def _refresh(key: str, w3) -> Dict[str, int]:
+    r = _redis()
+    rk = _rkey("fees", key)
+    # Another worker may have refreshed recently: adopt its value instead of calling RPC.
+    if r is not None:
+        try:
+            raw = r.get(rk)
+            if raw:
+                doc = json.loads(raw)
+                if time.time() - float(doc["ts"]) < FEE_ORACLE_TTL:
+                    with _LOCK:
+                        _FEES[key] = (float(doc["ts"]), doc["fees"])
+                    return doc["fees"]
+        except Exception:
+            pass
+
+    fees = fetch_fee_params(w3)
+    now = time.time()
+    with _LOCK:
+        _FEES[key] = (now, fees)
+    if r is not None:
+        try:
+            r.set(rk, json.dumps({"ts": now, "fees": fees}), ex=max(1, int(FEE_ORACLE_TTL * 10)))
+        except Exception:
+            pass
+    return fees
+
+
+def _refresh_loop(key: str, w3) -> None:
+    try:
+        while True:
+            with _LOCK:
+                if time.time() - _LAST_USED.get(key, 0) >= FEE_ORACLE_IDLE_STOP:
+                    break
+            try:
+                with _key_lock("fees|" + key):
+                    _refresh(key, w3)
+            except Exception:
+                pass
+            time.sleep(max(0.5, FEE_ORACLE_TTL * 0.8))
+    finally:
+        with _LOCK:
+            _THREADS.pop(key, None)
+
+
+def _ensure_refresher(key: str, w3) -> None:
+    with _LOCK:
+        if key in _THREADS:
+            return
+        t = threading.Thread(target=_refresh_loop, args=(key, w3), name="fee-oracle", daemon=True)
+        _THREADS[key] = t
+    t.start()
+
+
+def fee_params(w3, *, background: bool = True) -> Dict[str, int]:
+    """Current fee fields for a tx (copy), served from memory/Redis when fresh."""
+
+    key = _endpoint(w3)
+    with _LOCK:
+        _LAST_USED[key] = time.time()
+    fees = _fresh_fees(key)
+    if fees is None:
+        with _key_lock("fees|" + key):
+            # Another caller may have refreshed while we waited for the lock.
+            fees = _fresh_fees(key)
+            if fees is None:
+                fees = _refresh(key, w3)
+    if background:
+        _ensure_refresher(key, w3)
+    return dict(fees)
+
+
+def _fresh_gas(key: str) -> Optional[int]:
+    with _LOCK:
+        cached = _GAS.get(key)
+    return cached[1] if cached and time.time() - cached[0] < GAS_CACHE_TTL else None
+
+
+def gas_limit(
+    w3, contract_addr: str, fn_name: str, estimate: Callable[[], Any], *, margin: float = 1.2
+) -> Optional[int]:
+    """Cached `estimate()` * margin for a constant-cost call; None if estimation fails."""
+
+    key = f"{_endpoint(w3)}|{str(contract_addr).lower()}|{fn_name}"
+    val = _fresh_gas(key)
+    if val is not None:
+        return val
+
+    with _key_lock("gas|" + key):
+        val = _fresh_gas(key)
+        if val is not None:
+            return val
+
+        r = _redis()
+        rk = _rkey("gas", key)
+        if r is not None:
+            try:
+                raw = r.get(rk)
+                if raw:
+                    val = int(raw)
+                    with _LOCK:
+                        _GAS[key] = (time.time(), val)
+                    return val
+            except Exception:
+                pass
+
+        try:
+            val = int(int(estimate()) * margin)
+        except Exception:
+            return None
+        with _LOCK:
+            _GAS[key] = (time.time(), val)
+        if r is not None:
+            try:
+                r.set(rk, str(val), ex=GAS_CACHE_TTL)
+            except Exception:
+                pass
+        return val
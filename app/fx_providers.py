@@ -140,8 +140,11 @@ def get_chainlink_rate(rpc_url: Optional[str], aggregator_address: Optional[str]
     if Web3 is None:
         return None
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 10}))
-        contract = w3.eth.contract(address=Web3.to_checksum_address(aggregator_address), abi=AGGREGATORV3_ABI)
+        from . import providers
+
+        w3 = providers.get_web3(rpc_url, timeout=10)
+        addr = Web3.to_checksum_address(aggregator_address)
+        contract = providers.get_contract(w3, rpc_url, addr, AGGREGATORV3_ABI, "chainlink:AggregatorV3")
         decimals = int(contract.functions.decimals().call())
         roundData = contract.functions.latestRoundData().call()
         answer = roundData[1]
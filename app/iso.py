@@ -2,40 +2,17 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from decimal import Decimal
-from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 from lxml import etree
 
-try:
-    import xmlschema  # type: ignore
-except Exception:  # pragma: no cover
-    xmlschema = None  # type: ignore
-
+from . import iso_render, iso_validation
 
 # Namespace for pain.001.001.09
 NS_PAIN001 = "urn:iso:std:iso:20022:tech:xsd:pain.001.001.09"
 NSMAP = {None: NS_PAIN001}
 
-# XSD path (must be vendored into the repo under schemas/)
-SCHEMA_PATH = Path("schemas/pain.001.001.09.xsd")
-
-_schema: Optional["xmlschema.XMLSchema"] = None  # type: ignore
-
-
-def _get_schema() -> Optional["xmlschema.XMLSchema"]:  # type: ignore
-    global _schema
-    if _schema is not None:
-        return _schema
-    if xmlschema is None:
-        return None
-    if SCHEMA_PATH.exists():
-        try:
-            _schema = xmlschema.XMLSchema(str(SCHEMA_PATH))
-            return _schema
-        except Exception:
-            return None
-    return None
+# Schema validation: app/iso_validation.py (XSDs vendored under schemas/, see schemas/README.md)
 
 
 def _iso_dt(dt: datetime) -> str:
@@ -52,11 +29,17 @@ def _iso_date(dt: datetime) -> str:
     return dt.date().isoformat()
 
 
+def _q(tag: str) -> str:
+    # Qualified tags, so the built tree (validated before serialization) is namespaced
+    # exactly like the serialized document.
+    return f"{{{NS_PAIN001}}}{tag}"
+
+
 def _elm(parent, tag: str, text: Optional[str] = None, attrib: Optional[Dict[str, str]] = None):
     if attrib is None:
-        elem = etree.SubElement(parent, tag)
+        elem = etree.SubElement(parent, _q(tag))
     else:
-        elem = etree.SubElement(parent, tag, attrib=attrib)
+        elem = etree.SubElement(parent, _q(tag), attrib=attrib)
     if text is not None:
         elem.text = text
     return elem
@@ -90,133 +73,176 @@ def _agent_not_provided(parent):
     _elm(othr, "Id", "NOTPROVIDED")
 
 
-def generate_pain001(receipt: Dict[str, Any]) -> bytes:
-    """
-    Build a minimal schema-valid pain.001.001.09 for a single credit transfer.
-    Mapping decisions per spec:
-    - GrpHdr.MsgId = receipt['reference']
-    - GrpHdr.CreDtTm = receipt['created_at']
-    - GrpHdr.NbOfTxs = '1'
-    - GrpHdr.InitgPty.Nm = 'Capella' (or generic)
-    - PmtInf:
-      - PmtInfId = receipt['id']
-      - PmtMtd = TRF
-      - ReqdExctnDt = date(created_at)
-      - Dbtr (+ WALLET id mapping)
-      - DbtrAcct (Othr/Id = sender wallet)
-      - DbtrAgt = NOTPROVIDED
-      - ChrgBr = SLEV
-    - CdtTrfTxInf:
-      - PmtId.EndToEndId = receipt['id']
-      - Amt.InstdAmt @Ccy = receipt['currency'] (FLR for PoC)
-      - CdtrAgt = NOTPROVIDED
-      - Cdtr (+ WALLET id mapping)
-      - CdtrAcct (Othr/Id = receiver wallet)
-      - RmtInf.Ustrd = receipt['reference']
-    """
-    created_at: datetime = receipt["created_at"]
-    reference: str = receipt["reference"]
-    rid: str = receipt["id"]
-    sender_wallet: str = receipt["sender_wallet"]
-    receiver_wallet: str = receipt["receiver_wallet"]
-    currency: str = str(receipt["currency"])
-    amount = receipt["amount"]
+def _amount_str(amount: Any) -> str:
     if isinstance(amount, Decimal):
-        amt_str = format(amount, "f")
-    else:
-        amt_str = str(amount)
+        return format(amount, "f")
+    return str(amount)
+
 
-    root = etree.Element("Document", nsmap=NSMAP)
+def build_pain001(f: Mapping[str, str]):
+    """lxml tree of a pain.001 from precomputed field values.
+
+    Optional blocks are emitted when their field is present (org_lei, purpose,
+    category_purpose, lei, debtor_iban, debtor_bic, creditor_bic, creditor_iban).
+    Values are only placed, never inspected, so iso_render can compile it into a template.
+    """
+    root = etree.Element(_q("Document"), nsmap=NSMAP)
     cst = _elm(root, "CstmrCdtTrfInitn")
 
     # Group Header
     grp = _elm(cst, "GrpHdr")
-    _elm(grp, "MsgId", reference)
-    _elm(grp, "CreDtTm", _iso_dt(created_at))
+    _elm(grp, "MsgId", f["msg_id"])
+    _elm(grp, "CreDtTm", f["cre_dt_tm"])
     _elm(grp, "NbOfTxs", "1")
     initg = _elm(grp, "InitgPty")
-    _elm(initg, "Nm", "Capella")
+    _elm(initg, "Nm", f["org_name"])
+    if "org_lei" in f:
+        id_ = _elm(initg, "Id")
+        orgid = _elm(id_, "OrgId")
+        _elm(orgid, "LEI", f["org_lei"])
 
     # Payment Information
     pmt = _elm(cst, "PmtInf")
-    _elm(pmt, "PmtInfId", rid)
+    _elm(pmt, "PmtInfId", f["pmt_inf_id"])
     _elm(pmt, "PmtMtd", "TRF")
     _elm(pmt, "NbOfTxs", "1")
-    _elm(pmt, "CtrlSum", amt_str)
-    _elm(pmt, "ReqdExctnDt", _iso_date(created_at))
+    _elm(pmt, "CtrlSum", f["amount"])
+    _elm(pmt, "ReqdExctnDt", f["exec_date"])
+
+    # Optional payment type info
+    if "purpose" in f or "category_purpose" in f:
+        pti = _elm(pmt, "PmtTpInf")
+        if "purpose" in f:
+            purp = _elm(pti, "Purp")
+            _elm(purp, "Cd", f["purpose"])
+        if "category_purpose" in f:
+            cat = _elm(pti, "CtgyPurp")
+            _elm(cat, "Cd", f["category_purpose"])
 
     # Debtor
     dbtr = _elm(pmt, "Dbtr")
-    _wallet_party(dbtr, role_nm=None, wallet_addr=sender_wallet, scheme="WALLET")
+    _wallet_party(dbtr, role_nm=None, wallet_addr=f["sender_wallet"], scheme="WALLET")
+    # Optional debtor LEI
+    if "lei" in f:
+        id_ = _elm(dbtr, "Id")
+        orgid = _elm(id_, "OrgId")
+        _elm(orgid, "LEI", f["lei"])
 
+    # Debtor account: IBAN or Wallet account
     dbtr_acct = _elm(pmt, "DbtrAcct")
-    _wallet_acct(dbtr_acct, wallet_addr=sender_wallet, scheme="WALLET_ACCOUNT")
+    if "debtor_iban" in f:
+        id_dbtr = _elm(dbtr_acct, "Id")
+        _elm(id_dbtr, "IBAN", f["debtor_iban"])
+    else:
+        _wallet_acct(dbtr_acct, wallet_addr=f["sender_wallet"], scheme="WALLET_ACCOUNT")
 
+    # Debtor agent: BIC or NOTPROVIDED
     dbtr_agt = _elm(pmt, "DbtrAgt")
-    _agent_not_provided(dbtr_agt)
+    if "debtor_bic" in f:
+        agt = _elm(dbtr_agt, "FinInstnId")
+        _elm(agt, "BICFI", f["debtor_bic"])
+    else:
+        _agent_not_provided(dbtr_agt)
 
-    _elm(pmt, "ChrgBr", "SLEV")
+    _elm(pmt, "ChrgBr", f["charge_bearer"])
 
     # Credit Transfer Transaction
     cdt = _elm(pmt, "CdtTrfTxInf")
     pmt_id = _elm(cdt, "PmtId")
-    _elm(pmt_id, "EndToEndId", rid)
+    _elm(pmt_id, "EndToEndId", f["e2e_id"])
 
     amt = _elm(cdt, "Amt")
-    _elm(amt, "InstdAmt", amt_str, attrib={"Ccy": currency})
+    _elm(amt, "InstdAmt", f["amount"], attrib={"Ccy": f["currency"]})
 
+    # Creditor agent
     cdtr_agt = _elm(cdt, "CdtrAgt")
-    _agent_not_provided(cdtr_agt)
+    if "creditor_bic" in f:
+        agt2 = _elm(cdtr_agt, "FinInstnId")
+        _elm(agt2, "BICFI", f["creditor_bic"])
+    else:
+        _agent_not_provided(cdtr_agt)
 
+    # Creditor
     cdtr = _elm(cdt, "Cdtr")
-    _wallet_party(cdtr, role_nm=None, wallet_addr=receiver_wallet, scheme="WALLET")
+    _wallet_party(cdtr, role_nm=None, wallet_addr=f["receiver_wallet"], scheme="WALLET")
+    if "lei" in f:
+        idc = _elm(cdtr, "Id")
+        orgidc = _elm(idc, "OrgId")
+        _elm(orgidc, "LEI", f["lei"])
 
+    # Creditor account: IBAN or Wallet account
     cdtr_acct = _elm(cdt, "CdtrAcct")
-    _wallet_acct(cdtr_acct, wallet_addr=receiver_wallet, scheme="WALLET_ACCOUNT")
+    if "creditor_iban" in f:
+        id_cdtr = _elm(cdtr_acct, "Id")
+        _elm(id_cdtr, "IBAN", f["creditor_iban"])
+    else:
+        _wallet_acct(cdtr_acct, wallet_addr=f["receiver_wallet"], scheme="WALLET_ACCOUNT")
 
+    # Remittance info
     rmt = _elm(cdt, "RmtInf")
-    _elm(rmt, "Ustrd", reference)
-
-    xml_bytes = etree.tostring(
-        root,
-        pretty_print=True,
-        xml_declaration=True,
-        encoding="UTF-8",
-        standalone="yes",
-    )
+    _elm(rmt, "Ustrd", f["reference"])
 
-    # Validate if schema available
-    schema = _get_schema()
-    if schema is not None:
-        try:
-            # xmlschema can validate bytes directly
-            schema.validate(xml_bytes)
-        except Exception as e:
-            # Re-raise with readable error list if possible
-            if hasattr(schema, "iter_errors"):
-                msgs = []
-                for err in schema.iter_errors(xml_bytes):
-                    msgs.append(str(err))
-                raise ValueError("ISO20022 schema validation failed:\n" + "\n".join(msgs)) from e
-            raise
+    return root
 
-    return xml_bytes
 
+def render_pain001(fields: Dict[str, str], *, validator=None) -> bytes:
+    """Serialized pain.001 (template fast path unless the tree has to be validated)."""
 
-def generate_pain001_from_cfg(receipt: Dict[str, Any], cfg) -> bytes:
+    return iso_render.render(
+        "pain.001", build_pain001, fields, validate=validator.assert_valid if validator is not None else None
+    )
+
+
+def generate_pain001(receipt: Dict[str, Any]) -> bytes:
     """
-    Build pain.001 honoring OrgConfigModel:
-      - ID strategies: msg_id, e2e_id, pmt_inf_id with strategies uuid|reference|composite
-      - Execution timing: ReqdExctnDt immediate|date with offset days
-      - InitgPty name from org.name; optional LEI under InitgPty.Id.OrgId.LEI when org.lei present
-      - Optional IBAN/BIC/LEI injection based on mapping flags and defaults
-      - Charge bearer / purpose / category purpose from mapping
+    Build a minimal schema-valid pain.001.001.09 for a single credit transfer.
+    Mapping decisions per spec:
+    - GrpHdr.MsgId = receipt['reference']
+    - GrpHdr.CreDtTm = receipt['created_at']
+    - GrpHdr.NbOfTxs = '1'
+    - GrpHdr.InitgPty.Nm = 'Capella' (or generic)
+    - PmtInf:
+      - PmtInfId = receipt['id']
+      - PmtMtd = TRF
+      - ReqdExctnDt = date(created_at)
+      - Dbtr (+ WALLET id mapping)
+      - DbtrAcct (Othr/Id = sender wallet)
+      - DbtrAgt = NOTPROVIDED
+      - ChrgBr = SLEV
+    - CdtTrfTxInf:
+      - PmtId.EndToEndId = receipt['id']
+      - Amt.InstdAmt @Ccy = receipt['currency'] (FLR for PoC)
+      - CdtrAgt = NOTPROVIDED
+      - Cdtr (+ WALLET id mapping)
+      - CdtrAcct (Othr/Id = receiver wallet)
+      - RmtInf.Ustrd = receipt['reference']
     """
+    created_at: datetime = receipt["created_at"]
+    reference: str = receipt["reference"]
+    rid: str = receipt["id"]
+    fields = {
+        "msg_id": reference,
+        "cre_dt_tm": _iso_dt(created_at),
+        "org_name": "Capella",
+        "pmt_inf_id": rid,
+        "amount": _amount_str(receipt["amount"]),
+        "exec_date": _iso_date(created_at),
+        "sender_wallet": receipt["sender_wallet"],
+        "charge_bearer": "SLEV",
+        "e2e_id": rid,
+        "currency": str(receipt["currency"]),
+        "receiver_wallet": receipt["receiver_wallet"],
+        "reference": reference,
+    }
+
+    # Validate if the schema is available (compiled once per process)
+    return render_pain001(fields, validator=iso_validation.validator_for(iso_validation.PAIN001))
+
+
+def pain001_fields_from_cfg(receipt: Dict[str, Any], cfg) -> Dict[str, str]:
+    """Field values (and, by presence, the optional blocks) of a pain.001 for an org config."""
     from datetime import timedelta
 
-    def _strategy(val: str) -> str:
-        return (val or "").strip()
-
     def _id_for(strategy: str, rid: str, reference: str) -> str:
         s = (strategy or "uuid").lower()
         if s == "uuid":
@@ -229,14 +255,7 @@ def generate_pain001_from_cfg(receipt: Dict[str, Any], cfg) -> bytes:
     created_at: datetime = receipt["created_at"]
     reference: str = str(receipt.get("reference"))
     rid: str = str(receipt.get("id"))
-    sender_wallet: str = str(receipt.get("sender_wallet"))
-    receiver_wallet: str = str(receipt.get("receiver_wallet"))
-    currency: str = str(receipt.get("currency"))
-    amount = receipt["amount"]
-    if isinstance(amount, Decimal):
-        amt_str = format(amount, "f")
-    else:
-        amt_str = str(amount)
+    amt_str = _amount_str(receipt["amount"])
 
     msg_id = _id_for(getattr(getattr(cfg, "id_strategy", None), "msg_id_strategy", "uuid"), rid, reference)
     e2e_id = _id_for(getattr(getattr(cfg, "id_strategy", None), "e2e_id_strategy", "reference"), rid, reference)
@@ -264,130 +283,47 @@ def generate_pain001_from_cfg(receipt: Dict[str, Any], cfg) -> bytes:
     org_name = getattr(getattr(cfg, "org", None), "name", "Capella") or "Capella"
     org_lei = getattr(getattr(cfg, "org", None), "lei", None)
 
-    # Document
-    root = etree.Element("Document", nsmap=NSMAP)
-    cst = _elm(root, "CstmrCdtTrfInitn")
-
-    # Group Header
-    grp = _elm(cst, "GrpHdr")
-    _elm(grp, "MsgId", msg_id)
-    _elm(grp, "CreDtTm", _iso_dt(created_at))
-    _elm(grp, "NbOfTxs", "1")
-    initg = _elm(grp, "InitgPty")
-    _elm(initg, "Nm", org_name)
-    if org_lei:
-        id_ = _elm(initg, "Id")
-        orgid = _elm(id_, "OrgId")
-        _elm(orgid, "LEI", org_lei)
-
-    # Payment Information
-    pmt = _elm(cst, "PmtInf")
-    _elm(pmt, "PmtInfId", pmt_inf_id)
-    _elm(pmt, "PmtMtd", "TRF")
-    _elm(pmt, "NbOfTxs", "1")
-    _elm(pmt, "CtrlSum", amt_str)
-    _elm(pmt, "ReqdExctnDt", exec_date)
-
-    # Optional payment type info
-    if purpose_code or category_purpose:
-        pti = _elm(pmt, "PmtTpInf")
-        if purpose_code:
-            purp = _elm(pti, "Purp")
-            _elm(purp, "Cd", purpose_code)
-        if category_purpose:
-            cat = _elm(pti, "CtgyPurp")
-            _elm(cat, "Cd", category_purpose)
-
-    # Debtor
-    dbtr = _elm(pmt, "Dbtr")
-    _wallet_party(dbtr, role_nm=None, wallet_addr=sender_wallet, scheme="WALLET")
-    # Optional debtor LEI
-    if include_lei and (default_org_lei or org_lei):
-        id_ = _elm(dbtr, "Id")
-        orgid = _elm(id_, "OrgId")
-        _elm(orgid, "LEI", default_org_lei or org_lei)
-
-    # Debtor account: IBAN or Wallet account
-    dbtr_acct = _elm(pmt, "DbtrAcct")
-    id_dbtr = _elm(dbtr_acct, "Id")
-    if include_iban and d_debtor_iban:
-        _elm(id_dbtr, "IBAN", d_debtor_iban)
-    else:
-        othr = _elm(id_dbtr, "Othr")
-        _elm(othr, "Id", sender_wallet)
-        schme = _elm(othr, "SchmeNm")
-        _elm(schme, "Prtry", "WALLET_ACCOUNT")
-
-    # Debtor agent: BIC or NOTPROVIDED
-    dbtr_agt = _elm(pmt, "DbtrAgt")
-    agt = _elm(dbtr_agt, "FinInstnId")
-    if include_bic and d_debtor_bic:
-        _elm(agt, "BICFI", d_debtor_bic)
-    else:
-        othr = _elm(agt, "Othr")
-        _elm(othr, "Id", "NOTPROVIDED")
-
-    _elm(pmt, "ChrgBr", charge_bearer)
-
-    # Credit Transfer Transaction
-    cdt = _elm(pmt, "CdtTrfTxInf")
-    pmt_id = _elm(cdt, "PmtId")
-    _elm(pmt_id, "EndToEndId", e2e_id)
-
-    amt = _elm(cdt, "Amt")
-    _elm(amt, "InstdAmt", amt_str, attrib={"Ccy": currency})
-
-    # Creditor agent
-    cdtr_agt = _elm(cdt, "CdtrAgt")
-    agt2 = _elm(cdtr_agt, "FinInstnId")
-    if include_bic and d_creditor_bic:
-        _elm(agt2, "BICFI", d_creditor_bic)
-    else:
-        othr2 = _elm(agt2, "Othr")
-        _elm(othr2, "Id", "NOTPROVIDED")
+    fields = {
+        "msg_id": msg_id,
+        "cre_dt_tm": _iso_dt(created_at),
+        "org_name": org_name,
+        "pmt_inf_id": pmt_inf_id,
+        "amount": amt_str,
+        "exec_date": exec_date,
+        "sender_wallet": str(receipt.get("sender_wallet")),
+        "charge_bearer": charge_bearer,
+        "e2e_id": e2e_id,
+        "currency": str(receipt.get("currency")),
+        "receiver_wallet": str(receipt.get("receiver_wallet")),
+        "reference": reference,
+    }
+    optional = {
+        "org_lei": org_lei,
+        "purpose": purpose_code,
+        "category_purpose": category_purpose,
+        "lei": (default_org_lei or org_lei) if include_lei else None,
+        "debtor_iban": d_debtor_iban if include_iban else None,
+        "debtor_bic": d_debtor_bic if include_bic else None,
+        "creditor_bic": d_creditor_bic if include_bic else None,
+        "creditor_iban": d_creditor_iban if include_iban else None,
+    }
+    fields.update({k: v for k, v in optional.items() if v})
+    return fields
 
-    # Creditor
-    cdtr = _elm(cdt, "Cdtr")
-    _wallet_party(cdtr, role_nm=None, wallet_addr=receiver_wallet, scheme="WALLET")
-    if include_lei and (default_org_lei or org_lei):
-        idc = _elm(cdtr, "Id")
-        orgidc = _elm(idc, "OrgId")
-        _elm(orgidc, "LEI", default_org_lei or org_lei)
 
-    # Creditor account: IBAN or Wallet account
-    cdtr_acct = _elm(cdt, "CdtrAcct")
-    id_cdtr = _elm(cdtr_acct, "Id")
-    if include_iban and d_creditor_iban:
-        _elm(id_cdtr, "IBAN", d_creditor_iban)
-    else:
-        othr = _elm(id_cdtr, "Othr")
-        _elm(othr, "Id", receiver_wallet)
-        schme = _elm(othr, "SchmeNm")
-        _elm(schme, "Prtry", "WALLET_ACCOUNT")
+def generate_pain001_from_cfg(receipt: Dict[str, Any], cfg) -> bytes:
+    """
+    Build pain.001 honoring OrgConfigModel:
+      - ID strategies: msg_id, e2e_id, pmt_inf_id with strategies uuid|reference|composite
+      - Execution timing: ReqdExctnDt immediate|date with offset days
+      - InitgPty name from org.name; optional LEI under InitgPty.Id.OrgId.LEI when org.lei present
+      - Optional IBAN/BIC/LEI injection based on mapping flags and defaults
+      - Charge bearer / purpose / category purpose from mapping
+    """
+    fields = pain001_fields_from_cfg(receipt, cfg)
 
-    # Remittance info
-    rmt = _elm(cdt, "RmtInf")
-    _elm(rmt, "Ustrd", reference)
-
-    xml_bytes = etree.tostring(
-        root,
-        pretty_print=True,
-        xml_declaration=True,
-        encoding="UTF-8",
-        standalone="yes",
+    # Validate per the org's validation mode (strict | sampled | off)
+    validator = iso_validation.validator_for(
+        iso_validation.PAIN001, key=str(receipt.get("id")), **iso_validation.config_args(cfg)
     )
-
-    # Validate if schema available
-    schema = _get_schema()
-    if schema is not None:
-        try:
-            schema.validate(xml_bytes)
-        except Exception as e:
-            if hasattr(schema, "iter_errors"):
-                msgs = []
-                for err in schema.iter_errors(xml_bytes):
-                    msgs.append(str(err))
-                raise ValueError("ISO20022 schema validation failed:\n" + "\n".join(msgs)) from e
-            raise
-
-    return xml_bytes
+    return render_pain001(fields, validator=validator)
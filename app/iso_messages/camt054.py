@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from lxml import etree
 
+from .. import iso_render
+
 # Minimal camt.054.001.x Debit/Credit Notification (DCN)
 # This is a pragmatic artifact indicating a credit event tied to a receipt.
 NS = "urn:iso:std:iso:20022:tech:xsd:camt.054.001.09"
@@ -50,25 +52,38 @@ def generate_camt054(receipt: Dict[str, Any]) -> bytes:
     cdt = "CRDT" if str(receipt.get("status")) == "anchored" else "PDNG"
     amt_str = str(amount) if amount is not None else "0"
 
+    fields = {
+        "reference": reference,
+        "cre_dt_tm": _iso_dt(created_at),
+        "rid": rid,
+        "receiver_wallet": receiver_wallet,
+        "currency": currency,
+        "amount": amt_str,
+        "cdt_dbt_ind": cdt,
+    }
+    return iso_render.render("camt.054", _build, fields)
+
+
+def _build(f: Mapping[str, str]):
     root = etree.Element("Document", nsmap=NSMAP)
     ntf = etree.SubElement(root, "BkToCstmrDbtCdtNtfctn")
 
     grp = etree.SubElement(ntf, "GrpHdr")
-    etree.SubElement(grp, "MsgId").text = reference
-    etree.SubElement(grp, "CreDtTm").text = _iso_dt(created_at)
+    etree.SubElement(grp, "MsgId").text = f["reference"]
+    etree.SubElement(grp, "CreDtTm").text = f["cre_dt_tm"]
 
     noti = etree.SubElement(ntf, "Ntfctn")
-    etree.SubElement(noti, "Id").text = rid
+    etree.SubElement(noti, "Id").text = f["rid"]
 
     acct = etree.SubElement(noti, "Acct")
     acct_id = etree.SubElement(acct, "Id")
     othr = etree.SubElement(acct_id, "Othr")
-    etree.SubElement(othr, "Id").text = receiver_wallet
+    etree.SubElement(othr, "Id").text = f["receiver_wallet"]
 
     entry = etree.SubElement(noti, "Ntry")
-    amt = etree.SubElement(entry, "Amt", Ccy=currency)
-    amt.text = amt_str
-    etree.SubElement(entry, "CdtDbtInd").text = cdt
-    etree.SubElement(entry, "AddtlNtryInf").text = reference
+    amt = etree.SubElement(entry, "Amt", Ccy=f["currency"])
+    amt.text = f["amount"]
+    etree.SubElement(entry, "CdtDbtInd").text = f["cdt_dbt_ind"]
+    etree.SubElement(entry, "AddtlNtryInf").text = f["reference"]
 
-    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+    return root
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from lxml import etree
 
+from .. import iso_render
+
 # Minimal pacs.002.001.x FIToFIPaymentStatusReport
 NS = "urn:iso:std:iso:20022:tech:xsd:pacs.002.001.12"
 NSMAP = {None: NS}
@@ -31,29 +33,40 @@ def generate_pacs002(payload: Dict[str, Any]) -> bytes:
     if not isinstance(created_at, datetime):
         created_at = datetime.utcnow().replace(tzinfo=timezone.utc)
 
+    fields = {
+        "msg_id": f"pacs002-{rid}",
+        "cre_dt_tm": _iso_dt(created_at),
+        "orgnl_msg_id": reference or rid,
+        # Status code mapping (very simplified)
+        "grp_sts": {
+            "pending": "PDNG",
+            "anchored": "ACSC",  # AcceptedSettlementCompleted (approximate)
+            "failed": "RJCT",
+        }.get(status, "PDNG"),
+        "addtl_data": f"bundle_hash={payload.get('bundle_hash')}, flare_txid={payload.get('flare_txid')}",
+    }
+    return iso_render.render("pacs.002", _build, fields)
+
+
+def _build(f: Mapping[str, str]):
     root = etree.Element("Document", nsmap=NSMAP)
     msg = etree.SubElement(root, "FIToFIPmtStsRpt")
 
     # Group Header
     grp = etree.SubElement(msg, "GrpHdr")
-    etree.SubElement(grp, "MsgId").text = f"pacs002-{rid}"
-    etree.SubElement(grp, "CreDtTm").text = _iso_dt(created_at)
+    etree.SubElement(grp, "MsgId").text = f["msg_id"]
+    etree.SubElement(grp, "CreDtTm").text = f["cre_dt_tm"]
 
     # Original Group Info and Status
     ogi = etree.SubElement(msg, "OrgnlGrpInfAndSts")
-    etree.SubElement(ogi, "OrgnlMsgId").text = reference or rid
-    # Status code mapping (very simplified)
+    etree.SubElement(ogi, "OrgnlMsgId").text = f["orgnl_msg_id"]
     st = etree.SubElement(ogi, "GrpSts")
-    st.text = {
-        "pending": "PDNG",
-        "anchored": "ACSC",  # AcceptedSettlementCompleted (approximate)
-        "failed": "RJCT",
-    }.get(status, "PDNG")
+    st.text = f["grp_sts"]
 
     # Supplementary data (hashes/txids)
     sup = etree.SubElement(ogi, "SplmtryData")
     envlp = etree.SubElement(sup, "Envlp")
     add = etree.SubElement(envlp, "AddtlData")
-    add.text = f"bundle_hash={payload.get('bundle_hash')}, flare_txid={payload.get('flare_txid')}"
+    add.text = f["addtl_data"]
 
-    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+    return root
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from decimal import ROUND_HALF_EVEN, Decimal
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional
 
 from lxml import etree
 
-from .. import iso  # existing pain.001 generator
+from .. import iso, iso_render, iso_validation  # existing pain.001 generator
 from ..config import OrgConfigModel
 
 NS_PAIN001 = "urn:iso:std:iso:20022:tech:xsd:pain.001.001.09"
@@ -15,50 +15,64 @@ def _round_fiat(val: Decimal) -> str:
     return str(val.quantize(Decimal("0.01"), rounding=ROUND_HALF_EVEN))
 
 
-def _maybe_add_fx(root: etree._Element, receipt: Dict[str, Any], cfg: OrgConfigModel) -> bytes:
-    """
-    Optionally add EqvtAmt and XchgRateInf to CdtTrfTxInf/Amt based on fx_policy.
-    This is a best-effort post-processing step; if required inputs are missing, it no-ops.
-    """
+def _fx_fields(receipt: Dict[str, Any], cfg: OrgConfigModel) -> Optional[Dict[str, str]]:
+    """EqvtAmt/XchgRateInf values per fx_policy, or None when inputs are missing."""
     try:
         if cfg.fx_policy.mode != "eqvt_amt":
-            return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+            return None
         base_ccy = cfg.fx_policy.base_ccy
         if not base_ccy:
-            return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+            return None
 
         # Expect an optional fx_rate injected by the caller (or future provider)
         fx_rate = receipt.get("fx_rate")  # type: ignore
         if fx_rate is None:
-            return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+            return None
 
         amt_dec = receipt.get("amount")
         if not isinstance(amt_dec, Decimal):
-            try:
-                amt_dec = Decimal(str(amt_dec))
-            except Exception:
-                return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+            amt_dec = Decimal(str(amt_dec))
 
         rate_dec = Decimal(str(fx_rate))
-        eq_amt = _round_fiat(amt_dec * rate_dec)
-
-        # Find CdtTrfTxInf/Amt
-        ns = {"p": NS_PAIN001}
-        amt_node = root.find(".//p:CdtTrfTxInf/p:Amt", namespaces=ns)
-        if amt_node is None:
-            return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
-
-        # Insert EqvtAmt and XchgRateInf siblings under Amt
-        eq = etree.SubElement(amt_node, "EqvtAmt", Ccy=base_ccy)
-        eq.text = eq_amt
-        xri = etree.SubElement(amt_node, "XchgRateInf")
-        etree.SubElement(xri, "XchgRate").text = str(fx_rate)
-        # Optional: add rate source fields as needed in future
-
-        return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+        return {"fx_base_ccy": str(base_ccy), "fx_eqvt_amt": _round_fiat(amt_dec * rate_dec), "fx_rate": str(fx_rate)}
+    except Exception:
+        return None
+
+
+def _add_fx(root: etree._Element, fx: Mapping[str, str]) -> etree._Element:
+    """Insert EqvtAmt and XchgRateInf under CdtTrfTxInf/Amt (no-op when Amt is missing)."""
+    ns = {"p": NS_PAIN001}
+    amt_node = root.find(".//p:CdtTrfTxInf/p:Amt", namespaces=ns)
+    if amt_node is None:
+        return root
+
+    eq = etree.SubElement(amt_node, "EqvtAmt", Ccy=fx["fx_base_ccy"])
+    eq.text = fx["fx_eqvt_amt"]
+    xri = etree.SubElement(amt_node, "XchgRateInf")
+    etree.SubElement(xri, "XchgRate").text = fx["fx_rate"]
+    # Optional: add rate source fields as needed in future
+    return root
+
+
+def _maybe_add_fx(root: etree._Element, receipt: Dict[str, Any], cfg: OrgConfigModel) -> bytes:
+    """
+    Optionally add EqvtAmt and XchgRateInf to CdtTrfTxInf/Amt based on fx_policy.
+    This is a best-effort post-processing step; if required inputs are missing, it no-ops.
+    """
+    fx = _fx_fields(receipt, cfg)
+    try:
+        if fx is not None:
+            _add_fx(root, fx)
     except Exception:
-        # Fail-safe: return original
-        return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+        # Fail-safe: return what we have
+        pass
+    return iso_render.tostring(root)
+
+
+def _build_with_fx(f: Mapping[str, str]) -> etree._Element:
+    # Same steps as the tree path (serialize, re-parse, append) so the template matches it byte for byte.
+    root = etree.fromstring(iso_render.tostring(iso.build_pain001(f)))
+    return _add_fx(root, f) if "fx_rate" in f else root
 
 
 def generate_pain001_with_fx(receipt: Dict[str, Any], cfg: OrgConfigModel) -> bytes:
@@ -66,9 +80,22 @@ def generate_pain001_with_fx(receipt: Dict[str, Any], cfg: OrgConfigModel) -> by
     Generate base pain.001 via existing generator; optionally enrich with EqvtAmt/XchgRateInf
     depending on fx_policy and provided fx_rate.
     """
-    base_xml = iso.generate_pain001_from_cfg(receipt, cfg)
     if cfg.fx_policy.mode == "none":
-        return base_xml
+        return iso.generate_pain001_from_cfg(receipt, cfg)
+
+    validator = iso_validation.validator_for(
+        iso_validation.PAIN001, key=str(receipt.get("id")), **iso_validation.config_args(cfg)
+    )
+    if validator is None and iso_render.ISO_TEMPLATES_ENABLED:
+        # Template fast path: no tree per receipt, no serialize/re-parse round trip.
+        fields = {**iso.pain001_fields_from_cfg(receipt, cfg), **(_fx_fields(receipt, cfg) or {})}
+        try:
+            return iso_render.render("pain.001+fx", _build_with_fx, fields)
+        except ValueError:
+            pass  # e.g. a base_ccy lxml rejects: the tree path below keeps its fail-safe behaviour
+
+    # The base document is validated as built (before the FX nodes are appended).
+    base_xml = iso.generate_pain001_from_cfg(receipt, cfg)
     try:
         root = etree.fromstring(base_xml)
         return _maybe_add_fx(root, receipt, cfg)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from lxml import etree
 
+from .. import iso_render
+
 # Minimal Customer Payment Status Report (pain.002.001.10-like structure)
 # Note: We are not enforcing XSD here; this is a pragmatic artifact for PoC/prod-lite.
 NS = "urn:iso:std:iso:20022:tech:xsd:pain.002.001.10"
@@ -46,22 +48,27 @@ def generate_pain002(receipt: Dict[str, Any]) -> bytes:
 
     grp_sts = status_code_from_receipt_status(str(receipt.get("status", "")))
 
+    fields = {"reference": reference, "rid": rid, "cre_dt_tm": _iso_dt(created_at), "grp_sts": grp_sts}
+    return iso_render.render("pain.002", _build, fields)
+
+
+def _build(f: Mapping[str, str]):
     root = etree.Element("Document", nsmap=NSMAP)
     rpt = etree.SubElement(root, "CstmrPmtStsRpt")
 
     hdr = etree.SubElement(rpt, "GrpHdr")
-    etree.SubElement(hdr, "MsgId").text = reference
-    etree.SubElement(hdr, "CreDtTm").text = _iso_dt(created_at)
+    etree.SubElement(hdr, "MsgId").text = f["reference"]
+    etree.SubElement(hdr, "CreDtTm").text = f["cre_dt_tm"]
 
     ogi = etree.SubElement(rpt, "OrgnlGrpInfAndSts")
-    etree.SubElement(ogi, "OrgnlMsgId").text = reference
+    etree.SubElement(ogi, "OrgnlMsgId").text = f["reference"]
     etree.SubElement(ogi, "OrgnlNbOfTxs").text = "1"
-    etree.SubElement(ogi, "GrpSts").text = grp_sts
+    etree.SubElement(ogi, "GrpSts").text = f["grp_sts"]
 
     opt = etree.SubElement(rpt, "OrgnlPmtInfAndSts")
-    etree.SubElement(opt, "OrgnlPmtInfId").text = rid
+    etree.SubElement(opt, "OrgnlPmtInfId").text = f["rid"]
     tx_sts = etree.SubElement(opt, "TxInfAndSts")
     pmt_id = etree.SubElement(tx_sts, "OrgnlEndToEndId")
-    pmt_id.text = rid
+    pmt_id.text = f["rid"]
 
-    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+    return root
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from lxml import etree
 
+from .. import iso_render
+
 # Minimal remt.001.001.x Remittance Information message
 # Pragmatic structure to carry remittance data separate from the payment.
 NS = "urn:iso:std:iso:20022:tech:xsd:remt.001.001.05"
@@ -35,13 +37,22 @@ def generate_remt001(payload: Dict[str, Any]) -> bytes:
     if not isinstance(created_at, datetime):
         created_at = datetime.utcnow().replace(tzinfo=timezone.utc)
 
-    # XML
+    fields = {
+        "instr_id": rid or reference or _iso_dt(created_at),
+        "reference": reference,
+        # Free text compatible with bank-safe policies
+        "addtl_rmt_inf": f"RID={rid} AMT={amount} {currency} FROM={debtor} TO={creditor}",
+    }
+    return iso_render.render("remt.001", _build, fields)
+
+
+def _build(f: Mapping[str, str]):
     root = etree.Element("Document", nsmap=NSMAP)
     remt = etree.SubElement(root, "RmtInf")
 
     # Identification and creation time
     id_el = etree.SubElement(remt, "Id")
-    etree.SubElement(id_el, "InstrId").text = rid or reference or _iso_dt(created_at)
+    etree.SubElement(id_el, "InstrId").text = f["instr_id"]
 
     # Structured remittance details
     strd = etree.SubElement(remt, "Strd")
@@ -53,10 +64,10 @@ def generate_remt001(payload: Dict[str, Any]) -> bytes:
     etree.SubElement(cd_or_prtry, "Prtry").text = "REFERENCE"
 
     rfrd_id = etree.SubElement(rfrd, "Nb")
-    rfrd_id.text = reference
+    rfrd_id.text = f["reference"]
 
-    # Additional remittance info (free text compatible with bank-safe policies)
+    # Additional remittance info
     add_rem = etree.SubElement(strd, "AddtlRmtInf")
-    add_rem.text = f"RID={rid} AMT={amount} {currency} FROM={debtor} TO={creditor}"
+    add_rem.text = f["addtl_rmt_inf"]
 
-    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+    return root
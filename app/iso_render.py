@@ -0,0 +1,201 @@
+"""Template fast path for fixed-shape ISO 20022 messages.
+
+The generators (app/iso.py, app/iso_messages/*) are split into "compute the field values"
+and "build the lxml tree from those values". A template is compiled once per message
+shape by running the lxml builder with sentinel values, serializing exactly as the
+generators do and splitting the output at the sentinels. Rendering then escapes each
+value (same rules as libxml2) into the cached skeleton, which gives byte-identical
+output - and so unchanged bundle hashes - without building a tree per receipt.
+
+A compiled template is checked against the lxml output for a probe full of characters
+that need escaping; on any mismatch that shape keeps using lxml. ISO_TEMPLATES=off
+disables the fast path entirely.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from lxml import etree
+
+ISO_TEMPLATES_ENABLED = (os.getenv("ISO_TEMPLATES", "on") or "on").strip().lower() not in ("0", "off", "false", "no")
+
+Builder = Callable[[Mapping[str, str]], Any]  # fields -> lxml root element
+
+_OPEN, _CLOSE = "\ue000", "\ue001"  # private-use sentinels around slot names
+_SLOT_RE = re.compile(f"{_OPEN}([^{_CLOSE}]+){_CLOSE}")
+_START_TAG_END_RE = re.compile(r"<([^\s<>/!?]+)(?:\s[^<>]*)?>$")
+# Characters lxml refuses in text and attribute values.
+_INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_PROBE = "a&b<c>d\"e'f\r\ng\th]]>\u00e9\u20ac\U0001f600"
+
+_LOCK = threading.Lock()
+_TEMPLATES: Dict[Hashable, Optional["Template"]] = {}
+
+
+def tostring(root: Any) -> bytes:
+    """Serialization shared by all ISO generators."""
+
+    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8", standalone="yes")
+
+
+def _escape_text(value: str) -> str:
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    return value
+
+
+def _escape_attr(value: str) -> str:
+    value = _escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#9;")
+    return value
+
+
+class Template:
+    """A serialized message split into literal text and field slots.
+
+    Each slot is (field, in_attribute, close_len, collapse). close_len is the length of the
+    end tag that directly follows a slot holding an element's whole text; `collapse` marks
+    slots where lxml writes `<Tag/>` for an empty value instead of `<Tag></Tag>` (elements
+    of a document that was serialized and parsed again: empty text became no text).
+    """
+
+    __slots__ = ("literals", "slots")
+
+    def __init__(self, literals: List[str], slots: List[Tuple[str, bool, int, bool]]):
+        self.literals = literals
+        self.slots = slots
+
+    @classmethod
+    def parse(cls, skeleton: str) -> "Template":
+        literals: List[str] = []
+        slots: List[Tuple[str, bool, int, bool]] = []
+        pos = 0
+        for m in _SLOT_RE.finditer(skeleton):
+            literals.append(skeleton[pos : m.start()])
+            head = skeleton[: m.start()]
+            # Inside a start tag when the last '<' comes after the last '>'.
+            in_attr = head.rfind("<") > head.rfind(">")
+            close_len = 0
+            start_tag = None if in_attr else _START_TAG_END_RE.search(head)
+            if start_tag is not None:
+                end_tag = f"</{start_tag.group(1)}>"
+                if skeleton.startswith(end_tag, m.end()):
+                    close_len = len(end_tag)
+            slots.append((m.group(1), in_attr, close_len, False))
+            pos = m.end()
+        literals.append(skeleton[pos:])
+        return cls(literals, slots)
+
+    def render(self, fields: Mapping[str, str]) -> bytes:
+        out = [self.literals[0]]
+        for (name, in_attr, close_len, collapse), literal in zip(self.slots, self.literals[1:]):
+            value = fields[name]
+            if not isinstance(value, str):
+                raise TypeError(f"field {name} must be str")
+            if _INVALID_XML_RE.search(value):
+                raise ValueError(
+                    "All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters"
+                )
+            if collapse and not value:
+                out[-1] = out[-1][:-1]
+                out.append("/>" + literal[close_len:])
+                continue
+            out.append(_escape_attr(value) if in_attr else _escape_text(value))
+            out.append(literal)
+        return "".join(out).encode("utf-8")
+
+
+def _learn_collapse(template: Template, build: Builder, names: Tuple[str, ...], probe: Dict[str, str]) -> bool:
+    """Set the per-slot `collapse` flags from what lxml emits for each field left empty."""
+
+    for name in names:
+        idxs = [i for i, slot in enumerate(template.slots) if slot[0] == name and slot[2]]
+        if not idxs:
+            continue
+        sample = dict(probe, **{name: ""})
+        expected = tostring(build(sample))
+        for combo in itertools.product((False, True), repeat=len(idxs)):
+            for i, collapse in zip(idxs, combo):
+                template.slots[i] = template.slots[i][:3] + (collapse,)
+            if template.render(sample) == expected:
+                break
+        else:
+            return False
+    return True
+
+
+def compile_template(build: Builder, names: Tuple[str, ...]) -> Optional[Template]:
+    """Template for a builder, or None when it cannot reproduce the lxml output."""
+
+    try:
+        skeleton = tostring(build({n: f"{_OPEN}{n}{_CLOSE}" for n in names})).decode("utf-8")
+        template = Template.parse(skeleton)
+        if _OPEN in "".join(template.literals) or _CLOSE in "".join(template.literals):
+            return None
+        probe = {n: f"{n}:{_PROBE}" for n in names}
+        if not _learn_collapse(template, build, names, probe):
+            return None
+        for sample in (probe, {n: "" for n in names}):
+            if template.render(sample) != tostring(build(sample)):
+                return None
+        return template
+    except Exception:
+        return None
+
+
+def get_template(key: Hashable, build: Builder, names: Tuple[str, ...]) -> Optional[Template]:
+    cache_key = (key, names)
+    try:
+        return _TEMPLATES[cache_key]
+    except KeyError:
+        pass
+    with _LOCK:
+        if cache_key not in _TEMPLATES:
+            _TEMPLATES[cache_key] = compile_template(build, names)
+        return _TEMPLATES[cache_key]
+
+
+def clear() -> None:
+    with _LOCK:
+        _TEMPLATES.clear()
+
+
+def render(
+    key: Hashable,
+    build: Builder,
+    fields: Mapping[str, str],
+    *,
+    validate: Optional[Callable[[Any], None]] = None,
+) -> bytes:
+    """Serialized message for `fields`.
+
+    One template is kept per (key, field names): `build` may add or omit elements depending
+    on which fields are present, but must only place values, never branch on them. With
+    `validate` the lxml tree is built anyway, so it is validated as built and serialized
+    from it.
+    """
+
+    if validate is None and ISO_TEMPLATES_ENABLED:
+        template = get_template(key, build, tuple(fields))
+        if template is not None:
+            return template.render(fields)
+    root = build(fields)
+    if validate is not None:
+        validate(root)
+    return tostring(root)
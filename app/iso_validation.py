@@ -0,0 +1,171 @@
+"""Compiled, cached XSD validators for generated ISO 20022 messages.
+
+Each schema (ISO_SCHEMA_DIR/<message>.xsd, e.g. schemas/pain.001.001.09.xsd) is compiled
+once per process. Validation runs on the already-built lxml tree with libxml2's native
+`etree.XMLSchema`; the pure-Python `xmlschema` is only loaded to produce readable error
+detail once a document has failed (or as the validator when libxml2 cannot compile the XSD).
+
+Missing schemas are not an error: validation is skipped, as before (see schemas/README.md).
+
+Modes (per org: `OrgConfigModel.validation`):
+  strict   validate every document
+  sampled  validate a `sample_rate` fraction, chosen deterministically from a key (receipt id)
+  off      never validate
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+try:
+    import xmlschema  # type: ignore
+except Exception:  # pragma: no cover
+    xmlschema = None  # type: ignore
+
+ISO_SCHEMA_DIR = Path(os.getenv("ISO_SCHEMA_DIR", "schemas"))
+ISO_VALIDATION_MODE = (os.getenv("ISO_VALIDATION_MODE", "strict") or "strict").strip().lower()
+
+PAIN001 = "pain.001.001.09"
+MODES = ("strict", "sampled", "off")
+
+_LOCK = threading.Lock()
+_REGISTRY: Dict[str, Optional["SchemaValidator"]] = {}
+
+
+class SchemaValidator:
+    """One compiled XSD. lxml validators are not safe for concurrent use, hence the lock."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._detail: Any = None
+        try:
+            self._lxml: Optional[etree.XMLSchema] = etree.XMLSchema(etree.parse(str(path)))
+        except (etree.XMLSchemaParseError, etree.XMLSyntaxError):
+            # libxml2 rejects some XSD constructs; xmlschema then does all the work.
+            self._lxml = None
+            if self._detail_schema() is None:
+                raise
+
+    def _detail_schema(self) -> Any:
+        if self._detail is None and xmlschema is not None:
+            self._detail = xmlschema.XMLSchema(str(self.path))
+        return self._detail
+
+    def errors(self, root: Any) -> List[str]:
+        """Validation errors for an lxml element/tree ([] when valid)."""
+
+        if self._lxml is not None:
+            with self._lock:
+                if self._lxml.validate(root):
+                    return []
+                fallback = [f"line {e.line}: {e.message}" for e in self._lxml.error_log]
+            try:
+                detail = self._detail_schema()
+            except Exception:
+                detail = None
+            if detail is None:
+                return fallback
+        else:
+            detail = self._detail_schema()
+        with self._lock:
+            return [str(err) for err in detail.iter_errors(root)]
+
+    def assert_valid(self, root: Any) -> None:
+        errors = self.errors(root)
+        if errors:
+            raise ValueError("ISO20022 schema validation failed:\n" + "\n".join(errors))
+
+
+def get(message: str = PAIN001) -> Optional[SchemaValidator]:
+    """Compiled validator for a message type, or None when its XSD is missing or unusable."""
+
+    try:
+        return _REGISTRY[message]
+    except KeyError:
+        pass
+    with _LOCK:
+        if message not in _REGISTRY:
+            path = ISO_SCHEMA_DIR / f"{message}.xsd"
+            validator: Optional[SchemaValidator] = None
+            if path.exists():
+                try:
+                    validator = SchemaValidator(path)
+                except Exception:
+                    validator = None
+            _REGISTRY[message] = validator
+        return _REGISTRY[message]
+
+
+def clear() -> None:
+    """Drop compiled schemas (after replacing XSDs, or in tests)."""
+
+    with _LOCK:
+        _REGISTRY.clear()
+
+
+def should_validate(mode: Optional[str], sample_rate: float = 1.0, key: Optional[str] = None) -> bool:
+    mode = (mode or ISO_VALIDATION_MODE).strip().lower()
+    if mode == "off":
+        return False
+    if mode != "sampled":
+        return True
+    rate = max(0.0, min(1.0, float(sample_rate)))
+    if key:
+        return int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) < rate * 0x100000000
+    return random.random() < rate
+
+
+def validator_for(
+    message: str = PAIN001,
+    *,
+    mode: Optional[str] = None,
+    sample_rate: float = 1.0,
+    key: Optional[str] = None,
+) -> Optional[SchemaValidator]:
+    """The validator to apply to this document, or None (mode/sampling says skip, or no XSD)."""
+
+    if not should_validate(mode, sample_rate, key):
+        return None
+    return get(message)
+
+
+def validate(
+    root: Any,
+    message: str = PAIN001,
+    *,
+    mode: Optional[str] = None,
+    sample_rate: float = 1.0,
+    key: Optional[str] = None,
+) -> None:
+    """Validate a built document per the mode; raises ValueError with the error list."""
+
+    validator = validator_for(message, mode=mode, sample_rate=sample_rate, key=key)
+    if validator is not None:
+        validator.assert_valid(root)
+
+
+def validate_bytes(xml_bytes: bytes, message: str = PAIN001) -> None:
+    """Validate serialized XML (e.g. from a downloaded bundle); always strict."""
+
+    validator = get(message)
+    if validator is not None:
+        parser = etree.XMLParser(resolve_entities=False, no_network=True)
+        validator.assert_valid(etree.fromstring(xml_bytes, parser))
+
+
+def config_args(cfg: Any) -> Dict[str, Any]:
+    """(mode, sample_rate) keyword arguments from an OrgConfigModel (defaults when absent)."""
+
+    section = getattr(cfg, "validation", None)
+    return {
+        "mode": getattr(section, "mode", None),
+        "sample_rate": float(getattr(section, "sample_rate", 1.0) or 0.0),
+    }
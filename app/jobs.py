@@ -12,14 +12,15 @@ Design goals:
 """
 
 import json
+import logging
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 import anyio
 
-from . import bundle, compliance, db, fx_providers, models, storage, vc  # type: ignore
+from . import blobstore, bundle, compliance, db, fx_providers, models, providers, stages, storage, vc  # type: ignore
 from .config import get_config as load_config
 from .iso_messages import camt054 as iso_camt054  # type: ignore
 from .iso_messages import pacs002 as iso_pacs002  # type: ignore
@@ -31,6 +32,8 @@ from .sse import hub
 
 ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "artifacts")
 
+logger = logging.getLogger(__name__)
+
 
 def _ensure_dir_for_receipt(rid: str) -> Path:
     out = Path(ARTIFACTS_DIR) / rid
@@ -47,18 +50,30 @@ def _sha256_hex(b: bytes) -> str:
 def _write_iso_artifact(session, receipt_id: str, type_str: str, filename: str, content: bytes) -> Tuple[str, str]:
     out_dir = _ensure_dir_for_receipt(receipt_id)
     file_path = out_dir / filename
+    sha = _sha256_hex(content)
     try:
-        file_path.write_bytes(content)
+        blobstore.write(file_path, content, sha)
     except Exception:
         # best-effort write; proceed to DB row
         pass
-    sha = _sha256_hex(content)
     art = models.ISOArtifact(receipt_id=receipt_id, type=type_str, path=str(file_path), sha256=sha)
     session.add(art)
     session.commit()
     return str(file_path), sha
 
 
+def _resolve_key_ref(key_ref: Optional[str]) -> Optional[str]:
+    if not key_ref:
+        return None
+    if isinstance(key_ref, str) and key_ref.startswith("env:"):
+        return os.getenv(key_ref.split(":", 1)[1])
+    val = os.getenv(str(key_ref))
+    if val:
+        return val
+    alt = f"KEYREF_{str(key_ref).upper()}"
+    return os.getenv(alt) or None
+
+
 def _resolve_anchor_pk(cfg) -> Optional[str]:
     try:
         sec = getattr(cfg, "security", None)
@@ -67,20 +82,270 @@ def _resolve_anchor_pk(cfg) -> Optional[str]:
             return os.getenv("ANCHOR_PRIVATE_KEY")
         key_ref = getattr(sec, "key_ref", None) if sec else None
         if key_ref:
-            if isinstance(key_ref, str) and key_ref.startswith("env:"):
-                return os.getenv(key_ref.split(":", 1)[1])
-            val = os.getenv(str(key_ref))
+            val = _resolve_key_ref(key_ref)
             if val:
                 return val
-            alt = f"KEYREF_{str(key_ref).upper()}"
-            val2 = os.getenv(alt)
-            if val2:
-                return val2
         return os.getenv("ANCHOR_PRIVATE_KEY")
     except Exception:
         return os.getenv("ANCHOR_PRIVATE_KEY")
 
 
+def _anchoring_policy(session, rec: models.Receipt, cfg) -> Tuple[str, int]:
+    """Return (mode, quorum) for platform anchoring.
+
+    Project overrides win over org config; defaults keep the historical
+    behaviour (sequential, anchored after the first success).
+    """
+
+    org_anch = getattr(cfg, "anchoring", None)
+    mode = str(getattr(org_anch, "mode", None) or "sequential")
+    quorum = int(getattr(org_anch, "quorum", None) or 1)
+    try:
+        if getattr(rec, "project_id", None):
+            proj = session.get(models.Project, rec.project_id)
+            anch = ((proj.config or {}) if proj else {}).get("anchoring") or {}
+            if anch.get("mode"):
+                mode = str(anch["mode"])
+            if anch.get("quorum"):
+                quorum = int(anch["quorum"])
+    except Exception:
+        pass
+    return mode, max(1, quorum)
+
+
+def _clamp_quorum(quorum: int, n_chains: int, rec: models.Receipt) -> int:
+    """A quorum above the number of anchoring chains can never be met: cap it (and say so)."""
+
+    if n_chains and quorum > n_chains:
+        logger.warning(
+            "anchoring quorum %d exceeds the %d configured chain(s) for receipt %s; using %d",
+            quorum,
+            n_chains,
+            rec.id,
+            n_chains,
+        )
+        return n_chains
+    return quorum
+
+
+def _chain_anchor_params(ch: dict, cfg, default_pk: Optional[str]) -> Dict[str, Any]:
+    return {
+        "name": (ch.get("name") if isinstance(ch, dict) else None) or "unknown",
+        "rpc_url": (
+            (providers.join_urls(ch.get("rpc_urls")) if isinstance(ch, dict) else None)
+            or (ch.get("rpc_url") if isinstance(ch, dict) else None)
+            or getattr(getattr(cfg, "ledger", None), "rpc_url", None)
+            or os.getenv("FLARE_RPC_URL")
+        ),
+        "contract": (
+            (ch.get("contract") if isinstance(ch, dict) else None)
+            or os.getenv("ANCHOR_CONTRACT_ADDR")
+            or "0x0690d8cFb1897c12B2C0b34660edBDE4E20ff4d8"
+        ),
+        "private_key": (_resolve_key_ref(ch.get("key_ref")) if isinstance(ch, dict) else None) or default_pk,
+    }
+
+
+def _min_confirmations(cfg) -> int:
+    try:
+        return max(0, int(getattr(getattr(cfg, "tx_proof_policy", None), "min_confirmations", 0) or 0))
+    except Exception:
+        return 0
+
+
+def _anchor_on_chain(params: Dict[str, Any], bundle_hash: str, min_confirmations: int = 0) -> Tuple[str, int]:
+    from . import anchor as anchor_py  # type: ignore
+
+    return anchor_py.anchor_bundle(
+        bundle_hash,
+        rpc_url=params["rpc_url"],
+        contract_addr=params["contract"],
+        private_key=params["private_key"],
+        abi_path=os.getenv("ANCHOR_ABI_PATH"),
+        lookback_blocks=int(os.getenv("ANCHOR_LOOKBACK_BLOCKS", "50000")),
+        min_confirmations=min_confirmations,
+    )
+
+
+def _anchor_many_on_chain(
+    params: Dict[str, Any], bundle_hashes: list[str], min_confirmations: int = 0
+) -> Tuple[str, int]:
+    from . import anchor as anchor_py  # type: ignore
+
+    txid, block, _log_indexes = anchor_py.anchor_bundles(
+        bundle_hashes,
+        rpc_url=params["rpc_url"],
+        contract_addr=params["contract"],
+        private_key=params["private_key"],
+        abi_path=os.getenv("ANCHOR_ABI_PATH"),
+        min_confirmations=min_confirmations,
+    )
+    return txid, block
+
+
+def _record_chain_anchor(
+    session,
+    rec: models.Receipt,
+    chain_name: str,
+    txid: str,
+    *,
+    block_number: Optional[int] = None,
+    rpc_url: Optional[str] = None,
+    contract: Optional[str] = None,
+) -> None:
+    now = datetime.utcnow()
+    if not rec.flare_txid:
+        rec.flare_txid = txid
+    if not rec.anchored_at:
+        rec.anchored_at = now
+    session.add(
+        models.ChainAnchor(
+            receipt_id=str(rec.id),
+            chain=str(chain_name),
+            txid=txid,
+            anchored_at=now,
+            status="confirmed",
+            block_number=block_number,
+            # anchor_lookup.recheck verifies the tx against the chain/contract it was sent to.
+            rpc_url=rpc_url,
+            contract=contract,
+        )
+    )
+    session.commit()
+
+
+def _submit_chain_anchors(session, rec: models.Receipt, chain_params: list[Dict[str, Any]], bundle_hash: str) -> int:
+    """Async confirm mode: broadcast on every chain and record pending ChainAnchor rows.
+
+    Returns the number of successful submissions; the tracker job confirms them.
+    """
+
+    from . import anchor as anchor_py  # type: ignore
+
+    submitted = 0
+    for params in chain_params:
+        try:
+            txid, nonce, chain_id, signer = anchor_py.submit_anchor_tx(
+                bundle_hash,
+                rpc_url=params["rpc_url"],
+                contract_addr=params["contract"],
+                private_key=params["private_key"],
+                abi_path=os.getenv("ANCHOR_ABI_PATH"),
+            )
+            session.add(
+                models.ChainAnchor(
+                    receipt_id=str(rec.id),
+                    chain=str(params["name"]),
+                    txid=txid,
+                    status="pending",
+                    rpc_url=params["rpc_url"],
+                    contract=params["contract"],
+                    submitted_at=datetime.utcnow(),
+                    chain_id=chain_id,
+                    signer=signer,
+                    nonce=nonce,
+                )
+            )
+            session.commit()
+            submitted += 1
+        except Exception:
+            session.rollback()
+    return submitted
+
+
+def _submit_for_tracking(
+    session, rec: models.Receipt, chain_params: list[Dict[str, Any]], bundle_hash: str, callback_url: Optional[str]
+) -> bool:
+    """Async confirm mode: submit and hand the receipt to the tracker job.
+
+    Returns False when no chain accepted a submission. Anything broadcast, even below
+    quorum, is left to the tracker: it settles (completing the nonces of mined txs) or
+    abandons the pending rows before `_settle_tracked_receipt` fails the receipt.
+    """
+
+    from .queue import enqueue_anchor_tracker
+
+    rec.callback_url = callback_url
+    session.commit()
+    if not _submit_chain_anchors(session, rec, chain_params, bundle_hash):
+        return False
+    try:
+        from .anchor_tracker import ANCHOR_TRACKER_INTERVAL
+
+        enqueue_anchor_tracker(ANCHOR_TRACKER_INTERVAL)
+    except Exception:
+        pass
+    _publish_receipt_event(rec)
+    return True
+
+
+def _anchor_chains_concurrently(
+    session,
+    rec: models.Receipt,
+    chain_params: list[Dict[str, Any]],
+    bundle_hash: str,
+    quorum: int,
+    min_confirmations: int = 0,
+) -> int:
+    """Submit to all chains in parallel; record rows and flip status as results arrive.
+
+    Chains sharing an (rpc_url, signer) pair are serialized against each other so
+    they do not race on the same account nonce. DB writes stay on this thread.
+    """
+
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    locks: Dict[Tuple[Any, Any], threading.Lock] = {}
+    for p in chain_params:
+        locks.setdefault((p["rpc_url"], p["private_key"]), threading.Lock())
+
+    def _task(p: Dict[str, Any]) -> Tuple[str, int]:
+        with locks[(p["rpc_url"], p["private_key"])]:
+            return _anchor_on_chain(p, bundle_hash, min_confirmations)
+
+    successes = 0
+    workers = max(1, min(len(chain_params), int(os.getenv("ANCHOR_CONCURRENCY", "8"))))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="anchor") as pool:
+        futures = {pool.submit(_task, p): p for p in chain_params}
+        for fut in as_completed(futures):
+            p = futures[fut]
+            try:
+                txid, block = fut.result()
+                _record_chain_anchor(
+                    session, rec, p["name"], txid, block_number=block, rpc_url=p["rpc_url"], contract=p["contract"]
+                )
+                successes += 1
+            except Exception:
+                session.rollback()
+                continue
+
+            if successes == quorum and rec.status != "anchored":
+                # Quorum reached: receipt is anchored even while slower chains are still confirming.
+                rec.status = "anchored"
+                session.commit()
+                _publish_receipt_event(rec)
+
+    return successes
+
+
+def _publish_receipt_event(rec: models.Receipt) -> None:
+    """SSE notify (best-effort)."""
+
+    try:
+        evt_payload = {
+            "receipt_id": str(rec.id),
+            "status": rec.status,
+            "bundle_hash": rec.bundle_hash,
+            "flare_txid": rec.flare_txid,
+            "xml_url": f"/files/{rec.id}/pain001.xml",
+            "bundle_url": f"/files/{rec.id}/evidence.zip",
+            "created_at": rec.created_at.isoformat() if rec.created_at else None,
+            "anchored_at": rec.anchored_at.isoformat() if rec.anchored_at else None,
+        }
+        anyio.from_thread.run(hub.publish, str(rec.id), evt_payload)  # type: ignore
+    except Exception:
+        pass
 
 
 def _project_execution_mode(session, rec: models.Receipt) -> str:
@@ -126,6 +391,329 @@ def _project_anchoring_chains(session, rec: models.Receipt) -> list[dict]:
         return []
 
 
+def _resolve_anchoring_chains(session, rec: models.Receipt, cfg) -> list[dict]:
+    """Platform mode anchoring targets.
+
+    - Prefer per-project chains (project override) when present
+    - Else fall back to org config chains
+    """
+
+    proj_chains = _project_anchoring_chains(session, rec)
+    org_chains = list(getattr(getattr(cfg, "anchoring", None), "chains", []) or [])
+
+    chains_src: list[dict] = []
+    if proj_chains:
+        chains_src = proj_chains
+    elif org_chains:
+        for ch in org_chains:
+            chains_src.append(
+                {
+                    "name": getattr(ch, "name", None),
+                    "contract": getattr(ch, "contract", None),
+                    "rpc_url": providers.join_urls(getattr(ch, "rpc_urls", None)) or getattr(ch, "rpc_url", None),
+                    "explorer_base_url": getattr(ch, "explorer_base_url", None),
+                    "key_ref": getattr(ch, "key_ref", None),
+                }
+            )
+
+    if not chains_src:
+        # Last resort (keeps backwards compatibility)
+        chains_src = [
+            {
+                "name": rec.chain or "flare",
+                "contract": os.getenv("ANCHOR_CONTRACT_ADDR") or "0x0690d8cFb1897c12B2C0b34660edBDE4E20ff4d8",
+                "rpc_url": os.getenv("FLARE_RPC_URL"),
+            }
+        ]
+    return chains_src
+
+
+def _finalize_receipt(session, rec: models.Receipt, cfg, *, anchored: bool, callback_url: Optional[str]) -> None:
+    """Emit status artifacts, persist paths, notify SSE and the optional callback."""
+
+    if anchored:
+        # Cached "not anchored" answers for this bundle are now stale.
+        try:
+            from . import verify_cache
+
+            verify_cache.invalidate([rec.bundle_hash])
+        except Exception:
+            pass
+
+    # Status/extra ISO artifacts
+    try:
+        payload2 = {
+            "id": str(rec.id),
+            "reference": rec.reference,
+            "tip_tx_hash": rec.tip_tx_hash,
+            "chain": rec.chain,
+            "amount": rec.amount,
+            "currency": rec.currency,
+            "sender_wallet": rec.sender_wallet,
+            "receiver_wallet": rec.receiver_wallet,
+            "status": rec.status,
+            "created_at": rec.created_at,
+            "anchored_at": rec.anchored_at,
+            "flare_txid": rec.flare_txid,
+            "bundle_hash": rec.bundle_hash,
+        }
+        p002_bytes = iso_pain002.generate_pain002(payload2)
+        _write_iso_artifact(session, str(rec.id), "pain.002", "pain002.xml", p002_bytes)
+        if getattr(getattr(cfg, "status", None), "emit_pacs002", False):
+            try:
+                p2i = iso_pacs002.generate_pacs002(payload2)
+                _write_iso_artifact(session, str(rec.id), "pacs.002", "pacs002.xml", p2i)
+            except Exception:
+                pass
+        if anchored:
+            c054_bytes = iso_camt054.generate_camt054(payload2)
+            _write_iso_artifact(session, str(rec.id), "camt.054", "camt054.xml", c054_bytes)
+    except Exception:
+        pass
+
+    # Persist primary artifact paths
+    rec.xml_path = f"{ARTIFACTS_DIR}/{rec.id}/pain001.xml"
+    rec.bundle_path = f"{ARTIFACTS_DIR}/{rec.id}/evidence.zip"
+    session.commit()
+
+    _publish_receipt_event(rec)
+
+    # Optional callback
+    if callback_url:
+        try:
+            import requests
+
+            cb_payload = {
+                "receipt_id": str(rec.id),
+                "status": rec.status,
+                "bundle_hash": rec.bundle_hash,
+                "flare_txid": rec.flare_txid,
+                "xml_url": f"/files/{rec.id}/pain001.xml",
+                "bundle_url": f"/files/{rec.id}/evidence.zip",
+                "created_at": rec.created_at.isoformat() if rec.created_at else None,
+                "anchored_at": rec.anchored_at.isoformat() if rec.anchored_at else None,
+            }
+            base_url = os.getenv("PUBLIC_BASE_URL")
+            if base_url:
+                cb_payload["xml_url"] = f"{base_url}{cb_payload['xml_url']}"
+                cb_payload["bundle_url"] = f"{base_url}{cb_payload['bundle_url']}"
+            requests.post(callback_url, json=cb_payload, timeout=15)
+        except Exception:
+            pass
+
+
+def _enqueue_receipt_for_batch(
+    session, rec: models.Receipt, bundle_hash: str, callback_url: Optional[str], batch_cfg
+) -> None:
+    """Park a receipt for Merkle-batched anchoring and make sure a flush is scheduled."""
+
+    from . import anchor_batch
+    from .queue import enqueue_anchor_batch_flush
+
+    rec.callback_url = callback_url
+    rec.xml_path = f"{ARTIFACTS_DIR}/{rec.id}/pain001.xml"
+    rec.bundle_path = f"{ARTIFACTS_DIR}/{rec.id}/evidence.zip"
+    anchor_batch.add_pending(session, str(rec.id), bundle_hash)
+    session.commit()
+    _publish_receipt_event(rec)
+
+    max_size = max(1, int(getattr(batch_cfg, "max_size", 256) or 256))
+    window = max(0, int(getattr(batch_cfg, "window_seconds", 30) or 0))
+    if anchor_batch.pending_count(session) >= max_size:
+        enqueue_anchor_batch_flush(0)
+    else:
+        enqueue_anchor_batch_flush(window)
+
+
+def flush_anchor_batch_job() -> None:
+    """Anchor all receipts waiting for a batch, one transaction per project and chain.
+
+    With `anchoring.batch.strategy` "merkle" one Merkle root is anchored and each member
+    receipt gets a `merkle_proof.json` artifact; with "multi" every bundle hash gets its
+    own EvidenceAnchored event (anchorEvidenceBatch), so no proof is needed. Either way
+    members get ChainAnchor rows pointing at the batch transaction(s), and the usual
+    status artifacts/callbacks.
+    """
+
+    from . import anchor_batch
+    from .queue import clear_anchor_batch_flush_marker
+
+    # Receipts arriving from now on must schedule their own flush.
+    clear_anchor_batch_flush_marker()
+
+    session = db.SessionLocal()
+    try:
+        cfg = load_config(session)
+        batch_cfg = getattr(getattr(cfg, "anchoring", None), "batch", None)
+        limit = max(1, int(getattr(batch_cfg, "max_size", 256) or 256))
+        multi = str(getattr(batch_cfg, "strategy", "merkle") or "merkle").lower() == "multi"
+        min_conf = _min_confirmations(cfg)
+
+        while True:
+            groups = anchor_batch.claim_pending(session, limit=limit)
+            if not groups:
+                break
+
+            for batch, items, proofs in groups:
+                recs = [session.get(models.Receipt, it.receipt_id) for it in items]
+                if not recs or any(r is None for r in recs):
+                    batch.status = "failed"
+                    session.commit()
+                    continue
+
+                chains_src = _resolve_anchoring_chains(session, recs[0], cfg)
+                pk = _resolve_anchor_pk(cfg)
+                _mode, quorum = _anchoring_policy(session, recs[0], cfg)
+                quorum = _clamp_quorum(quorum, len(chains_src), recs[0])
+                anchors: list[Dict[str, Any]] = []
+                sent_via: list[Dict[str, Any]] = []  # params per anchor (not part of the proof document)
+                for ch in chains_src:
+                    params = _chain_anchor_params(ch, cfg, pk)
+                    try:
+                        if multi:
+                            txid, block = _anchor_many_on_chain(params, [it.bundle_hash for it in items], min_conf)
+                        else:
+                            txid, block = _anchor_on_chain(params, str(batch.merkle_root), min_conf)
+                        anchors.append({"chain": str(params["name"]), "txid": txid, "block_number": block})
+                        sent_via.append(params)
+                    except Exception:
+                        continue
+
+                anchored = len(anchors) >= quorum
+                batch.status = "anchored" if anchored else "failed"
+                batch.anchored_at = datetime.utcnow() if anchored else None
+                if multi and anchored:
+                    # Nothing on-chain commits to the root: do not advertise one for verification.
+                    batch.merkle_root = None
+                session.commit()
+
+                for item, proof, rec in zip(items, proofs, recs):
+                    try:
+                        if not multi:
+                            proof_doc = anchor_batch.proof_document(batch, item, proof, anchors)
+                            _write_iso_artifact(
+                                session,
+                                str(rec.id),
+                                "merkle_proof",
+                                "merkle_proof.json",
+                                json.dumps(proof_doc, separators=(",", ":")).encode("utf-8"),
+                            )
+                        for a, params in zip(anchors, sent_via):
+                            _record_chain_anchor(
+                                session,
+                                rec,
+                                a["chain"],
+                                a["txid"],
+                                block_number=a["block_number"],
+                                rpc_url=params["rpc_url"],
+                                contract=params["contract"],
+                            )
+                        rec.status = "anchored" if anchored else "failed"
+                        session.commit()
+                        _finalize_receipt(session, rec, cfg, anchored=anchored, callback_url=rec.callback_url)
+                    except Exception:
+                        session.rollback()
+    finally:
+        session.close()
+
+
+def sweep_anchor_batches_job() -> None:
+    """Recurring safety net for batch anchoring; reschedules itself.
+
+    Releases batches abandoned mid-flush and flushes pending items that waited longer than
+    the batch window, i.e. whose scheduled flush was lost.
+    """
+
+    from . import anchor_batch
+    from .queue import clear_anchor_batch_sweep_marker, enqueue_anchor_batch_sweep
+
+    clear_anchor_batch_sweep_marker()
+
+    session = db.SessionLocal()
+    try:
+        cfg = load_config(session)
+        batch_cfg = getattr(getattr(cfg, "anchoring", None), "batch", None)
+        stale_before = datetime.utcnow() - timedelta(seconds=anchor_batch.ANCHOR_BATCH_STALE_SECONDS)
+        released = anchor_batch.release_stale_batches(session, older_than=stale_before)
+        window = max(0, int(getattr(batch_cfg, "window_seconds", 30) or 0))
+        stale = anchor_batch.has_stale_pending(session, window)
+    finally:
+        session.close()
+
+    try:
+        if released or stale:
+            flush_anchor_batch_job()
+    finally:
+        if anchor_batch.ANCHOR_BATCH_SWEEP_INTERVAL > 0:
+            enqueue_anchor_batch_sweep(anchor_batch.ANCHOR_BATCH_SWEEP_INTERVAL)
+
+
+def _settle_tracked_receipt(session, rec: models.Receipt, cfg) -> None:
+    """Flip a receipt once enough of its submitted anchors are confirmed (or none can be)."""
+
+    rows = session.query(models.ChainAnchor).filter(models.ChainAnchor.receipt_id == str(rec.id)).all()
+    confirmed = [r for r in rows if r.status == "confirmed"]
+    pending = [r for r in rows if r.status == "pending"]
+    _mode, quorum = _anchoring_policy(session, rec, cfg)
+    quorum = _clamp_quorum(quorum, len(_resolve_anchoring_chains(session, rec, cfg)), rec)
+
+    if len(confirmed) >= quorum and rec.status != "anchored":
+        first = confirmed[0]
+        rec.flare_txid = rec.flare_txid or first.txid
+        rec.anchored_at = rec.anchored_at or first.anchored_at
+        rec.status = "anchored"
+        session.commit()
+        _finalize_receipt(session, rec, cfg, anchored=True, callback_url=rec.callback_url)
+    elif not pending and len(confirmed) < quorum and rec.status == "pending":
+        rec.status = "failed"
+        session.commit()
+        _finalize_receipt(session, rec, cfg, anchored=False, callback_url=rec.callback_url)
+
+
+def track_anchor_confirmations_job() -> None:
+    """One tick of the async confirmation tracker; reschedules itself while work remains."""
+
+    from . import anchor_tracker
+    from .queue import clear_anchor_tracker_marker, enqueue_anchor_tracker
+
+    clear_anchor_tracker_marker()
+
+    session = db.SessionLocal()
+    try:
+        cfg = load_config(session)
+        changed = anchor_tracker.poll_pending(session, min_confirmations=_min_confirmations(cfg))
+        for rid in {str(r.receipt_id) for r in changed}:
+            rec = session.get(models.Receipt, rid)
+            if rec is None:
+                continue
+            try:
+                _settle_tracked_receipt(session, rec, cfg)
+            except Exception:
+                session.rollback()
+
+        if anchor_tracker.pending_remaining(session):
+            enqueue_anchor_tracker(anchor_tracker.ANCHOR_TRACKER_INTERVAL)
+    finally:
+        session.close()
+
+
+def sync_chain_index_job() -> None:
+    """Sync the local EvidenceAnchored index for all configured contracts; reschedules itself."""
+
+    from . import chain_index
+    from .queue import clear_chain_index_sync_marker, enqueue_chain_index_sync
+
+    clear_chain_index_sync_marker()
+
+    session = db.SessionLocal()
+    try:
+        chain_index.sync_all(session, load_config(session))
+    finally:
+        session.close()
+        if chain_index.CHAIN_INDEX_ENABLED:
+            enqueue_chain_index_sync(chain_index.CHAIN_INDEX_INTERVAL)
+
+
 def process_receipt_job(
     receipt_id: str,
     callback_url: Optional[str] = None,
@@ -165,19 +753,54 @@ def process_receipt_job(
             "created_at": rec.created_at,
         }
 
+        # Independent enrichment stages (remote hooks) run concurrently and are joined here.
+        comp_cfg = getattr(cfg, "compliance", None)
+        fx_cfg = getattr(cfg, "fx_policy", None)
+        fxp = getattr(fx_cfg, "provider", None)
+        fx_mode = getattr(fx_cfg, "mode", "none")
+        fx_base = getattr(fx_cfg, "base_ccy", None)
+
+        stage_list = [
+            stages.Stage(
+                name="travel_rule",
+                fn=lambda: compliance.evaluate_travel_rule(
+                    amount=receipt_dict.get("amount"),
+                    threshold=getattr(comp_cfg, "travel_rule_threshold", None),
+                    provider=getattr(comp_cfg, "travel_rule_provider", None),
+                ),
+                default=compliance.TravelRuleResult(decision="allow", reason="provider_error_ignored"),
+            ),
+            stages.Stage(
+                name="sanctions",
+                fn=lambda: compliance.check_sanctions(
+                    sender_wallet=receipt_dict.get("sender_wallet"),
+                    receiver_wallet=receipt_dict.get("receiver_wallet"),
+                    provider=getattr(comp_cfg, "sanctions_provider", None),
+                    metadata={"reference": receipt_dict.get("reference")},
+                ),
+                default=compliance.SanctionsResult(decision="allow", reason="provider_error_ignored"),
+            ),
+        ]
+        if fxp and fx_mode != "none":
+            fx_rpc = getattr(fx_cfg, "chainlink_rpc_url", None) or getattr(getattr(cfg, "ledger", None), "rpc_url", None)
+            stage_list.append(
+                stages.Stage(
+                    name="fx",
+                    fn=lambda: fx_providers.get_rate_detail(
+                        base_ccy=fx_base,
+                        quote_ccy=receipt_dict.get("currency"),
+                        provider=fxp,
+                        rpc_url=fx_rpc,
+                        feed=getattr(fx_cfg, "chainlink_feed", None),
+                    ),
+                )
+            )
+        stage_results = stages.run_stages(stage_list)
+
         # Compliance checks
         try:
-            tr = compliance.evaluate_travel_rule(
-                amount=receipt_dict.get("amount"),
-                threshold=getattr(getattr(cfg, "compliance", None), "travel_rule_threshold", None),
-                provider=getattr(getattr(cfg, "compliance", None), "travel_rule_provider", None),
-            )
-            sc = compliance.check_sanctions(
-                sender_wallet=receipt_dict.get("sender_wallet"),
-                receiver_wallet=receipt_dict.get("receiver_wallet"),
-                provider=getattr(getattr(cfg, "compliance", None), "sanctions_provider", None),
-                metadata={"reference": receipt_dict.get("reference")},
-            )
+            tr = stage_results["travel_rule"].value
+            sc = stage_results["sanctions"].value
             comp = {
                 "travel_rule": {"decision": tr.decision, "reason": tr.reason},
                 "sanctions": {"decision": sc.decision, "reason": sc.reason},
@@ -190,8 +813,8 @@ def process_receipt_job(
                 json.dumps(comp, separators=(",", ":"), default=str).encode("utf-8"),
             )
 
-            enforce_tr = getattr(getattr(cfg, "compliance", None), "travel_rule_enforce", False)
-            enforce_sc = getattr(getattr(cfg, "compliance", None), "sanctions_enforce", False)
+            enforce_tr = getattr(comp_cfg, "travel_rule_enforce", False)
+            enforce_sc = getattr(comp_cfg, "sanctions_enforce", False)
             if (enforce_tr and getattr(tr, "decision", "allow") == "deny") or (
                 enforce_sc and getattr(sc, "decision", "allow") == "deny"
             ):
@@ -203,19 +826,12 @@ def process_receipt_job(
 
         # FX enrichment helper artifact
         try:
-            fxp = getattr(getattr(cfg, "fx_policy", None), "provider", None)
-            mode = getattr(getattr(cfg, "fx_policy", None), "mode", "none")
-            if fxp and mode != "none":
-                base = getattr(getattr(cfg, "fx_policy", None), "base_ccy", None)
-                ccy = receipt_dict.get("currency")
-                feed = getattr(getattr(cfg, "fx_policy", None), "chainlink_feed", None)
-                rpc = getattr(getattr(cfg, "fx_policy", None), "chainlink_rpc_url", None) or getattr(
-                    getattr(cfg, "ledger", None), "rpc_url", None
-                )
-                detail = fx_providers.get_rate_detail(base_ccy=base, quote_ccy=ccy, provider=fxp, rpc_url=rpc, feed=feed)
+            fx_res = stage_results.get("fx")
+            if fx_res is not None and fx_res.ok and fx_res.value is not None:
+                detail = fx_res.value
                 fx_info = {
-                    "base_ccy": base,
-                    "quote_ccy": ccy,
+                    "base_ccy": fx_base,
+                    "quote_ccy": receipt_dict.get("currency"),
                     "provider": fxp,
                     "rate": detail.get("rate"),
                     "source": detail.get("source"),
@@ -255,14 +871,14 @@ def process_receipt_job(
                     refund_id=str(rec.id),
                     reason_code=reason_code
                 )
-                _write_iso_artifact(session, str(rec.id), "pacs.004", "pacs004.xml", xml_bytes)
+                _, xml_sha256 = _write_iso_artifact(session, str(rec.id), "pacs.004", "pacs004.xml", xml_bytes)
             else:
                 # Fallback if original not found
                 xml_bytes = iso_pain001.generate_pain001_with_fx(receipt_dict, cfg)
-                _write_iso_artifact(session, str(rec.id), "pain.001", "pain001.xml", xml_bytes)
+                _, xml_sha256 = _write_iso_artifact(session, str(rec.id), "pain.001", "pain001.xml", xml_bytes)
         else:
             xml_bytes = iso_pain001.generate_pain001_with_fx(receipt_dict, cfg)
-            _write_iso_artifact(session, str(rec.id), "pain.001", "pain001.xml", xml_bytes)
+            _, xml_sha256 = _write_iso_artifact(session, str(rec.id), "pain.001", "pain001.xml", xml_bytes)
 
         # Optional remittance
         try:
@@ -273,7 +889,10 @@ def process_receipt_job(
             pass
 
         # Create deterministic evidence bundle (and manifest signature)
-        zip_path, bundle_hash = bundle.create_bundle(receipt_dict, xml_bytes)
+        bundle_version = str(getattr(getattr(cfg, "evidence", None), "bundle_version", None) or bundle.BUNDLE_V1)
+        zip_path, bundle_hash = bundle.create_bundle(
+            receipt_dict, xml_bytes, xml_sha256=xml_sha256, version=bundle_version
+        )
         rec.bundle_hash = bundle_hash
         session.commit()
 
@@ -308,97 +927,49 @@ def process_receipt_job(
         if exec_mode == "tenant":
             rec.status = "awaiting_anchor"
             session.commit()
-            # SSE notify
-            try:
-                evt_payload = {
-                    "receipt_id": str(rec.id),
-                    "status": rec.status,
-                    "bundle_hash": rec.bundle_hash,
-                    "flare_txid": rec.flare_txid,
-                    "xml_url": f"/files/{rec.id}/pain001.xml",
-                    "bundle_url": f"/files/{rec.id}/evidence.zip",
-                    "created_at": rec.created_at.isoformat() if rec.created_at else None,
-                    "anchored_at": rec.anchored_at.isoformat() if rec.anchored_at else None,
-                }
-                anyio.from_thread.run(hub.publish, str(rec.id), evt_payload)  # type: ignore
-            except Exception:
-                pass
+            _publish_receipt_event(rec)
             return
 
-        # Platform mode anchoring:
-        # - Prefer per-project chains (project override) when present
-        # - Else fall back to org config chains
-        proj_chains = _project_anchoring_chains(session, rec)
-        org_chains = list(getattr(getattr(cfg, "anchoring", None), "chains", []) or [])
-
-        chains_src: list[dict] = []
-        if proj_chains:
-            chains_src = proj_chains
-        elif org_chains:
-            for ch in org_chains:
-                chains_src.append(
-                    {
-                        "name": getattr(ch, "name", None),
-                        "contract": getattr(ch, "contract", None),
-                        "rpc_url": getattr(ch, "rpc_url", None),
-                        "explorer_base_url": getattr(ch, "explorer_base_url", None),
-                    }
-                )
+        chains_src = _resolve_anchoring_chains(session, rec, cfg)
 
-        if not chains_src:
-            # Last resort (keeps backwards compatibility)
-            chains_src = [
-                {
-                    "name": rec.chain or "flare",
-                    "contract": os.getenv("ANCHOR_CONTRACT_ADDR") or "0x0690d8cFb1897c12B2C0b34660edBDE4E20ff4d8",
-                    "rpc_url": os.getenv("FLARE_RPC_URL"),
-                }
-            ]
+        # Batch mode: park the receipt until a Merkle root covering it is anchored.
+        batch_cfg = getattr(getattr(cfg, "anchoring", None), "batch", None)
+        if getattr(batch_cfg, "enabled", False):
+            _enqueue_receipt_for_batch(session, rec, bundle_hash, callback_url, batch_cfg)
+            return
 
-        successes = 0
         pk = _resolve_anchor_pk(cfg)
+        mode, quorum = _anchoring_policy(session, rec, cfg)
+        quorum = _clamp_quorum(quorum, len(chains_src), rec)
+        chain_params = [_chain_anchor_params(ch, cfg, pk) for ch in chains_src]
+        min_conf = _min_confirmations(cfg)
+
+        # Async confirmation: submit only; the tracker job settles the receipt later.
+        if getattr(getattr(cfg, "anchoring", None), "confirm_mode", "inline") == "async":
+            if _submit_for_tracking(session, rec, chain_params, bundle_hash, callback_url):
+                return
+            successes = 0
+        elif mode == "concurrent" and len(chain_params) > 1:
+            successes = _anchor_chains_concurrently(session, rec, chain_params, bundle_hash, quorum, min_conf)
+        else:
+            successes = 0
+            for params in chain_params:
+                try:
+                    txid, block = _anchor_on_chain(params, bundle_hash, min_conf)
+                    _record_chain_anchor(
+                        session,
+                        rec,
+                        params["name"],
+                        txid,
+                        block_number=block,
+                        rpc_url=params["rpc_url"],
+                        contract=params["contract"],
+                    )
+                    successes += 1
+                except Exception:
+                    session.rollback()
 
-        from . import anchor as anchor_py  # type: ignore
-
-        for ch in chains_src:
-            try:
-                rpc_url = (
-                    (ch.get("rpc_url") if isinstance(ch, dict) else None)
-                    or getattr(getattr(cfg, "ledger", None), "rpc_url", None)
-                    or os.getenv("FLARE_RPC_URL")
-                )
-                contract_addr = (
-                    (ch.get("contract") if isinstance(ch, dict) else None)
-                    or os.getenv("ANCHOR_CONTRACT_ADDR")
-                    or "0x0690d8cFb1897c12B2C0b34660edBDE4E20ff4d8"
-                )
-                chain_name = (ch.get("name") if isinstance(ch, dict) else None) or "unknown"
-
-                txid, _block = anchor_py.anchor_bundle(
-                    bundle_hash,
-                    rpc_url=rpc_url,
-                    contract_addr=contract_addr,
-                    private_key=pk,
-                    abi_path=os.getenv("ANCHOR_ABI_PATH"),
-                    lookback_blocks=int(os.getenv("ANCHOR_LOOKBACK_BLOCKS", "50000")),
-                )
-
-                now = datetime.utcnow()
-                if not rec.flare_txid:
-                    rec.flare_txid = txid
-                if not rec.anchored_at:
-                    rec.anchored_at = now
-
-                session.add(
-                    models.ChainAnchor(receipt_id=str(rec.id), chain=str(chain_name), txid=txid, anchored_at=now)
-                )
-                session.commit()
-
-                successes += 1
-            except Exception:
-                session.rollback()
-
-        if successes > 0:
+        if successes >= quorum:
             rec.status = "anchored"
             session.commit()
             anchored = True
@@ -406,80 +977,7 @@ def process_receipt_job(
             rec.status = "failed"
             session.commit()
 
-        # Status/extra ISO artifacts
-        try:
-            payload2 = {
-                "id": str(rec.id),
-                "reference": rec.reference,
-                "tip_tx_hash": rec.tip_tx_hash,
-                "chain": rec.chain,
-                "amount": rec.amount,
-                "currency": rec.currency,
-                "sender_wallet": rec.sender_wallet,
-                "receiver_wallet": rec.receiver_wallet,
-                "status": rec.status,
-                "created_at": rec.created_at,
-                "anchored_at": rec.anchored_at,
-                "flare_txid": rec.flare_txid,
-                "bundle_hash": rec.bundle_hash,
-            }
-            p002_bytes = iso_pain002.generate_pain002(payload2)
-            _write_iso_artifact(session, str(rec.id), "pain.002", "pain002.xml", p002_bytes)
-            if getattr(getattr(cfg, "status", None), "emit_pacs002", False):
-                try:
-                    p2i = iso_pacs002.generate_pacs002(payload2)
-                    _write_iso_artifact(session, str(rec.id), "pacs.002", "pacs002.xml", p2i)
-                except Exception:
-                    pass
-            if anchored:
-                c054_bytes = iso_camt054.generate_camt054(payload2)
-                _write_iso_artifact(session, str(rec.id), "camt.054", "camt054.xml", c054_bytes)
-        except Exception:
-            pass
-
-        # Persist primary artifact paths
-        rec.xml_path = f"{ARTIFACTS_DIR}/{rec.id}/pain001.xml"
-        rec.bundle_path = f"{ARTIFACTS_DIR}/{rec.id}/evidence.zip"
-        session.commit()
-
-        # SSE notify (best-effort)
-        try:
-            evt_payload = {
-                "receipt_id": str(rec.id),
-                "status": rec.status,
-                "bundle_hash": rec.bundle_hash,
-                "flare_txid": rec.flare_txid,
-                "xml_url": f"/files/{rec.id}/pain001.xml",
-                "bundle_url": f"/files/{rec.id}/evidence.zip",
-                "created_at": rec.created_at.isoformat() if rec.created_at else None,
-                "anchored_at": rec.anchored_at.isoformat() if rec.anchored_at else None,
-            }
-            anyio.from_thread.run(hub.publish, str(rec.id), evt_payload)  # type: ignore
-        except Exception:
-            pass
-
-        # Optional callback
-        if callback_url:
-            try:
-                import requests
-
-                cb_payload = {
-                    "receipt_id": str(rec.id),
-                    "status": rec.status,
-                    "bundle_hash": rec.bundle_hash,
-                    "flare_txid": rec.flare_txid,
-                    "xml_url": f"/files/{rec.id}/pain001.xml",
-                    "bundle_url": f"/files/{rec.id}/evidence.zip",
-                    "created_at": rec.created_at.isoformat() if rec.created_at else None,
-                    "anchored_at": rec.anchored_at.isoformat() if rec.anchored_at else None,
-                }
-                base_url = os.getenv("PUBLIC_BASE_URL")
-                if base_url:
-                    cb_payload["xml_url"] = f"{base_url}{cb_payload['xml_url']}"
-                    cb_payload["bundle_url"] = f"{base_url}{cb_payload['bundle_url']}"
-                requests.post(callback_url, json=cb_payload, timeout=15)
-            except Exception:
-                pass
+        _finalize_receipt(session, rec, cfg, anchored=anchored, callback_url=callback_url)
 
     except Exception:
         if rec is not None:
@@ -0,0 +1,194 @@
+"""Process-wide cache of the Ed25519 signing keys.
+
+Bundle (SERVICE_PRIVATE_KEY / SERVICE_PUBLIC_KEY or the .keys/ dev pair) and VC
+(VC_PRIVATE_KEY) keys are read and parsed once per process. After rotating the key
+files, call `reload()` -- via SIGHUP (`install_reload_signal`) or
+POST /v1/keys/reload -- to pick up the new keys without a restart.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import signal
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from nacl import signing
+except Exception:  # pragma: no cover
+    signing = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+KEYS_DIR = Path(".keys")
+DEV_SK_HEX = KEYS_DIR / "service_sk.hex"
+DEV_PK_PEM = KEYS_DIR / "service_pk.pem"
+
+_UNAVAILABLE_PEM = "-----BEGIN ED25519 PUBLIC KEY-----\nUNAVAILABLE\n-----END ED25519 PUBLIC KEY-----\n"
+
+
+@dataclass(frozen=True)
+class ServiceKey:
+    signing_key: Any
+    public_raw: bytes
+    pem: str
+    pem_bytes: bytes
+    key_id: str
+
+
+# Re-entrant: the SIGHUP handler runs on the main thread, possibly while it holds the lock.
+_LOCK = threading.RLock()
+_SERVICE: Optional[ServiceKey] = None
+_VC: Optional[Any] = None
+_VC_LOADED = False
+
+
+def _to_pem(pk_raw: bytes) -> str:
+    b64 = base64.b64encode(pk_raw).decode("ascii")
+    wrapped = "\n".join(b64[i : i + 64] for i in range(0, len(b64), 64))
+    return "-----BEGIN ED25519 PUBLIC KEY-----\n" + wrapped + "\n-----END ED25519 PUBLIC KEY-----\n"
+
+
+def key_id_for(pk_raw: bytes) -> str:
+    """Short, stable id of a public key: 'ed25519:' + first 16 hex chars of sha256(raw key)."""
+
+    if not pk_raw:
+        return "ed25519:unavailable"
+    return "ed25519:" + hashlib.sha256(pk_raw).hexdigest()[:16]
+
+
+def _seed_from_hex(text: str, name: str) -> bytes:
+    seed = bytes.fromhex(text.strip().lower().replace("0x", ""))
+    if len(seed) not in (32, 64):
+        raise ValueError(f"{name} must contain 32-byte hex seed or 64-byte expanded key")
+    return seed[:32]
+
+
+def _load_service_key() -> ServiceKey:
+    """Preference:
+    1) SERVICE_PRIVATE_KEY (hex seed) + SERVICE_PUBLIC_KEY (PEM) file paths via env
+    2) Dev fallback: generate keypair into .keys/
+    """
+
+    if signing is None:  # type: ignore
+        # Deterministic placeholders; signature verification will be skipped.
+        class _DummySK:
+            def sign(self, data: bytes):
+                class _Sig:
+                    signature = b""
+
+                return _Sig()
+
+        return ServiceKey(_DummySK(), b"", _UNAVAILABLE_PEM, _UNAVAILABLE_PEM.encode("utf-8"), key_id_for(b""))
+
+    sk_path = os.getenv("SERVICE_PRIVATE_KEY")
+    pk_path = os.getenv("SERVICE_PUBLIC_KEY")
+
+    # 1) Use provided keys
+    if sk_path and Path(sk_path).exists():
+        sk = signing.SigningKey(_seed_from_hex(Path(sk_path).read_text(), "SERVICE_PRIVATE_KEY"))
+        pk_raw = sk.verify_key.encode()
+        if pk_path and Path(pk_path).exists():
+            pem_text = Path(pk_path).read_text(encoding="utf-8")
+        else:
+            pem_text = _to_pem(pk_raw)
+    # 2) Dev fallback: generate and persist locally
+    elif DEV_SK_HEX.exists() and DEV_PK_PEM.exists():
+        sk = signing.SigningKey(bytes.fromhex(DEV_SK_HEX.read_text().strip()))
+        pk_raw = sk.verify_key.encode()
+        pem_text = DEV_PK_PEM.read_text(encoding="utf-8")
+    else:
+        KEYS_DIR.mkdir(parents=True, exist_ok=True)
+        sk = signing.SigningKey.generate()
+        pk_raw = sk.verify_key.encode()
+        pem_text = _to_pem(pk_raw)
+        DEV_SK_HEX.write_text(sk.encode().hex())
+        DEV_PK_PEM.write_text(pem_text)
+
+    return ServiceKey(sk, pk_raw, pem_text, pem_text.encode("utf-8"), key_id_for(pk_raw))
+
+
+def _load_vc_key() -> Optional[Any]:
+    if signing is None:  # type: ignore
+        return None
+    key_hex = os.getenv("VC_PRIVATE_KEY")  # 64 hex characters for Ed25519 private key (seed)
+    if not key_hex:
+        return None
+    try:
+        return signing.SigningKey(_seed_from_hex(key_hex, "VC_PRIVATE_KEY"))
+    except Exception:
+        return None
+
+
+def service_key() -> ServiceKey:
+    """Bundle signing key, loaded on first use and cached for the process."""
+
+    global _SERVICE
+    key = _SERVICE
+    if key is not None:
+        return key
+    with _LOCK:
+        if _SERVICE is None:
+            _SERVICE = _load_service_key()
+        return _SERVICE
+
+
+def vc_signing_key() -> Optional[Any]:
+    """VC issuer key from VC_PRIVATE_KEY (None when unset or invalid), cached for the process."""
+
+    global _VC, _VC_LOADED
+    if _VC_LOADED:
+        return _VC
+    with _LOCK:
+        if not _VC_LOADED:
+            _VC = _load_vc_key()
+            _VC_LOADED = True
+        return _VC
+
+
+def reload() -> Dict[str, Any]:
+    """Re-read all keys (after rotation). A failed load keeps the previous keys."""
+
+    global _SERVICE, _VC, _VC_LOADED
+    new_service = _load_service_key()
+    new_vc = _load_vc_key()
+    with _LOCK:
+        previous = _SERVICE.key_id if _SERVICE is not None else None
+        _SERVICE, _VC, _VC_LOADED = new_service, new_vc, True
+    if previous != new_service.key_id:
+        logger.info("signing key reloaded: %s -> %s", previous, new_service.key_id)
+    return info()
+
+
+def info() -> Dict[str, Any]:
+    key = service_key()
+    vc = vc_signing_key()
+    return {
+        "key_id": key.key_id,
+        "public_key_pem": key.pem,
+        "vc_key_id": key_id_for(vc.verify_key.encode()) if vc is not None else None,
+    }
+
+
+def install_reload_signal() -> bool:
+    """Reload keys on SIGHUP. Only possible from the main thread; returns False otherwise."""
+
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def _on_sighup(signum, frame):  # noqa: ARG001
+        try:
+            reload()
+        except Exception as e:
+            logger.warning("signing key reload failed, keeping previous keys: %s", e)
+
+    try:
+        signal.signal(signal.SIGHUP, _on_sighup)
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,148 @@
+"""Range-split eth_getLogs scanning.
+
+A single `get_logs` over the whole lookback window is rejected or times out on many
+public RPCs ("block range too large", "query returned more than 10000 results").
+`iter_logs` splits the range into provider-sized windows, fetches several windows
+concurrently and yields them in scan order (newest-first by default), so callers can
+stop as soon as they find what they are looking for.
+
+On a range error a window is split in half and retried; the smaller size is remembered
+per endpoint so later scans start from a window the provider accepts. Anything else
+(or a window that cannot be split further) raises `LogScanError` instead of silently
+returning no logs.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LOG_SCAN_CHUNK_BLOCKS = int(os.getenv("LOG_SCAN_CHUNK_BLOCKS", "5000"))
+LOG_SCAN_MIN_CHUNK_BLOCKS = int(os.getenv("LOG_SCAN_MIN_CHUNK_BLOCKS", "16"))
+LOG_SCAN_CONCURRENCY = int(os.getenv("LOG_SCAN_CONCURRENCY", "4"))
+LOG_SCAN_RETRIES = int(os.getenv("LOG_SCAN_RETRIES", "1"))
+
+_RANGE_ERROR_HINTS = (
+    "range",
+    "too large",
+    "too many",
+    "more than",
+    "limit exceeded",
+    "exceeds",
+    "response size",
+    "query timeout",
+    "10000 results",
+)
+
+_LOCK = threading.Lock()
+_CHUNKS: Dict[str, int] = {}
+
+
+class LogScanError(RuntimeError):
+    """A block window could not be fetched; the scan result would be incomplete."""
+
+
+def is_range_error(exc: BaseException) -> bool:
+    """Heuristic for provider errors that mean "ask for fewer blocks"."""
+
+    msg = str(exc).lower()
+    if not msg and getattr(exc, "args", None):
+        msg = str(exc.args[0]).lower()
+    return any(h in msg for h in _RANGE_ERROR_HINTS)
+
+
+def _endpoint(w3) -> str:
+    return str(getattr(getattr(w3, "provider", None), "endpoint_uri", None) or id(w3))
+
+
+def chunk_size(w3, default: Optional[int] = None) -> int:
+    """Window size to start with for this endpoint (shrinks as the provider pushes back)."""
+
+    return _CHUNKS.get(_endpoint(w3), int(default or LOG_SCAN_CHUNK_BLOCKS))
+
+
+def _shrink(w3, size: int) -> None:
+    key = _endpoint(w3)
+    with _LOCK:
+        _CHUNKS[key] = min(_CHUNKS.get(key, size), max(1, size))
+
+
+def get_logs_range(w3, params: Dict[str, Any], from_block: int, to_block: int) -> List[Any]:
+    """All logs in [from_block, to_block], splitting the range while the provider refuses it."""
+
+    attempts = 0
+    while True:
+        try:
+            return list(w3.eth.get_logs({**params, "fromBlock": int(from_block), "toBlock": int(to_block)}))
+        except Exception as e:
+            span = int(to_block) - int(from_block) + 1
+            if is_range_error(e) and span > max(1, LOG_SCAN_MIN_CHUNK_BLOCKS):
+                mid = int(from_block) + span // 2
+                _shrink(w3, span // 2)
+                return get_logs_range(w3, params, from_block, mid - 1) + get_logs_range(w3, params, mid, to_block)
+            if attempts < LOG_SCAN_RETRIES and not is_range_error(e):
+                attempts += 1
+                continue
+            raise LogScanError(f"get_logs failed for blocks {from_block}-{to_block}: {type(e).__name__}") from e
+
+
+def windows(from_block: int, to_block: int, size: int, *, newest_first: bool = True) -> List[Tuple[int, int]]:
+    size = max(1, int(size))
+    out = []
+    if newest_first:
+        hi = int(to_block)
+        while hi >= int(from_block):
+            lo = max(int(from_block), hi - size + 1)
+            out.append((lo, hi))
+            hi = lo - 1
+    else:
+        lo = int(from_block)
+        while lo <= int(to_block):
+            hi = min(int(to_block), lo + size - 1)
+            out.append((lo, hi))
+            lo = hi + 1
+    return out
+
+
+def iter_logs(
+    w3,
+    params: Dict[str, Any],
+    from_block: int,
+    to_block: int,
+    *,
+    newest_first: bool = True,
+    chunk_blocks: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Iterator[Tuple[Tuple[int, int], List[Any]]]:
+    """Yield ((lo, hi), logs) per window in scan order; logs within a window are as returned.
+
+    Up to `concurrency` windows are in flight; closing the generator early (e.g. `break`
+    after a match) cancels the windows that have not started yet.
+    """
+
+    if from_block > to_block:
+        return
+    spans = windows(from_block, to_block, chunk_size(w3, chunk_blocks), newest_first=newest_first)
+    workers = max(1, int(concurrency or LOG_SCAN_CONCURRENCY))
+    if workers == 1 or len(spans) == 1:
+        for lo, hi in spans:
+            yield (lo, hi), get_logs_range(w3, params, lo, hi)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(spans)), thread_name_prefix="log-scan")
+    inflight: List[Tuple[Tuple[int, int], Future]] = []
+    nxt = 0
+    try:
+        while nxt < len(spans) or inflight:
+            while nxt < len(spans) and len(inflight) < workers:
+                lo, hi = spans[nxt]
+                inflight.append(((lo, hi), pool.submit(get_logs_range, w3, params, lo, hi)))
+                nxt += 1
+            span, fut = inflight.pop(0)
+            yield span, fut.result()
+    finally:
+        for _, fut in inflight:
+            fut.cancel()
+        pool.shutdown(wait=False)
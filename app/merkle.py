@@ -0,0 +1,117 @@
+"""Binary Merkle trees over 32-byte hashes (SHA-256).
+
+Used to anchor many bundle hashes with a single on-chain transaction.
+
+Construction (RFC 6962 style, domain separated):
+- leaf node     = sha256(0x00 || leaf)
+- interior node = sha256(0x01 || left || right)
+- an odd node at the end of a level is promoted unchanged to the next level
+
+Proofs are lists of {"position": "left"|"right", "hash": "0x..."} from leaf to root,
+where position is the side the sibling sits on.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Sequence
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def _to_bytes32(val: Any) -> bytes:
+    if isinstance(val, (bytes, bytearray)):
+        b = bytes(val)
+    elif isinstance(val, str):
+        body = val[2:] if val.startswith("0x") else val
+        b = bytes.fromhex(body)
+    else:
+        raise ValueError("hash must be bytes or hex string")
+    if len(b) != 32:
+        raise ValueError("hash must be 32 bytes")
+    return b
+
+
+def _hex(b: bytes) -> str:
+    return "0x" + b.hex()
+
+
+def hash_leaf(leaf: Any) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + _to_bytes32(leaf)).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _levels(leaves: Sequence[Any]) -> List[List[bytes]]:
+    if not leaves:
+        raise ValueError("cannot build a Merkle tree without leaves")
+    level = [hash_leaf(x) for x in leaves]
+    levels = [level]
+    while len(level) > 1:
+        nxt: List[bytes] = []
+        for i in range(0, len(level) - 1, 2):
+            nxt.append(hash_node(level[i], level[i + 1]))
+        if len(level) % 2 == 1:
+            nxt.append(level[-1])
+        levels.append(nxt)
+        level = nxt
+    return levels
+
+
+def merkle_root(leaves: Sequence[Any]) -> str:
+    """Return the 0x-prefixed root over the given 32-byte leaves (order matters)."""
+    return _hex(_levels(leaves)[-1][0])
+
+
+def merkle_proofs(leaves: Sequence[Any]) -> tuple[str, List[List[Dict[str, str]]]]:
+    """Return (root, proofs) where proofs[i] proves inclusion of leaves[i]."""
+
+    levels = _levels(leaves)
+    proofs: List[List[Dict[str, str]]] = []
+    for idx in range(len(leaves)):
+        path: List[Dict[str, str]] = []
+        i = idx
+        for level in levels[:-1]:
+            sib = i ^ 1
+            if sib < len(level):
+                path.append({"position": "left" if sib < i else "right", "hash": _hex(level[sib])})
+            i //= 2
+        proofs.append(path)
+    return _hex(levels[-1][0]), proofs
+
+
+def verify_proof(leaf: Any, proof: Sequence[Dict[str, str]], root: Any) -> bool:
+    """Check that `leaf` is included under `root` using `proof`."""
+
+    try:
+        h = hash_leaf(leaf)
+        for step in proof or []:
+            sib = _to_bytes32(step.get("hash"))
+            pos = step.get("position")
+            if pos == "left":
+                h = hash_node(sib, h)
+            elif pos == "right":
+                h = hash_node(h, sib)
+            else:
+                return False
+        return h == _to_bytes32(root)
+    except Exception:
+        return False
+
+
+def root_for_proof(leaf: str, proof_doc: Dict[str, Any]) -> str:
+    """Return the root committed to by a `merkle_proof.json` document for `leaf`.
+
+    Raises ValueError when the document does not prove inclusion of `leaf`.
+    """
+
+    doc_leaf = proof_doc.get("leaf") or leaf
+    if str(doc_leaf).lower() != str(leaf).lower():
+        raise ValueError("merkle_proof_leaf_mismatch")
+    root = proof_doc.get("root")
+    if not root or not verify_proof(leaf, proof_doc.get("proof") or [], root):
+        raise ValueError("merkle_proof_invalid")
+    return str(root)
@@ -4,9 +4,11 @@ import uuid
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Column,
     DateTime,
     ForeignKey,
+    Integer,
     Numeric,
     String,
     UniqueConstraint,
@@ -73,13 +75,15 @@ class Receipt(Base):
 
     status = Column(String, nullable=False)  # pending/anchored/failed
 
-    bundle_hash = Column(String, nullable=True)  # 0x-prefixed sha256 of zip
+    bundle_hash = Column(String, nullable=True, index=True)  # 0x-prefixed sha256 of zip
     flare_txid = Column(String, nullable=True)
 
     xml_path = Column(String, nullable=True)
     bundle_path = Column(String, nullable=True)
     # If this receipt represents a return/refund, reference the original receipt
     refund_of = Column(GUID, ForeignKey("receipts.id"), nullable=True)
+    # Callback target kept for pipelines that complete outside the originating job (batch anchoring)
+    callback_url = Column(String, nullable=True)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     anchored_at = Column(DateTime(timezone=True), nullable=True)
@@ -109,6 +113,81 @@ class ChainAnchor(Base):
     chain = Column(String, nullable=False)
     txid = Column(String, nullable=False)
     anchored_at = Column(DateTime(timezone=True), nullable=True)
+    # Submit/confirm split: async-confirmed rows start "pending"; inline rows are born "confirmed".
+    status = Column(String, nullable=False, default="confirmed", server_default="confirmed", index=True)
+    block_number = Column(Integer, nullable=True)
+    block_hash = Column(String, nullable=True)
+    rpc_url = Column(String, nullable=True)
+    contract = Column(String, nullable=True)
+    submitted_at = Column(DateTime(timezone=True), nullable=True)
+    # Nonce manager entry of an async submission (its tx hash changes when fee-bumped).
+    chain_id = Column(Integer, nullable=True)
+    signer = Column(String, nullable=True)
+    nonce = Column(Integer, nullable=True)
+
+
+class AnchorBatch(Base):
+    """A Merkle root anchored once on behalf of many receipts."""
+
+    __tablename__ = "anchor_batches"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4, nullable=False)
+    project_id = Column(GUID, ForeignKey("projects.id"), nullable=True, index=True)
+    merkle_root = Column(String, nullable=True, index=True)  # 0x-prefixed root over member bundle hashes
+    size = Column(Integer, nullable=False, server_default="0")
+    status = Column(String, nullable=False, server_default="pending")  # pending | anchored | failed
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    anchored_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class AnchorBatchItem(Base):
+    """A receipt waiting for (or included in) a batch anchor."""
+
+    __tablename__ = "anchor_batch_items"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4, nullable=False)
+    receipt_id = Column(GUID, ForeignKey("receipts.id"), nullable=False, unique=True)
+    batch_id = Column(GUID, ForeignKey("anchor_batches.id"), nullable=True, index=True)
+    bundle_hash = Column(String, nullable=False)
+    leaf_index = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class EvidenceEvent(Base):
+    """Local copy of an on-chain EvidenceAnchored event (see chain_index.py)."""
+
+    __tablename__ = "evidence_events"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4, nullable=False)
+    chain = Column(String, nullable=False)
+    contract = Column(String, nullable=False)  # lowercased 0x address
+    bundle_hash = Column(String, nullable=False, index=True)  # lowercased 0x-prefixed bytes32
+    txid = Column(String, nullable=False)
+    log_index = Column(Integer, nullable=False)
+    block_number = Column(BigInteger, nullable=False, index=True)
+    block_hash = Column(String, nullable=True)
+    sender = Column(String, nullable=True)
+    anchored_at = Column(DateTime(timezone=True), nullable=True)  # event `ts`
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (UniqueConstraint("chain", "txid", "log_index", name="uq_evidence_event_log"),)
+
+
+class IndexCursor(Base):
+    """Per (chain, contract) sync position of the EvidenceAnchored indexer."""
+
+    __tablename__ = "index_cursors"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4, nullable=False)
+    chain = Column(String, nullable=False)
+    contract = Column(String, nullable=False)
+    rpc_url = Column(String, nullable=True)
+    first_block = Column(BigInteger, nullable=True)  # indexed range is [first_block, last_block]
+    last_block = Column(BigInteger, nullable=False)
+    last_block_hash = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint("chain", "contract", name="uq_index_cursor_chain_contract"),)
 
 
 class OrgConfig(Base):
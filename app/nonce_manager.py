@@ -0,0 +1,203 @@
+"""Shared nonce allocation for anchor transactions.
+
+Every RQ worker signing with the same key on the same chain draws nonces from Redis,
+so transactions can be pipelined (many in flight) instead of each call asking the
+node for `get_transaction_count(..., "pending")` and racing the other workers.
+
+State per (chain_id, address), under `nonce:{chain_id}:{address}`:
+- `:next`      next never-used nonce (INCR)
+- `:free`      ZSET of nonces handed back before broadcast (gaps refilled first)
+- `:inflight`  HASH nonce -> JSON {state: reserved|sent, ts, tx_hash, tx, bumps, hashes}
+               (`hashes`: every tx hash broadcast for the nonce once it was replaced)
+- `:settled:N` last inflight entry of a consumed nonce N, kept NONCE_SETTLED_TTL seconds so
+               a waiter can still learn which (possibly replaced) tx hash used it
+
+`reconcile()` resyncs with the chain, recycles reservations whose holder died, and
+reports broadcast transactions that have been pending too long so the caller can
+replace them with a fee bump.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+NONCE_MANAGER = os.getenv("NONCE_MANAGER", "redis").strip().lower()  # redis | off
+NONCE_STUCK_SECONDS = int(os.getenv("NONCE_STUCK_SECONDS", "60"))
+NONCE_RESERVE_TTL = int(os.getenv("NONCE_RESERVE_TTL", "120"))
+NONCE_RECONCILE_INTERVAL = int(os.getenv("NONCE_RECONCILE_INTERVAL", "15"))
+NONCE_MAX_BUMPS = int(os.getenv("NONCE_MAX_BUMPS", "5"))
+NONCE_SETTLED_TTL = int(os.getenv("NONCE_SETTLED_TTL", "3600"))
+# Replacement txs must outbid the original; most clients require >= +10%.
+FEE_BUMP_PERCENT = int(os.getenv("NONCE_FEE_BUMP_PERCENT", "15"))
+
+# SET key to max(current, ARGV[1]) atomically.
+_RAISE_TO_LUA = """
+local cur = tonumber(redis.call('GET', KEYS[1]) or '-1')
+local want = tonumber(ARGV[1])
+if want > cur then
+  redis.call('SET', KEYS[1], want)
+  return want
+end
+return cur
+"""
+
+
+def bump_fees(tx: Dict[str, Any], current: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    """Return a copy of `tx` priced to replace it (same nonce), never below `current` fees."""
+
+    out = dict(tx)
+    mult = 100 + FEE_BUMP_PERCENT
+    if "maxFeePerGas" in out:
+        prio = int(out.get("maxPriorityFeePerGas") or 0) * mult // 100 + 1
+        fee = int(out["maxFeePerGas"]) * mult // 100 + 1
+        if current:
+            fee = max(fee, int(current[0]))
+            prio = max(prio, int(current[1]))
+        out["maxPriorityFeePerGas"] = prio
+        out["maxFeePerGas"] = max(fee, prio)
+    else:
+        price = int(out.get("gasPrice") or 0) * mult // 100 + 1
+        if current:
+            price = max(price, int(current[0]))
+        out["gasPrice"] = price
+    return out
+
+
+class NonceManager:
+    def __init__(self, redis, chain_id: int, address: str) -> None:
+        self.r = redis
+        self.chain_id = int(chain_id)
+        self.address = address
+        prefix = f"nonce:{self.chain_id}:{address.lower()}"
+        self.k_next = f"{prefix}:next"
+        self.k_free = f"{prefix}:free"
+        self.k_inflight = f"{prefix}:inflight"
+        self.k_reconcile = f"{prefix}:reconcile"
+        self.k_settled = f"{prefix}:settled"
+
+    # --- allocation ---
+
+    def acquire(self, w3) -> int:
+        """Reserve a nonce: lowest recycled gap first, else the next sequential one."""
+
+        if not self.r.exists(self.k_next):
+            self.r.set(self.k_next, int(w3.eth.get_transaction_count(self.address, "pending")), nx=True)
+
+        popped = self.r.zpopmin(self.k_free, 1)
+        if popped:
+            nonce = int(float(popped[0][0]))
+        else:
+            nonce = int(self.r.incr(self.k_next)) - 1
+        self._put(nonce, {"state": "reserved", "ts": time.time()})
+        return nonce
+
+    def mark_sent(self, nonce: int, tx_hash: str, tx: Dict[str, Any], *, bumps: int = 0) -> None:
+        entry: Dict[str, Any] = {"state": "sent", "ts": time.time(), "tx_hash": tx_hash, "tx": tx, "bumps": bumps}
+        if bumps:
+            # Replacement: any earlier broadcast for this nonce may still be the one mined.
+            prev = self.get(nonce) or {}
+            hashes = list(prev.get("hashes") or ([prev["tx_hash"]] if prev.get("tx_hash") else []))
+            entry["hashes"] = hashes + [tx_hash] if tx_hash not in hashes else hashes
+        self._put(nonce, entry)
+
+    def complete(self, nonce: int) -> None:
+        """Nonce is consumed on-chain (mined, or dropped for good)."""
+        self._settle([str(nonce)])
+
+    def release(self, nonce: int) -> None:
+        """Hand back a nonce that was never broadcast so the gap gets refilled."""
+        pipe = self.r.pipeline()
+        pipe.hdel(self.k_inflight, str(nonce))
+        pipe.zadd(self.k_free, {str(nonce): nonce})
+        pipe.execute()
+
+    def get(self, nonce: int) -> Optional[Dict[str, Any]]:
+        """Current entry of a nonce; for a recently consumed one, its last recorded entry."""
+        raw = self.r.hget(self.k_inflight, str(nonce)) or self.r.get(f"{self.k_settled}:{int(nonce)}")
+        return json.loads(raw) if raw else None
+
+    def inflight(self, nonce: int) -> bool:
+        """True while the nonce is reserved or broadcast and not yet consumed on-chain."""
+        return self.r.hget(self.k_inflight, str(nonce)) is not None
+
+    # --- chain sync ---
+
+    def resync(self, w3) -> int:
+        """Align with the chain; returns the confirmed ("latest") transaction count."""
+
+        latest = int(w3.eth.get_transaction_count(self.address, "latest"))
+        pending = int(w3.eth.get_transaction_count(self.address, "pending"))
+        self.r.eval(_RAISE_TO_LUA, 1, self.k_next, max(latest, pending))
+
+        # Anything below the confirmed count is settled one way or another.
+        self.r.zremrangebyscore(self.k_free, "-inf", latest - 1)
+        stale = [k for k in self.r.hkeys(self.k_inflight) if int(k) < latest]
+        if stale:
+            self._settle(stale)
+        return latest
+
+    def reconcile(self, w3, *, force: bool = False) -> List[Tuple[int, Dict[str, Any]]]:
+        """Resync, recycle dead reservations and return stuck (nonce, entry) pairs.
+
+        Throttled across workers to once per NONCE_RECONCILE_INTERVAL unless `force`.
+        """
+
+        if not force and not self.r.set(self.k_reconcile, b"1", nx=True, ex=max(1, NONCE_RECONCILE_INTERVAL)):
+            return []
+
+        latest = self.resync(w3)
+        now = time.time()
+        stuck: List[Tuple[int, Dict[str, Any]]] = []
+        for k, raw in (self.r.hgetall(self.k_inflight) or {}).items():
+            nonce = int(k)
+            try:
+                entry = json.loads(raw)
+            except Exception:
+                continue
+            age = now - float(entry.get("ts") or 0)
+            if entry.get("state") == "reserved":
+                # Holder crashed between acquire and broadcast: refill the gap.
+                if age > NONCE_RESERVE_TTL:
+                    self.release(nonce)
+            elif entry.get("state") == "sent" and nonce >= latest and age > NONCE_STUCK_SECONDS:
+                if int(entry.get("bumps") or 0) < NONCE_MAX_BUMPS:
+                    stuck.append((nonce, entry))
+        return sorted(stuck, key=lambda x: x[0])
+
+    def _settle(self, nonces: List[Any]) -> None:
+        """Drop nonces from `:inflight`, keeping their last entry readable through get()."""
+
+        pipe = self.r.pipeline()
+        for k in nonces:
+            raw = self.r.hget(self.k_inflight, k)
+            if raw:
+                pipe.set(f"{self.k_settled}:{int(k)}", raw, ex=max(1, NONCE_SETTLED_TTL))
+            pipe.hdel(self.k_inflight, k)
+        pipe.execute()
+
+    def _put(self, nonce: int, entry: Dict[str, Any]) -> None:
+        self.r.hset(self.k_inflight, str(nonce), json.dumps(entry, separators=(",", ":")))
+
+
+_REDIS = None
+
+
+def get_nonce_manager(chain_id: int, address: str) -> Optional[NonceManager]:
+    """Return a Redis-backed manager, or None (callers fall back to node-assigned nonces)."""
+
+    if NONCE_MANAGER in ("off", "0", "false", "none"):
+        return None
+    global _REDIS
+    try:
+        if _REDIS is None:
+            from .queue import get_redis
+
+            r = get_redis()
+            r.ping()
+            _REDIS = r
+        return NonceManager(_REDIS, chain_id, address)
+    except Exception:
+        return None
@@ -0,0 +1,387 @@
+"""Process-wide registry of RPC clients, keyed by endpoint.
+
+Building `Web3(HTTPProvider(url))` per call means a fresh TCP/TLS handshake for every
+anchor, verify or FX lookup, plus re-reading ABI files from disk. This module keeps:
+
+- one `Web3` per (rpc_url, timeout), backed by a pooled keep-alive `requests.Session`
+- parsed ABIs (re-read only when the file changes) and contract objects
+- `chain_id` per endpoint (it never changes for a URL)
+- per-endpoint call/error/latency counters, exposed via `/v1/health`
+
+An `rpc_url` may list several endpoints separated by commas ("https://a,https://b").
+Such a group gets a `MultiEndpointProvider`: reads go to the fastest healthy endpoint
+and are hedged to the next one if they take longer than that endpoint's usual
+(percentile) latency; writes fail over in order. The group string is used as the
+endpoint key everywhere else (DB rows, caches), so callers need not know about it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from web3 import HTTPProvider, Web3  # type: ignore
+from web3.providers.base import JSONBaseProvider  # type: ignore
+
+RPC_TIMEOUT = float(os.getenv("RPC_TIMEOUT", "30"))
+RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "32"))
+RPC_HEDGE_PERCENTILE = float(os.getenv("RPC_HEDGE_PERCENTILE", "95"))
+RPC_HEDGE_MIN_MS = float(os.getenv("RPC_HEDGE_MIN_MS", "50"))
+RPC_HEDGE_MAX_MS = float(os.getenv("RPC_HEDGE_MAX_MS", "2000"))
+RPC_HEDGE_DEFAULT_MS = float(os.getenv("RPC_HEDGE_DEFAULT_MS", "500"))  # until enough samples exist
+RPC_FAIL_THRESHOLD = int(os.getenv("RPC_FAIL_THRESHOLD", "3"))  # consecutive transport errors
+RPC_COOLDOWN_SECONDS = float(os.getenv("RPC_COOLDOWN_SECONDS", "30"))
+
+_LOCK = threading.Lock()
+_SESSIONS: Dict[str, requests.Session] = {}
+_WEB3: Dict[Tuple[str, float], Web3] = {}
+_ABIS: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_CONTRACTS: Dict[Tuple[str, str, str], Tuple[Web3, List[Dict[str, Any]], Any]] = {}
+_CHAIN_IDS: Dict[str, int] = {}
+_CHAIN_ID_LOCKS: Dict[str, threading.Lock] = {}
+_STATS: Dict[str, Dict[str, Any]] = {}
+_HEALTH: Dict[str, "_Health"] = {}
+
+_EWMA_ALPHA = 0.2
+_WRITE_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction"}
+# Filters live on one node: keep them on the first configured endpoint.
+_STICKY_METHODS = {
+    "eth_newFilter",
+    "eth_newBlockFilter",
+    "eth_newPendingTransactionFilter",
+    "eth_getFilterChanges",
+    "eth_getFilterLogs",
+    "eth_uninstallFilter",
+}
+
+
+class _Health:
+    """Latency/error state of one endpoint, fed by every call made to it."""
+
+    def __init__(self) -> None:
+        self.ewma_ms: Optional[float] = None
+        self.samples: deque = deque(maxlen=256)
+        self.fails = 0
+        self.down_until = 0.0
+
+    def observe(self, elapsed_ms: float, ok: bool) -> None:
+        if ok:
+            self.samples.append(elapsed_ms)
+            self.ewma_ms = (
+                elapsed_ms if self.ewma_ms is None else (_EWMA_ALPHA * elapsed_ms + (1 - _EWMA_ALPHA) * self.ewma_ms)
+            )
+            self.fails = 0
+            self.down_until = 0.0
+        else:
+            self.fails += 1
+            if self.fails >= RPC_FAIL_THRESHOLD:
+                self.down_until = time.time() + RPC_COOLDOWN_SECONDS
+
+    def hedge_delay_ms(self) -> float:
+        if len(self.samples) < 20:
+            return RPC_HEDGE_DEFAULT_MS
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * RPC_HEDGE_PERCENTILE / 100.0))
+        return min(RPC_HEDGE_MAX_MS, max(RPC_HEDGE_MIN_MS, ordered[idx]))
+
+
+def _health(rpc_url: str) -> _Health:
+    h = _HEALTH.get(rpc_url)
+    if h is None:
+        with _LOCK:
+            h = _HEALTH.setdefault(rpc_url, _Health())
+    return h
+
+
+def split_urls(rpc_url: Optional[str]) -> List[str]:
+    """Endpoints of a (possibly comma-separated) rpc_url."""
+
+    return [u.strip() for u in str(rpc_url or "").split(",") if u.strip()]
+
+
+def join_urls(urls: Optional[Iterable[str]]) -> Optional[str]:
+    """Group string for a list of endpoints (None if empty)."""
+
+    cleaned = [str(u).strip() for u in (urls or []) if str(u or "").strip()]
+    return ",".join(cleaned) or None
+
+
+def ordered_urls(rpc_url: str) -> List[str]:
+    """Endpoints of a group, healthy ones first, fastest (EWMA) first; config order breaks ties."""
+
+    urls = split_urls(rpc_url)
+    if len(urls) < 2:
+        return urls
+    now = time.time()
+
+    def key(item: Tuple[int, str]) -> Tuple[bool, float, int]:
+        h = _health(item[1])
+        return (h.down_until > now, h.ewma_ms or 0.0, item[0])
+
+    return [u for _, u in sorted(enumerate(urls), key=key)]
+
+
+def record_call(
+    rpc_url: str, elapsed_ms: float, error: Optional[str] = None, *, healthy: Optional[bool] = None
+) -> None:
+    """Count a call. `healthy=False` marks transport failures (default: any error does)."""
+
+    _health(rpc_url).observe(elapsed_ms, error is None if healthy is None else healthy)
+    with _LOCK:
+        st = _STATS.setdefault(
+            rpc_url,
+            {"calls": 0, "errors": 0, "total_ms": 0.0, "last_ms": None, "last_error": None, "last_ok_at": None},
+        )
+        st["calls"] += 1
+        st["total_ms"] += elapsed_ms
+        st["last_ms"] = round(elapsed_ms, 1)
+        if error:
+            st["errors"] += 1
+            st["last_error"] = error[:200]
+        else:
+            st["last_ok_at"] = time.time()
+
+
+class InstrumentedHTTPProvider(HTTPProvider):
+    """HTTPProvider that feeds the per-endpoint stats."""
+
+    def make_request(self, method, params):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            resp = super().make_request(method, params)
+        except Exception as e:
+            # Exception type only: transport errors echo the URL, which may carry an API key.
+            record_call(str(self.endpoint_uri), (time.perf_counter() - started) * 1000, f"{method}: {type(e).__name__}")
+            raise
+        err = resp.get("error") if isinstance(resp, dict) else None
+        # A JSON-RPC error is still an answer from a working node.
+        record_call(
+            str(self.endpoint_uri),
+            (time.perf_counter() - started) * 1000,
+            f"{method}: {err}" if err else None,
+            healthy=True,
+        )
+        return resp
+
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_PID: Optional[int] = None
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    # RQ forks work horses; a pool inherited across fork has no live threads.
+    global _POOL, _POOL_PID
+    with _LOCK:
+        if _POOL is None or _POOL_PID != os.getpid():
+            _POOL = ThreadPoolExecutor(max_workers=RPC_POOL_SIZE, thread_name_prefix="rpc-hedge")
+            _POOL_PID = os.getpid()
+        return _POOL
+
+
+class MultiEndpointProvider(JSONBaseProvider):
+    """One logical endpoint over several RPC nodes of the same chain.
+
+    - reads: fastest healthy node; if it has not answered after its hedge delay
+      (RPC_HEDGE_PERCENTILE of its recent latencies), the next node is asked too and
+      the first answer wins; transport errors fail over to the remaining nodes
+    - writes: tried node by node until one accepts; "already known" from a later node
+      means an earlier one did get the tx, so its hash is returned
+    """
+
+    def __init__(self, urls: List[str], timeout: float = RPC_TIMEOUT) -> None:
+        super().__init__()
+        self.urls = list(urls)
+        self.endpoint_uri = join_urls(self.urls)
+        self._nodes = {
+            u: InstrumentedHTTPProvider(
+                u, request_kwargs={"timeout": timeout}, session=http_session(u), exception_retry_configuration=None
+            )
+            for u in self.urls
+        }
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(node.is_connected(show_traceback) for node in self._nodes.values())
+
+    def _send(self, url: str, method, params) -> Any:
+        return self._nodes[url].make_request(method, params)
+
+    def _failover(self, method, params, order: List[str], *, write: bool = False) -> Any:
+        last: Optional[BaseException] = None
+        for i, url in enumerate(order):
+            try:
+                resp = self._send(url, method, params)
+            except Exception as e:
+                last = e
+                continue
+            err = str((resp or {}).get("error") or "").lower() if isinstance(resp, dict) else ""
+            if (
+                write
+                and i > 0
+                and method == "eth_sendRawTransaction"
+                and ("already known" in err or "known transaction" in err)
+            ):
+                return {"jsonrpc": "2.0", "id": resp.get("id"), "result": Web3.to_hex(Web3.keccak(hexstr=params[0]))}
+            return resp
+        raise last if last is not None else RuntimeError("no rpc endpoints")
+
+    def _hedged(self, method, params, order: List[str]) -> Any:
+        pool = _hedge_pool()
+        first = pool.submit(self._send, order[0], method, params)
+        try:
+            return first.result(timeout=_health(order[0]).hedge_delay_ms() / 1000.0)
+        except FuturesTimeout:
+            pass
+        except Exception:
+            return self._failover(method, params, order[1:])
+
+        pending = {first, pool.submit(self._send, order[1], method, params)}
+        last: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    return fut.result()
+                except Exception as e:
+                    last = e
+        if order[2:]:
+            return self._failover(method, params, order[2:])
+        raise last if last is not None else RuntimeError("no rpc endpoints")
+
+    def make_request(self, method, params):  # type: ignore[override]
+        if method in _STICKY_METHODS:
+            return self._failover(method, params, self.urls)
+        order = ordered_urls(self.endpoint_uri)
+        if method in _WRITE_METHODS:
+            return self._failover(method, params, order, write=True)
+        if len(order) == 1:
+            return self._send(order[0], method, params)
+        return self._hedged(method, params, order)
+
+
+def http_session(rpc_url: str) -> requests.Session:
+    """Keep-alive session for an endpoint (also used for raw JSON-RPC batches)."""
+
+    with _LOCK:
+        sess = _SESSIONS.get(rpc_url)
+        if sess is None:
+            sess = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=RPC_POOL_SIZE)
+            sess.mount("http://", adapter)
+            sess.mount("https://", adapter)
+            _SESSIONS[rpc_url] = sess
+        return sess
+
+
+def get_web3(rpc_url: str, *, timeout: Optional[float] = None) -> Web3:
+    key = (rpc_url, float(timeout or RPC_TIMEOUT))
+    w3 = _WEB3.get(key)
+    if w3 is not None:
+        return w3
+    urls = split_urls(rpc_url)
+    if len(urls) > 1:
+        provider = MultiEndpointProvider(urls, timeout=key[1])
+    else:
+        provider = InstrumentedHTTPProvider(rpc_url, request_kwargs={"timeout": key[1]}, session=http_session(rpc_url))
+    w3 = Web3(provider)
+    with _LOCK:
+        return _WEB3.setdefault(key, w3)
+
+
+def register_web3(rpc_url: str, w3: Web3, *, timeout: Optional[float] = None) -> None:
+    """Serve `w3` for `rpc_url` (test chains and benchmarks plug in non-HTTP providers here)."""
+
+    with _LOCK:
+        _WEB3[(rpc_url, float(timeout or RPC_TIMEOUT))] = w3
+
+
+def load_abi(path: Optional[str], fallback: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Parsed ABI from `path` (cached until the file's mtime changes), else `fallback`."""
+
+    if not path:
+        return fallback
+    try:
+        mtime = Path(path).stat().st_mtime
+    except OSError:
+        return fallback
+    cached = _ABIS.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    abi = json.loads(Path(path).read_text(encoding="utf-8"))
+    with _LOCK:
+        _ABIS[path] = (mtime, abi)
+    return abi
+
+
+def get_contract(w3: Web3, rpc_url: str, address: str, abi: List[Dict[str, Any]], abi_key: str) -> Any:
+    """Contract object bound to `w3`, reused while the same client and ABI are in use."""
+
+    key = (rpc_url, address, abi_key)
+    cached = _CONTRACTS.get(key)
+    if cached and cached[0] is w3 and cached[1] is abi:
+        return cached[2]
+    contract = w3.eth.contract(address=address, abi=abi)
+    with _LOCK:
+        _CONTRACTS[key] = (w3, abi, contract)
+    return contract
+
+
+def chain_id(w3: Web3, rpc_url: str) -> int:
+    cached = _CHAIN_IDS.get(rpc_url)
+    if cached is not None:
+        return cached
+    with _LOCK:
+        lock = _CHAIN_ID_LOCKS.setdefault(rpc_url, threading.Lock())
+    # Single-flight: concurrent first callers share one eth_chainId.
+    with lock:
+        if rpc_url not in _CHAIN_IDS:
+            value = int(w3.eth.chain_id)
+            with _LOCK:
+                _CHAIN_IDS[rpc_url] = value
+        return _CHAIN_IDS[rpc_url]
+
+
+def redact_url(url: str) -> str:
+    """scheme://host[:port] only: RPC paths and query strings often embed API keys."""
+
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    rest = parts.path.strip("/") + parts.query
+    # Short digest keeps distinct endpoints on one host apart without revealing the path.
+    suffix = f"/…{hashlib.sha256(rest.encode()).hexdigest()[:6]}" if rest else ""
+    return f"{parts.scheme}://{host}{suffix}"
+
+
+def stats() -> Dict[str, Any]:
+    """Per-endpoint counters for health/metrics output (URLs redacted)."""
+
+    with _LOCK:
+        out = {}
+        now = time.time()
+        for url, st in _STATS.items():
+            calls = st["calls"] or 1
+            h = _HEALTH.get(url)
+            out[redact_url(url)] = {
+                "calls": st["calls"],
+                "errors": st["errors"],
+                "avg_ms": round(st["total_ms"] / calls, 1),
+                "last_ms": st["last_ms"],
+                "last_error": st["last_error"],
+                "last_ok_at": st["last_ok_at"],
+                "chain_id": _CHAIN_IDS.get(url),
+                "ewma_ms": round(h.ewma_ms, 1) if h and h.ewma_ms is not None else None,
+                "healthy": not (h and h.down_until > now),
+            }
+        return out
@@ -7,6 +7,11 @@ from .settings import get_settings
 
 settings = get_settings()
 
+ANCHOR_BATCH_FLUSH_KEY = "anchor_batch:flush_scheduled"
+ANCHOR_BATCH_SWEEP_KEY = "anchor_batch:sweep_scheduled"
+ANCHOR_TRACKER_KEY = "anchor_tracker:scheduled"
+CHAIN_INDEX_SYNC_KEY = "chain_index:sync_scheduled"
+
 
 def _redis_url() -> str:
     return settings.redis_url
@@ -38,3 +43,70 @@ def enqueue_receipt_processing(
         reason_code=reason_code,
         is_refund=is_refund,
     )
+
+
+def _enqueue_once(marker_key: str, fn, delay_seconds: int) -> None:
+    """Enqueue `fn` now, or once per delay window across all producers."""
+    from datetime import timedelta
+
+    q = get_queue()
+    if delay_seconds <= 0:
+        q.enqueue(fn)
+        return
+    if not get_redis().set(marker_key, b"1", nx=True, ex=max(1, int(delay_seconds) * 2)):
+        return
+    q.enqueue_in(timedelta(seconds=int(delay_seconds)), fn)
+
+
+def _clear_marker(marker_key: str) -> None:
+    try:
+        get_redis().delete(marker_key)
+    except Exception:
+        pass
+
+
+def enqueue_anchor_batch_flush(delay_seconds: int = 0) -> None:
+    """Schedule a Merkle batch flush.
+
+    Only one delayed flush is scheduled per window; receipts arriving meanwhile ride along.
+    """
+    from .jobs import flush_anchor_batch_job
+
+    _enqueue_once(ANCHOR_BATCH_FLUSH_KEY, flush_anchor_batch_job, delay_seconds)
+
+
+def clear_anchor_batch_flush_marker() -> None:
+    _clear_marker(ANCHOR_BATCH_FLUSH_KEY)
+
+
+def enqueue_anchor_batch_sweep(delay_seconds: int = 0) -> None:
+    """Schedule the recurring sweep that flushes batch items whose flush was lost."""
+    from .jobs import sweep_anchor_batches_job
+
+    _enqueue_once(ANCHOR_BATCH_SWEEP_KEY, sweep_anchor_batches_job, delay_seconds)
+
+
+def clear_anchor_batch_sweep_marker() -> None:
+    _clear_marker(ANCHOR_BATCH_SWEEP_KEY)
+
+
+def enqueue_anchor_tracker(delay_seconds: int = 0) -> None:
+    """Schedule a confirmation-tracker tick (one outstanding delayed tick at a time)."""
+    from .jobs import track_anchor_confirmations_job
+
+    _enqueue_once(ANCHOR_TRACKER_KEY, track_anchor_confirmations_job, delay_seconds)
+
+
+def clear_anchor_tracker_marker() -> None:
+    _clear_marker(ANCHOR_TRACKER_KEY)
+
+
+def enqueue_chain_index_sync(delay_seconds: int = 0) -> None:
+    """Schedule an EvidenceAnchored index sync (one outstanding delayed run at a time)."""
+    from .jobs import sync_chain_index_job
+
+    _enqueue_once(CHAIN_INDEX_SYNC_KEY, sync_chain_index_job, delay_seconds)
+
+
+def clear_chain_index_sync_marker() -> None:
+    _clear_marker(CHAIN_INDEX_SYNC_KEY)
@@ -50,6 +50,19 @@ class ReceiptResponse(BaseModel):
 class VerifyRequest(BaseModel):
     bundle_url: Optional[str] = Field(None, description="URL to evidence.zip")
     bundle_hash: Optional[str] = Field(None, description="0x-prefixed sha256 of evidence.zip")
+    merkle_proof: Optional[dict] = Field(
+        None, description="Optional merkle_proof.json for batch-anchored bundles (inclusion is checked against its root)"
+    )
+    onchain_recheck: bool = Field(
+        False, description="Re-check anchors recorded by this middleware against the chain instead of trusting the DB"
+    )
+
+
+class VerifyMemberRequest(BaseModel):
+    name: str = Field(..., description="Member file name inside a v2 evidence.zip, e.g. pain001.xml")
+    content_b64: str = Field(..., description="Base64 of the member's bytes")
+    proof: dict = Field(..., description="Proof document from GET /v1/evidence/{receipt_id}/files/{name}/proof")
+    onchain_recheck: bool = False
 
 
 class DebugAnchorRequest(BaseModel):
@@ -61,11 +74,25 @@ class DebugAnchorResponse(BaseModel):
     block_number: int
 
 
+class AnchorRecord(BaseModel):
+    chain: str
+    txid: str
+    status: str = "confirmed"
+    block_number: Optional[int] = None
+    anchored_at: Optional[datetime] = None
+    onchain: Optional[bool] = None  # set only when re-checked against the chain
+
+
 class VerifyResponse(BaseModel):
     matches_onchain: bool
     bundle_hash: Optional[str] = None
     flare_txid: Optional[str] = None
     anchored_at: Optional[datetime] = None
+    merkle_root: Optional[str] = None
+    # DB-first path: anchors this middleware recorded for the bundle, on every chain
+    receipt_id: Optional[str] = None
+    anchors: List[AnchorRecord] = Field(default_factory=list)
+    source: Optional[str] = None  # db | chain
     # Optional VC hints for verify-by-CID or when available
     vc_present: Optional[bool] = None
     vc_url: Optional[str] = None
@@ -130,6 +157,7 @@ class ProjectAnchoringChain(BaseModel):
     contract: str = Field(..., description="EvidenceAnchor contract address")
     rpc_url: Optional[str] = Field(None, description="RPC URL override")
     explorer_base_url: Optional[str] = Field(None, description="Explorer base URL, e.g. https://flarescan.com")
+    key_ref: Optional[str] = Field(None, description="Optional signer key reference for this chain")
 
 
 DEFAULT_FLARE_CHAIN = ProjectAnchoringChain(
@@ -151,6 +179,8 @@ def _fallback_explorer_for_chain(chain_name: Optional[str]) -> Optional[str]:
 class ProjectAnchoringConfig(BaseModel):
     execution_mode: str = Field("platform", description="platform | tenant")
     chains: List[ProjectAnchoringChain] = Field(default_factory=list)
+    mode: Optional[str] = Field(None, description="sequential | concurrent (inherits org config when unset)")
+    quorum: Optional[int] = Field(None, description="Chain anchors required for 'anchored' (inherits org config)")
 
 
 class ProjectConfig(BaseModel):
@@ -207,6 +237,14 @@ class ChainMatch:
     anchored_at: Optional[datetime] = None
 
 
+@dataclass
+class BundleAnchors:
+    receipt_id: str
+    bundle_hash: str
+    anchors: List[AnchorRecord]
+    merkle_root: Optional[str] = None  # set for batch-anchored receipts (anchors point at the root)
+
+
 class CancelRequest(BaseModel):
     original_receipt_id: str = Field(..., description="Receipt to cancel (original pain.001)")
     reason_code: Optional[str] = Field(None, description="Optional ISO cancellation reason code (e.g., 'CUST')")
@@ -0,0 +1,122 @@
+"""Ed25519 manifest signature checks with a verify-key cache.
+
+Practically every bundle carries the same service `public_key.pem`, so `VerifyKey`
+objects are cached by a fingerprint of the PEM bytes and the PEM is decoded once.
+`verify_many` checks (pem, manifest, signature) triples in one call; large batches
+(SIGVERIFY_POOL_MIN and up) are grouped by key and spread over a process pool.
+
+Results are per item: None when the signature is valid, otherwise the same error
+strings verify_bundle reports (signature_invalid, signature_check_failed:...,
+signature_check_unavailable).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from nacl.exceptions import BadSignatureError
+    from nacl.signing import VerifyKey
+except Exception:  # pragma: no cover
+    VerifyKey = None  # type: ignore
+
+    class BadSignatureError(Exception):  # type: ignore[no-redef]
+        pass
+
+
+SIGVERIFY_KEY_CACHE = int(os.getenv("SIGVERIFY_KEY_CACHE", "256"))
+SIGVERIFY_POOL_MIN = int(os.getenv("SIGVERIFY_POOL_MIN", "512"))
+SIGVERIFY_PROCESSES = int(os.getenv("SIGVERIFY_PROCESSES", "0")) or (os.cpu_count() or 1)
+SIGVERIFY_CHUNK = int(os.getenv("SIGVERIFY_CHUNK", "256"))
+
+_LOCK = threading.Lock()
+_KEYS: "OrderedDict[str, Any]" = OrderedDict()
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_PID: Optional[int] = None
+
+Item = Tuple[bytes, bytes, bytes]  # (public_key.pem, manifest bytes, signature)
+
+
+def fingerprint(pem_bytes: bytes) -> str:
+    return hashlib.sha256(pem_bytes).hexdigest()
+
+
+def _pem_to_raw(pem_text: str) -> bytes:
+    lines = [ln.strip() for ln in pem_text.strip().splitlines() if "-----" not in ln]
+    return base64.b64decode("".join(lines))
+
+
+def verify_key(pem_bytes: bytes) -> Any:
+    """Cached VerifyKey for a PEM (raises on a malformed key)."""
+
+    fp = fingerprint(pem_bytes)
+    with _LOCK:
+        vk = _KEYS.get(fp)
+        if vk is not None:
+            _KEYS.move_to_end(fp)
+            return vk
+    vk = VerifyKey(_pem_to_raw(pem_bytes.decode("utf-8")))
+    with _LOCK:
+        _KEYS[fp] = vk
+        while len(_KEYS) > SIGVERIFY_KEY_CACHE:
+            _KEYS.popitem(last=False)
+    return vk
+
+
+def verify_one(pem_bytes: bytes, message: bytes, signature: bytes) -> Optional[str]:
+    if VerifyKey is None:
+        return "signature_check_unavailable"
+    try:
+        verify_key(pem_bytes).verify(message, signature)
+        return None
+    except BadSignatureError:
+        return "signature_invalid"
+    except Exception as e:
+        return f"signature_check_failed:{e}"
+
+
+def _verify_group(pem_bytes: bytes, pairs: Sequence[Tuple[bytes, bytes]]) -> List[Optional[str]]:
+    """Process-pool worker: one key, many (message, signature) pairs."""
+
+    return [verify_one(pem_bytes, msg, sig) for msg, sig in pairs]
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _POOL, _POOL_PID
+    with _LOCK:
+        if _POOL is None or _POOL_PID != os.getpid():
+            _POOL = ProcessPoolExecutor(max_workers=SIGVERIFY_PROCESSES)
+            _POOL_PID = os.getpid()
+        return _POOL
+
+
+def verify_many(items: Sequence[Item], *, use_pool: Optional[bool] = None) -> List[Optional[str]]:
+    """Check many (pem, manifest, signature) triples; returns one result per item, in order."""
+
+    if use_pool is None:
+        use_pool = len(items) >= SIGVERIFY_POOL_MIN and SIGVERIFY_PROCESSES > 1
+    if not use_pool:
+        return [verify_one(pem, msg, sig) for pem, msg, sig in items]
+
+    groups: Dict[bytes, List[int]] = {}
+    for i, (pem, _msg, _sig) in enumerate(items):
+        groups.setdefault(pem, []).append(i)
+
+    results: List[Optional[str]] = [None] * len(items)
+    jobs = []
+    pool = _pool()
+    for pem, idxs in groups.items():
+        for start in range(0, len(idxs), SIGVERIFY_CHUNK):
+            chunk = idxs[start : start + SIGVERIFY_CHUNK]
+            pairs = [(items[i][1], items[i][2]) for i in chunk]
+            jobs.append((chunk, pool.submit(_verify_group, pem, pairs)))
+    for chunk, fut in jobs:
+        for i, res in zip(chunk, fut.result()):
+            results[i] = res
+    return results
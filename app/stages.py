@@ -0,0 +1,90 @@
+"""Concurrent execution of independent pipeline stages.
+
+Used by the receipt pipeline to fan out remote enrichment calls (compliance
+hooks, FX lookups) that do not depend on each other, then join them before
+ISO generation.
+
+Semantics mirror the sequential pipeline:
+- a stage that raises or misses its deadline yields its `default` value
+- stages never abort the whole run; callers decide what a default means
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_MAX_WORKERS = int(os.getenv("PIPELINE_STAGE_WORKERS", "4"))
+DEFAULT_STAGE_TIMEOUT = float(os.getenv("PIPELINE_STAGE_TIMEOUT", "12"))
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[], Any]
+    timeout: Optional[float] = None  # seconds; falls back to DEFAULT_STAGE_TIMEOUT
+    default: Any = None
+
+
+@dataclass
+class StageResult:
+    name: str
+    value: Any
+    ok: bool
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
+
+def run_stages(stages: List[Stage], *, max_workers: Optional[int] = None) -> Dict[str, StageResult]:
+    """Run stages concurrently on a bounded thread pool and join them.
+
+    Each stage gets its own deadline measured from submission. Late or failing
+    stages resolve to their default; the pool is not waited on for stragglers.
+    """
+
+    if not stages:
+        return {}
+
+    workers = max(1, min(int(max_workers or DEFAULT_MAX_WORKERS), len(stages)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage")
+    started = time.monotonic()
+    results: Dict[str, StageResult] = {}
+    try:
+        futures: Dict[Future, Stage] = {pool.submit(s.fn): s for s in stages}
+        deadlines = {
+            f: started + (s.timeout if s.timeout is not None else DEFAULT_STAGE_TIMEOUT) for f, s in futures.items()
+        }
+
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            expired = {f for f in pending if deadlines[f] <= now and not f.done()}
+            for f in expired:
+                s = futures[f]
+                f.cancel()
+                results[s.name] = StageResult(
+                    name=s.name, value=s.default, ok=False, error="timeout", elapsed_ms=int((now - started) * 1000)
+                )
+            pending -= expired
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for f in done:
+                s = futures[f]
+                elapsed = int((time.monotonic() - started) * 1000)
+                try:
+                    results[s.name] = StageResult(name=s.name, value=f.result(), ok=True, elapsed_ms=elapsed)
+                except Exception as e:
+                    results[s.name] = StageResult(
+                        name=s.name, value=s.default, ok=False, error=str(e) or type(e).__name__, elapsed_ms=elapsed
+                    )
+    finally:
+        # Do not block on stragglers that missed their deadline.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import base64
 import json
-import os
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
@@ -20,24 +19,9 @@ def _now_iso() -> str:
 
 
 def _load_ed25519_key() -> Optional[Any]:
-    try:
-        from nacl.signing import SigningKey  # type: ignore
-    except Exception:
-        return None
-    key_hex = os.getenv("VC_PRIVATE_KEY")  # 64 hex characters for Ed25519 private key (seed)
-    if not key_hex:
-        return None
-    try:
-        key_bytes = bytes.fromhex(key_hex.replace("0x", ""))
-        if len(key_bytes) != 32:
-            # Support 64-byte private key format where first half is seed
-            if len(key_bytes) == 64:
-                key_bytes = key_bytes[:32]
-            else:
-                return None
-        return SigningKey(key_bytes)
-    except Exception:
-        return None
+    from app import keys
+
+    return keys.vc_signing_key()
 
 
 def _did_key_from_public(pubkey: bytes) -> str:
@@ -0,0 +1,234 @@
+"""Shared cache for bundle verification (Redis, with an in-process fallback).
+
+Three kinds of entries:
+- `verify:bundle:<hash>`  -> VerificationResult of a downloaded bundle, keyed by the sha256 of the
+                             zip (content-addressed, long TTL; for v2 bundles the result's
+                             bundle_hash is the anchored Merkle root, not this key)
+- `verify:url:<digest>`   -> zip hash for a URL at a given ETag/Last-Modified
+- `verify:anchor:<hash>`  -> on-chain lookup result; found and not-found answers get separate
+                             TTLs, and not-found entries are dropped when new anchors are seen
+                             (jobs finalising a receipt, chain_index sync).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+from .schemas import ChainMatch, VerificationResult
+
+VERIFY_CACHE_ENABLED = (os.getenv("VERIFY_CACHE", "on") or "on").strip().lower() not in ("0", "off", "false", "no")
+VERIFY_CACHE_BUNDLE_TTL = int(os.getenv("VERIFY_CACHE_BUNDLE_TTL", "86400"))
+VERIFY_CACHE_URL_TTL = int(os.getenv("VERIFY_CACHE_URL_TTL", "3600"))
+VERIFY_CACHE_POSITIVE_TTL = int(os.getenv("VERIFY_CACHE_POSITIVE_TTL", "3600"))
+VERIFY_CACHE_NEGATIVE_TTL = int(os.getenv("VERIFY_CACHE_NEGATIVE_TTL", "30"))
+VERIFY_CACHE_LOCAL_MAX = int(os.getenv("VERIFY_CACHE_LOCAL_MAX", "2048"))
+VERIFY_CACHE_HEAD_TIMEOUT = float(os.getenv("VERIFY_CACHE_HEAD_TIMEOUT", "5"))
+
+_LOCK = threading.Lock()
+_LOCAL: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_REDIS = None
+_REDIS_RETRY_AT = 0.0
+
+
+def _redis():
+    """Cached Redis client; after a failure, retried at most every 30s."""
+
+    global _REDIS, _REDIS_RETRY_AT
+    if _REDIS is not None:
+        return _REDIS
+    if time.time() < _REDIS_RETRY_AT:
+        return None
+    try:
+        from .queue import get_redis
+
+        r = get_redis()
+        r.ping()
+        _REDIS = r
+        return r
+    except Exception:
+        _REDIS_RETRY_AT = time.time() + 30
+        return None
+
+
+def _norm(h: str) -> str:
+    h = str(h or "").strip().lower()
+    return h if h.startswith("0x") else "0x" + h
+
+
+def _get(key: str) -> Optional[Any]:
+    if not VERIFY_CACHE_ENABLED:
+        return None
+    raw: Optional[str] = None
+    r = _redis()
+    if r is not None:
+        try:
+            val = r.get(key)
+            raw = val.decode() if isinstance(val, bytes) else val
+        except Exception:
+            raw = None
+    else:
+        with _LOCK:
+            hit = _LOCAL.get(key)
+            if hit is not None:
+                if hit[0] > time.time():
+                    _LOCAL.move_to_end(key)
+                    raw = hit[1]
+                else:
+                    _LOCAL.pop(key, None)
+    return json.loads(raw) if raw else None
+
+
+def _set(key: str, value: Any, ttl: int) -> None:
+    if not VERIFY_CACHE_ENABLED or ttl <= 0:
+        return
+    raw = json.dumps(value, separators=(",", ":"), default=str)
+    r = _redis()
+    if r is not None:
+        try:
+            r.set(key, raw, ex=ttl)
+        except Exception:
+            pass
+        return
+    with _LOCK:
+        _LOCAL[key] = (time.time() + ttl, raw)
+        _LOCAL.move_to_end(key)
+        while len(_LOCAL) > VERIFY_CACHE_LOCAL_MAX:
+            _LOCAL.popitem(last=False)
+
+
+def _delete(keys: Iterable[str]) -> None:
+    keys = list(keys)
+    if not keys:
+        return
+    r = _redis()
+    if r is not None:
+        try:
+            r.delete(*keys)
+        except Exception:
+            pass
+    with _LOCK:
+        for k in keys:
+            _LOCAL.pop(k, None)
+
+
+# --- Bundle results ------------------------------------------------------------------
+
+
+def get_bundle(download_hash: str) -> Optional[VerificationResult]:
+    """Earlier result for the zip whose sha256 is `download_hash`."""
+
+    data = _get(f"verify:bundle:{_norm(download_hash)}")
+    return VerificationResult(**data) if data else None
+
+
+def put_bundle(download_hash: str, result: VerificationResult) -> None:
+    if download_hash and result.bundle_hash:
+        _set(f"verify:bundle:{_norm(download_hash)}", asdict(result), VERIFY_CACHE_BUNDLE_TTL)
+
+
+def url_validator(url: str) -> Optional[str]:
+    """ETag/Last-Modified of `url` via HEAD (None when the server sends neither)."""
+
+    from . import bundle, providers
+
+    try:
+        resp = providers.http_session(bundle._BUNDLE_HTTP_KEY).head(
+            url, timeout=VERIFY_CACHE_HEAD_TIMEOUT, allow_redirects=True
+        )
+        if not resp.ok:
+            return None
+        etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        if not (etag or modified):
+            return None
+        return f"{etag or ''}|{modified or ''}"
+    except Exception:
+        return None
+
+
+def _url_key(url: str, validator: str) -> str:
+    return "verify:url:" + hashlib.sha256(f"{url}\n{validator}".encode()).hexdigest()[:32]
+
+
+def _cached_url(url: str) -> Tuple[Optional[str], Optional[VerificationResult]]:
+    """(validator, cached result) for a URL whose content is unchanged since it was verified."""
+
+    validator = url_validator(url)
+    if validator:
+        data = _get(_url_key(url, validator))
+        cached = get_bundle(data["download_hash"]) if data and data.get("download_hash") else None
+        if cached is not None:
+            return validator, cached
+    return validator, None
+
+
+def _remember(url: str, validator: Optional[str], download_hash: Optional[str], result: VerificationResult) -> None:
+    if download_hash and result.bundle_hash:
+        put_bundle(download_hash, result)
+        if validator:
+            _set(_url_key(url, validator), {"download_hash": download_hash}, VERIFY_CACHE_URL_TTL)
+
+
+def _verify(url: str) -> Tuple[Optional[str], VerificationResult]:
+    """(zip sha256, result) of `bundle.verify_bundle`, answered from the cache for known zips."""
+
+    from . import bundle
+
+    downloaded: List[str] = []
+
+    def lookup(download_hash: str) -> Optional[VerificationResult]:
+        downloaded.append(download_hash)
+        return get_bundle(download_hash)
+
+    result = bundle.verify_bundle(url, lookup=lookup)
+    return (downloaded[0] if downloaded else None), result
+
+
+def verify_bundle_url(url: str) -> VerificationResult:
+    """`bundle.verify_bundle` with caching: an unchanged URL (same ETag/Last-Modified) skips
+    the download, and a known bundle hash skips XSD/signature/manifest validation."""
+
+    from . import bundle
+
+    if not VERIFY_CACHE_ENABLED:
+        return bundle.verify_bundle(url)
+
+    validator, cached = _cached_url(url)
+    if cached is not None:
+        return cached
+
+    download_hash, result = _verify(url)
+    _remember(url, validator, download_hash, result)
+    return result
+
+
+# --- On-chain lookups ----------------------------------------------------------------
+
+
+def get_anchor(lookup_hash: str) -> Optional[ChainMatch]:
+    data = _get(f"verify:anchor:{_norm(lookup_hash)}")
+    if not data:
+        return None
+    at = data.get("anchored_at")
+    return ChainMatch(
+        matches=bool(data["matches"]), txid=data.get("txid"), anchored_at=datetime.fromisoformat(at) if at else None
+    )
+
+
+def put_anchor(lookup_hash: str, match: ChainMatch) -> None:
+    ttl = VERIFY_CACHE_POSITIVE_TTL if match.matches else VERIFY_CACHE_NEGATIVE_TTL
+    at = match.anchored_at.isoformat() if isinstance(match.anchored_at, datetime) else match.anchored_at
+    _set(f"verify:anchor:{_norm(lookup_hash)}", {"matches": match.matches, "txid": match.txid, "anchored_at": at}, ttl)
+
+
+def invalidate(hashes: Iterable[Optional[str]]) -> None:
+    """Drop cached on-chain answers for newly anchored/indexed hashes."""
+
+    _delete(f"verify:anchor:{_norm(h)}" for h in hashes if h)
@@ -14,9 +14,8 @@ from typing import Any, Callable, Dict, Optional
 
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
-from web3 import Web3
 
-from . import models
+from . import models, providers
 
 
 @dataclass
@@ -45,7 +44,7 @@ class X402PaymentVerifier:
 
     def __init__(self, rpc_url: Optional[str] = None):
         self.rpc_url = rpc_url or os.getenv("BASE_RPC_URL", "https://mainnet.base.org")
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        self.w3 = providers.get_web3(self.rpc_url)
         
         # USDC contract on Base mainnet
         self.usdc_address = os.getenv("X402_USDC_ADDRESS", "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913")
@@ -7,4 +7,11 @@ contract EvidenceAnchor {
     function anchorEvidence(bytes32 bundleHash) external {
         emit EvidenceAnchored(bundleHash, msg.sender, block.timestamp);
     }
+
+    // One EvidenceAnchored per hash, so each bundle stays individually verifiable.
+    function anchorEvidenceBatch(bytes32[] calldata bundleHashes) external {
+        for (uint256 i = 0; i < bundleHashes.length; i++) {
+            emit EvidenceAnchored(bundleHashes[i], msg.sender, block.timestamp);
+        }
+    }
 }
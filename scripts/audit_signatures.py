@@ -0,0 +1,77 @@
+"""Re-check the manifest signatures of stored evidence bundles (audits).
+
+Walks receipts for a project/date range (same filters as scripts/export_evidence.py) and
+checks ARTIFACTS_DIR/<receipt_id>/evidence.zip in batches with sigverify.verify_many, which
+spreads batches of SIGVERIFY_POOL_MIN or more over a process pool. Prints one line per
+receipt whose signature does not verify; exits 1 if there were any.
+
+Examples:
+  python scripts/audit_signatures.py --project <uuid> --since 2026-01-01 --until 2026-03-31
+  python scripts/audit_signatures.py --batch 4096
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import bundle, db, export  # noqa: E402
+
+
+def _date(value: str, *, end_of_day: bool = False) -> datetime:
+    dt = datetime.strptime(value, "%Y-%m-%d")
+    return dt.replace(hour=23, minute=59, second=59) if end_of_day else dt
+
+
+def _check(batch: List[Tuple[str, str]]) -> int:
+    failed = 0
+    for (rid, _path), err in zip(batch, bundle.audit_signatures([p for _, p in batch])):
+        if err:
+            failed += 1
+            print(f"{rid}\t{err}")
+    return failed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--project", help="project id (default: all projects)")
+    ap.add_argument("--since", help="first day, YYYY-MM-DD")
+    ap.add_argument("--until", help="last day, YYYY-MM-DD")
+    ap.add_argument("--batch", type=int, default=2048, help="bundles per verify_many call")
+    args = ap.parse_args()
+
+    checked = failed = 0
+    batch: List[Tuple[str, str]] = []
+    session = db.SessionLocal()
+    try:
+        for rec in export.iter_receipts(
+            session,
+            project_id=args.project,
+            since=_date(args.since) if args.since else None,
+            until=_date(args.until, end_of_day=True) if args.until else None,
+        ):
+            path = bundle.ARTIFACTS_DIR / str(rec.id) / "evidence.zip"
+            if not path.exists():
+                continue
+            batch.append((str(rec.id), str(path)))
+            if len(batch) >= args.batch:
+                failed += _check(batch)
+                checked += len(batch)
+                batch = []
+        if batch:
+            failed += _check(batch)
+            checked += len(batch)
+    finally:
+        session.close()
+
+    print(f"{checked} bundles checked, {failed} failed", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Anchoring throughput benchmark on a local test chain.
+
+Deploys EvidenceAnchor to a throwaway chain, then drives the real anchoring code
+(`app.anchor.anchor_bundle`, `anchor_bundles`, `find_anchor`, `verify_anchor_tx`) at a
+configurable concurrency and reports, per operation: throughput, latency percentiles
+and RPC calls per operation.
+
+Backends:
+- default: in-process py-evm chain (`pip install "eth-tester[py-evm]"`), auto-mining
+- `--rpc-url http://127.0.0.1:8545 --private-key 0x...`: anvil / hardhat node
+
+Bytecode comes from `--bytecode FILE`, else contracts/EvidenceAnchor.sol compiled with
+py-solc-x or the repo's npm `solc`, else a hand-assembled stand-in with the same ABI
+and events (printed at startup), so the benchmark also runs without a compiler.
+
+Examples:
+    python scripts/bench_anchoring.py --count 200 --concurrency 8
+    python scripts/bench_anchoring.py --count 500 --concurrency 16 --batch-size 50 --json
+    NONCE_MANAGER=redis python scripts/bench_anchoring.py --count 200 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Before app imports: nonce manager needs Redis (opt in via env), the event index needs a DB.
+os.environ.setdefault("NONCE_MANAGER", "off")
+os.environ.setdefault("CHAIN_INDEX_ENABLED", "0")
+
+from web3 import Web3  # type: ignore  # noqa: E402
+
+from app import anchor, providers  # noqa: E402
+
+TESTER_URL = "eth-tester://bench"
+
+# --- Contract bytecode -------------------------------------------------------------
+
+_OPS = {
+    "STOP": 0x00, "ADD": 0x01, "MUL": 0x02, "LT": 0x10, "EQ": 0x14, "ISZERO": 0x15, "SHR": 0x1C,
+    "CALLER": 0x33, "CALLDATALOAD": 0x35, "CODECOPY": 0x39, "TIMESTAMP": 0x42, "MSTORE": 0x52,
+    "JUMP": 0x56, "JUMPI": 0x57, "JUMPDEST": 0x5B, "DUP1": 0x80, "DUP2": 0x81, "DUP3": 0x82,
+    "SWAP1": 0x90, "LOG2": 0xA2, "RETURN": 0xF3, "REVERT": 0xFD,
+}  # fmt: skip
+
+
+def _assemble(program: List[Any]) -> bytes:
+    """Tiny two-pass assembler: opcode names, ("push", bytes), ("label", name), ("ref", name)."""
+
+    labels: Dict[str, int] = {}
+    for final in (False, True):
+        out = bytearray()
+        for item in program:
+            if isinstance(item, str):
+                out.append(_OPS[item])
+            elif item[0] == "label":
+                labels[item[1]] = len(out)
+                out.append(_OPS["JUMPDEST"])
+            elif item[0] == "ref":
+                out += bytes([0x61]) + labels.get(item[1], 0).to_bytes(2, "big")  # PUSH2
+            else:
+                data = item[1]
+                out += bytes([0x5F + len(data)]) + data  # PUSH<n>
+        if final:
+            return bytes(out)
+    raise AssertionError("unreachable")
+
+
+def standin_bytecode() -> str:
+    """anchorEvidence(bytes32) / anchorEvidenceBatch(bytes32[]) emitting EvidenceAnchored, as raw EVM."""
+
+    def sel(sig: str) -> Tuple[str, bytes]:
+        return ("push", bytes(Web3.keccak(text=sig)[:4]))
+
+    topic0 = ("push", bytes(anchor.EVIDENCE_ANCHORED_TOPIC0))
+    # event EvidenceAnchored(bytes32 bundleHash, address indexed sender, uint256 ts)
+    emit = ["TIMESTAMP", ("push", b"\x20"), "MSTORE", "CALLER", topic0, ("push", b"\x40"), ("push", b"\x00"), "LOG2"]
+
+    def emit_with(load_hash: List[Any]) -> List[Any]:
+        return load_hash + [("push", b"\x00"), "MSTORE"] + emit
+
+    runtime = [
+        ("push", b"\x00"), "CALLDATALOAD", ("push", b"\xe0"), "SHR",
+        "DUP1", sel("anchorEvidence(bytes32)"), "EQ", ("ref", "single"), "JUMPI",
+        "DUP1", sel("anchorEvidenceBatch(bytes32[])"), "EQ", ("ref", "batch"), "JUMPI",
+        ("push", b"\x00"), "DUP1", "REVERT",
+        ("label", "single"),
+        *emit_with([("push", b"\x04"), "CALLDATALOAD"]),
+        "STOP",
+        ("label", "batch"),
+        # [end, ptr]: ptr walks the array elements, end = first byte after them
+        ("push", b"\x04"), "CALLDATALOAD", ("push", b"\x04"), "ADD",
+        "DUP1", "CALLDATALOAD", "SWAP1", ("push", b"\x20"), "ADD", "SWAP1",
+        ("push", b"\x20"), "MUL", "DUP2", "ADD",
+        ("label", "loop"),
+        "DUP1", "DUP3", "LT", "ISZERO", ("ref", "done"), "JUMPI",
+        *emit_with(["DUP2", "CALLDATALOAD"]),
+        "SWAP1", ("push", b"\x20"), "ADD", "SWAP1",
+        ("ref", "loop"), "JUMP",
+        ("label", "done"),
+        "STOP",
+    ]  # fmt: skip
+    code = _assemble(runtime)
+    init = _assemble(
+        [("push", len(code).to_bytes(2, "big")), "DUP1", ("push", (13).to_bytes(2, "big")), ("push", b"\x00"),
+         "CODECOPY", ("push", b"\x00"), "RETURN"]
+    )  # fmt: skip
+    return "0x" + (init + code).hex()
+
+
+def compiled_bytecode() -> Optional[str]:
+    sol = ROOT / "contracts" / "EvidenceAnchor.sol"
+    try:
+        import solcx  # type: ignore
+
+        out = solcx.compile_source(sol.read_text(), output_values=["bin"], optimize=True, optimize_runs=200)
+        return "0x" + next(v["bin"] for k, v in out.items() if k.endswith(":EvidenceAnchor"))
+    except Exception:
+        pass
+    # Same settings as scripts/deploy.js
+    js = (
+        "const solc=require('solc'),fs=require('fs');"
+        "const src=fs.readFileSync(process.argv[1],'utf8');"
+        "const inp={language:'Solidity',sources:{'EvidenceAnchor.sol':{content:src}},"
+        "settings:{optimizer:{enabled:true,runs:200},outputSelection:{'*':{'*':['evm.bytecode.object']}}}};"
+        "const o=JSON.parse(solc.compile(JSON.stringify(inp)));"
+        "process.stdout.write(o.contracts['EvidenceAnchor.sol'].EvidenceAnchor.evm.bytecode.object);"
+    )
+    try:
+        res = subprocess.run(["node", "-e", js, str(sol)], capture_output=True, text=True, cwd=ROOT, timeout=120)
+        if res.returncode == 0 and res.stdout.strip():
+            return "0x" + res.stdout.strip()
+    except Exception:
+        pass
+    return None
+
+
+# --- Backends ----------------------------------------------------------------------
+
+METHOD_CALLS: Counter = Counter()
+
+
+def tester_backend() -> Tuple[str, str]:
+    """Register an in-process py-evm chain under TESTER_URL. Returns (rpc_url, private_key)."""
+
+    try:
+        from eth_tester import EthereumTester, PyEVMBackend  # type: ignore
+        from web3 import EthereumTesterProvider  # type: ignore
+    except ImportError:
+        raise SystemExit('in-process backend needs: pip install "eth-tester[py-evm]" (or pass --rpc-url)')
+
+    backend = PyEVMBackend()
+    lock = threading.Lock()
+
+    class CountingTesterProvider(EthereumTesterProvider):
+        # py-evm is not thread-safe; concurrency is still exercised on the client side.
+        def make_request(self, method, params):  # type: ignore[override]
+            started = time.perf_counter()
+            with lock:
+                resp = super().make_request(method, params)
+            METHOD_CALLS[method] += 1
+            providers.record_call(TESTER_URL, (time.perf_counter() - started) * 1000)
+            return resp
+
+    w3 = Web3(CountingTesterProvider(EthereumTester(backend)))
+    providers.register_web3(TESTER_URL, w3)
+    return TESTER_URL, backend.account_keys[0].to_hex()
+
+
+def deploy(rpc_url: str, private_key: str, bytecode: str) -> str:
+    w3 = providers.get_web3(rpc_url)
+    acct = w3.eth.account.from_key(private_key)
+    factory = w3.eth.contract(abi=anchor.FALLBACK_ABI, bytecode=bytecode)
+    tx = factory.constructor().build_transaction(
+        {"from": acct.address, "nonce": w3.eth.get_transaction_count(acct.address, "pending"), "gas": 1_000_000}
+    )
+    tx_hash = w3.eth.send_raw_transaction(anchor._raw_tx(acct.sign_transaction(tx)))
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+    return Web3.to_checksum_address(receipt["contractAddress"])
+
+
+# --- Measurement -------------------------------------------------------------------
+
+
+def _rpc_calls() -> int:
+    return sum(int(st["calls"]) for st in providers.stats().values())
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(round(p / 100.0 * (len(sorted_ms) - 1))))]
+
+
+def run_phase(name: str, jobs: List[Callable[[], Any]], concurrency: int, items_per_job: int = 1) -> Dict[str, Any]:
+    lat: List[float] = []
+    errors: Counter = Counter()
+    results: List[Any] = []
+    lock = threading.Lock()
+
+    def timed(fn: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        try:
+            res = fn()
+            ok = True
+        except Exception as e:
+            res, ok = None, False
+            with lock:
+                errors[type(e).__name__] += 1
+        with lock:
+            lat.append((time.perf_counter() - started) * 1000)
+            if ok:
+                results.append(res)
+
+    calls_before = _rpc_calls()
+    methods_before = Counter(METHOD_CALLS)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        list(pool.map(timed, jobs))
+    wall = time.perf_counter() - started
+    calls = _rpc_calls() - calls_before
+    lat.sort()
+    n = len(jobs)
+    return {
+        "op": name,
+        "n": n,
+        "items": n * items_per_job,
+        "errors": dict(errors),
+        "wall_s": round(wall, 3),
+        "ops_per_s": round(n / wall, 2) if wall else None,
+        "items_per_s": round(n * items_per_job / wall, 2) if wall else None,
+        "p50_ms": round(_pct(lat, 50), 1),
+        "p90_ms": round(_pct(lat, 90), 1),
+        "p99_ms": round(_pct(lat, 99), 1),
+        "max_ms": round(lat[-1], 1) if lat else 0.0,
+        "rpc_calls": calls,
+        "rpc_per_op": round(calls / n, 2) if n else None,
+        "rpc_methods": dict((METHOD_CALLS - methods_before).most_common(6)),
+        "_results": results,
+    }
+
+
+def _hashes(count: int, salt: str) -> List[str]:
+    return [Web3.to_hex(Web3.keccak(text=f"bench:{salt}:{i}")) for i in range(count)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rpc-url", help="Use an external dev chain (anvil/hardhat) instead of in-process py-evm")
+    ap.add_argument("--private-key", help="Funded key for --rpc-url")
+    ap.add_argument("--contract", help="Use an already deployed EvidenceAnchor instead of deploying")
+    ap.add_argument("--bytecode", help="File with EvidenceAnchor creation bytecode (hex)")
+    ap.add_argument("--count", type=int, default=100, help="Bundles to anchor / look up")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--batch-size", type=int, default=0, help="Also anchor via anchorEvidenceBatch in batches of N")
+    ap.add_argument("--lookups", type=int, default=None, help="find/verify calls (default: --count)")
+    ap.add_argument("--ops", default="anchor,batch,find,verify", help="Comma-separated phases to run")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    if args.rpc_url:
+        if not args.private_key:
+            raise SystemExit("--private-key is required with --rpc-url")
+        rpc_url, pk = args.rpc_url, args.private_key
+    else:
+        rpc_url, pk = tester_backend()
+
+    contract = args.contract
+    if not contract:
+        bytecode = Path(args.bytecode).read_text().strip() if args.bytecode else compiled_bytecode()
+        if not bytecode:
+            print("note: no Solidity compiler found; deploying the assembled EvidenceAnchor stand-in", file=sys.stderr)
+            bytecode = standin_bytecode()
+        contract = deploy(rpc_url, pk, bytecode)
+
+    ops = {o.strip() for o in args.ops.split(",") if o.strip()}
+    common = {"rpc_url": rpc_url, "contract_addr": contract}
+    lookups = args.lookups if args.lookups is not None else args.count
+    report: List[Dict[str, Any]] = []
+    anchored: List[Tuple[str, str]] = []
+
+    if "anchor" in ops:
+        hashes = _hashes(args.count, "single")
+        phase = run_phase(
+            "anchor_bundle",
+            [lambda h=h: (h, anchor.anchor_bundle(h, private_key=pk, **common)[0]) for h in hashes],
+            args.concurrency,
+        )
+        anchored += phase["_results"]
+        report.append(phase)
+
+    if "batch" in ops and args.batch_size > 0:
+        hashes = _hashes(args.count, "batch")
+        chunks = [hashes[i : i + args.batch_size] for i in range(0, len(hashes), args.batch_size)]
+        phase = run_phase(
+            "anchor_bundles",
+            [lambda c=c: (c, anchor.anchor_bundles(c, private_key=pk, **common)[0]) for c in chunks],
+            args.concurrency,
+            items_per_job=args.batch_size,
+        )
+        anchored += [(h, txid) for c, txid in phase["_results"] for h in c]
+        report.append(phase)
+
+    sample = [anchored[i % len(anchored)] for i in range(lookups)] if anchored else []
+    if "find" in ops and sample:
+        phase = run_phase(
+            "find_anchor",
+            [lambda h=h: anchor.find_anchor(h, **common).matches or _raise("not found") for h, _ in sample],
+            args.concurrency,
+        )
+        report.append(phase)
+
+    if "verify" in ops and sample:
+        phase = run_phase(
+            "verify_anchor_tx",
+            [
+                lambda h=h, t=t: anchor.verify_anchor_tx(txid=t, expected_bundle_hash_hex=h, **common)[0]
+                or _raise("no match")
+                for h, t in sample
+            ],
+            args.concurrency,
+        )
+        report.append(phase)
+
+    for r in report:
+        r.pop("_results", None)
+    if args.json:
+        print(json.dumps({"backend": providers.redact_url(rpc_url), "contract": contract, "results": report}, indent=2))
+        return
+
+    print(f"backend={providers.redact_url(rpc_url)} contract={contract} concurrency={args.concurrency}")
+    hdr = f"{'op':<18}{'n':>6}{'err':>5}{'ops/s':>9}{'items/s':>9}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}{'rpc/op':>8}"
+    print(hdr)
+    for r in report:
+        print(
+            f"{r['op']:<18}{r['n']:>6}{sum(r['errors'].values()):>5}{r['ops_per_s'] or 0:>9}{r['items_per_s'] or 0:>9}"
+            f"{r['p50_ms']:>8}{r['p90_ms']:>8}{r['p99_ms']:>8}{r['max_ms']:>8}{r['rpc_per_op'] or 0:>8}"
+        )
+        if r["rpc_methods"]:
+            print(f"{'':<18}methods: {r['rpc_methods']}")
+        if r["errors"]:
+            print(f"{'':<18}errors: {r['errors']}")
+
+
+def _raise(msg: str) -> Any:
+    raise RuntimeError(msg)
+
+
+if __name__ == "__main__":
+    main()
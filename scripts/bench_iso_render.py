@@ -0,0 +1,139 @@
+"""ISO message rendering benchmark: template fast path vs lxml tree building.
+
+Generates the per-receipt messages (pain.001 from the org config - optionally with FX -,
+pain.002, pacs.002, camt.054, remt.001) for synthetic receipts through the real generators,
+once with app.iso_render templates and once with them disabled (lxml SubElement +
+pretty-printed tostring), checks that both produce identical bytes and reports the
+per-message cost and speed-up.
+
+Schema validation is off for the run (it forces the tree path; see app/iso_validation.py).
+
+Examples:
+    python scripts/bench_iso_render.py
+    python scripts/bench_iso_render.py --count 20000 --fx --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("ISO_VALIDATION_MODE", "off")
+
+from app import iso_render  # noqa: E402
+from app.config import OrgConfigModel  # noqa: E402
+from app.iso_messages import camt054, pacs002, pain001, pain002, remt001  # noqa: E402
+
+
+def _receipts(count: int) -> List[Dict[str, Any]]:
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "reference": f"INV-{i:08d} <A&B>",
+            "created_at": t0 + timedelta(seconds=i),
+            "sender_wallet": f"0x{i:040x}",
+            "receiver_wallet": f"0x{i * 7:040x}",
+            "currency": "FLR",
+            "amount": Decimal(i) / Decimal(100),
+            "status": "anchored",
+            "bundle_hash": f"0x{i:064x}",
+            "flare_txid": f"0x{i * 3:064x}",
+            "fx_rate": "0.0215",
+        }
+        for i in range(count)
+    ]
+
+
+def _config(fx: bool) -> OrgConfigModel:
+    return OrgConfigModel.model_validate(
+        {
+            "ledger": {"network": "flare", "rpc_url": "http://localhost", "asset": {"symbol": "FLR"}},
+            "org": {"name": "Bench Org", "lei": "5493001KJTIIGC8Y1R12"},
+            "mapping": {"purpose": "GDDS", "include_lei": True},
+            "fx_policy": {"mode": "eqvt_amt" if fx else "none", "base_ccy": "EUR"},
+            "validation": {"mode": "off"},
+        }
+    )
+
+
+def _generators(cfg: OrgConfigModel) -> Dict[str, Callable[[Dict[str, Any]], bytes]]:
+    return {
+        "pain.001": lambda r: pain001.generate_pain001_with_fx(r, cfg),
+        "pain.002": pain002.generate_pain002,
+        "pacs.002": pacs002.generate_pacs002,
+        "camt.054": camt054.generate_camt054,
+        "remt.001": remt001.generate_remt001,
+    }
+
+
+def _run(fn: Callable[[Dict[str, Any]], bytes], receipts: List[Dict[str, Any]], templates: bool) -> Dict[str, Any]:
+    iso_render.ISO_TEMPLATES_ENABLED = templates
+    fn(receipts[0])  # compile the template / warm up
+    start = time.perf_counter()
+    out = [fn(r) for r in receipts]
+    elapsed = time.perf_counter() - start
+    return {
+        "us_per_msg": round(elapsed / len(receipts) * 1e6, 2),
+        "msgs_per_s": round(len(receipts) / elapsed),
+        "out": out,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=5000, help="Receipts per message type")
+    ap.add_argument("--fx", action="store_true", help="pain.001 with EqvtAmt/XchgRateInf (fx_policy eqvt_amt)")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    receipts = _receipts(args.count)
+    report = []
+    for name, fn in _generators(_config(args.fx)).items():
+        lxml = _run(fn, receipts, templates=False)
+        tmpl = _run(fn, receipts, templates=True)
+        report.append(
+            {
+                "message": name,
+                "lxml_us": lxml["us_per_msg"],
+                "template_us": tmpl["us_per_msg"],
+                "speedup": round(lxml["us_per_msg"] / tmpl["us_per_msg"], 1),
+                "identical": lxml.pop("out") == tmpl.pop("out"),
+            }
+        )
+    iso_render.ISO_TEMPLATES_ENABLED = True
+
+    total_lxml = sum(r["lxml_us"] for r in report)
+    total_tmpl = sum(r["template_us"] for r in report)
+    summary = {
+        "count": args.count,
+        "fx": args.fx,
+        "per_receipt_lxml_us": round(total_lxml, 1),
+        "per_receipt_template_us": round(total_tmpl, 1),
+        "results": report,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"receipts={args.count} fx={args.fx} python={sys.version.split()[0]}")
+    print(f"{'message':<10}{'lxml us':>10}{'tmpl us':>10}{'speedup':>9}{'identical':>11}")
+    for r in report:
+        print(f"{r['message']:<10}{r['lxml_us']:>10}{r['template_us']:>10}{r['speedup']:>8}x{str(r['identical']):>11}")
+    print(f"{'all 5':<10}{total_lxml:>10.1f}{total_tmpl:>10.1f}{total_lxml / total_tmpl:>8.1f}x")
+    if not all(r["identical"] for r in report):
+        raise SystemExit("template output differs from lxml output")
+
+
+if __name__ == "__main__":
+    main()
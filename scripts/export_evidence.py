@@ -0,0 +1,67 @@
+"""Export evidence bundles and ISO artifacts for audits as one tar archive.
+
+Streams straight from the database and ARTIFACTS_DIR with constant memory (see app/export.py).
+
+Examples:
+  python scripts/export_evidence.py --project <uuid> --since 2026-01-01 --until 2026-03-31 -o q1.tar
+  python scripts/export_evidence.py --project <uuid> --limit 10000 -o part1.tar   # prints the next cursor
+  python scripts/export_evidence.py --project <uuid> --after <cursor> -o part2.tar
+  python scripts/export_evidence.py --since 2026-01-01 -o - | gzip > all.tar.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tarfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db, export  # noqa: E402
+
+
+def _date(value: str, *, end_of_day: bool = False) -> datetime:
+    dt = datetime.strptime(value, "%Y-%m-%d")
+    return dt.replace(hour=23, minute=59, second=59) if end_of_day else dt
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--project", help="project id (default: all projects)")
+    ap.add_argument("--since", help="first day, YYYY-MM-DD")
+    ap.add_argument("--until", help="last day, YYYY-MM-DD")
+    ap.add_argument("--after", help="resume after this cursor")
+    ap.add_argument("--limit", type=int, default=None, help="max receipts in this archive")
+    ap.add_argument("-o", "--out", default="-", help="output file ('-' for stdout)")
+    args = ap.parse_args()
+
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    session = db.SessionLocal()
+    try:
+        for chunk in export.iter_export(
+            session,
+            project_id=args.project,
+            since=_date(args.since) if args.since else None,
+            until=_date(args.until, end_of_day=True) if args.until else None,
+            after=args.after,
+            limit=args.limit,
+        ):
+            out.write(chunk)
+    finally:
+        session.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    if args.out != "-":
+        with tarfile.open(args.out) as tf:
+            summary = json.load(tf.extractfile("export.json"))
+        print(f"{summary['count']} receipts -> {args.out}", file=sys.stderr)
+        if summary["next_cursor"]:
+            print(f"more receipts remain: --after {summary['next_cursor']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
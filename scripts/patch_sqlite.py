@@ -28,6 +28,17 @@ def main():
         ensure_column(con, "receipts", "project_id", "TEXT")
         ensure_column(con, "api_keys", "project_id", "TEXT")
         ensure_column(con, "api_keys", "role", "TEXT")
+        # Batch anchoring / async confirmation tracking
+        ensure_column(con, "receipts", "callback_url", "TEXT")
+        ensure_column(con, "chain_anchors", "status", "TEXT NOT NULL DEFAULT 'confirmed'")
+        ensure_column(con, "chain_anchors", "block_number", "INTEGER")
+        ensure_column(con, "chain_anchors", "block_hash", "TEXT")
+        ensure_column(con, "chain_anchors", "rpc_url", "TEXT")
+        ensure_column(con, "chain_anchors", "contract", "TEXT")
+        ensure_column(con, "chain_anchors", "submitted_at", "DATETIME")
+        # Indexed bundle_hash lookups (DB-first verification)
+        con.execute("CREATE INDEX IF NOT EXISTS ix_receipts_bundle_hash ON receipts (bundle_hash)")
+        con.commit()
         print("Patch complete.")
     finally:
         con.close()
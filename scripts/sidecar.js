@@ -0,0 +1,158 @@
+import fs from "fs";
+import path from "path";
+import readline from "readline";
+import { ethers } from "ethers";
+
+// Long-lived anchoring sidecar for app/anchor_node.py.
+//
+// Protocol: newline-delimited JSON over stdin/stdout.
+//   request:  {"id": 1, "op": "anchor" | "find" | "ping", "bundleHash": "0x..."}
+//   response: {"id": 1, "ok": true, "result": {...}}  or  {"id": 1, "ok": false, "error": "..."}
+// Requests are handled concurrently; responses may arrive out of order (match on id).
+// Provider, wallet and contract are created once and reused for every request.
+
+const HASH_RE = /^0x[0-9a-fA-F]{64}$/;
+
+function env(...names) {
+  for (const n of names) {
+    const v = (process.env[n] || "").trim();
+    if (v) return v;
+  }
+  return "";
+}
+
+const rpcUrl = env("RPC_URL", "FLARE_RPC_URL");
+const addr = env("CONTRACT_ADDR", "ANCHOR_CONTRACT_ADDR");
+let pk = env("PRIVATE_KEY", "ANCHOR_PRIVATE_KEY").replace(/\s+/g, "");
+if (pk && !pk.startsWith("0x")) pk = "0x" + pk;
+
+const LOOKBACK = parseInt(process.env.ANCHOR_LOOKBACK_BLOCKS || "50000", 10);
+const CHUNK = parseInt(process.env.LOG_SCAN_CHUNK_BLOCKS || "5000", 10);
+
+const abiPath = path.resolve(process.cwd(), "contracts", "EvidenceAnchor.abi.json");
+const abi = JSON.parse(fs.readFileSync(abiPath, "utf8"));
+const iface = new ethers.Interface(abi);
+const topic0 = iface.getEvent("EvidenceAnchored").topicHash;
+
+let provider = null;
+let reader = null;
+let writer = null;
+
+function getProvider() {
+  if (!rpcUrl) throw new Error("Missing RPC_URL/FLARE_RPC_URL");
+  if (!provider) {
+    // Comma-separated endpoints (see app/providers.py): first answer wins, in priority order.
+    const urls = rpcUrl.split(",").map((u) => u.trim()).filter(Boolean);
+    provider =
+      urls.length > 1
+        ? new ethers.FallbackProvider(
+            urls.map((u, i) => ({ provider: new ethers.JsonRpcProvider(u), priority: i + 1, stallTimeout: 750 })),
+            undefined,
+            { quorum: 1 }
+          )
+        : new ethers.JsonRpcProvider(urls[0]);
+  }
+  return provider;
+}
+
+function getReader() {
+  if (!/^0x[0-9a-fA-F]{40}$/.test(addr)) throw new Error("CONTRACT_ADDR must be 0x address");
+  if (!reader) reader = new ethers.Contract(addr, abi, getProvider());
+  return reader;
+}
+
+function getWriter() {
+  if (!/^0x[0-9a-fA-F]{64}$/.test(pk)) throw new Error("PRIVATE_KEY must be 0x 32-byte hex");
+  if (!writer) {
+    // NonceManager hands out nonces locally so concurrent anchors do not collide.
+    const signer = new ethers.NonceManager(new ethers.Wallet(pk, getProvider()));
+    writer = new ethers.Contract(getReader().target, abi, signer);
+  }
+  return writer;
+}
+
+async function anchor(bundleHash) {
+  const contract = getWriter();
+  try {
+    const tx = await contract.anchorEvidence(ethers.getBytes(bundleHash));
+    const receipt = await tx.wait(1);
+    return { txid: tx.hash, blockNumber: receipt?.blockNumber ?? null };
+  } catch (e) {
+    // Resync the local nonce from the chain after a failed send.
+    contract.runner.reset();
+    throw e;
+  }
+}
+
+async function getLogsRange(p, fromBlock, toBlock) {
+  try {
+    return await p.getLogs({ address: addr, fromBlock, toBlock, topics: [topic0] });
+  } catch (e) {
+    if (toBlock - fromBlock < 16) throw e;
+    const mid = fromBlock + Math.floor((toBlock - fromBlock + 1) / 2);
+    const newer = await getLogsRange(p, mid, toBlock);
+    const older = await getLogsRange(p, fromBlock, mid - 1);
+    return older.concat(newer);
+  }
+}
+
+async function find(bundleHash) {
+  getReader();
+  const p = getProvider();
+  const want = bundleHash.toLowerCase();
+  const latest = await p.getBlockNumber();
+  const start = Math.max(0, latest - LOOKBACK);
+
+  // Newest window first; stop at the first match.
+  for (let hi = latest; hi >= start; hi -= CHUNK) {
+    const lo = Math.max(start, hi - CHUNK + 1);
+    const logs = await getLogsRange(p, lo, hi);
+    for (let i = logs.length - 1; i >= 0; i--) {
+      let parsed;
+      try {
+        parsed = iface.parseLog(logs[i]);
+      } catch {
+        continue;
+      }
+      if (!parsed || ethers.hexlify(parsed.args.bundleHash).toLowerCase() !== want) continue;
+      const ts = parsed.args.ts;
+      let anchoredAt = ts ? new Date(Number(ts) * 1000).toISOString() : null;
+      if (!anchoredAt) {
+        const blk = await p.getBlock(logs[i].blockNumber);
+        anchoredAt = blk?.timestamp ? new Date(blk.timestamp * 1000).toISOString() : null;
+      }
+      return { matches: true, txid: logs[i].transactionHash, anchored_at: anchoredAt };
+    }
+  }
+  return { matches: false };
+}
+
+async function handle(req) {
+  if (req.op === "ping") return { pong: true };
+  const bundleHash = String(req.bundleHash || "").trim();
+  if (!HASH_RE.test(bundleHash)) throw new Error("bundleHash must be 0x-prefixed 32-byte hex");
+  if (req.op === "anchor") return anchor(bundleHash);
+  if (req.op === "find") return find(bundleHash);
+  throw new Error(`unknown op: ${req.op}`);
+}
+
+function reply(obj) {
+  process.stdout.write(JSON.stringify(obj) + "\n");
+}
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on("line", (line) => {
+  if (!line.trim()) return;
+  let req;
+  try {
+    req = JSON.parse(line);
+  } catch {
+    reply({ id: null, ok: false, error: "invalid_json" });
+    return;
+  }
+  handle(req)
+    .then((result) => reply({ id: req.id, ok: true, result }))
+    .catch((e) => reply({ id: req.id, ok: false, error: e?.shortMessage || e?.message || String(e) }));
+});
+// Parent went away: exit instead of lingering as an orphan.
+rl.on("close", () => process.exit(0));
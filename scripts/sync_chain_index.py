@@ -0,0 +1,69 @@
+"""Sync (or backfill) the local EvidenceAnchored event index.
+
+Examples:
+  python scripts/sync_chain_index.py                      # all configured contracts, once
+  python scripts/sync_chain_index.py --loop 30            # keep syncing every 30s
+  python scripts/sync_chain_index.py --chain flare --contract 0x... --rpc-url https://... --from-block 0
+  python scripts/sync_chain_index.py --from-block 21000000            # backfill every target down to a block
+  python scripts/sync_chain_index.py --from-block 21500000 --rewind   # re-index from a block onwards
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import chain_index, db  # noqa: E402
+from app.config import get_config  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--chain", help="chain name (single-contract mode)")
+    ap.add_argument("--contract", help="EvidenceAnchor contract address (single-contract mode)")
+    ap.add_argument("--rpc-url", help="RPC endpoint (single-contract mode)")
+    ap.add_argument(
+        "--from-block",
+        type=int,
+        default=None,
+        help="start block for a new cursor; for an existing one, backfill down to it",
+    )
+    ap.add_argument("--rewind", action="store_true", help="with --from-block: re-index from that block onwards")
+    ap.add_argument("--loop", type=int, default=0, help="repeat every N seconds")
+    args = ap.parse_args()
+    if args.rewind and args.from_block is None:
+        ap.error("--rewind needs --from-block")
+
+    while True:
+        session = db.SessionLocal()
+        try:
+            if args.contract:
+                added = chain_index.sync_contract(
+                    session,
+                    chain=args.chain or "flare",
+                    rpc_url=args.rpc_url,
+                    contract=args.contract,
+                    start_block=args.from_block,
+                    rewind=args.rewind,
+                )
+                print(f"{args.chain or 'flare'}:{args.contract.lower()}: +{added} events")
+            else:
+                results = chain_index.sync_all(
+                    session, get_config(session), start_block=args.from_block, rewind=args.rewind
+                )
+                for name, res in results.items():
+                    print(f"{name}: {res if isinstance(res, str) else f'+{res} events'}")
+        finally:
+            session.close()
+        if not args.loop:
+            break
+        args.from_block, args.rewind = None, False  # backfill/rewind once, then keep syncing
+        time.sleep(args.loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import types
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import anchor_batch, jobs, merkle, models
+from app import queue as queue_mod
+
+PROJECT = uuid.uuid4()
+
+
+def _factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def _park(session, n: int, project_id=None, created_at=None) -> list[str]:
+    ids = []
+    for _ in range(n):
+        rec = models.Receipt(
+            reference=f"ref-{uuid.uuid4()}",
+            tip_tx_hash=f"0x{uuid.uuid4().hex}",
+            chain="flare",
+            amount=Decimal("1"),
+            currency="FLR",
+            sender_wallet="0xa",
+            receiver_wallet="0xb",
+            status="pending",
+            project_id=project_id,
+        )
+        session.add(rec)
+        session.commit()
+        item = anchor_batch.add_pending(session, str(rec.id), "0x" + uuid.uuid4().hex * 2)
+        if created_at is not None:
+            item.created_at = created_at
+        session.commit()
+        ids.append(str(rec.id))
+    return ids
+
+
+def _cfg(window: int = 30, max_size: int = 256):
+    batch = types.SimpleNamespace(enabled=True, max_size=max_size, window_seconds=window, strategy="merkle")
+    return types.SimpleNamespace(anchoring=types.SimpleNamespace(batch=batch, chains=[], quorum=1, mode="sequential"))
+
+
+def _patch_flush(monkeypatch, factory, anchor_fn, cfg=None):
+    finalized = []
+    monkeypatch.setattr(jobs.db, "SessionLocal", factory)
+    monkeypatch.setattr(jobs, "load_config", lambda session: cfg or _cfg())
+    monkeypatch.setattr(jobs, "_resolve_anchoring_chains", lambda session, rec, cfg: [{"name": "flare"}])
+    monkeypatch.setattr(jobs, "_resolve_anchor_pk", lambda cfg: "0xkey")
+    monkeypatch.setattr(jobs, "_anchor_on_chain", anchor_fn)
+    monkeypatch.setattr(jobs, "_write_iso_artifact", lambda *a, **k: ("", ""))
+    monkeypatch.setattr(
+        jobs, "_finalize_receipt", lambda session, rec, cfg, anchored, callback_url: finalized.append(anchored)
+    )
+    monkeypatch.setattr(queue_mod, "clear_anchor_batch_flush_marker", lambda: None)
+    return finalized
+
+
+def test_claim_groups_by_project_and_is_not_repeated():
+    session = _factory()()
+    _park(session, 3)
+    _park(session, 2, project_id=PROJECT)
+
+    groups = anchor_batch.claim_pending(session, limit=10)
+    assert sorted(len(items) for _, items, _ in groups) == [2, 3]
+    for batch, items, proofs in groups:
+        assert batch.size == len(items) and [it.leaf_index for it in items] == list(range(len(items)))
+        for it, proof in zip(items, proofs):
+            assert merkle.verify_proof(it.bundle_hash, proof, batch.merkle_root)
+
+    assert anchor_batch.claim_pending(session, limit=10) == []
+    assert anchor_batch.pending_count(session) == 0
+
+
+def test_flush_anchors_root_and_settles_members(monkeypatch):
+    factory = _factory()
+    session = factory()
+    ids = _park(session, 3)
+    anchored_roots = []
+
+    def fake_anchor(params, bundle_hash, min_confirmations=0):
+        anchored_roots.append(bundle_hash)
+        return "0xbatchtx", 7
+
+    finalized = _patch_flush(monkeypatch, factory, fake_anchor)
+    jobs.flush_anchor_batch_job()
+
+    session = factory()
+    batch = session.query(models.AnchorBatch).one()
+    assert batch.status == "anchored" and anchored_roots == [batch.merkle_root]
+    assert finalized == [True, True, True]
+    for rid in ids:
+        assert session.get(models.Receipt, rid).status == "anchored"
+    assert session.query(models.ChainAnchor).filter(models.ChainAnchor.txid == "0xbatchtx").count() == 3
+
+
+def test_failed_flush_marks_batch_and_members_failed(monkeypatch):
+    factory = _factory()
+    _park(factory(), 2)
+
+    def down(params, bundle_hash, min_confirmations=0):
+        raise RuntimeError("rpc down")
+
+    finalized = _patch_flush(monkeypatch, factory, down)
+    jobs.flush_anchor_batch_job()
+
+    session = factory()
+    assert session.query(models.AnchorBatch).one().status == "failed"
+    assert finalized == [False, False]
+
+
+def test_abandoned_batch_is_released_and_claimed_again():
+    session = _factory()()
+    _park(session, 2)
+    [(batch, _, _)] = anchor_batch.claim_pending(session, limit=10)
+
+    # Flusher died after claiming: nothing happens until the batch is stale.
+    assert anchor_batch.release_stale_batches(session, older_than=datetime.utcnow() - timedelta(hours=1)) == 0
+    assert anchor_batch.release_stale_batches(session, older_than=datetime.utcnow() + timedelta(seconds=5)) == 2
+    assert session.get(models.AnchorBatch, batch.id).status == "failed"
+
+    [(retry, items, _)] = anchor_batch.claim_pending(session, limit=10)
+    assert retry.id != batch.id and len(items) == 2
+
+
+def test_enqueue_schedules_window_or_immediate_flush(monkeypatch):
+    session = _factory()()
+    monkeypatch.setattr(jobs, "_publish_receipt_event", lambda rec: None)
+    delays = []
+    monkeypatch.setattr(queue_mod, "enqueue_anchor_batch_flush", lambda delay=0: delays.append(delay))
+    cfg = types.SimpleNamespace(max_size=2, window_seconds=30)
+
+    for _ in range(2):
+        [rid] = _park(session, 1)
+        jobs._enqueue_receipt_for_batch(session, session.get(models.Receipt, rid), "0x" + "cc" * 32, None, cfg)
+    assert delays == [30, 0]
+
+
+def test_sweep_flushes_items_whose_flush_was_lost(monkeypatch):
+    factory = _factory()
+    session = factory()
+    _park(session, 1, created_at=datetime.utcnow() - timedelta(seconds=5))
+    flushed, rescheduled = [], []
+    monkeypatch.setattr(jobs.db, "SessionLocal", factory)
+    monkeypatch.setattr(jobs, "flush_anchor_batch_job", lambda: flushed.append(1))
+    monkeypatch.setattr(queue_mod, "clear_anchor_batch_sweep_marker", lambda: None)
+    monkeypatch.setattr(queue_mod, "enqueue_anchor_batch_sweep", lambda delay=0: rescheduled.append(delay))
+
+    # Still inside its window: the scheduled flush will handle it.
+    monkeypatch.setattr(jobs, "load_config", lambda session: _cfg(window=60))
+    jobs.sweep_anchor_batches_job()
+    assert flushed == [] and rescheduled == [anchor_batch.ANCHOR_BATCH_SWEEP_INTERVAL]
+
+    monkeypatch.setattr(jobs, "load_config", lambda session: _cfg(window=1))
+    jobs.sweep_anchor_batches_job()
+    assert flushed == [1] and len(rescheduled) == 2
+
+
+def test_multi_flush_keeps_root_until_anchored(monkeypatch):
+    factory = _factory()
+    _park(factory(), 2)
+    cfg = _cfg()
+    cfg.anchoring.batch.strategy = "multi"
+    _patch_flush(monkeypatch, factory, None, cfg=cfg)
+
+    def down(params, bundle_hashes, min_confirmations=0):
+        raise RuntimeError("anchorEvidenceBatch gas estimation failed")
+
+    monkeypatch.setattr(jobs, "_anchor_many_on_chain", down)
+    jobs.flush_anchor_batch_job()
+    batch = factory().query(models.AnchorBatch).one()
+    assert batch.status == "failed" and batch.merkle_root
+
+    _park(factory(), 2)
+    sent = []
+    monkeypatch.setattr(
+        jobs, "_anchor_many_on_chain", lambda params, hashes, min_conf=0: sent.append(hashes) or ("0xm", 9)
+    )
+    jobs.flush_anchor_batch_job()
+    session = factory()
+    latest = session.query(models.AnchorBatch).filter(models.AnchorBatch.status == "anchored").one()
+    assert latest.merkle_root is None and len(sent[0]) == 2
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+from web3 import Web3
+
+from app import anchor, fee_oracle
+
+CONTRACT = Web3.to_checksum_address("0x" + "ab" * 20)
+OTHER = Web3.to_checksum_address("0x" + "cd" * 20)
+
+
+def _log(address, bundle_byte, index):
+    return {
+        "address": address,
+        "topics": [bytes(anchor.EVIDENCE_ANCHORED_TOPIC0), b"\x00" * 12 + b"\x11" * 20],
+        "data": "0x" + (bytes([bundle_byte]) * 32 + (1_700_000_000).to_bytes(32, "big")).hex(),
+        "logIndex": index,
+    }
+
+
+RECEIPT = {
+    "status": 1,
+    "blockNumber": 42,
+    "logs": [_log(CONTRACT, 1, 0), _log(OTHER, 2, 1), _log(CONTRACT, 3, 2)],
+}
+
+
+def test_batch_tx_calls_anchor_evidence_batch(monkeypatch):
+    monkeypatch.setattr(fee_oracle, "fee_params", lambda w3: {"gasPrice": 1})
+    monkeypatch.setattr(fee_oracle, "gas_limit", lambda *a, **k: 90_000)
+    w3 = Web3()
+    contract = w3.eth.contract(address=CONTRACT, abi=anchor.FALLBACK_ABI)
+    hashes = [bytes([1]) * 32, bytes([2]) * 32]
+
+    tx = anchor._build_tx_anchor(w3, contract, OTHER, hashes, nonce=7, chain_id=14)
+    selector = Web3.keccak(text="anchorEvidenceBatch(bytes32[])")[:4]
+    assert bytes(Web3.to_bytes(hexstr=tx["data"]))[:4] == selector
+    assert tx["gas"] == 90_000
+
+
+def test_batch_tx_is_not_built_when_estimation_fails(monkeypatch):
+    # e.g. an older contract without anchorEvidenceBatch: a fallback gas limit would just revert.
+    monkeypatch.setattr(fee_oracle, "fee_params", lambda w3: {"gasPrice": 1})
+    monkeypatch.setattr(fee_oracle, "gas_limit", lambda *a, **k: None)
+    w3 = Web3()
+    contract = w3.eth.contract(address=CONTRACT, abi=anchor.FALLBACK_ABI)
+
+    with pytest.raises(RuntimeError, match="anchorEvidenceBatch"):
+        anchor._build_tx_anchor(w3, contract, OTHER, [bytes([1]) * 32], nonce=7, chain_id=14)
+    assert anchor._build_tx_anchor(w3, contract, OTHER, bytes([1]) * 32, nonce=7, chain_id=14)["gas"] == (
+        anchor.ANCHOR_GAS_DEFAULT
+    )
+
+
+def test_batch_receipt_decodes_per_hash_events(monkeypatch):
+    assert anchor.anchored_hashes(RECEIPT, CONTRACT) == {"0x" + "01" * 32: 0, "0x" + "03" * 32: 2}
+
+    eth = types.SimpleNamespace(
+        get_transaction_receipt=lambda txid: RECEIPT, get_block=lambda n: {"timestamp": 1_700_000_000}
+    )
+    monkeypatch.setattr(anchor, "_load_web3", lambda rpc_url: types.SimpleNamespace(eth=eth))
+
+    ok, block, _ = anchor.verify_anchor_tx(
+        txid="0x01", expected_bundle_hash_hex="0x" + "03" * 32, contract_addr=CONTRACT
+    )
+    assert ok and block == 42
+    ok, _, _ = anchor.verify_anchor_tx(txid="0x01", expected_bundle_hash_hex="0x" + "02" * 32, contract_addr=CONTRACT)
+    assert not ok
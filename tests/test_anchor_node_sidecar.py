@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pytest
+
+from app import anchor_node
+
+# Stand-in for scripts/sidecar.js: same NDJSON protocol, answers out of order.
+FAKE_SIDECAR = r"""
+import json, sys, threading, time
+
+def handle(req):
+    if req["op"] == "crash":
+        sys.stdout.flush()
+        import os; os._exit(3)
+    if req["op"] in ("hang", "anchor"):
+        return  # never answers (hung RPC)
+    time.sleep(0.2 if req.get("bundleHash", "").endswith("1") else 0.0)
+    out = {"id": req["id"], "ok": True, "result": {"echo": req.get("bundleHash")}}
+    if req["op"] == "fail":
+        out = {"id": req["id"], "ok": False, "error": "boom"}
+    with lock:
+        sys.stdout.write(json.dumps(out) + "\n")
+        sys.stdout.flush()
+
+lock = threading.Lock()
+for line in sys.stdin:
+    threading.Thread(target=handle, args=(json.loads(line),)).start()
+"""
+
+
+@pytest.fixture()
+def sidecar():
+    sc = anchor_node.NodeSidecar(cmd=[sys.executable, "-c", FAKE_SIDECAR], env={})
+    yield sc
+    sc.close()
+
+
+def test_concurrent_requests_are_correlated(sidecar):
+    results = {}
+
+    def call(h):
+        results[h] = sidecar.request("find", timeout=10, bundleHash=h)["echo"]
+
+    threads = [threading.Thread(target=call, args=(h,)) for h in ("0x1", "0x2", "0x3")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {"0x1": "0x1", "0x2": "0x2", "0x3": "0x3"}
+
+    with pytest.raises(RuntimeError, match="boom"):
+        sidecar.request("fail", timeout=10, bundleHash="0x4")
+
+
+def test_restarts_after_exit(sidecar):
+    first_pid = sidecar.request("find", timeout=10, bundleHash="0x2") and sidecar._proc.pid
+    with pytest.raises(anchor_node.SidecarError):
+        sidecar.request("crash", timeout=10, bundleHash="0x0")
+    sidecar._proc.wait(timeout=5)
+
+    assert sidecar.request("find", timeout=10, bundleHash="0x5") == {"echo": "0x5"}
+    assert sidecar._proc.pid != first_pid
+
+
+def test_timed_out_call_restarts_sidecar(sidecar):
+    sidecar.request("find", timeout=10, bundleHash="0x2")
+    first = sidecar._proc
+    with pytest.raises(anchor_node.SidecarError, match="timed out"):
+        sidecar.request("hang", timeout=0.3, bundleHash="0x0")
+    assert first.wait(timeout=5) is not None
+
+    assert sidecar.request("find", timeout=10, bundleHash="0x5") == {"echo": "0x5"}
+    assert sidecar._proc.pid != first.pid
+
+
+def test_timeout_keeps_sidecar_with_anchor_in_flight(sidecar):
+    threading.Thread(target=lambda: sidecar.request("anchor", timeout=3, bundleHash="0x0"), daemon=True).start()
+    time.sleep(0.2)
+    proc = sidecar._proc
+    with pytest.raises(anchor_node.SidecarError):
+        sidecar.request("hang", timeout=0.3, bundleHash="0x0")
+    # It still answers a ping, so the pending anchor is not orphaned.
+    assert proc.poll() is None and sidecar._proc is proc
+
+
+def test_find_anchors_runs_concurrently_and_reports_failure(monkeypatch):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_call(op, bundle_hash_hex, script):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        if bundle_hash_hex.endswith("ff"):
+            raise anchor_node.SidecarError("sidecar find timed out")
+        return {"matches": bundle_hash_hex.endswith("01"), "txid": "0xt"}
+
+    monkeypatch.setattr(anchor_node, "_call", fake_call)
+    hashes = ["0x" + f"{i:02x}" * 32 for i in range(1, 9)]
+    out = anchor_node.find_anchors(hashes)
+    assert peak[0] > 1 and out[hashes[0]].matches and not out[hashes[1]].matches
+
+    with pytest.raises(RuntimeError, match="node find failed"):
+        anchor_node.find_anchors(hashes + ["0x" + "ff" * 32])
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import types
+from datetime import datetime, timedelta
+
+from app import anchor_tracker
+
+
+def _row(**kw):
+    base = dict(status="pending", block_number=None, block_hash=None, anchored_at=None, submitted_at=datetime.utcnow())
+    base.update(kw)
+    return types.SimpleNamespace(**base)
+
+
+def _rcpt(block: int, block_hash: str = "0xaa", status: str = "0x1"):
+    return {"blockNumber": hex(block), "blockHash": block_hash, "status": status}
+
+
+def test_confirmation_depth_and_reorg():
+    now = datetime.utcnow()
+    row = _row()
+
+    anchor_tracker._apply(row, _rcpt(100), latest=101, min_conf=3, now=now)
+    assert row.status == "pending" and row.block_number == 100
+
+    # reorg: re-mined in a later block, depth restarts from there
+    anchor_tracker._apply(row, _rcpt(102, "0xbb"), latest=103, min_conf=3, now=now)
+    assert row.status == "pending" and row.block_hash == "0xbb"
+
+    anchor_tracker._apply(row, _rcpt(102, "0xbb"), latest=104, min_conf=3, now=now)
+    assert row.status == "confirmed" and row.anchored_at == now
+
+
+def test_reverted_dropped_and_timeout():
+    now = datetime.utcnow()
+    reverted = _row()
+    anchor_tracker._apply(reverted, _rcpt(10, status="0x0"), latest=20, min_conf=0, now=now)
+    assert reverted.status == "failed"
+
+    dropped = _row(block_number=10, block_hash="0xaa")
+    anchor_tracker._apply(dropped, None, latest=20, min_conf=0, now=now)
+    assert dropped.status == "pending" and dropped.block_hash is None
+
+    stale = _row(submitted_at=now - timedelta(seconds=anchor_tracker.ANCHOR_TRACKER_TIMEOUT + 1))
+    anchor_tracker._apply(stale, None, latest=20, min_conf=0, now=now)
+    assert stale.status == "failed"
+
+
+class FakeNonces:
+    def __init__(self, entries):
+        self.entries = entries
+        self.completed = []
+
+    def get(self, nonce):
+        return self.entries.get(nonce)
+
+    def complete(self, nonce):
+        self.completed.append(nonce)
+
+
+def test_poll_follows_fee_bumped_replacement(monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app import models
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    row = models.ChainAnchor(
+        receipt_id="00000000-0000-4000-8000-000000000001",
+        chain="flare",
+        txid="0xaa",
+        status="pending",
+        rpc_url="http://rpc",
+        submitted_at=datetime.utcnow(),
+        chain_id=14,
+        signer="0xabc",
+        nonce=3,
+    )
+    session.add(row)
+    session.commit()
+
+    nonces = FakeNonces({3: {"tx_hash": "0xcc", "hashes": ["0xaa", "0xbb", "0xcc"]}})
+    monkeypatch.setattr(anchor_tracker, "get_nonce_manager", lambda chain_id, signer: nonces)
+    asked = []
+
+    def fake_fetch(rpc_url, txids):
+        asked.append(txids)
+        return 20, {t: (_rcpt(10) if t == "0xbb" else None) for t in txids}
+
+    monkeypatch.setattr(anchor_tracker, "fetch_receipts", fake_fetch)
+
+    changed = anchor_tracker.poll_pending(session, min_confirmations=1)
+    assert asked == [["0xaa", "0xbb", "0xcc"]]
+    assert [r.txid for r in changed] == ["0xbb"] and row.status == "confirmed"
+    assert nonces.completed == [3]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+
+from app import blobstore
+
+
+def test_identical_files_share_one_blob(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    monkeypatch.setattr(blobstore, "BLOB_STORE_ENABLED", True)
+    pem = b"-----BEGIN ED25519 PUBLIC KEY-----\nabc\n-----END ED25519 PUBLIC KEY-----\n"
+
+    a, b = tmp_path / "r1" / "public_key.pem", tmp_path / "r2" / "public_key.pem"
+    sha = blobstore.write(a, pem)
+    assert blobstore.write(b, pem, sha) == sha
+    assert os.path.samefile(a, b) and os.path.samefile(a, blobstore.blob_path(sha))
+    assert os.stat(a).st_nlink == 3
+
+    # Rewriting an already linked file is a no-op; replacing one receipt's file leaves the other alone.
+    mtime = os.stat(blobstore.blob_path(sha)).st_mtime_ns
+    blobstore.write(a, pem, sha)
+    assert os.stat(blobstore.blob_path(sha)).st_mtime_ns == mtime
+    blobstore.write(b, b"rotated")
+    assert a.read_bytes() == pem and b.read_bytes() == b"rotated"
+    assert not [p for p in (tmp_path / "r1").iterdir() if p.name.startswith(".")]
+
+
+def test_falls_back_to_copies_without_hardlinks(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    monkeypatch.setattr(blobstore, "BLOB_STORE_ENABLED", True)
+
+    def no_link(src, dst):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(blobstore.os, "link", no_link)
+    dest = tmp_path / "r1" / "pain001.xml"
+    blobstore.write(dest, b"<Document/>")
+    assert dest.read_bytes() == b"<Document/>"
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+import time
+import types
+from zipfile import ZipFile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import (
+    anchor,
+    anchor_node,
+    bulk_verify,
+    bundle,
+    chain_index,
+    log_scan,
+    models,
+    providers,
+    schemas,
+    verify_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    monkeypatch.setattr(verify_cache, "_redis", lambda: None)
+    verify_cache._LOCAL.clear()
+    yield
+    verify_cache._LOCAL.clear()
+
+
+def _session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _h(i):
+    return "0x" + f"{i:02x}" * 32
+
+
+def test_downloads_run_concurrently_and_chain_lookup_is_batched(monkeypatch):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_verify_url(url):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return schemas.VerificationResult(bundle_hash=_h(int(url.rsplit("/", 1)[1])), errors=[])
+
+    lookups = []
+
+    def fake_find_anchors(hashes, **k):
+        lookups.append(sorted(hashes))
+        return {h: schemas.ChainMatch(matches=h == _h(1), txid="0xt" if h == _h(1) else None) for h in hashes}
+
+    monkeypatch.setattr(verify_cache, "verify_bundle_url", fake_verify_url)
+    monkeypatch.setattr(anchor, "find_anchors", fake_find_anchors)
+
+    urls = [f"https://b.test/{i}" for i in range(1, 9)] + ["https://b.test/1"]
+    results = list(bulk_verify.iter_results(_session(), bundle_urls=urls, bundle_hashes=[_h(9), _h(9)], concurrency=4))
+
+    assert len(results) == 9 and peak[0] > 1
+    # Sub-batches of at most BULK_VERIFY_CHAIN_BATCH hashes, each hash looked up once
+    assert sorted(h for batch in lookups for h in batch) == sorted({_h(i) for i in range(1, 10)})
+    assert all(len(batch) <= bulk_verify.BULK_VERIFY_CHAIN_BATCH for batch in lookups)
+    by_url = {r.get("url") or r.get("bundle_hash"): r["result"] for r in results}
+    assert by_url["https://b.test/1"].matches_onchain and by_url["https://b.test/1"].flare_txid == "0xt"
+    assert not by_url[_h(9)].matches_onchain
+
+
+def test_results_stream_while_a_download_is_still_running(monkeypatch):
+    release = threading.Event()
+
+    def fake_verify_url(url):
+        i = int(url.rsplit("/", 1)[1])
+        if i == 5:
+            release.wait(5)
+        return schemas.VerificationResult(bundle_hash=_h(i), errors=[])
+
+    monkeypatch.setattr(verify_cache, "verify_bundle_url", fake_verify_url)
+    monkeypatch.setattr(bulk_verify, "BULK_VERIFY_CHAIN_BATCH", 2)
+    monkeypatch.setattr(
+        anchor, "find_anchors", lambda hashes, **k: {h: schemas.ChainMatch(matches=False) for h in hashes}
+    )
+
+    urls = [f"https://b.test/{i}" for i in range(1, 6)]
+    results = bulk_verify.iter_results(_session(), bundle_urls=urls, bundle_hashes=[], concurrency=5)
+    early = [next(results)["url"] for _ in range(4)]
+    assert not release.is_set() and sorted(early) == urls[:4]
+    release.set()
+    assert [r["url"] for r in results] == [urls[4]]
+
+
+def test_node_fallback_failure_is_reported_unavailable_and_not_cached(monkeypatch):
+    def down(hashes, **k):
+        raise RuntimeError("rpc down")
+
+    monkeypatch.setattr(anchor, "find_anchors", down)
+    monkeypatch.setattr(anchor_node, "find_anchors", down)
+    [out] = bulk_verify.iter_results(_session(), bundle_urls=[], bundle_hashes=[_h(1)])
+    assert out["result"].errors == ["anchor_lookup_unavailable"] and not out["result"].matches_onchain
+    assert verify_cache.get_anchor(_h(1)) is None
+
+    monkeypatch.setattr(
+        anchor_node, "find_anchors", lambda hashes: {h: schemas.ChainMatch(matches=True, txid="0xn") for h in hashes}
+    )
+    [out] = bulk_verify.iter_results(_session(), bundle_urls=[], bundle_hashes=[_h(1)])
+    assert out["result"].errors == [] and out["result"].flare_txid == "0xn"
+    assert verify_cache.get_anchor(_h(1)).matches
+
+
+def test_manifest_signatures_are_checked_inline_and_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    served = {}
+    for i in range(1, 3):
+        zip_path, _ = bundle.create_bundle({"id": f"r-{i}", "reference": f"ref-{i}"}, b"<Document/>")
+        with ZipFile(zip_path) as src:
+            files = {n: src.read(n) for n in src.namelist()}
+        if i == 2:
+            files["manifest.sig"] = bytes(64)
+        out = io.BytesIO()
+        with ZipFile(out, "w") as dst:
+            for name, data in files.items():
+                dst.writestr(name, data)
+        served[f"https://b.test/{i}"] = out.getvalue()
+
+    class Response:
+        def __init__(self, data):
+            self.data, self.headers = data, {}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield self.data
+
+    class Session:
+        def get(self, url, stream, timeout):
+            return Response(served[url])
+
+    monkeypatch.setattr(providers, "http_session", lambda key: Session())
+    monkeypatch.setattr(verify_cache, "url_validator", lambda url: None)
+    monkeypatch.setattr(
+        anchor, "find_anchors", lambda hashes, **k: {h: schemas.ChainMatch(matches=False) for h in hashes}
+    )
+
+    results = {
+        r["url"]: r["result"] for r in bulk_verify.iter_results(_session(), bundle_urls=list(served), bundle_hashes=[])
+    }
+
+    assert "signature_invalid" in results["https://b.test/2"].errors
+    assert "signature_invalid" not in results["https://b.test/1"].errors
+    # The signature outcome is cached with the result, under the zip hash.
+    zip_hash = "0x" + hashlib.sha256(served["https://b.test/2"]).hexdigest()
+    assert "signature_invalid" in verify_cache.get_bundle(zip_hash).errors
+
+
+def test_find_anchors_resolves_many_hashes_in_one_scan(monkeypatch):
+    contract = types.SimpleNamespace(address="0x" + "ab" * 20)
+    w3 = types.SimpleNamespace(eth=types.SimpleNamespace(block_number=1000))
+    monkeypatch.setattr(anchor, "_load_contract", lambda **k: (w3, contract))
+    monkeypatch.setattr(chain_index, "CHAIN_INDEX_ENABLED", False)
+
+    def log(i, block):
+        data = bytes.fromhex(_h(i)[2:]) + (1_700_000_000).to_bytes(32, "big")
+        return {
+            "topics": [bytes(anchor.EVIDENCE_ANCHORED_TOPIC0), b"\x00" * 32],
+            "data": data,
+            "transactionHash": bytes([i]) * 32,
+            "blockNumber": block,
+        }
+
+    scans = []
+
+    def fake_iter_logs(w3, params, from_block, to_block, **k):
+        scans.append((from_block, to_block))
+        yield (900, 1000), [log(1, 950), log(2, 990)]
+        yield (800, 899), [log(2, 850)]
+
+    monkeypatch.setattr(log_scan, "iter_logs", fake_iter_logs)
+
+    out = anchor.find_anchors([_h(1), _h(2), _h(3)])
+    assert len(scans) == 1
+    assert out[_h(1)].matches and out[_h(2)].txid == "0x" + "02" * 32 and not out[_h(3)].matches
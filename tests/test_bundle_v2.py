@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from zipfile import ZipFile
+
+from nacl import signing
+
+from app import bundle, keys
+
+
+def _v2_bundle(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    receipt = {"id": "r-2", "reference": "ref-2", "created_at": "2026-01-01T00:00:00Z"}
+    zip_path, bundle_hash = bundle.create_bundle(receipt, b"<Document/>", version=bundle.BUNDLE_V2)
+    with ZipFile(zip_path) as zf:
+        members = {n: zf.read(n) for n in zf.namelist()}
+    return zip_path, bundle_hash, members
+
+
+def _proof_doc(members, name):
+    return {
+        **bundle.member_proof(members["manifest.json"], name),
+        "manifest": members["manifest.json"].decode("utf-8"),
+        "manifest_sig": members["manifest.sig"].hex(),
+        "public_key_pem": members["public_key.pem"].decode("utf-8"),
+    }
+
+
+def test_v2_bundle_hash_is_merkle_root(tmp_path, monkeypatch):
+    zip_path, bundle_hash, members = _v2_bundle(tmp_path, monkeypatch)
+    manifest = json.loads(members["manifest.json"])
+    assert manifest["version"] == bundle.BUNDLE_V2
+    assert manifest["merkle"] == {"alg": bundle.MERKLE_ALG, "root": bundle_hash}
+
+    data = open(zip_path, "rb").read()
+    res = bundle.verify_bundle_file(io.BytesIO(data), "0x" + hashlib.sha256(data).hexdigest())
+    assert res.errors == []
+    assert res.bundle_hash == bundle_hash
+
+
+def _resigned(members, keep_root):
+    """The bundle re-signed with another key (manifest rebuilt around the new public_key.pem)."""
+
+    sk = signing.SigningKey.generate()
+    raw = bytes(sk.verify_key)
+    pem = keys._to_pem(raw).encode("utf-8")
+    manifest = json.loads(members["manifest.json"])
+    manifest["key_id"] = keys.key_id_for(raw)
+    for f in manifest["files"]:
+        if f["name"] == "public_key.pem":
+            f.update(sha256="0x" + hashlib.sha256(pem).hexdigest(), size=len(pem))
+    if not keep_root:
+        manifest["merkle"]["root"] = bundle._manifest_merkle(manifest)[0]
+    canon = bundle._canonical_manifest_bytes(manifest)
+    return dict(members, **{"manifest.json": canon, "manifest.sig": sk.sign(canon).signature, "public_key.pem": pem})
+
+
+def test_v2_root_binds_signing_key(tmp_path, monkeypatch):
+    _, bundle_hash, members = _v2_bundle(tmp_path, monkeypatch)
+    assert any(f["name"] == "public_key.pem" for f in json.loads(members["manifest.json"])["files"])
+
+    for keep_root in (True, False):
+        forged = _resigned(members, keep_root)
+        zip_path = tmp_path / f"forged-{keep_root}.zip"
+        zip_hash, _ = bundle._deterministic_zip(forged, zip_path)
+        res = bundle.verify_bundle_file(io.BytesIO(zip_path.read_bytes()), zip_hash)
+        # Either the signed root no longer matches the tree, or it is not the anchored one.
+        assert "merkle_root_mismatch" in res.errors if keep_root else res.bundle_hash != bundle_hash
+
+        doc = {
+            **bundle.member_proof(members["manifest.json"], "pain001.xml"),
+            "manifest": forged["manifest.json"].decode(),
+        }
+        doc.update(manifest_sig=forged["manifest.sig"].hex(), public_key_pem=forged["public_key.pem"].decode())
+        _, errors = bundle.verify_member("pain001.xml", members["pain001.xml"], doc)
+        assert "manifest_root_mismatch" in errors
+
+
+def test_member_proof_verifies_single_file(tmp_path, monkeypatch):
+    _, bundle_hash, members = _v2_bundle(tmp_path, monkeypatch)
+    for name in ("pain001.xml", "receipt.json"):
+        root, errors = bundle.verify_member(name, members[name], _proof_doc(members, name))
+        assert errors == []
+        assert root == bundle_hash
+
+
+def test_member_proof_rejects_tampering(tmp_path, monkeypatch):
+    _, _, members = _v2_bundle(tmp_path, monkeypatch)
+    doc = _proof_doc(members, "pain001.xml")
+
+    _, errors = bundle.verify_member("pain001.xml", b"<Document>x</Document>", doc)
+    assert "file_hash_mismatch:pain001.xml" in errors
+
+    forged = dict(doc, manifest_sig=("00" * 64))
+    _, errors = bundle.verify_member("pain001.xml", members["pain001.xml"], forged)
+    assert "signature_invalid" in errors
+
+
+def test_member_proof_requires_v2(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    zip_path, _ = bundle.create_bundle({"id": "r-1", "reference": "r", "created_at": "x"}, b"<Document/>")
+    with ZipFile(zip_path) as zf:
+        manifest = zf.read("manifest.json")
+    try:
+        bundle.member_proof(manifest, "pain001.xml")
+    except ValueError as e:
+        assert str(e) == "bundle_not_v2"
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_verify_cid_looks_up_v2_root(tmp_path, monkeypatch):
+    from app import anchor, schemas
+    from app.api.routes import verify as verify_routes
+
+    zip_path, bundle_hash, _ = _v2_bundle(tmp_path, monkeypatch)
+    data = open(zip_path, "rb").read()
+    looked_up = []
+    monkeypatch.setattr(verify_routes, "_fetch_cid_bytes", lambda cid, store=None: data)
+    monkeypatch.setattr(anchor, "find_anchor", lambda h: looked_up.append(h) or schemas.ChainMatch(matches=True))
+
+    res = verify_routes.verify_cid(schemas.VerifyCidRequest(cid="bafy-test"))
+    assert looked_up == [bundle_hash] and res.matches_onchain and res.errors == []
+    assert res.checksums["content_sha256"] == "0x" + hashlib.sha256(data).hexdigest()
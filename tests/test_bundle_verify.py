@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+from zipfile import ZIP_STORED, ZipFile
+
+from app import bundle, providers
+
+
+class FakeResponse:
+    def __init__(self, data, headers=None):
+        self.data, self.headers = data, headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+
+class FakeSession:
+    def __init__(self, data, headers=None):
+        self.data, self.headers = data, headers
+
+    def get(self, url, stream, timeout):
+        return FakeResponse(self.data, self.headers)
+
+
+def _bundle_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    receipt = {"id": "r-1", "reference": "ref-1", "created_at": "2026-01-01T00:00:00Z"}
+    zip_path, bundle_hash = bundle.create_bundle(receipt, b"<Document/>")
+    return open(zip_path, "rb").read(), bundle_hash
+
+
+def _serve(monkeypatch, data, headers=None):
+    monkeypatch.setattr(providers, "http_session", lambda key: FakeSession(data, headers))
+
+
+def test_verify_streams_hash_and_checks_members(tmp_path, monkeypatch):
+    data, bundle_hash = _bundle_bytes(tmp_path, monkeypatch)
+    monkeypatch.setattr(bundle, "VERIFY_SPOOL_BYTES", 1024)  # force the spill-to-disk path
+    _serve(monkeypatch, data)
+
+    res = bundle.verify_bundle("https://example.test/evidence.zip")
+    assert res.bundle_hash == bundle_hash
+    assert not [e for e in res.errors if e.startswith(("file_hash", "signature", "missing", "zip_open"))]
+
+    # Tampered member -> hash mismatch, reported once
+    with ZipFile(io.BytesIO(data)) as src:
+        files = {n: src.read(n) for n in src.namelist()}
+    files["receipt.json"] = b"{}"
+    out = io.BytesIO()
+    with ZipFile(out, "w", compression=ZIP_STORED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    _serve(monkeypatch, out.getvalue())
+    assert (
+        bundle.verify_bundle("https://example.test/evidence.zip").errors.count("file_hash_mismatch:receipt.json") == 1
+    )
+
+
+def test_oversized_bundle_is_rejected(tmp_path, monkeypatch):
+    data, _ = _bundle_bytes(tmp_path, monkeypatch)
+    monkeypatch.setattr(bundle, "VERIFY_MAX_BUNDLE_BYTES", len(data) - 1)
+
+    _serve(monkeypatch, data, {"Content-Length": str(len(data))})
+    assert bundle.verify_bundle("https://example.test/a.zip").errors[0].startswith("bundle_too_large")
+    _serve(monkeypatch, data)
+    assert bundle.verify_bundle("https://example.test/a.zip").errors[0].startswith("bundle_too_large")
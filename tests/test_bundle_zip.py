@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
+
+from app import bundle
+
+
+def _reference_zip(file_map):
+    mem = io.BytesIO()
+    with ZipFile(mem, mode="w", compression=ZIP_STORED) as zf:
+        for name in sorted(file_map):
+            zi = ZipInfo(filename=name, date_time=(1980, 1, 1, 0, 0, 0))
+            zi.external_attr = 0o644 << 16
+            zf.writestr(zi, file_map[name])
+    return mem.getvalue()
+
+
+def test_streamed_zip_is_byte_identical_to_zipfile(tmp_path):
+    file_map = {"receipt.json": b"{}" * 5000, "pain001.xml": b"<Document/>", "empty.txt": b"", "café.json": b"1"}
+    out = tmp_path / "r" / "evidence.zip"
+
+    digest, size = bundle._deterministic_zip(file_map, out)
+
+    expected = _reference_zip(file_map)
+    assert out.read_bytes() == expected and size == len(expected)
+    assert digest == "0x" + hashlib.sha256(expected).hexdigest()
+    assert [p.name for p in out.parent.iterdir()] == ["evidence.zip"]
+
+
+def test_create_bundle_hash_and_member_digests(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    xml = b"<Document>pain</Document>"
+    receipt = {"id": "r-1", "reference": "ref-1", "created_at": "2026-01-01T00:00:00Z"}
+
+    zip_path, bundle_hash = bundle.create_bundle(receipt, xml, xml_sha256=bundle._sha256_hex(xml))
+
+    data = open(zip_path, "rb").read()
+    assert bundle_hash == bundle._sha256_hex(data)
+    with ZipFile(zip_path) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        for entry in manifest["files"]:
+            assert entry["sha256"] == bundle._sha256_hex(zf.read(entry["name"]))
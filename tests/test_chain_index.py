@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import types
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import anchor, chain_index, db, models
+
+CONTRACT = "0x" + "ab" * 20
+
+
+def _log(block: int, bundle_byte: int, ts: int = 1_700_000_000):
+    data = bytes([bundle_byte]) * 32 + ts.to_bytes(32, "big")
+    return {
+        "topics": [bytes(anchor.EVIDENCE_ANCHORED_TOPIC0), b"\x00" * 12 + b"\x11" * 20],
+        "data": data,
+        "transactionHash": bytes([block]) * 32,
+        "logIndex": 0,
+        "blockNumber": block,
+        "blockHash": b"\xaa" * 32,
+    }
+
+
+class FakeEth:
+    def __init__(self):
+        self.block_number = 10
+        self.logs = [_log(3, 1), _log(8, 2)]
+        self.fork = b"\x00"
+
+    def get_logs(self, flt):
+        return [lg for lg in self.logs if flt["fromBlock"] <= lg["blockNumber"] <= flt["toBlock"]]
+
+    def get_block(self, n):
+        return {"hash": self.fork * 31 + bytes([n])}
+
+
+def test_sync_lookup_and_reorg(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(db, "SessionLocal", Session)
+
+    eth = FakeEth()
+    monkeypatch.setattr(anchor, "_load_web3", lambda rpc_url: types.SimpleNamespace(eth=eth))
+
+    session = Session()
+    assert chain_index.sync_contract(session, chain="flare", rpc_url="http://x", contract=CONTRACT, start_block=0) == 2
+
+    hit, covered = chain_index.find_indexed("0x" + "02" * 32, rpc_url="http://x", contract_addr=CONTRACT)
+    assert hit.matches and hit.txid == "0x" + "08" * 32 and hit.anchored_at.year == 2023
+    assert covered == (0, 10)
+
+    miss, _ = chain_index.find_indexed("0x" + "05" * 32, rpc_url="http://x", contract_addr=CONTRACT)
+    assert miss is None
+
+    # Reorg: tip hash changes and block 8's event is replaced by one in block 9.
+    eth.fork = b"\x01"
+    eth.logs = [_log(3, 1), _log(9, 3)]
+    eth.block_number = 12
+    chain_index.sync_contract(session, chain="flare", rpc_url="http://x", contract=CONTRACT)
+    hashes = {e.bundle_hash for e in session.query(models.EvidenceEvent).all()}
+    assert hashes == {"0x" + "01" * 32, "0x" + "03" * 32}
+
+
+def test_backfill_rewind_and_trusted_range(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(db, "SessionLocal", Session)
+    eth = FakeEth()
+    monkeypatch.setattr(anchor, "_load_web3", lambda rpc_url: types.SimpleNamespace(eth=eth))
+    monkeypatch.setattr(chain_index, "CHAIN_INDEX_CHUNK_BLOCKS", 2)
+    session = Session()
+
+    # The worker created the cursor recently: block 3 is outside its range.
+    assert chain_index.sync_contract(session, chain="flare", rpc_url="http://x", contract=CONTRACT, start_block=6) == 1
+    miss, covered = chain_index.find_indexed("0x" + "01" * 32, rpc_url="http://x", contract_addr=CONTRACT)
+    assert miss is None and covered == (6, 10)
+    assert chain_index.scan_from(covered, 2) == 2  # window starts before the index: scan it all
+    assert chain_index.scan_from(covered, 7) == 11
+    assert chain_index.scan_from(None, 7) == 7
+
+    # Backfill below an existing cursor.
+    assert chain_index.sync_contract(session, chain="flare", rpc_url="http://x", contract=CONTRACT, start_block=0) == 1
+    hit, covered = chain_index.find_indexed("0x" + "01" * 32, rpc_url="http://x", contract_addr=CONTRACT)
+    assert hit.matches and covered == (0, 10)
+
+    # Rewind re-indexes forward from a block and picks up events missed there.
+    eth.logs.append({**_log(5, 4), "transactionHash": b"\x55" * 32})
+    assert chain_index.sync_contract(session, chain="flare", rpc_url="http://x", contract=CONTRACT) == 0
+    assert (
+        chain_index.sync_contract(
+            session, chain="flare", rpc_url="http://x", contract=CONTRACT, start_block=4, rewind=True
+        )
+        == 1
+    )
+    assert session.query(models.EvidenceEvent).count() == 3
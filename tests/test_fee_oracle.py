@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from app import fee_oracle
+
+
+class CountingEth:
+    def __init__(self):
+        self.calls = 0
+
+    def fee_history(self, *_args):
+        self.calls += 1
+        return {"baseFeePerGas": [10, 20], "reward": [[1, 3_000_000_000, 5]]}
+
+
+def test_fee_params_served_from_cache(monkeypatch):
+    monkeypatch.setattr(fee_oracle, "_redis", lambda: None)
+    eth = CountingEth()
+    w3 = types.SimpleNamespace(eth=eth, provider=types.SimpleNamespace(endpoint_uri="http://fees.test"))
+
+    first = fee_oracle.fee_params(w3, background=False)
+    assert first == {"type": 2, "maxFeePerGas": 40 + 3_000_000_000, "maxPriorityFeePerGas": 3_000_000_000}
+    first["maxFeePerGas"] = 1  # callers get a copy
+    for _ in range(5):
+        assert fee_oracle.fee_params(w3, background=False)["maxFeePerGas"] == 40 + 3_000_000_000
+    assert eth.calls == 1
+
+
+def test_gas_limit_cached_per_function(monkeypatch):
+    monkeypatch.setattr(fee_oracle, "_redis", lambda: None)
+    w3 = types.SimpleNamespace(provider=types.SimpleNamespace(endpoint_uri="http://gas.test"))
+    calls = []
+
+    def estimate():
+        calls.append(1)
+        return 25_000
+
+    assert fee_oracle.gas_limit(w3, "0xAB", "anchorEvidence", estimate) == 30_000
+    assert fee_oracle.gas_limit(w3, "0xab", "anchorEvidence", estimate) == 30_000
+    assert len(calls) == 1
+    assert fee_oracle.gas_limit(w3, "0xab", "other", lambda: 1 / 0) is None
+
+
+def test_cold_cache_is_single_flight(monkeypatch):
+    monkeypatch.setattr(fee_oracle, "_redis", lambda: None)
+    eth = CountingEth()
+    slow_history = eth.fee_history
+    eth.fee_history = lambda *a: time.sleep(0.1) or slow_history(*a)
+    w3 = types.SimpleNamespace(eth=eth, provider=types.SimpleNamespace(endpoint_uri="http://cold.test"))
+    estimates = []
+
+    def estimate():
+        estimates.append(1)
+        time.sleep(0.1)
+        return 25_000
+
+    def build():
+        fee_oracle.fee_params(w3, background=False)
+        return fee_oracle.gas_limit(w3, "0xab", "anchorEvidence", estimate)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(lambda _: build(), range(4))) == [30_000] * 4
+    assert eth.calls == 1 and len(estimates) == 1
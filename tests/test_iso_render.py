@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app import iso, iso_render
+from app.config import OrgConfigModel
+from app.iso_messages import camt054, pacs002, pain001, pain002, remt001
+
+TRICKY = "a&b<c>d\"e'f\r\ng\th]]>é\U0001f600"
+
+
+def _receipt(**kw):
+    r = {
+        "id": "00000000-0000-4000-8000-000000000001",
+        "reference": "INV-1",
+        "created_at": datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc),
+        "sender_wallet": "0xa",
+        "receiver_wallet": "0xb",
+        "currency": "FLR",
+        "amount": Decimal("1.50"),
+        "status": "anchored",
+        "bundle_hash": "0x" + "ab" * 32,
+        "flare_txid": "0xt1",
+        "fx_rate": "0.02",
+    }
+    r.update(kw)
+    return r
+
+
+def _cfg(**kw):
+    data = {
+        "ledger": {"network": "flare", "rpc_url": "http://localhost", "asset": {"symbol": "FLR"}},
+        "org": {"name": "Org", "lei": "L" * 20},
+        "mapping": {"include_iban": True, "default_debtor_iban": "DE89", "purpose": "GDDS", "include_lei": True},
+        "fx_policy": {"mode": "eqvt_amt", "base_ccy": "EUR"},
+        "validation": {"mode": "off"},
+    }
+    data.update(kw)
+    return OrgConfigModel.model_validate(data)
+
+
+GENERATORS = {
+    "pain.001": iso.generate_pain001,
+    "pain.001-cfg": lambda r: iso.generate_pain001_from_cfg(r, _cfg()),
+    "pain.001-fx": lambda r: pain001.generate_pain001_with_fx(r, _cfg()),
+    "pain.001-fx-norate": lambda r: pain001.generate_pain001_with_fx({**r, "fx_rate": None}, _cfg()),
+    "pain.002": pain002.generate_pain002,
+    "pacs.002": pacs002.generate_pacs002,
+    "camt.054": camt054.generate_camt054,
+    "remt.001": remt001.generate_remt001,
+}
+
+
+def _both(fn, receipt, monkeypatch):
+    monkeypatch.setattr(iso_render, "ISO_TEMPLATES_ENABLED", False)
+    expected = fn(receipt)
+    monkeypatch.setattr(iso_render, "ISO_TEMPLATES_ENABLED", True)
+    return fn(receipt), expected
+
+
+@pytest.mark.parametrize("name", sorted(GENERATORS))
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"reference": TRICKY, "sender_wallet": TRICKY, "currency": TRICKY},
+        {"reference": "", "sender_wallet": "", "receiver_wallet": "", "currency": ""},
+    ],
+)
+def test_template_output_is_byte_identical(name, overrides, monkeypatch):
+    rendered, expected = _both(GENERATORS[name], _receipt(**overrides), monkeypatch)
+    assert rendered == expected
+
+
+def test_templates_are_compiled_and_cached():
+    iso_render.clear()
+    pain002.generate_pain002(_receipt())
+    pain002.generate_pain002(_receipt(reference="other"))
+    templates = [t for (key, _), t in iso_render._TEMPLATES.items() if key == "pain.002"]
+    assert len(templates) == 1 and templates[0] is not None
+
+
+def test_invalid_characters_rejected_like_lxml(monkeypatch):
+    for enabled in (False, True):
+        monkeypatch.setattr(iso_render, "ISO_TEMPLATES_ENABLED", enabled)
+        with pytest.raises(ValueError):
+            pain002.generate_pain002(_receipt(reference="bad\x01"))
+
+
+def test_builder_that_branches_on_values_falls_back_to_lxml():
+    from lxml import etree
+
+    def build(f):
+        root = etree.Element("Doc")
+        etree.SubElement(root, "V").text = f["v"].upper()
+        return root
+
+    assert iso_render.compile_template(build, ("v",)) is None
+    assert iso_render.render("test-upper", build, {"v": "abc"}) == iso_render.tostring(build({"v": "abc"}))
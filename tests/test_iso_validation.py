@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app import iso, iso_validation
+
+# Minimal stand-in for the licensed pain.001 XSD: checks MsgId, accepts the rest.
+XSD = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:iso:std:iso:20022:tech:xsd:pain.001.001.09"
+           targetNamespace="urn:iso:std:iso:20022:tech:xsd:pain.001.001.09"
+           elementFormDefault="qualified">
+  <xs:element name="Document">
+    <xs:complexType><xs:sequence>
+      <xs:element name="CstmrCdtTrfInitn">
+        <xs:complexType><xs:sequence>
+          <xs:element name="GrpHdr">
+            <xs:complexType><xs:sequence>
+              <xs:element name="MsgId">
+                <xs:simpleType><xs:restriction base="xs:string"><xs:maxLength value="35"/></xs:restriction></xs:simpleType>
+              </xs:element>
+              <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+            </xs:sequence></xs:complexType>
+          </xs:element>
+          <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+    </xs:sequence></xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+
+@pytest.fixture
+def schema_dir(tmp_path, monkeypatch):
+    (tmp_path / f"{iso_validation.PAIN001}.xsd").write_text(XSD)
+    monkeypatch.setattr(iso_validation, "ISO_SCHEMA_DIR", tmp_path)
+    iso_validation.clear()
+    yield tmp_path
+    iso_validation.clear()
+
+
+def _receipt(reference="ref-1"):
+    return {
+        "id": "00000000-0000-4000-8000-000000000001",
+        "reference": reference,
+        "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "sender_wallet": "0xa",
+        "receiver_wallet": "0xb",
+        "currency": "FLR",
+        "amount": Decimal("1.5"),
+    }
+
+
+def test_schema_compiled_once(schema_dir):
+    first = iso_validation.get()
+    assert first is not None
+    assert iso_validation.get() is first
+
+
+def test_missing_schema_skips_validation(tmp_path, monkeypatch):
+    monkeypatch.setattr(iso_validation, "ISO_SCHEMA_DIR", tmp_path)
+    iso_validation.clear()
+    assert iso_validation.get() is None
+    assert iso.generate_pain001(_receipt("x" * 40)).startswith(b"<?xml")
+    iso_validation.clear()
+
+
+def test_generate_validates_built_tree(schema_dir):
+    assert b"<MsgId>ref-1</MsgId>" in iso.generate_pain001(_receipt())
+    with pytest.raises(ValueError) as exc:
+        iso.generate_pain001(_receipt("x" * 40))
+    assert "ISO20022 schema validation failed" in str(exc.value)
+    assert "MsgId" in str(exc.value)
+
+
+def test_validate_bytes_uses_same_registry(schema_dir):
+    iso_validation.validate_bytes(iso.generate_pain001(_receipt()))
+    bad = iso.generate_pain001(_receipt()).replace(b"<MsgId>ref-1<", b"<MsgId>" + b"y" * 40 + b"<")
+    with pytest.raises(ValueError):
+        iso_validation.validate_bytes(bad)
+
+
+def test_modes():
+    assert iso_validation.should_validate("strict")
+    assert not iso_validation.should_validate("off")
+    assert not iso_validation.should_validate("sampled", 0.0, key="r-1")
+    assert iso_validation.should_validate("sampled", 1.0, key="r-1")
+    # Sampling is deterministic per key
+    picks = [iso_validation.should_validate("sampled", 0.5, key=f"r-{i}") for i in range(200)]
+    assert picks == [iso_validation.should_validate("sampled", 0.5, key=f"r-{i}") for i in range(200)]
+    assert 50 < sum(picks) < 150
+
+
+def test_org_mode_off_skips_validation(schema_dir):
+    cfg = SimpleNamespace(validation=SimpleNamespace(mode="off", sample_rate=0.0))
+    assert iso_validation.config_args(cfg) == {"mode": "off", "sample_rate": 0.0}
+    root = iso.etree.fromstring(b'<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pain.001.001.09"/>')
+    iso_validation.validate(root, **iso_validation.config_args(cfg))
+    with pytest.raises(ValueError):
+        iso_validation.validate(root, mode="strict")
+
+
+def test_org_without_mode_uses_env_default(monkeypatch):
+    from app.config import ValidationConfig
+
+    cfg = SimpleNamespace(validation=ValidationConfig())
+    assert iso_validation.config_args(cfg)["mode"] is None
+    monkeypatch.setattr(iso_validation, "ISO_VALIDATION_MODE", "off")
+    assert not iso_validation.should_validate(**iso_validation.config_args(cfg), key="r-1")
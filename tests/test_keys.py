@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app import keys
+
+nacl_signing = pytest.importorskip("nacl.signing")
+
+
+@pytest.fixture
+def key_files(tmp_path, monkeypatch):
+    sk_path = tmp_path / "sk.hex"
+    sk_path.write_text(nacl_signing.SigningKey.generate().encode().hex())
+    monkeypatch.setenv("SERVICE_PRIVATE_KEY", str(sk_path))
+    monkeypatch.delenv("SERVICE_PUBLIC_KEY", raising=False)
+    monkeypatch.setattr(keys, "_SERVICE", None)
+    yield sk_path
+    keys._SERVICE = None
+
+
+def test_service_key_is_loaded_once_and_reloaded_on_rotation(key_files, monkeypatch):
+    reads = []
+    real_read = Path.read_text
+
+    def counting_read(self, *a, **k):
+        reads.append(str(self))
+        return real_read(self, *a, **k)
+
+    monkeypatch.setattr(Path, "read_text", counting_read)
+
+    first = keys.service_key()
+    assert keys.service_key() is first and reads == [str(key_files)]
+    assert first.key_id.startswith("ed25519:") and first.pem_bytes == first.pem.encode()
+
+    key_files.write_text(nacl_signing.SigningKey.generate().encode().hex())
+    assert keys.service_key() is first
+    assert keys.reload()["key_id"] != first.key_id
+    assert keys.service_key().key_id == keys.key_id_for(keys.service_key().public_raw)
+
+
+def test_manifest_references_key_id(key_files, tmp_path, monkeypatch):
+    from app import bundle
+
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    receipt = {"id": "r-1", "reference": "ref-1", "created_at": "2026-01-01T00:00:00Z"}
+    zip_path, _ = bundle.create_bundle(receipt, b"<Document/>")
+
+    manifest = json.loads((Path(zip_path).parent / "manifest.json").read_text())
+    assert manifest["key_id"] == keys.service_key().key_id
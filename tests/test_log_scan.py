@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import types
+
+import pytest
+
+from app import log_scan
+
+
+class FakeEth:
+    """get_logs that refuses ranges wider than `max_span` blocks."""
+
+    def __init__(self, logs, max_span=1000, fail_blocks=()):
+        self.logs = logs
+        self.max_span = max_span
+        self.fail_blocks = set(fail_blocks)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_logs(self, flt):
+        lo, hi = flt["fromBlock"], flt["toBlock"]
+        with self.lock:
+            self.calls.append((lo, hi))
+        if hi - lo + 1 > self.max_span:
+            raise ValueError({"code": -32005, "message": "block range too large"})
+        if any(lo <= b <= hi for b in self.fail_blocks):
+            raise ConnectionError("upstream unavailable")
+        return [lg for lg in self.logs if lo <= lg["blockNumber"] <= hi]
+
+
+def _w3(eth, uri):
+    return types.SimpleNamespace(eth=eth, provider=types.SimpleNamespace(endpoint_uri=uri))
+
+
+def test_shrinks_window_and_remembers_it(monkeypatch):
+    monkeypatch.setattr(log_scan, "_CHUNKS", {})
+    eth = FakeEth([{"blockNumber": 10}, {"blockNumber": 3999}], max_span=1000)
+    w3 = _w3(eth, "http://shrink")
+
+    got = [lg["blockNumber"] for _, logs in log_scan.iter_logs(w3, {}, 0, 3999, chunk_blocks=4000) for lg in logs]
+    assert got == [10, 3999]
+    assert log_scan.chunk_size(w3) <= 1000
+
+    eth.calls.clear()
+    list(log_scan.iter_logs(w3, {}, 0, 3999, newest_first=False))
+    assert all(hi - lo + 1 <= 1000 for lo, hi in eth.calls)
+
+
+def test_newest_first_stops_early(monkeypatch):
+    monkeypatch.setattr(log_scan, "_CHUNKS", {})
+    eth = FakeEth([{"blockNumber": 9_950}], max_span=100_000)
+    w3 = _w3(eth, "http://early")
+
+    scan = log_scan.iter_logs(w3, {}, 0, 9_999, chunk_blocks=100, concurrency=2)
+    for span, logs in scan:
+        if logs:
+            break
+    scan.close()
+    assert span == (9_900, 9_999)
+    assert len(eth.calls) <= 3
+
+
+def test_unfetchable_window_raises(monkeypatch):
+    monkeypatch.setattr(log_scan, "_CHUNKS", {})
+    w3 = _w3(FakeEth([], fail_blocks={500}), "http://broken")
+
+    with pytest.raises(log_scan.LogScanError):
+        list(log_scan.iter_logs(w3, {}, 0, 999, chunk_blocks=250))
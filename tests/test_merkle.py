@@ -0,0 +1,31 @@
+import hashlib
+
+import pytest
+
+from app import merkle
+
+
+def _h(i: int) -> str:
+    return "0x" + hashlib.sha256(str(i).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 13])
+def test_proofs_verify_against_root(n):
+    leaves = [_h(i) for i in range(n)]
+    root, proofs = merkle.merkle_proofs(leaves)
+    assert root == merkle.merkle_root(leaves)
+    for leaf, proof in zip(leaves, proofs):
+        assert merkle.verify_proof(leaf, proof, root)
+        assert merkle.root_for_proof(leaf, {"leaf": leaf, "root": root, "proof": proof}) == root
+    # a proof for one leaf must not validate another
+    if n > 1:
+        assert not merkle.verify_proof(leaves[1], proofs[0], root)
+
+
+def test_root_for_proof_rejects_mismatch():
+    leaves = [_h(i) for i in range(4)]
+    root, proofs = merkle.merkle_proofs(leaves)
+    with pytest.raises(ValueError, match="merkle_proof_leaf_mismatch"):
+        merkle.root_for_proof(leaves[0], {"leaf": leaves[1], "root": root, "proof": proofs[1]})
+    with pytest.raises(ValueError, match="merkle_proof_invalid"):
+        merkle.root_for_proof(leaves[0], {"leaf": leaves[0], "root": _h(99), "proof": proofs[0]})
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import time
+import types
+
+import pytest
+
+from app import anchor, nonce_manager
+from app.nonce_manager import NonceManager, bump_fees
+
+
+class DummyRedis:
+    """Just enough of the redis-py surface used by NonceManager."""
+
+    def __init__(self):
+        self.kv = {}
+        self.hashes = {}
+        self.zsets = {}
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def exists(self, key):
+        return int(key in self.kv)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.kv:
+            return None
+        self.kv[key] = value
+        return True
+
+    def incr(self, key):
+        self.kv[key] = int(self.kv.get(key, 0)) + 1
+        return self.kv[key]
+
+    def eval(self, _script, _numkeys, key, want):
+        # _RAISE_TO_LUA
+        self.kv[key] = max(int(self.kv.get(key, -1)), int(want))
+        return self.kv[key]
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zpopmin(self, key, count=1):
+        z = self.zsets.get(key) or {}
+        if not z:
+            return []
+        member = min(z, key=z.get)
+        return [(member.encode(), float(z.pop(member)))]
+
+    def zremrangebyscore(self, key, lo, hi):
+        z = self.zsets.get(key) or {}
+        for m in [m for m, sc in z.items() if sc <= hi]:
+            z.pop(m)
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hdel(self, key, *fields):
+        for f in fields:
+            self.hashes.get(key, {}).pop(f, None)
+
+    def hkeys(self, key):
+        return list(self.hashes.get(key, {}))
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self):
+        outer = self
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return getattr(outer, name)
+
+            def execute(self):
+                return []
+
+        return _Pipe()
+
+
+class DummyEth:
+    def __init__(self, latest=0, pending=0):
+        self.counts = {"latest": latest, "pending": pending}
+
+    def get_transaction_count(self, _addr, tag):
+        return self.counts[tag]
+
+
+def test_sequential_nonces_and_gap_refill():
+    w3 = types.SimpleNamespace(eth=DummyEth(latest=5, pending=7))
+    nm = NonceManager(DummyRedis(), 14, "0xAbC")
+
+    assert [nm.acquire(w3) for _ in range(3)] == [7, 8, 9]
+    nm.release(8)  # never broadcast
+    assert nm.acquire(w3) == 8
+    assert nm.acquire(w3) == 10
+
+
+def test_reconcile_recycles_dead_reservations_and_reports_stuck(monkeypatch):
+    w3 = types.SimpleNamespace(eth=DummyEth(latest=0, pending=0))
+    r = DummyRedis()
+    nm = NonceManager(r, 14, "0xabc")
+    n0, n1 = nm.acquire(w3), nm.acquire(w3)
+    nm.mark_sent(n0, "0xaa", {"nonce": n0, "maxFeePerGas": 100, "maxPriorityFeePerGas": 10})
+
+    old = time.time() - 10_000
+    for n in (n0, n1):
+        entry = json.loads(r.hget(nm.k_inflight, str(n)))
+        entry["ts"] = old
+        r.hset(nm.k_inflight, str(n), json.dumps(entry))
+
+    stuck = nm.reconcile(w3, force=True)
+    assert [n for n, _ in stuck] == [n0]
+    assert nm.get(n1) is None and nm.acquire(w3) == n1
+
+    # once mined, the chain count moves past it and it is dropped (its last entry stays readable)
+    w3.eth.counts.update(latest=2, pending=2)
+    assert nm.reconcile(w3, force=True) == []
+    assert not nm.inflight(n0) and nm.get(n0)["tx_hash"] == "0xaa"
+
+
+class WaitEth(DummyEth):
+    def __init__(self, mined, **kw):
+        super().__init__(**kw)
+        self.mined = mined
+
+    def get_transaction_receipt(self, tx_hash):
+        return self.mined.get(tx_hash)
+
+
+def test_wait_follows_replacement_sent_by_another_worker():
+    r = DummyRedis()
+    nm = NonceManager(r, 14, "0xabc")
+    w3 = types.SimpleNamespace(eth=WaitEth({}, latest=0, pending=0))
+    n = nm.acquire(w3)
+    nm.mark_sent(n, "0xaa", {"nonce": n})
+
+    # Another worker fee-bumps the nonce, the replacement is mined and a resync settles it.
+    nm.mark_sent(n, "0xbb", {"nonce": n}, bumps=1)
+    w3.eth.counts.update(latest=n + 1, pending=n + 1)
+    w3.eth.mined["0xbb"] = {"transactionHash": "0xbb", "status": 1, "blockNumber": 9}
+    nm.resync(w3)
+
+    acct = types.SimpleNamespace(address="0xabc")
+    assert anchor._wait_tx_anchor(w3, acct, nm, n, "0xaa", timeout=5)["transactionHash"] == "0xbb"
+
+
+def test_anchor_is_not_resubmitted_while_its_nonce_is_in_flight(monkeypatch):
+    nm = NonceManager(DummyRedis(), 14, "0xabc")
+    w3 = types.SimpleNamespace(
+        eth=types.SimpleNamespace(
+            account=types.SimpleNamespace(from_key=lambda pk: types.SimpleNamespace(address="0xabc"))
+        )
+    )
+    submitted = []
+
+    def submit(w3, contract, acct, payload, nm, chain_id):
+        n = nm.acquire(types.SimpleNamespace(eth=DummyEth()))
+        nm.mark_sent(n, f"0x{n:02x}", {"nonce": n})
+        submitted.append(n)
+        return f"0x{n:02x}", n
+
+    def wait(*a, **k):
+        raise TimeoutError("not mined")
+
+    monkeypatch.setattr(anchor, "_load_contract", lambda **k: (w3, None))
+    monkeypatch.setattr(anchor, "_chain_id", lambda w3, url: 14)
+    monkeypatch.setattr(anchor, "get_nonce_manager", lambda chain_id, addr: nm)
+    monkeypatch.setattr(anchor, "_submit_tx_anchor", submit)
+    monkeypatch.setattr(anchor, "_wait_tx_anchor", wait)
+
+    with pytest.raises(TimeoutError):
+        anchor._anchor_payload(
+            b"\x01" * 32, rpc_url=None, contract_addr=None, private_key="0x01", abi_path=None, min_confirmations=0
+        )
+    assert submitted == [0]
+
+
+def test_nonce_is_kept_when_send_fails_after_broadcast(monkeypatch):
+    nm = NonceManager(DummyRedis(), 14, "0xabc")
+    signed = types.SimpleNamespace(hash=b"\xaa" * 32, raw_transaction=b"raw")
+    acct = types.SimpleNamespace(address="0xabc", sign_transaction=lambda tx: signed)
+
+    class TimeoutEth(DummyEth):
+        def send_raw_transaction(self, raw):
+            raise ConnectionError("read timed out")
+
+    w3 = types.SimpleNamespace(eth=TimeoutEth())
+    monkeypatch.setattr(anchor, "_replace_stuck", lambda *a: None)
+    monkeypatch.setattr(anchor, "_build_tx_anchor", lambda *a, **k: {"nonce": k["nonce"]})
+
+    # The node may have accepted it: the nonce stays in flight with its tx for re-broadcast.
+    tx_hash, n = anchor._submit_tx_anchor(w3, None, acct, b"\x01" * 32, nm, 14)
+    assert tx_hash == "0x" + "aa" * 32 and nm.inflight(n) and nm.get(n)["tx"] == {"nonce": n}
+    assert nm.acquire(w3) == n + 1
+
+    # Failing before the broadcast hands the nonce back.
+    def boom(*a, **k):
+        raise ValueError("already known")  # e.g. from gas estimation
+
+    monkeypatch.setattr(anchor, "_build_tx_anchor", boom)
+    with pytest.raises(ValueError):
+        anchor._submit_tx_anchor(w3, None, acct, b"\x01" * 32, nm, 14)
+    assert nm.acquire(w3) == n + 2
+
+
+def test_bump_fees_outbids_and_tracks_market():
+    tx = {"maxFeePerGas": 100, "maxPriorityFeePerGas": 10, "nonce": 3}
+    out = bump_fees(tx)
+    pct = 100 + nonce_manager.FEE_BUMP_PERCENT
+    assert out["maxFeePerGas"] > 100 * pct // 100 - 1 and out["maxPriorityFeePerGas"] > 10
+    assert out["nonce"] == 3 and tx["maxFeePerGas"] == 100
+    assert bump_fees(tx, current=(1000, 50))["maxFeePerGas"] == 1000
+    assert bump_fees({"gasPrice": 20})["gasPrice"] > 20
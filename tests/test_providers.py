@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from app import providers
+
+
+def test_web3_and_abi_are_reused(tmp_path):
+    w3 = providers.get_web3("http://127.0.0.1:1/rpc")
+    assert providers.get_web3("http://127.0.0.1:1/rpc") is w3
+    assert providers.get_web3("http://127.0.0.1:1/rpc", timeout=5) is not w3
+
+    abi_file = tmp_path / "abi.json"
+    abi_file.write_text(json.dumps([{"type": "function", "name": "a", "inputs": [], "outputs": []}]))
+    first = providers.load_abi(str(abi_file), [])
+    assert providers.load_abi(str(abi_file), []) is first
+    assert providers.load_abi(str(tmp_path / "missing.json"), ["fallback"]) == ["fallback"]
+
+
+def test_stats_do_not_leak_rpc_paths():
+    providers.record_call("https://rpc.example.com/v3/SECRETKEY", 12.0)
+    providers.record_call("https://rpc.example.com/v3/SECRETKEY", 8.0, "eth_call: ConnectionError")
+    out = providers.stats()
+    key = next(k for k in out if k.startswith("https://rpc.example.com"))
+    assert "SECRETKEY" not in key
+    assert out[key]["calls"] == 2 and out[key]["errors"] == 1 and out[key]["avg_ms"] == 10.0
+
+
+class FakeNode:
+    def __init__(self, delay=0.0, result="0x1", error=None, rpc_error=None):
+        self.delay, self.result, self.error, self.rpc_error = delay, result, error, rpc_error
+        self.calls = 0
+
+    def make_request(self, method, params):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        if self.rpc_error:
+            return {"jsonrpc": "2.0", "id": 1, "error": {"message": self.rpc_error}}
+        return {"jsonrpc": "2.0", "id": 1, "result": self.result}
+
+
+def _multi(monkeypatch, nodes):
+    monkeypatch.setattr(providers, "RPC_HEDGE_DEFAULT_MS", 50.0)
+    p = providers.MultiEndpointProvider(list(nodes))
+    p._nodes = nodes
+    return p
+
+
+def test_slow_read_is_hedged_to_next_endpoint(monkeypatch):
+    slow, fast = FakeNode(delay=1.0, result="0xslow"), FakeNode(result="0xfast")
+    p = _multi(monkeypatch, {"http://hedge-a": slow, "http://hedge-b": fast})
+
+    started = time.perf_counter()
+    assert p.make_request("eth_blockNumber", [])["result"] == "0xfast"
+    assert time.perf_counter() - started < 0.5
+    assert slow.calls == 1 and fast.calls == 1
+
+
+def test_write_fails_over_and_unhealthy_endpoint_is_demoted(monkeypatch):
+    raw = "0x02f8"
+    down = FakeNode(error=ConnectionError("refused"))
+    dup = FakeNode(rpc_error="already known")
+    p = _multi(monkeypatch, {"http://fo-a": down, "http://fo-b": dup})
+
+    resp = p.make_request("eth_sendRawTransaction", [raw])
+    assert resp["result"] == providers.Web3.to_hex(providers.Web3.keccak(hexstr=raw))
+
+    for _ in range(providers.RPC_FAIL_THRESHOLD):
+        providers.record_call("http://fo-a", 5.0, "eth_call: ConnectionError")
+    providers.record_call("http://fo-b", 40.0)
+    assert providers.ordered_urls("http://fo-a,http://fo-b") == ["http://fo-b", "http://fo-a"]
+
+
+def test_chain_id_is_read_once_per_endpoint():
+    calls = []
+
+    class Eth:
+        @property
+        def chain_id(self):
+            calls.append(1)
+            time.sleep(0.1)
+            return 14
+
+    w3 = types.SimpleNamespace(eth=Eth())
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(lambda _: providers.chain_id(w3, "http://chain-id.test"), range(4))) == [14] * 4
+    assert len(calls) == 1
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from zipfile import ZipFile
+
+import pytest
+
+from app import bundle, keys, sigverify
+
+signing = pytest.importorskip("nacl.signing")
+
+
+def _signed(sk, msg):
+    return keys._to_pem(sk.verify_key.encode()).encode(), msg, sk.sign(msg).signature
+
+
+def test_verify_key_is_built_once_per_public_key(monkeypatch):
+    built = []
+    real = sigverify.VerifyKey
+
+    def counting(raw):
+        built.append(raw)
+        return real(raw)
+
+    monkeypatch.setattr(sigverify, "VerifyKey", counting)
+    sigverify._KEYS.clear()
+    sk = signing.SigningKey.generate()
+
+    for i in range(5):
+        assert sigverify.verify_one(*_signed(sk, b"manifest-%d" % i)) is None
+    assert len(built) == 1
+
+
+@pytest.mark.parametrize("use_pool", [False, True])
+def test_verify_many_reports_per_item(use_pool):
+    a, b = signing.SigningKey.generate(), signing.SigningKey.generate()
+    items = [_signed(a, b"m1"), _signed(b, b"m2"), _signed(a, b"m3")]
+    pem, msg, sig = items[1]
+    items.append((pem, b"tampered", sig))
+    items.append((b"not a pem", b"m", b"x" * 64))
+
+    out = sigverify.verify_many(items, use_pool=use_pool)
+    assert out[:3] == [None, None, None]
+    assert out[3] == "signature_invalid"
+    assert out[4].startswith("signature_check_failed")
+
+
+def test_audit_checks_stored_bundles_through_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / ".blobs"))
+    paths = [bundle.create_bundle({"id": f"r-{i}", "reference": f"ref-{i}"}, b"<Document/>")[0] for i in range(3)]
+    with ZipFile(paths[1]) as src:
+        files = {n: src.read(n) for n in src.namelist()}
+    files["manifest.sig"] = bytes(64)
+    with ZipFile(paths[1], "w") as dst:
+        for name, data in files.items():
+            dst.writestr(name, data)
+
+    pools = []
+    real_pool = sigverify._pool
+    monkeypatch.setattr(sigverify, "_pool", lambda: pools.append(1) or real_pool())
+    monkeypatch.setattr(sigverify, "SIGVERIFY_POOL_MIN", 3)
+    monkeypatch.setattr(sigverify, "SIGVERIFY_PROCESSES", 2)
+
+    out = bundle.audit_signatures(paths + [str(tmp_path / "missing.zip")])
+    assert pools == [1]
+    assert out[0] is None and out[2] is None and out[1] == "signature_invalid"
+    assert out[3].startswith("zip_open_failed")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+
+from app.stages import Stage, run_stages
+
+
+def test_run_stages_joins_results_concurrently():
+    def slow(val):
+        def _fn():
+            time.sleep(0.2)
+            return val
+
+        return _fn
+
+    started = time.monotonic()
+    res = run_stages([Stage(name="a", fn=slow(1)), Stage(name="b", fn=slow(2)), Stage(name="c", fn=slow(3))])
+    elapsed = time.monotonic() - started
+
+    assert {k: v.value for k, v in res.items()} == {"a": 1, "b": 2, "c": 3}
+    assert all(r.ok for r in res.values())
+    assert elapsed < 0.5
+
+
+def test_run_stages_defaults_on_error_and_timeout():
+    def boom():
+        raise RuntimeError("provider down")
+
+    def hang():
+        time.sleep(2)
+        return "late"
+
+    started = time.monotonic()
+    res = run_stages(
+        [
+            Stage(name="err", fn=boom, default="allow"),
+            Stage(name="slow", fn=hang, timeout=0.1, default="allow"),
+            Stage(name="ok", fn=lambda: "value"),
+        ]
+    )
+
+    assert time.monotonic() - started < 1.0
+    assert res["err"].value == "allow" and not res["err"].ok and "provider down" in res["err"].error
+    assert res["slow"].value == "allow" and res["slow"].error == "timeout"
+    assert res["ok"].value == "value" and res["ok"].ok
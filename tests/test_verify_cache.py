@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import anchor, bundle, models, schemas, verify_cache
+from app.api.routes.verify import verify_request
+
+UNKNOWN = "0x" + "5e" * 32
+ZIP_HASH = "0x" + "21" * 32
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    monkeypatch.setattr(verify_cache, "_redis", lambda: None)
+    monkeypatch.setattr(verify_cache, "VERIFY_CACHE_ENABLED", True)
+    verify_cache._LOCAL.clear()
+    yield
+    verify_cache._LOCAL.clear()
+
+
+def _session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def test_chain_answers_are_cached_until_invalidated(monkeypatch):
+    session = _session()
+    calls = []
+
+    def fake_find(h, **k):
+        calls.append(h)
+        return schemas.ChainMatch(matches=False)
+
+    monkeypatch.setattr(anchor, "find_anchor", fake_find)
+    req = schemas.VerifyRequest(bundle_hash=UNKNOWN)
+
+    assert not verify_request(req, session).matches_onchain
+    assert not verify_request(req, session).matches_onchain
+    assert len(calls) == 1
+
+    verify_request(schemas.VerifyRequest(bundle_hash=UNKNOWN, onchain_recheck=True), session)
+    assert len(calls) == 2
+
+    verify_cache.invalidate([UNKNOWN.upper().replace("0X", "0x")])
+    monkeypatch.setattr(anchor, "find_anchor", lambda h, **k: schemas.ChainMatch(matches=True, txid="0xt"))
+    res = verify_request(req, session)
+    assert res.matches_onchain and res.flare_txid == "0xt"
+
+
+def test_negative_and_positive_ttls_differ(monkeypatch):
+    monkeypatch.setattr(verify_cache, "VERIFY_CACHE_NEGATIVE_TTL", 0)
+    verify_cache.put_anchor(UNKNOWN, schemas.ChainMatch(matches=False))
+    assert verify_cache.get_anchor(UNKNOWN) is None
+
+    verify_cache.put_anchor(UNKNOWN, schemas.ChainMatch(matches=True, txid="0xt"))
+    assert verify_cache.get_anchor(UNKNOWN).txid == "0xt"
+
+
+def test_unchanged_url_skips_download(monkeypatch):
+    downloads = []
+
+    def fake_verify(url, lookup=None, signatures=None):
+        downloads.append(url)
+        return lookup(ZIP_HASH) or schemas.VerificationResult(bundle_hash=UNKNOWN, errors=[])
+
+    monkeypatch.setattr(bundle, "verify_bundle", fake_verify)
+    monkeypatch.setattr(verify_cache, "url_validator", lambda url: '"etag-1"|')
+
+    assert verify_cache.verify_bundle_url("https://x.test/b.zip").bundle_hash == UNKNOWN
+    assert verify_cache.verify_bundle_url("https://x.test/b.zip").bundle_hash == UNKNOWN
+    assert downloads == ["https://x.test/b.zip"]
+
+    monkeypatch.setattr(verify_cache, "url_validator", lambda url: '"etag-2"|')
+    verify_cache.verify_bundle_url("https://x.test/b.zip")
+    assert len(downloads) == 2
+
+
+def test_v2_results_are_found_by_zip_hash(monkeypatch):
+    validated = []
+
+    def fake_verify_file(fp, zip_hash, signatures=None):
+        validated.append(zip_hash)
+        return schemas.VerificationResult(bundle_hash=UNKNOWN, errors=[])  # the v2 Merkle root
+
+    def fake_download(url, spool):
+        spool.write(b"zip")
+        return ZIP_HASH
+
+    monkeypatch.setattr(bundle, "_download_bundle", fake_download)
+    monkeypatch.setattr(bundle, "verify_bundle_file", fake_verify_file)
+    monkeypatch.setattr(verify_cache, "url_validator", lambda url: None)
+
+    # Same zip behind two URLs without validators: downloaded twice, validated once.
+    assert verify_cache.verify_bundle_url("https://x.test/a.zip").bundle_hash == UNKNOWN
+    assert verify_cache.verify_bundle_url("https://x.test/b.zip").bundle_hash == UNKNOWN
+    assert validated == [ZIP_HASH]
+    assert verify_cache.get_bundle(UNKNOWN) is None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import anchor, models, schemas
+from app.api.routes.verify import verify_request
+
+BUNDLE = "0x" + "ab" * 32
+
+
+def _session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+
+    rec = models.Receipt(
+        reference="ref-1",
+        tip_tx_hash="0x01",
+        chain="flare",
+        amount=Decimal("1"),
+        currency="FLR",
+        sender_wallet="0xa",
+        receiver_wallet="0xb",
+        status="anchored",
+        bundle_hash=BUNDLE,
+        flare_txid="0xt1",
+    )
+    session.add(rec)
+    session.commit()
+    session.add_all(
+        [
+            models.ChainAnchor(
+                receipt_id=str(rec.id), chain="flare", txid="0xt1", anchored_at=datetime(2026, 1, 1), block_number=7
+            ),
+            models.ChainAnchor(
+                receipt_id=str(rec.id), chain="base", txid="0xt2", anchored_at=datetime(2026, 1, 2), status="pending"
+            ),
+        ]
+    )
+    session.commit()
+    return session, str(rec.id)
+
+
+def test_answers_from_db_without_rpc(monkeypatch):
+    session, rid = _session()
+
+    def no_chain(*a, **k):
+        raise AssertionError("chain lookup not expected")
+
+    monkeypatch.setattr(anchor, "find_anchor", no_chain)
+    monkeypatch.setattr(anchor, "verify_anchor_tx", no_chain)
+
+    res = verify_request(schemas.VerifyRequest(bundle_hash=BUNDLE.upper().replace("0X", "0x")), session)
+    assert res.matches_onchain and res.source == "db"
+    assert res.receipt_id == rid and res.flare_txid == "0xt1"
+    assert [(a.chain, a.status) for a in res.anchors] == [("flare", "confirmed"), ("base", "pending")]
+
+
+def test_onchain_recheck_and_unknown_bundle(monkeypatch):
+    session, _ = _session()
+    checked = []
+
+    def fake_verify_tx(*, txid, expected_bundle_hash_hex, rpc_url=None, contract_addr=None):
+        checked.append((txid, expected_bundle_hash_hex))
+        return False, None, None
+
+    monkeypatch.setattr(anchor, "verify_anchor_tx", fake_verify_tx)
+    monkeypatch.setattr(anchor, "find_anchor", lambda h, **k: schemas.ChainMatch(matches=False))
+
+    res = verify_request(schemas.VerifyRequest(bundle_hash=BUNDLE, onchain_recheck=True), session)
+    assert checked == [("0xt1", BUNDLE)]
+    assert not res.matches_onchain and res.source == "chain"
+    assert "anchor_not_found_onchain" in res.errors and res.anchors[0].onchain is False
+
+    res = verify_request(schemas.VerifyRequest(bundle_hash="0x" + "cd" * 32), session)
+    assert res.source == "chain" and res.receipt_id is None and res.anchors == []
+
+
+def test_recheck_uses_the_chain_an_anchor_was_recorded_on(monkeypatch):
+    from app import jobs
+
+    session, rid = _session()
+    rec = session.get(models.Receipt, rid)
+    jobs._record_chain_anchor(
+        session, rec, "base", "0xt3", block_number=9, rpc_url="https://base.example", contract="0x" + "cc" * 20
+    )
+    checked = {}
+
+    def fake_verify_tx(*, txid, expected_bundle_hash_hex, rpc_url=None, contract_addr=None):
+        checked[txid] = (rpc_url, contract_addr)
+        return True, 9, None
+
+    monkeypatch.setattr(anchor, "verify_anchor_tx", fake_verify_tx)
+    monkeypatch.setattr(anchor, "find_anchor", lambda h, **k: schemas.ChainMatch(matches=False))
+
+    res = verify_request(schemas.VerifyRequest(bundle_hash=BUNDLE, onchain_recheck=True), session)
+    assert checked["0xt3"] == ("https://base.example", "0x" + "cc" * 20)
+    assert res.matches_onchain and "anchor_not_found_onchain" not in res.errors
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import time
+import types
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import jobs, models
+from app import queue as queue_mod
+
+
+class DummySession:
+    def __init__(self, project=None):
+        self._project = project
+        self.added = []
+        self.commits = 0
+
+    def get(self, model, pk):
+        if model is models.Project:
+            return self._project
+        return None
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def test_anchoring_policy_project_overrides_org():
+    cfg = types.SimpleNamespace(anchoring=types.SimpleNamespace(mode="sequential", quorum=1))
+    proj = types.SimpleNamespace(config={"anchoring": {"mode": "concurrent", "quorum": 2}})
+    rec = types.SimpleNamespace(project_id="p1")
+    assert jobs._anchoring_policy(DummySession(proj), rec, cfg) == ("concurrent", 2)
+    assert jobs._anchoring_policy(DummySession(None), types.SimpleNamespace(project_id=None), cfg) == (
+        "sequential",
+        1,
+    )
+
+
+def test_quorum_is_clamped_to_configured_chains(caplog):
+    rec = types.SimpleNamespace(id="r1")
+    assert jobs._clamp_quorum(3, 2, rec) == 2
+    assert "exceeds" in caplog.text
+    assert jobs._clamp_quorum(2, 3, rec) == 2
+    assert jobs._clamp_quorum(1, 1, rec) == 1
+
+
+def test_concurrent_anchoring_records_each_chain(monkeypatch):
+    def fake_anchor(params, bundle_hash, min_confirmations=0):
+        time.sleep(0.2)
+        if params["name"] == "bad":
+            raise RuntimeError("rpc down")
+        return "0x" + params["name"].encode().hex().ljust(64, "0"), 1
+
+    monkeypatch.setattr(jobs, "_anchor_on_chain", fake_anchor)
+    monkeypatch.setattr(jobs, "_publish_receipt_event", lambda rec: None)
+
+    rec = types.SimpleNamespace(id="r1", status="pending", flare_txid=None, anchored_at=None)
+    params = [
+        {"name": n, "rpc_url": f"http://{n}", "contract": "0x" + "1" * 40, "private_key": "k"}
+        for n in ("flare", "base", "bad")
+    ]
+    session = DummySession()
+
+    started = time.monotonic()
+    successes = jobs._anchor_chains_concurrently(session, rec, params, "0x" + "ab" * 32, quorum=2)
+
+    assert time.monotonic() - started < 0.5
+    assert successes == 2
+    assert rec.status == "anchored"
+    assert sorted(a.chain for a in session.added) == ["base", "flare"]
+
+
+def test_async_submission_below_quorum_is_left_to_the_tracker(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    rec = models.Receipt(
+        reference="ref-async",
+        tip_tx_hash="0x" + "ab" * 32,
+        chain="flare",
+        amount=Decimal("1"),
+        currency="FLR",
+        sender_wallet="0xa",
+        receiver_wallet="0xb",
+        status="pending",
+    )
+    session.add(rec)
+    session.commit()
+
+    def submit_one(session, rec, chain_params, bundle_hash):
+        session.add(models.ChainAnchor(receipt_id=str(rec.id), chain="flare", txid="0x01", status="pending"))
+        session.commit()
+        return 1  # the second chain failed: below a quorum of 2
+
+    trackers, finalized = [], []
+    monkeypatch.setattr(jobs, "_submit_chain_anchors", submit_one)
+    monkeypatch.setattr(jobs, "_publish_receipt_event", lambda rec: None)
+    monkeypatch.setattr(queue_mod, "enqueue_anchor_tracker", lambda delay=0: trackers.append(delay))
+    monkeypatch.setattr(jobs, "_anchoring_policy", lambda session, rec, cfg: ("sequential", 2))
+    monkeypatch.setattr(jobs, "_resolve_anchoring_chains", lambda session, rec, cfg: [{}, {}])
+    monkeypatch.setattr(
+        jobs, "_finalize_receipt", lambda session, rec, cfg, anchored, callback_url: finalized.append(anchored)
+    )
+
+    assert jobs._submit_for_tracking(session, rec, [{}, {}], "0x" + "cd" * 32, None)
+    assert len(trackers) == 1 and rec.status == "pending"
+
+    # Still pending on-chain: the receipt is not failed yet.
+    jobs._settle_tracked_receipt(session, rec, None)
+    assert finalized == []
+
+    session.query(models.ChainAnchor).update({"status": "confirmed"})
+    jobs._settle_tracked_receipt(session, rec, None)
+    assert rec.status == "failed" and finalized == [False]
@@ -20,6 +20,37 @@ def main() -> None:
     queue_names = [q.strip() for q in (os.getenv("RQ_QUEUES") or "default").split(",") if q.strip()]
     queues = [get_queue(name) for name in queue_names]
     worker = Worker(queues, connection=get_redis())
+
+    # Load signing keys once here so forked work horses inherit them; SIGHUP reloads.
+    try:
+        from app import keys
+
+        keys.service_key()
+        keys.vc_signing_key()
+        keys.install_reload_signal()
+    except Exception:
+        pass
+
+    # Kick off the recurring EvidenceAnchored index sync (it reschedules itself).
+    try:
+        from app.chain_index import CHAIN_INDEX_ENABLED
+        from app.queue import enqueue_chain_index_sync
+
+        if CHAIN_INDEX_ENABLED:
+            enqueue_chain_index_sync(0)
+    except Exception:
+        pass
+
+    # Recurring sweep for batch-anchoring items whose scheduled flush was lost.
+    try:
+        from app.anchor_batch import ANCHOR_BATCH_SWEEP_INTERVAL
+        from app.queue import enqueue_anchor_batch_sweep
+
+        if ANCHOR_BATCH_SWEEP_INTERVAL > 0:
+            enqueue_anchor_batch_sweep(ANCHOR_BATCH_SWEEP_INTERVAL)
+    except Exception:
+        pass
+
     worker.work(with_scheduler=True)
 
 